@@ -0,0 +1,96 @@
+"""
+Compares loading columns written by ColumnarSink with re-parsing the CSV file produced by create-import-file.
+
+Usage:
+    python benchmarks/columnar_benchmark.py [number of lines]
+"""
+import csv
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Callable, List
+
+from csv_import.csv.columnar import (FLOAT64, INT64, STRING, ColumnarReader,
+                                     ColumnarSink)
+from csv_import.csv.parsers import FileParserFactory, ParserOptions
+from csv_import.csv.processors import FileProcessorFactory
+
+
+def measure(name: str, function: Callable[[], Any]) -> Any:
+    started = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - started
+
+    print(f'{name}: {elapsed:.3f}s')
+
+    return result
+
+
+def generate_input_file(file_path: str, lines_count: int) -> None:
+    with open(file_path, 'w') as input_file:
+        input_file.write('ID,Name,Age,Salary\n')
+
+        for index in range(lines_count):
+            input_file.write(f'{index},Name {index},{20 + index % 50},{1000 + index % 7 * 0.5}\n')
+
+
+def reparse_csv(file_path: str) -> List[List[Any]]:
+    ids: List[int] = []
+    names: List[str] = []
+    ages: List[int] = []
+    salaries: List[float] = []
+
+    with open(file_path, newline='') as output_file:
+        reader = csv.reader(output_file)
+        next(reader)
+
+        for record_id, name, age, salary in reader:
+            ids.append(int(record_id))
+            names.append(name)
+            ages.append(int(age))
+            salaries.append(float(salary))
+
+    return [ids, names, ages, salaries]
+
+
+def load_columns(directory: str) -> List[Any]:
+    reader = ColumnarReader(directory)
+
+    return [reader.read_column(column.name) for column in reader.columns]
+
+
+def total(column: Any) -> Any:
+    # NumPy arrays are summed without boxing every element
+    return column.sum() if hasattr(column, 'sum') else sum(column)
+
+
+def main() -> None:
+    lines_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    options = ParserOptions(field_terminator=',', field_enclosing_value='"')
+
+    with tempfile.TemporaryDirectory() as directory:
+        input_file_path = os.path.join(directory, 'input.csv')
+        output_file_path = os.path.join(directory, 'output.csv')
+        output_directory = os.path.join(directory, 'columns')
+
+        generate_input_file(input_file_path, lines_count)
+
+        file_processor = FileProcessorFactory(FileParserFactory()).create(input_file_path, options)
+        column_types = [INT64, STRING, INT64, FLOAT64]
+
+        measure('Writing CSV', lambda: file_processor.process(input_file_path, output_file_path))
+        measure(
+            'Writing columns',
+            lambda: file_processor.process_into(
+                input_file_path, ColumnarSink(output_directory, column_types=column_types, options=options)))
+
+        measure('Re-parsing CSV', lambda: reparse_csv(output_file_path))
+        columns = measure('Loading columns', lambda: load_columns(output_directory))
+
+        # Touch numeric columns to make sure their pages are actually read
+        measure('Summing loaded numeric columns', lambda: [total(columns[index]) for index in (0, 2, 3)])
+
+
+if __name__ == '__main__':
+    main()
@@ -1,18 +1,18 @@
-from typing import List
+from typing import FrozenSet, List, Optional
 
 from csv_import.csv.parsers import (FileParser, FileParserFactory, Line,
-                                    LineParser, NumberParser, ParserOptions,
-                                    ParsingError, StringParser)
+                                    LineParser, LineParserDispatcher,
+                                    NumberParser, ParserOptions, ParsingError,
+                                    StringParser)
 
 
 class LineWithIDAndNameFirstLetterParser(LineParser):
-    def _parse(self, line: Line, values: List[str]) -> List[str]:
-        # First Let's check whether is our case and we can handle it
-        if len(values) != 2:
-            raise ParsingError(
-                f'Line # {line.index}: {line.line}. '
-                f'Expected 2 fields, got {len(values)}')
+    @property
+    def field_counts(self) -> Optional[FrozenSet[int]]:
+        # This parser can handle only lines containing two fields
+        return frozenset([2])
 
+    def _parse(self, line: Line, values: List[str]) -> List[str]:
         # We got the first field
         record_id = self._value_parsers[0].parse(values[0])
 
@@ -38,13 +38,12 @@ class LineWithIDAndNameFirstLetterParser(LineParser):
 
 
 class IDAndNameLineParser(LineParser):
-    def _parse(self, line: Line, values: List[str]) -> List[str]:
-        # First Let's check whether is our case and we can handle it
-        if len(values) != 2:
-            raise ParsingError(
-                f'Line # {line.index}: {line.line}. '
-                f'Expected 2 fields, got {len(values)}')
+    @property
+    def field_counts(self) -> Optional[FrozenSet[int]]:
+        # This parser can handle only lines containing two fields
+        return frozenset([2])
 
+    def _parse(self, line: Line, values: List[str]) -> List[str]:
         # We got the record ID
         record_id = self._value_parsers[0].parse(values[0])
 
@@ -83,21 +82,15 @@ class BrokerCSVFileParserFactory(FileParserFactory):
             NumberParser()   # Salary
         ]
 
-        # Let's define a line parser as a chain of parsers
-        line_parser = LineParser(
-            value_parsers,
+        # Let's define a line parser dispatching lines to the parsers able to handle them
+        line_parser = LineParserDispatcher(
+            [
+                LineParser(value_parsers, options),
+                LineWithIDAndNameFirstLetterParser(value_parsers, options),
+                IDAndNameLineParser(value_parsers, options)
+            ],
             options,
-            skip_incorrect_lines=False,
-            next_line_parser=LineWithIDAndNameFirstLetterParser(
-                value_parsers,
-                options,
-                skip_incorrect_lines=False,
-                next_line_parser=IDAndNameLineParser(
-                    value_parsers,
-                    options,
-                    skip_incorrect_lines=False
-                )
-            )
+            skip_incorrect_lines=False
         )
 
         # Finally let's create a file parser
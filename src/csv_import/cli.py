@@ -1,16 +1,38 @@
 import importlib
 import importlib.util
 import inspect
+import json
 import logging
 import os
+import signal
 import sys
-from types import TracebackType
-from typing import Optional, Type
+from dataclasses import asdict
+from types import ModuleType, TracebackType
+from typing import Dict, List, Optional, Tuple, Type
 
 import click
 
+from csv_import.csv.cache import DEFAULT_CACHE_MAX_SIZE, CacheOptions
+from csv_import.csv.columnar import ColumnarSink
+from csv_import.csv.dedup import (DEFAULT_DEDUPLICATION_MEMORY_LIMIT,
+                                  DeduplicationOptions)
+from csv_import.csv.diff import (DEFAULT_DIFF_MEMORY_LIMIT, DiffOptions,
+                                 FileDiffer)
+from csv_import.csv.incremental import IncrementalState
+from csv_import.csv.index import LineIndex
+from csv_import.csv.lookup import (DEFAULT_LOOKUP_MEMORY_LIMIT, LookupIndex,
+                                   LookupOptions)
 from csv_import.csv.parsers import FileParserFactory, ParserOptions
-from csv_import.csv.processors import FileProcessorFactory
+from csv_import.csv.partitions import (BYTES, HASH, ROWS, PartitionedSink,
+                                       PartitionOptions)
+from csv_import.csv.processors import (ENCLOSED, MINIMAL, NDJSON, TSV,
+                                       FileProcessorFactory, OutputOptions)
+from csv_import.csv.profiling import FileProfiler, ProfileOptions
+from csv_import.csv.progress import JSON, LOG, NONE, TTY
+from csv_import.csv.sort import DEFAULT_SORT_MEMORY_LIMIT, SortOptions
+from csv_import.csv.sql import MYSQL, POSTGRESQL, SQLITE, SqlOptions, SqlSink
+from csv_import.csv.validation import FileValidator
+from csv_import.server import JobServer, submit_job
 
 
 def excepthook(
@@ -33,6 +55,56 @@ def excepthook(
 sys.excepthook = excepthook
 
 
+# Plugin modules loaded by this process with modification times of their files
+# (a long-running server reuses them between jobs and reloads them when they change)
+_parser_factory_modules: Dict[str, Tuple[float, ModuleType]] = {}
+
+
+def _load_parser_factory_module(parser_factory_file: str) -> ModuleType:
+    modification_time = os.path.getmtime(parser_factory_file)
+    cached_module = _parser_factory_modules.get(os.path.abspath(parser_factory_file))
+
+    if cached_module and cached_module[0] == modification_time:
+        return cached_module[1]
+
+    parser_factory_module_name = os.path.basename(parser_factory_file)
+    parser_factory_module_spec = importlib.util.spec_from_file_location(
+        parser_factory_module_name, parser_factory_file)
+
+    if not parser_factory_module_spec:
+        raise ValueError(f'Cannot FileParserFactory from {parser_factory_file}')
+
+    parser_factory_module = importlib.util.module_from_spec(parser_factory_module_spec)
+    # The module is registered to make parsers defined in it picklable (they are sent to worker processes)
+    sys.modules[parser_factory_module_name] = parser_factory_module
+    parser_factory_module_spec.loader.exec_module(parser_factory_module)  # type: ignore
+    _parser_factory_modules[os.path.abspath(parser_factory_file)] = (modification_time, parser_factory_module)
+
+    return parser_factory_module
+
+
+def load_file_parser_factory(parser_factory_file: Optional[str] = None) -> FileParserFactory:
+    """
+    Loads a file parser factory from a Python file (the module is loaded once per process
+    and reloaded only when the file is modified)
+
+    :param parser_factory_file: Optional path to a Python file containing definition of FileParserFactory
+                                (by default the sniffing FileParserFactory is used)
+    :return: File parser factory
+    """
+
+    if not parser_factory_file:
+        return FileParserFactory()
+
+    parser_factory_module = _load_parser_factory_module(parser_factory_file)
+
+    for module_type_name, module_type in inspect.getmembers(parser_factory_module):
+        if inspect.isclass(module_type) and issubclass(module_type, FileParserFactory):
+            return module_type()
+
+    raise ValueError(f'Cannot FileParserFactory from {parser_factory_file}')
+
+
 @click.group()
 @click.pass_context
 def cli(*args, **kwargs) -> None:  # type: ignore
@@ -61,6 +133,155 @@ def process() -> None:
 @click.option('--field-terminator', '-f', help='Character used as a field terminator (comma by default)', type=str, required=False, default=',')
 @click.option('--field-enclosing-value', '-e', help='Character used to enclose fields (double quote string by default)', type=str, required=False, default='"')
 @click.option('--parser-factory-file', '-p', help='Path to a Python file containing definition of FileParserFactory', type=str, required=False)
+@click.option(
+    '--encoding',
+    help='Encoding of input files (the platform one by default, a UTF-8 byte order mark is always skipped)',
+    type=str, required=False)
+@click.option(
+    '--columns',
+    help='Comma separated list of columns to parse, all other columns are skipped (names or 0-based positions)',
+    type=str, required=False)
+@click.option('--exclude-columns', help='Comma separated list of columns to skip (names or 0-based positions)', type=str, required=False)
+@click.option(
+    '--filter', 'row_filter',
+    help='Expression selecting rows to parse evaluated against raw fields, e.g. "status == \'ACTIVE\' and amount >= 100"',
+    type=str, required=False)
+@click.option(
+    '--progress',
+    help='Progress reporting: to the log, as a progress line in a terminal or as JSON events written to standard error',
+    type=click.Choice([NONE, LOG, TTY, JSON]), required=False, default=LOG)
+@click.option(
+    '--progress-interval',
+    help='Minimal number of seconds between two progress reports (depends on the reporting mode by default)',
+    type=float, required=False)
+@click.option('--reject-file', '-r', help='Path to a file where skipped and failed lines will be written', type=str, required=False)
+@click.option(
+    '--error-summary-interval',
+    help='Minimal number of seconds between two error summaries',
+    type=float, required=False, default=10.0)
+@click.option('--error-sample-size', help='Number of example skipped lines written to the log', type=int, required=False, default=10)
+@click.option(
+    '--max-record-size',
+    help='Lines longer than this number of bytes are written to the reject file without being read into memory',
+    type=int, required=False)
+@click.option('--max-field-size', help='Lines with values longer than this number of chars are rejected', type=int, required=False)
+@click.option(
+    '--output-format',
+    help='Format of the output: CSV file, directory with binary column files or SQL script',
+    type=click.Choice(['csv', 'columnar', 'sql']), required=False, default='csv')
+@click.option(
+    '--column-types',
+    help='Comma separated list of column types used by columnar format (int64, float64 or str)',
+    type=str, required=False)
+@click.option(
+    '--output-dialect',
+    help=(
+        'Dialect of CSV output: every value enclosed, values enclosed only when needed, TSV with escaped special chars '
+        'or newline delimited JSON'),
+    type=click.Choice([ENCLOSED, MINIMAL, TSV, NDJSON]), required=False, default=ENCLOSED)
+@click.option('--output-field-terminator', help='Field terminator of CSV output (the input one by default)', type=str, required=False)
+@click.option(
+    '--output-field-enclosing-value',
+    help='Character used to enclose fields of CSV output (the input one by default)',
+    type=str, required=False)
+@click.option(
+    '--output-escape-char',
+    help='Character escaping enclosing values inside of values in minimal dialect (they are doubled by default)',
+    type=str, required=False)
+@click.option('--sql-table', help='Name of the table used by SQL format', type=str, required=False)
+@click.option(
+    '--sql-dialect',
+    help='SQL dialect used by SQL format',
+    type=click.Choice([POSTGRESQL, MYSQL, SQLITE]), required=False, default=POSTGRESQL)
+@click.option(
+    '--sql-conflict-columns',
+    help='Comma separated list of key columns turning SQL inserts into upserts',
+    type=str, required=False)
+@click.option('--sql-rows-per-statement', help='Number of rows inserted by a single SQL statement', type=int, required=False, default=1000)
+@click.option(
+    '--sql-statements-per-transaction',
+    help='Number of SQL statements in a transaction (0 disables transactions)',
+    type=int, required=False, default=100)
+@click.option(
+    '--sql-max-statement-size',
+    help='Maximum size of a SQL statement in bytes (e.g. max_allowed_packet of MySQL)',
+    type=int, required=False, default=1024 * 1024)
+@click.option('--head', help='Process only the first N data lines', type=int, required=False)
+@click.option('--tail', help='Process only the last N data lines', type=int, required=False)
+@click.option(
+    '--sample',
+    help='Process a random sample of data lines: a rate (if less than 1) or a number of lines',
+    type=float, required=False)
+@click.option('--sample-seed', help='Seed used for sampling', type=int, required=False)
+@click.option('--deduplicate', help='Drop duplicate lines', is_flag=True, default=False)
+@click.option(
+    '--deduplication-columns',
+    help='Comma separated list of key columns used to find duplicates (all columns by default)',
+    type=str, required=False)
+@click.option(
+    '--deduplication-memory-limit',
+    help='Memory limit of deduplication in megabytes',
+    type=int, required=False, default=DEFAULT_DEDUPLICATION_MEMORY_LIMIT // (1024 * 1024))
+@click.option('--sort-columns', help='Comma separated list of key columns used to sort lines', type=str, required=False)
+@click.option('--sort-column-types', help='Comma separated list of key column types (int64, float64 or str)', type=str, required=False)
+@click.option(
+    '--sort-memory-limit',
+    help='Size of a sorted run kept in memory in megabytes',
+    type=int, required=False, default=DEFAULT_SORT_MEMORY_LIMIT // (1024 * 1024))
+@click.option('--sort-workers', help='Number of worker processes sorting runs', type=int, required=False, default=1)
+@click.option(
+    '--partition-by',
+    help='Split the output into several files by a hash of key columns, by the number of rows or by the size in bytes',
+    type=click.Choice([HASH, ROWS, BYTES]), required=False)
+@click.option('--partitions', help='Number of partitions created by hash partitioning', type=int, required=False, default=4)
+@click.option('--partition-size', help='Maximum number of rows or bytes in a partition', type=int, required=False, default=1000000)
+@click.option(
+    '--partition-columns',
+    help='Comma separated list of key columns used by hash partitioning (all columns by default)',
+    type=str, required=False)
+@click.option('--repeat-header/--no-repeat-header', help='Write header lines into every partition', default=True)
+@click.option(
+    '--incremental',
+    help='Process only lines appended since the previous run and append them to the output file',
+    is_flag=True, default=False)
+@click.option(
+    '--state-file',
+    help='Path to the state file used by incremental processing (input file path with .state extension by default)',
+    type=str, required=False)
+@click.option('--cache-dir', help='Directory of the cache of outputs used to skip processing of unchanged files', type=str, required=False)
+@click.option(
+    '--cache-max-size',
+    help='Maximum size of the cache of outputs in megabytes',
+    type=int, required=False, default=DEFAULT_CACHE_MAX_SIZE // (1024 * 1024))
+@click.option(
+    '--cache-full-hash',
+    help='Hash whole input files instead of their sizes, modification times and sampled blocks',
+    is_flag=True, default=False)
+@click.option(
+    '--lookup-file',
+    help='Path to a reference CSV file (with a header line) joined with lines by a key column',
+    type=str, required=False)
+@click.option('--lookup-key-column', help='Key column of lines looked up in the reference file', type=str, required=False)
+@click.option(
+    '--lookup-reference-key-column',
+    help='Key column of the reference file (the same name as the key column of lines by default)',
+    type=str, required=False)
+@click.option(
+    '--lookup-columns',
+    help='Comma separated list of reference columns appended to lines (all except the key column by default)',
+    type=str, required=False)
+@click.option(
+    '--lookup-inner-join',
+    help='Drop lines without a matching key (they get empty values by default)',
+    is_flag=True, default=False)
+@click.option(
+    '--lookup-memory-limit',
+    help='Reference files with larger indexes are searched on disk (in megabytes)',
+    type=int, required=False, default=DEFAULT_LOOKUP_MEMORY_LIMIT // (1024 * 1024))
+@click.option(
+    '--lookup-cache/--no-lookup-cache',
+    help='Keep the index of the reference file next to it and reuse it in next runs',
+    default=True)
 def create_import_file(
         input_file: str,
         output_file: str,
@@ -68,39 +289,540 @@ def create_import_file(
         line_terminator: str = '\n',
         field_terminator: str = ',',
         field_enclosing_value: str = '"',
-        parser_factory_file: Optional[str] = None) -> None:
+        parser_factory_file: Optional[str] = None,
+        encoding: Optional[str] = None,
+        columns: Optional[str] = None,
+        exclude_columns: Optional[str] = None,
+        row_filter: Optional[str] = None,
+        progress: str = LOG,
+        progress_interval: Optional[float] = None,
+        reject_file: Optional[str] = None,
+        error_summary_interval: float = 10.0,
+        error_sample_size: int = 10,
+        max_record_size: Optional[int] = None,
+        max_field_size: Optional[int] = None,
+        output_format: str = 'csv',
+        column_types: Optional[str] = None,
+        output_dialect: str = ENCLOSED,
+        output_field_terminator: Optional[str] = None,
+        output_field_enclosing_value: Optional[str] = None,
+        output_escape_char: Optional[str] = None,
+        sql_table: Optional[str] = None,
+        sql_dialect: str = POSTGRESQL,
+        sql_conflict_columns: Optional[str] = None,
+        sql_rows_per_statement: int = 1000,
+        sql_statements_per_transaction: int = 100,
+        sql_max_statement_size: int = 1024 * 1024,
+        head: Optional[int] = None,
+        tail: Optional[int] = None,
+        sample: Optional[float] = None,
+        sample_seed: Optional[int] = None,
+        deduplicate: bool = False,
+        deduplication_columns: Optional[str] = None,
+        deduplication_memory_limit: int = DEFAULT_DEDUPLICATION_MEMORY_LIMIT // (1024 * 1024),
+        sort_columns: Optional[str] = None,
+        sort_column_types: Optional[str] = None,
+        sort_memory_limit: int = DEFAULT_SORT_MEMORY_LIMIT // (1024 * 1024),
+        sort_workers: int = 1,
+        partition_by: Optional[str] = None,
+        partitions: int = 4,
+        partition_size: int = 1000000,
+        partition_columns: Optional[str] = None,
+        repeat_header: bool = True,
+        incremental: bool = False,
+        state_file: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        cache_max_size: int = DEFAULT_CACHE_MAX_SIZE // (1024 * 1024),
+        cache_full_hash: bool = False,
+        lookup_file: Optional[str] = None,
+        lookup_key_column: Optional[str] = None,
+        lookup_reference_key_column: Optional[str] = None,
+        lookup_columns: Optional[str] = None,
+        lookup_inner_join: bool = False,
+        lookup_memory_limit: int = DEFAULT_LOOKUP_MEMORY_LIMIT // (1024 * 1024),
+        lookup_cache: bool = True) -> None:
     """
     Creates an import file
     """
 
-    file_parser_factory: Optional[FileParserFactory] = None
     parser_options = ParserOptions(
         header_lines=header_lines,
         line_terminator=line_terminator,
         field_terminator=field_terminator,
-        field_enclosing_value=field_enclosing_value
+        field_enclosing_value=field_enclosing_value,
+        reject_file_path=reject_file,
+        error_summary_interval=error_summary_interval,
+        error_sample_size=error_sample_size,
+        head=head,
+        tail=tail,
+        sample=sample,
+        sample_seed=sample_seed,
+        encoding=encoding,
+        columns=tuple(columns.split(',')) if columns else None,
+        exclude_columns=tuple(exclude_columns.split(',')) if exclude_columns else None,
+        row_filter=row_filter,
+        progress=progress,
+        progress_interval=progress_interval,
+        max_record_size=max_record_size,
+        max_field_size=max_field_size
     )
 
-    if parser_factory_file:
-        parser_factory_module_name = os.path.basename(parser_factory_file)
-        parser_factory_module_spec = importlib.util.spec_from_file_location(
-            parser_factory_module_name, parser_factory_file)
+    deduplication_options: Optional[DeduplicationOptions] = None
+
+    if deduplicate or deduplication_columns:
+        deduplication_options = DeduplicationOptions(
+            key_columns=tuple(deduplication_columns.split(',')) if deduplication_columns else None,
+            memory_limit=deduplication_memory_limit * 1024 * 1024
+        )
+
+    sort_options: Optional[SortOptions] = None
+
+    if sort_columns:
+        sort_options = SortOptions(
+            key_columns=tuple(sort_columns.split(',')),
+            key_types=tuple(sort_column_types.split(',')) if sort_column_types else None,
+            memory_limit=sort_memory_limit * 1024 * 1024,
+            workers=sort_workers
+        )
+
+    state_file_path: Optional[str] = None
 
-        if not parser_factory_module_spec:
-            raise ValueError(f'Cannot FileParserFactory from {parser_factory_file}')
+    if incremental or state_file:
+        # Columnar and partitioned outputs are rewritten by every run, so only a CSV file can be appended to
+        if output_format != 'csv' or partition_by:
+            raise click.UsageError('Incremental processing supports only a single CSV output file')
 
-        parser_factory_module = importlib.util.module_from_spec(parser_factory_module_spec)
-        parser_factory_module_spec.loader.exec_module(parser_factory_module)  # type: ignore
+        state_file_path = state_file or IncrementalState.state_file_path(input_file)
 
-        for module_type_name, module_type in inspect.getmembers(parser_factory_module):
-            if inspect.isclass(module_type) and issubclass(module_type, FileParserFactory):
-                file_parser_factory = module_type()
-                break
+    cache_options: Optional[CacheOptions] = None
 
-    else:
-        file_parser_factory = FileParserFactory()
+    if cache_dir:
+        if output_format != 'csv' or partition_by or state_file_path:
+            raise click.UsageError('Cache supports only a single CSV output file processed from the beginning')
 
+        os.makedirs(cache_dir, exist_ok=True)
+        cache_options = CacheOptions(
+            directory=cache_dir,
+            max_size=cache_max_size * 1024 * 1024,
+            full_hash=cache_full_hash
+        )
+
+    output_options = OutputOptions(
+        dialect=output_dialect,
+        field_terminator=output_field_terminator,
+        field_enclosing_value=output_field_enclosing_value,
+        escape_char=output_escape_char
+    )
+
+    lookup_index: Optional[LookupIndex] = None
+
+    if lookup_file:
+        if not lookup_key_column:
+            raise click.UsageError('Lookup requires --lookup-key-column')
+
+        lookup_options = LookupOptions(
+            reference_file_path=lookup_file,
+            key_column=lookup_key_column,
+            reference_key_column=lookup_reference_key_column,
+            value_columns=tuple(lookup_columns.split(',')) if lookup_columns else None,
+            inner_join=lookup_inner_join,
+            memory_limit=lookup_memory_limit * 1024 * 1024,
+            cache_index=lookup_cache
+        )
+        # The reference file uses the same format as the input file
+        reference_options = ParserOptions(
+            header_lines=1,
+            line_terminator=line_terminator,
+            field_terminator=field_terminator,
+            field_enclosing_value=field_enclosing_value,
+            encoding=encoding
+        )
+        lookup_index = LookupIndex.create(lookup_options, reference_options)
+
+    file_parser_factory = load_file_parser_factory(parser_factory_file)
     file_processor_factory = FileProcessorFactory(file_parser_factory)
-    file_processor = file_processor_factory.create(input_file, parser_options)
+    file_processor = file_processor_factory.create(
+        input_file, parser_options, deduplication_options, sort_options, output_options, cache_options, lookup_index)
+
+    try:
+        if output_format == 'columnar':
+            column_types_list = column_types.split(',') if column_types else None
+            output_sink = ColumnarSink(output_file, column_types=column_types_list, options=parser_options)
+
+            file_processor.process_into(input_file, output_sink)
+        elif output_format == 'sql':
+            if not sql_table:
+                raise click.UsageError('SQL format requires --sql-table')
+
+            sql_options = SqlOptions(
+                table=sql_table,
+                dialect=sql_dialect,
+                conflict_columns=tuple(sql_conflict_columns.split(',')) if sql_conflict_columns else None,
+                rows_per_statement=sql_rows_per_statement,
+                statements_per_transaction=sql_statements_per_transaction,
+                max_statement_size=sql_max_statement_size
+            )
+
+            file_processor.process_into(input_file, SqlSink(output_file, sql_options, parser_options))
+        elif partition_by:
+            partition_options = PartitionOptions(
+                mode=partition_by,
+                partitions_count=partitions,
+                partition_size=partition_size,
+                key_columns=tuple(partition_columns.split(',')) if partition_columns else None,
+                repeat_header=repeat_header
+            )
+            partitioned_sink = PartitionedSink(
+                output_file,
+                partition_options,
+                parser_options,
+                file_processor.line_processor.format_values,
+                file_processor.line_processor.format_header)
+
+            file_processor.process_into(input_file, partitioned_sink)
+        else:
+            file_processor.process(input_file, output_file, state_file_path)
+    finally:
+        if lookup_index is not None:
+            lookup_index.close()
+
+
+@process.command()
+@click.option('--input-file', '-i', help='Path to the input CSV file', type=str, required=True)
+@click.option('--step', '-s', help='Number of lines between two indexed lines', type=int, required=False, default=LineIndex.DEFAULT_STEP)
+def build_line_index(input_file: str, step: int = LineIndex.DEFAULT_STEP) -> None:
+    """
+    Builds a line index used by --head, --tail and --sample options to seek directly to the selected lines
+    """
+
+    line_index = LineIndex.build(input_file, step)
+    line_index.save(LineIndex.index_file_path(input_file))
+
+
+@process.command()
+@click.option('--input-file', '-i', help='Path to the input CSV file', type=str, required=True)
+@click.option('--header-lines', '-h', help='Number of header lines', type=int, required=False, default=1)
+@click.option(
+    '--line-terminator', '-l',
+    help='Character used as a line terminator (new line by default)',
+    type=str, required=False, default='\n')
+@click.option(
+    '--field-terminator', '-f',
+    help='Character used as a field terminator (comma by default)',
+    type=str, required=False, default=',')
+@click.option(
+    '--field-enclosing-value', '-e',
+    help='Character used to enclose fields (double quote string by default)',
+    type=str, required=False, default='"')
+@click.option(
+    '--parser-factory-file', '-p',
+    help='Path to a Python file containing definition of FileParserFactory',
+    type=str, required=False)
+@click.option(
+    '--encoding',
+    help='Encoding of input files (the platform one by default, a UTF-8 byte order mark is always skipped)',
+    type=str, required=False)
+@click.option(
+    '--columns',
+    help='Comma separated list of columns to parse, all other columns are skipped (names or 0-based positions)',
+    type=str, required=False)
+@click.option('--exclude-columns', help='Comma separated list of columns to skip (names or 0-based positions)', type=str, required=False)
+@click.option(
+    '--filter', 'row_filter',
+    help='Expression selecting rows to parse evaluated against raw fields, e.g. "status == \'ACTIVE\' and amount >= 100"',
+    type=str, required=False)
+@click.option(
+    '--progress',
+    help='Progress reporting: to the log, as a progress line in a terminal or as JSON events written to standard error',
+    type=click.Choice([NONE, LOG, TTY, JSON]), required=False, default=LOG)
+@click.option(
+    '--progress-interval',
+    help='Minimal number of seconds between two progress reports (depends on the reporting mode by default)',
+    type=float, required=False)
+@click.option('--workers', '-w', help='Number of worker processes', type=int, required=False, default=os.cpu_count() or 1)
+@click.option(
+    '--max-offending-offsets',
+    help='Number of offsets of offending lines in the report',
+    type=int, required=False, default=FileValidator.DEFAULT_MAX_OFFENDING_OFFSETS)
+def validate(
+        input_file: str,
+        header_lines: int = 1,
+        line_terminator: str = '\n',
+        field_terminator: str = ',',
+        field_enclosing_value: str = '"',
+        parser_factory_file: Optional[str] = None,
+        encoding: Optional[str] = None,
+        columns: Optional[str] = None,
+        exclude_columns: Optional[str] = None,
+        row_filter: Optional[str] = None,
+        progress: str = LOG,
+        progress_interval: Optional[float] = None,
+        workers: int = 1,
+        max_offending_offsets: int = FileValidator.DEFAULT_MAX_OFFENDING_OFFSETS) -> None:
+    """
+    Validates an input file without writing any output and prints a JSON report
+    """
+
+    parser_options = ParserOptions(
+        header_lines=header_lines,
+        line_terminator=line_terminator,
+        field_terminator=field_terminator,
+        field_enclosing_value=field_enclosing_value,
+        # Skipped lines are summarized by the report
+        error_summary_interval=float('inf'),
+        error_sample_size=0,
+        encoding=encoding,
+        columns=tuple(columns.split(',')) if columns else None,
+        exclude_columns=tuple(exclude_columns.split(',')) if exclude_columns else None,
+        row_filter=row_filter,
+        progress=progress,
+        progress_interval=progress_interval
+    )
+
+    file_parser_factory = load_file_parser_factory(parser_factory_file)
+    file_parser = file_parser_factory.create(input_file, parser_options)
+    file_validator = FileValidator(file_parser, workers, max_offending_offsets)
+    report = file_validator.validate(input_file)
+
+    click.echo(json.dumps(report.to_dict(), indent=2))
+
+
+@process.command()
+@click.option('--input-file', '-i', help='Path to the input CSV file', type=str, required=True)
+@click.option('--header-lines', '-h', help='Number of header lines', type=int, required=False, default=1)
+@click.option(
+    '--line-terminator', '-l',
+    help='Character used as a line terminator (new line by default)',
+    type=str, required=False, default='\n')
+@click.option(
+    '--field-terminator', '-f',
+    help='Character used as a field terminator (comma by default)',
+    type=str, required=False, default=',')
+@click.option(
+    '--field-enclosing-value', '-e',
+    help='Character used to enclose fields (double quote string by default)',
+    type=str, required=False, default='"')
+@click.option(
+    '--parser-factory-file', '-p',
+    help='Path to a Python file containing definition of FileParserFactory',
+    type=str, required=False)
+@click.option(
+    '--encoding',
+    help='Encoding of input files (the platform one by default, a UTF-8 byte order mark is always skipped)',
+    type=str, required=False)
+@click.option(
+    '--columns',
+    help='Comma separated list of columns to parse, all other columns are skipped (names or 0-based positions)',
+    type=str, required=False)
+@click.option('--exclude-columns', help='Comma separated list of columns to skip (names or 0-based positions)', type=str, required=False)
+@click.option(
+    '--filter', 'row_filter',
+    help='Expression selecting rows to parse evaluated against raw fields, e.g. "status == \'ACTIVE\' and amount >= 100"',
+    type=str, required=False)
+@click.option(
+    '--progress',
+    help='Progress reporting: to the log, as a progress line in a terminal or as JSON events written to standard error',
+    type=click.Choice([NONE, LOG, TTY, JSON]), required=False, default=LOG)
+@click.option(
+    '--progress-interval',
+    help='Minimal number of seconds between two progress reports (depends on the reporting mode by default)',
+    type=float, required=False)
+@click.option('--top-values', help='Number of the most frequent values reported for every column', type=int, required=False, default=10)
+@click.option(
+    '--table',
+    help='Name of the table in the suggested CREATE TABLE statement (the input file name by default)',
+    type=str, required=False)
+@click.option(
+    '--sql-dialect',
+    help='SQL dialect of the suggested CREATE TABLE statement',
+    type=click.Choice([POSTGRESQL, MYSQL, SQLITE]), required=False, default=POSTGRESQL)
+def profile(
+        input_file: str,
+        header_lines: int = 1,
+        line_terminator: str = '\n',
+        field_terminator: str = ',',
+        field_enclosing_value: str = '"',
+        parser_factory_file: Optional[str] = None,
+        encoding: Optional[str] = None,
+        columns: Optional[str] = None,
+        exclude_columns: Optional[str] = None,
+        row_filter: Optional[str] = None,
+        progress: str = LOG,
+        progress_interval: Optional[float] = None,
+        top_values: int = 10,
+        table: Optional[str] = None,
+        sql_dialect: str = POSTGRESQL) -> None:
+    """
+    Profiles columns of an input file in a single pass and prints a JSON report with a suggested CREATE TABLE statement
+    """
+
+    parser_options = ParserOptions(
+        header_lines=header_lines,
+        line_terminator=line_terminator,
+        field_terminator=field_terminator,
+        field_enclosing_value=field_enclosing_value,
+        # Skipped lines are counted by the profile
+        error_summary_interval=float('inf'),
+        error_sample_size=0,
+        encoding=encoding,
+        columns=tuple(columns.split(',')) if columns else None,
+        exclude_columns=tuple(exclude_columns.split(',')) if exclude_columns else None,
+        row_filter=row_filter,
+        progress=progress,
+        progress_interval=progress_interval
+    )
+
+    file_parser_factory = load_file_parser_factory(parser_factory_file)
+    file_parser = file_parser_factory.create(input_file, parser_options)
+    file_profiler = FileProfiler(file_parser, ProfileOptions(top_values=top_values))
+    file_profile = file_profiler.profile(input_file)
+    report = file_profile.to_dict()
+    report['create_table'] = file_profile.create_table(
+        table or os.path.splitext(os.path.basename(input_file))[0], sql_dialect)
+
+    click.echo(json.dumps(report, indent=2))
+
+
+@process.command()
+@click.option('--old-file', help='Path to the old version of the input CSV file', type=str, required=True)
+@click.option('--new-file', help='Path to the new version of the input CSV file', type=str, required=True)
+@click.option(
+    '--output-prefix', '-o',
+    help='Prefix of output files (PREFIX.inserts.csv, PREFIX.updates.csv and PREFIX.deletes.csv)',
+    type=str, required=True)
+@click.option('--key-columns', '-k', help='Comma separated list of key columns identifying lines', type=str, required=True)
+@click.option('--header-lines', '-h', help='Number of header lines', type=int, required=False, default=1)
+@click.option(
+    '--line-terminator', '-l',
+    help='Character used as a line terminator (new line by default)',
+    type=str, required=False, default='\n')
+@click.option(
+    '--field-terminator', '-f',
+    help='Character used as a field terminator (comma by default)',
+    type=str, required=False, default=',')
+@click.option(
+    '--field-enclosing-value', '-e',
+    help='Character used to enclose fields (double quote string by default)',
+    type=str, required=False, default='"')
+@click.option(
+    '--parser-factory-file', '-p',
+    help='Path to a Python file containing definition of FileParserFactory',
+    type=str, required=False)
+@click.option(
+    '--encoding',
+    help='Encoding of input files (the platform one by default, a UTF-8 byte order mark is always skipped)',
+    type=str, required=False)
+@click.option(
+    '--columns',
+    help='Comma separated list of columns to parse, all other columns are skipped (names or 0-based positions)',
+    type=str, required=False)
+@click.option('--exclude-columns', help='Comma separated list of columns to skip (names or 0-based positions)', type=str, required=False)
+@click.option(
+    '--filter', 'row_filter',
+    help='Expression selecting rows to parse evaluated against raw fields, e.g. "status == \'ACTIVE\' and amount >= 100"',
+    type=str, required=False)
+@click.option(
+    '--progress',
+    help='Progress reporting: to the log, as a progress line in a terminal or as JSON events written to standard error',
+    type=click.Choice([NONE, LOG, TTY, JSON]), required=False, default=LOG)
+@click.option(
+    '--progress-interval',
+    help='Minimal number of seconds between two progress reports (depends on the reporting mode by default)',
+    type=float, required=False)
+@click.option(
+    '--memory-limit',
+    help='Memory limit of the index of the old version in megabytes',
+    type=int, required=False, default=DEFAULT_DIFF_MEMORY_LIMIT // (1024 * 1024))
+def diff(
+        old_file: str,
+        new_file: str,
+        output_prefix: str,
+        key_columns: str,
+        header_lines: int = 1,
+        line_terminator: str = '\n',
+        field_terminator: str = ',',
+        field_enclosing_value: str = '"',
+        parser_factory_file: Optional[str] = None,
+        encoding: Optional[str] = None,
+        columns: Optional[str] = None,
+        exclude_columns: Optional[str] = None,
+        row_filter: Optional[str] = None,
+        progress: str = LOG,
+        progress_interval: Optional[float] = None,
+        memory_limit: int = DEFAULT_DIFF_MEMORY_LIMIT // (1024 * 1024)) -> None:
+    """
+    Compares two versions of a file by key columns and writes inserted, updated and deleted lines into separate files
+    """
+
+    parser_options = ParserOptions(
+        header_lines=header_lines,
+        line_terminator=line_terminator,
+        field_terminator=field_terminator,
+        field_enclosing_value=field_enclosing_value,
+        encoding=encoding,
+        columns=tuple(columns.split(',')) if columns else None,
+        exclude_columns=tuple(exclude_columns.split(',')) if exclude_columns else None,
+        row_filter=row_filter,
+        progress=progress,
+        progress_interval=progress_interval
+    )
+    diff_options = DiffOptions(key_columns=tuple(key_columns.split(',')), memory_limit=memory_limit * 1024 * 1024)
+
+    file_parser_factory = load_file_parser_factory(parser_factory_file)
+    # Both versions are parsed by the same parser
+    file_parser = file_parser_factory.create(new_file, parser_options)
+    file_differ = FileDiffer(file_parser, diff_options)
+    statistics = file_differ.diff(
+        old_file,
+        new_file,
+        f'{output_prefix}.inserts.csv',
+        f'{output_prefix}.updates.csv',
+        f'{output_prefix}.deletes.csv')
+
+    click.echo(json.dumps(asdict(statistics), indent=2))
+
+
+def run_job(args: List[str]) -> None:
+    """
+    Runs a command submitted to the server
+
+    :param args: Command line arguments of the command
+    """
+
+    # Only processing commands can be submitted, so a job cannot start another server
+    if not args or args[0] != process.name:
+        raise click.UsageError(f'Only {process.name} commands can be submitted')
+
+    cli.main(args=args, prog_name='csv-import', standalone_mode=False)
+
+
+@cli.command()
+@click.option('--socket', '-s', 'socket_path', help='Path to the Unix socket', type=str, required=True)
+@click.option('--workers', '-w', help='Number of worker processes running jobs', type=int, required=False, default=os.cpu_count() or 1)
+def serve(socket_path: str, workers: int = 1) -> None:
+    """
+    Runs a server executing processing commands submitted through a Unix socket on warm worker processes
+    which keep parser factory plugins loaded between jobs
+    """
+
+    job_server = JobServer(socket_path, run_job, workers)
+    # Termination unwinds the server like an interrupt, so worker processes are stopped and the socket is removed
+    signal.signal(signal.SIGTERM, lambda signal_number, frame: sys.exit(0))
+
+    try:
+        job_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+@cli.command(context_settings={'ignore_unknown_options': True})
+@click.option('--socket', '-s', 'socket_path', help='Path to the Unix socket of a running server', type=str, required=True)
+@click.argument('args', nargs=-1, type=click.UNPROCESSED)
+def submit(socket_path: str, args: Tuple[str, ...]) -> None:
+    """
+    Submits a processing command (e.g. process create-import-file ...) to a running server and streams its output
+    """
+
+    exit_code = submit_job(socket_path, list(args), sys.stdout, sys.stderr)
 
-    file_processor.process(input_file, output_file)
+    sys.exit(exit_code)
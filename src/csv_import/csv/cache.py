@@ -0,0 +1,229 @@
+import hashlib
+import inspect
+import json
+import logging
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from logging import Logger
+from typing import Any, Dict, List, Optional, Tuple
+
+from csv_import import __version__
+
+DEFAULT_CACHE_MAX_SIZE: int = 1024 * 1024 * 1024
+# Size of every block of an input file hashed by sampled fingerprints
+SAMPLE_BLOCK_SIZE: int = 64 * 1024
+HASH_READ_SIZE: int = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class CacheOptions:
+    """
+    Class used for storing options of the result cache
+    """
+
+    # Directory containing cached outputs
+    directory: str
+    # Maximum size of cached outputs in bytes (the least recently used outputs are evicted)
+    max_size: int = DEFAULT_CACHE_MAX_SIZE
+    # Boolean value indicating whether the whole input file is hashed, by default only its size,
+    # modification time and blocks at its beginning, middle and end are used
+    full_hash: bool = False
+
+
+class ResultCache:
+    """
+    Content-addressed cache of processed files. Outputs are stored in entries named after fingerprints
+    of processing: the input file, the processing settings (e.g. parser options and the source of
+    the parser factory) and the tool version. Outputs are restored by copies, so entries aren't changed
+    when restored outputs are overwritten later (e.g. by runs without the cache).
+    Entries are evicted in the least recently used order when the cache exceeds its maximum size
+    """
+
+    ENTRY_FILE_NAME: str = 'entry.json'
+    OUTPUT_FILE_NAME: str = 'output'
+    REJECTS_FILE_NAME: str = 'rejects'
+
+    def __init__(self, options: CacheOptions, settings: Dict[str, Any]) -> None:
+        """
+        :param options: Cache options
+        :param settings: Processing settings affecting outputs (they have to be serializable to JSON,
+                         e.g. dictionaries of options, values which are not are converted to strings)
+        """
+
+        self._logger: Logger = logging.getLogger(__name__)
+        self._options: CacheOptions = options
+        self._settings: str = json.dumps(settings, sort_keys=True, default=str)
+
+    @staticmethod
+    def source_hash(source_type: type) -> str:
+        """
+        Returns a hash of the source file defining a type (e.g. a parser factory loaded from a plugin file)
+        :param source_type: Type
+        :return: Hash of the source file or the qualified name of the type if its source is unknown
+        """
+
+        name = f'{source_type.__module__}.{source_type.__qualname__}'
+
+        try:
+            source_file_path = inspect.getsourcefile(source_type)
+        except TypeError:
+            source_file_path = None
+
+        if not source_file_path or not os.path.exists(source_file_path):
+            return name
+
+        with open(source_file_path, 'rb') as source_file:
+            return name + ':' + hashlib.sha256(source_file.read()).hexdigest()
+
+    def _hash_input(self, input_file_path: str, size: int) -> str:
+        input_hash = hashlib.sha256()
+
+        with open(input_file_path, 'rb') as input_file:
+            if self._options.full_hash or size <= 3 * SAMPLE_BLOCK_SIZE:
+                for block in iter(lambda: input_file.read(HASH_READ_SIZE), b''):
+                    input_hash.update(block)
+            else:
+                for offset in (0, (size - SAMPLE_BLOCK_SIZE) // 2, size - SAMPLE_BLOCK_SIZE):
+                    input_file.seek(offset)
+                    input_hash.update(input_file.read(SAMPLE_BLOCK_SIZE))
+
+        return input_hash.hexdigest()
+
+    def fingerprint(self, input_file_path: str) -> str:
+        """
+        Computes the fingerprint of processing an input file
+        :param input_file_path: Input file path
+        :return: Fingerprint
+        """
+
+        stat = os.stat(input_file_path)
+        fingerprint = {
+            'version': __version__,
+            'settings': self._settings,
+            'size': stat.st_size,
+            # Sampled hashes miss changes between blocks, so they rely on modification times as well
+            'modification_time': None if self._options.full_hash else stat.st_mtime_ns,
+            'hash': self._hash_input(input_file_path, stat.st_size)
+        }
+
+        return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _entry_path(self, fingerprint: str) -> str:
+        return os.path.join(self._options.directory, fingerprint)
+
+    @staticmethod
+    def _copy(source_file_path: str, target_file_path: str) -> None:
+        temporary_file_path = f'{target_file_path}.{os.getpid()}.tmp'
+
+        # Targets are replaced atomically, so they are never left incomplete
+        try:
+            shutil.copyfile(source_file_path, temporary_file_path)
+            os.replace(temporary_file_path, target_file_path)
+        finally:
+            if os.path.exists(temporary_file_path):
+                os.remove(temporary_file_path)
+
+    def restore(self, fingerprint: str, output_file_path: str, reject_file_path: Optional[str] = None) -> bool:
+        """
+        Restores a cached output
+        :param fingerprint: Fingerprint of processing
+        :param output_file_path: Output file path
+        :param reject_file_path: Optional path to the reject file which has to be restored as well
+        :return: Boolean value indicating whether the output has been restored
+        """
+
+        entry_path = self._entry_path(fingerprint)
+        entry_file_path = os.path.join(entry_path, self.ENTRY_FILE_NAME)
+        rejects_file_path = os.path.join(entry_path, self.REJECTS_FILE_NAME)
+
+        # Entries are complete once their entry files exist
+        if not os.path.exists(entry_file_path):
+            return False
+
+        if reject_file_path is not None and not os.path.exists(rejects_file_path):
+            return False
+
+        try:
+            self._copy(os.path.join(entry_path, self.OUTPUT_FILE_NAME), output_file_path)
+
+            if reject_file_path is not None:
+                self._copy(rejects_file_path, reject_file_path)
+
+            # Modification times of entry files order entries for eviction
+            os.utime(entry_file_path)
+        except FileNotFoundError:
+            # The entry has been evicted by another process
+            return False
+
+        return True
+
+    def store(self, fingerprint: str, output_file_path: str, reject_file_path: Optional[str] = None) -> None:
+        """
+        Stores an output in the cache and evicts the least recently used entries if the cache is too large
+        :param fingerprint: Fingerprint of processing
+        :param output_file_path: Output file path
+        :param reject_file_path: Optional path to the reject file stored with the output
+        """
+
+        entry_path = self._entry_path(fingerprint)
+        temporary_entry_path = f'{entry_path}.{os.getpid()}.tmp'
+        size = os.path.getsize(output_file_path)
+
+        if size > self._options.max_size:
+            self._logger.info(f'Output "{output_file_path}" is larger than the cache and is not cached')
+
+            return
+
+        shutil.rmtree(temporary_entry_path, ignore_errors=True)
+        os.makedirs(temporary_entry_path)
+        # Outputs are copied, so entries aren't changed when the files are overwritten later
+        shutil.copyfile(output_file_path, os.path.join(temporary_entry_path, self.OUTPUT_FILE_NAME))
+
+        if reject_file_path is not None and os.path.exists(reject_file_path):
+            shutil.copyfile(reject_file_path, os.path.join(temporary_entry_path, self.REJECTS_FILE_NAME))
+            size += os.path.getsize(reject_file_path)
+
+        with open(os.path.join(temporary_entry_path, self.ENTRY_FILE_NAME), 'w') as entry_file:
+            json.dump({'output': os.path.abspath(output_file_path), 'size': size, 'created': time.time()}, entry_file)
+
+        # Entries are replaced atomically, so readers never see incomplete ones
+        shutil.rmtree(entry_path, ignore_errors=True)
+
+        try:
+            os.rename(temporary_entry_path, entry_path)
+        except OSError:
+            # Another process has stored the same entry in the meantime
+            shutil.rmtree(temporary_entry_path, ignore_errors=True)
+
+        self._evict()
+
+    def _read_entries(self) -> List[Tuple[float, int, str]]:
+        entries = []
+
+        for name in os.listdir(self._options.directory):
+            entry_file_path = os.path.join(self._options.directory, name, self.ENTRY_FILE_NAME)
+
+            try:
+                with open(entry_file_path) as entry_file:
+                    size = json.load(entry_file)['size']
+
+                entries.append((os.path.getmtime(entry_file_path), size, name))
+            except (OSError, ValueError, KeyError):
+                # Temporary entries of running processes don't have entry files yet
+                continue
+
+        return entries
+
+    def _evict(self) -> None:
+        entries = sorted(self._read_entries())
+        cache_size = sum(size for _, size, _ in entries)
+
+        for _, size, name in entries:
+            if cache_size <= self._options.max_size:
+                break
+
+            self._logger.info(f'Evicting cached output {name} ({size} bytes)')
+            shutil.rmtree(os.path.join(self._options.directory, name), ignore_errors=True)
+            cache_size -= size
@@ -0,0 +1,456 @@
+import ast
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from abc import ABC, abstractmethod
+from array import array
+from dataclasses import dataclass
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence, Union
+
+from csv_import.csv.parsers import LineParser, ParserOptions
+from csv_import.csv.processors import ProcessingError
+from csv_import.csv.sinks import OutputSink
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None  # type: ignore
+
+SCHEMA_FILE_NAME: str = '_schema.json'
+
+NPY_MAGIC: bytes = b'\x93NUMPY\x01\x00'
+# Header is padded to a fixed size so that the shape can be rewritten in place when the column grows
+NPY_HEADER_SIZE: int = 128
+
+INT64: str = 'int64'
+FLOAT64: str = 'float64'
+STRING: str = 'str'
+
+_BYTE_ORDER: str = '<' if sys.byteorder == 'little' else '>'
+_TYPECODES: Dict[str, str] = {INT64: 'q', FLOAT64: 'd'}
+_DESCRS: Dict[str, str] = {INT64: _BYTE_ORDER + 'i8', FLOAT64: _BYTE_ORDER + 'f8'}
+
+
+@dataclass(frozen=True)
+class Column:
+    """
+    Class used for storing description of a single column
+    """
+
+    name: str
+    dtype: str = STRING
+
+
+def _to_int64(value: Any) -> int:
+    integer = int(value)
+
+    # int() silently truncates real values, so only integral ones are accepted
+    if not isinstance(value, (int, str)) and integer != value:
+        raise ValueError(f'{value} is not integral')
+
+    return integer
+
+
+def _column_file_name(position: int, column: Column) -> str:
+    return f'{position}_' + re.sub(r'[^\w.-]', '_', column.name)
+
+
+def _write_npy_header(file: IO[bytes], dtype: str, length: int) -> None:
+    header = f"{{'descr': '{_DESCRS[dtype]}', 'fortran_order': False, 'shape': ({length},), }}"
+    header = header.ljust(NPY_HEADER_SIZE - len(NPY_MAGIC) - 2 - 1) + '\n'
+
+    file.seek(0)
+    file.write(NPY_MAGIC)
+    file.write(struct.pack('<H', len(header)))
+    file.write(header.encode('latin1'))
+
+
+def _read_npy_header(file_path: str) -> Dict[str, Any]:
+    with open(file_path, 'rb') as file:
+        magic = file.read(len(NPY_MAGIC))
+
+        if magic != NPY_MAGIC:
+            raise ValueError(f'{file_path} is not a supported .npy file')
+
+        header_length, = struct.unpack('<H', file.read(2))
+        header = ast.literal_eval(file.read(header_length).decode('latin1'))
+        header['offset'] = len(NPY_MAGIC) + 2 + header_length
+
+        return header
+
+
+class _ColumnWriter(ABC):
+    """
+    Base class for writers of single-column files
+    """
+
+    def __init__(self, directory: str, position: int, column: Column) -> None:
+        self._file_prefix: str = os.path.join(directory, _column_file_name(position, column))
+        self._column: Column = column
+        self._length: int = 0
+
+    @abstractmethod
+    def open(self) -> None:
+        pass
+
+    @abstractmethod
+    def append(self, value: Any) -> None:
+        pass
+
+    @abstractmethod
+    def flush(self) -> None:
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
+
+class _NumericColumnWriter(_ColumnWriter):
+    """
+    Class writing numeric values into an appendable .npy file
+    """
+
+    def __init__(self, directory: str, position: int, column: Column) -> None:
+        super().__init__(directory, position, column)
+
+        self._converter: Any = _to_int64 if column.dtype == INT64 else float
+        self._buffer: array = array(_TYPECODES[column.dtype])
+        self._file: Optional[IO[bytes]] = None
+
+    def open(self) -> None:
+        self._file = open(self._file_prefix + '.npy', 'wb')
+        _write_npy_header(self._file, self._column.dtype, 0)
+
+    def append(self, value: Any) -> None:
+        try:
+            self._buffer.append(self._converter(value))
+        except (TypeError, ValueError, OverflowError):
+            raise ProcessingError(f'Value "{value}" of column "{self._column.name}" is not {self._column.dtype}')
+
+    def flush(self) -> None:
+        if self._file is None or not self._buffer:
+            return
+
+        self._buffer.tofile(self._file)
+        self._length += len(self._buffer)
+        self._buffer = array(self._buffer.typecode)
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+
+        self.flush()
+        _write_npy_header(self._file, self._column.dtype, self._length)
+        self._file.close()
+        self._file = None
+
+
+class _StringColumnWriter(_ColumnWriter):
+    """
+    Class writing string values into a pair of files: UTF-8 encoded bytes and an .npy file with their offsets
+    """
+
+    def __init__(self, directory: str, position: int, column: Column) -> None:
+        super().__init__(directory, position, column)
+
+        self._data_buffer: List[bytes] = []
+        self._offsets_buffer: array = array('q')
+        self._data_length: int = 0
+        self._data_file: Optional[IO[bytes]] = None
+        self._offsets_file: Optional[IO[bytes]] = None
+
+    def open(self) -> None:
+        self._data_file = open(self._file_prefix + '.bytes', 'wb')
+        self._offsets_file = open(self._file_prefix + '.offsets.npy', 'wb')
+        _write_npy_header(self._offsets_file, INT64, 0)
+        self._offsets_buffer.append(0)
+
+    def append(self, value: Any) -> None:
+        # Missing values are written as empty strings, the same way the text outputs format them
+        encoded_value = ('' if value is None else str(value)).encode('utf-8')
+
+        self._data_buffer.append(encoded_value)
+        self._data_length += len(encoded_value)
+        self._offsets_buffer.append(self._data_length)
+
+    def flush(self) -> None:
+        if self._data_file is None or self._offsets_file is None or not self._offsets_buffer:
+            return
+
+        self._data_file.write(b''.join(self._data_buffer))
+        self._offsets_buffer.tofile(self._offsets_file)
+        self._length += len(self._offsets_buffer)
+        self._data_buffer = []
+        self._offsets_buffer = array('q')
+
+    def close(self) -> None:
+        if self._data_file is None or self._offsets_file is None:
+            return
+
+        self.flush()
+        _write_npy_header(self._offsets_file, INT64, self._length)
+        self._data_file.close()
+        self._offsets_file.close()
+        self._data_file = None
+        self._offsets_file = None
+
+
+class ColumnarSink(OutputSink):
+    """
+    Output sink writing every column into a separate typed binary file inside of an output directory:
+      - numeric columns are written into .npy files which can be memory-mapped by NumPy,
+      - string columns are written into a pair of files: .bytes containing UTF-8 encoded values and
+        .offsets.npy containing offsets of values' ends.
+    Values are buffered and written in batches
+    """
+
+    DEFAULT_BATCH_SIZE: int = 64 * 1024
+
+    def __init__(
+            self,
+            directory: str,
+            columns: Optional[Sequence[Column]] = None,
+            column_types: Optional[Sequence[str]] = None,
+            options: ParserOptions = ParserOptions(),
+            batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        """
+        :param directory: Path to the output directory
+        :param columns: Optional list of columns (by default names are taken from the last header line)
+        :param column_types: Optional list of column types used when @columns are not set
+                             (by default they are inferred from typed values of the first line,
+                             and columns of strings remain strings)
+        :param options: Parser options used to split the header line
+        :param batch_size: Number of lines buffered before writing them to files
+        """
+
+        self._directory: str = directory
+        self._columns: Optional[List[Column]] = list(columns) if columns else None
+        self._column_types: Optional[Sequence[str]] = column_types
+        self._options: ParserOptions = options
+        self._batch_size: int = batch_size
+        self._header: Optional[List[str]] = None
+        self._writers: List[_ColumnWriter] = []
+        self._buffered_lines: int = 0
+        self._length: int = 0
+
+        for column_type in column_types or []:
+            if column_type not in (INT64, FLOAT64, STRING):
+                raise ValueError(f'Unsupported column type "{column_type}"')
+
+    @property
+    def columns(self) -> Optional[List[Column]]:
+        """
+        Returns the list of columns written by the sink (it's known only after the first line has been written)
+        :return: List of columns
+        """
+
+        return self._columns
+
+    def open(self) -> None:
+        os.makedirs(self._directory, exist_ok=True)
+
+    def write_header(self, line: str) -> None:
+        self._header = LineParser.split(line, self._options)
+
+    @staticmethod
+    def _infer_column_type(value: Any) -> str:
+        # Typed values returned by value parsers (e.g. IntegerParser) determine types of their columns
+        if isinstance(value, int) and not isinstance(value, bool):
+            return INT64
+
+        if isinstance(value, float):
+            return FLOAT64
+
+        return STRING
+
+    def _create_writers(self, values_count: int, values: Optional[Sequence[Any]] = None) -> None:
+        if self._columns is None:
+            names = self._header if self._header and len(self._header) == values_count else \
+                [f'column{position}' for position in range(values_count)]
+
+            if self._column_types:
+                types = list(self._column_types)
+            else:
+                types = [self._infer_column_type(value) for value in values] if values else [STRING] * values_count
+
+            if len(types) != values_count:
+                raise ProcessingError(f'Expected {len(types)} column types (got {values_count} values)')
+
+            self._columns = [Column(name, dtype) for name, dtype in zip(names, types)]
+
+        for position, column in enumerate(self._columns):
+            writer_class = _StringColumnWriter if column.dtype == STRING else _NumericColumnWriter
+            writer = writer_class(self._directory, position, column)
+
+            writer.open()
+            self._writers.append(writer)
+
+    def write_values(self, values: Sequence[Any]) -> None:
+        if not self._writers:
+            self._create_writers(len(values), values)
+
+        if len(values) != len(self._writers):
+            raise ProcessingError(f'Expected {len(self._writers)} number of values (got {len(values)})')
+
+        for writer, value in zip(self._writers, values):
+            writer.append(value)
+
+        self._length += 1
+        self._buffered_lines += 1
+
+        if self._buffered_lines >= self._batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes buffered values to column files
+        """
+
+        for writer in self._writers:
+            writer.flush()
+
+        self._buffered_lines = 0
+
+    def close(self) -> None:
+        # Files without data lines still get empty columns
+        if not self._writers and (self._columns or self._header):
+            self._create_writers(len(self._columns or self._header or []))
+
+        for writer in self._writers:
+            writer.close()
+
+        schema = {
+            'length': self._length,
+            'columns': [
+                {'name': column.name, 'dtype': column.dtype, 'file': _column_file_name(position, column)}
+                for position, column in enumerate(self._columns or [])
+            ]
+        }
+
+        with open(os.path.join(self._directory, SCHEMA_FILE_NAME), 'w') as schema_file:
+            json.dump(schema, schema_file, indent=2)
+
+
+class StringColumn(Sequence[str]):
+    """
+    Class providing zero-copy access to a string column: values are decoded only when they are accessed
+    """
+
+    def __init__(self, offsets: Sequence[int], data: memoryview) -> None:
+        """
+        :param offsets: Sequence of offsets of values' ends (the first element is always zero)
+        :param data: Buffer containing UTF-8 encoded values
+        """
+
+        self._offsets: Sequence[int] = offsets
+        self._data: memoryview = data
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError('StringColumn index out of range')
+
+        return bytes(self._data[self._offsets[index]:self._offsets[index + 1]]).decode('utf-8')
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self)):
+            yield self[index]
+
+
+class ColumnarReader:
+    """
+    Class used for reading columns written by ColumnarSink.
+    Files are memory-mapped, so columns are loaded without copying. NumPy arrays are returned for numeric columns
+    when NumPy is installed, otherwise memoryview objects are returned
+    """
+
+    def __init__(self, directory: str) -> None:
+        """
+        :param directory: Path to the directory created by ColumnarSink
+        """
+
+        self._directory: str = directory
+
+        with open(os.path.join(directory, SCHEMA_FILE_NAME)) as schema_file:
+            self._schema: Dict[str, Any] = json.load(schema_file)
+
+        self._columns: List[Column] = [
+            Column(column['name'], column['dtype']) for column in self._schema['columns']
+        ]
+        self._files: Dict[str, str] = {column['name']: column['file'] for column in self._schema['columns']}
+        self._maps: List[mmap.mmap] = []
+
+    def __enter__(self) -> 'ColumnarReader':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    @property
+    def columns(self) -> List[Column]:
+        """
+        Returns the list of columns
+        :return: List of columns
+        """
+
+        return self._columns
+
+    def __len__(self) -> int:
+        return int(self._schema['length'])
+
+    def _map(self, file_path: str) -> memoryview:
+        with open(file_path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return memoryview(b'')
+
+            file_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._maps.append(file_map)
+
+        return memoryview(file_map)
+
+    def _read_npy(self, file_path: str, dtype: str) -> Any:
+        if numpy is not None:
+            return numpy.load(file_path, mmap_mode='r')
+
+        header = _read_npy_header(file_path)
+        data = self._map(file_path)[header['offset']:]
+
+        return data.cast(_TYPECODES[dtype])
+
+    def read_column(self, name: str) -> Union[Sequence[Any], StringColumn]:
+        """
+        Returns values of a column
+        :param name: Name of the column
+        :return: NumPy array or memoryview for numeric columns, StringColumn for string columns
+        """
+
+        column = next((column for column in self._columns if column.name == name), None)
+
+        if column is None:
+            raise KeyError(f'Unknown column "{name}"')
+
+        file_prefix = os.path.join(self._directory, self._files[name])
+
+        if column.dtype == STRING:
+            offsets = self._read_npy(file_prefix + '.offsets.npy', INT64)
+
+            return StringColumn(offsets, self._map(file_prefix + '.bytes'))
+
+        return self._read_npy(file_prefix + '.npy', column.dtype)
+
+    def close(self) -> None:
+        # Memory maps still referenced by returned columns are closed by the garbage collector
+        self._maps = []
@@ -0,0 +1,395 @@
+import hashlib
+import heapq
+import json
+import logging
+import os
+import tempfile
+from array import array
+from dataclasses import dataclass
+from logging import Logger
+from types import TracebackType
+from typing import Any, Iterator, List, Optional, Sequence, Set, Tuple, Type
+
+DEFAULT_DEDUPLICATION_MEMORY_LIMIT: int = 64 * 1024 * 1024
+# Approximate number of bytes used by a single 64-bit hash stored in a Python set
+HASH_SET_ENTRY_SIZE: int = 72
+# Approximate number of bytes used by a deferred line (in addition to the length of its values)
+DEFERRED_ENTRY_OVERHEAD: int = 128
+# Approximate length of a typed value (e.g. an integer or a date) which isn't a string
+TYPED_VALUE_SIZE: int = 32
+RUN_READ_SIZE: int = 64 * 1024
+
+
+def encode_values(values: Sequence[Any]) -> str:
+    """
+    Encodes values into a canonical string tagged with their types, so values which are equal only after
+    a conversion (e.g. 1 and 1.0 or '1' and 1) have different encodings
+    :param values: Processed values (strings or typed values)
+    :return: Canonical encoding of the values
+    """
+
+    return json.dumps(
+        [value if isinstance(value, str) else [type(value).__name__, repr(value)] for value in values],
+        ensure_ascii=False)
+
+
+def digest_values(encoding: str) -> int:
+    """
+    Computes a stable 64-bit digest of encoded values (unlike the built-in hash it doesn't depend on the process
+    and it doesn't map distinct numbers, e.g. -1 and -2, to the same value)
+    :param encoding: Canonical encoding of values (see encode_values)
+    :return: 64-bit digest
+    """
+
+    return int.from_bytes(
+        hashlib.blake2b(encoding.encode('utf-8', 'surrogatepass'), digest_size=8).digest(), 'big')
+
+
+@dataclass(frozen=True)
+class DeduplicationOptions:
+    """
+    Class used for storing options of duplicate line elimination
+    """
+
+    # Names (or 0-based positions) of key columns, all values are compared if not set
+    key_columns: Optional[Tuple[str, ...]] = None
+    memory_limit: int = DEFAULT_DEDUPLICATION_MEMORY_LIMIT
+
+
+@dataclass
+class DeduplicationStatistics:
+    """
+    Class used for storing statistics of duplicate line elimination
+    """
+
+    lines: int = 0
+    duplicates: int = 0
+    # Lines which might have been duplicates according to the Bloom filter and were verified at the end
+    deferred: int = 0
+    false_positives: int = 0
+    spilled_runs: int = 0
+
+
+class BloomFilter:
+    """
+    Bloom filter of 64-bit hashes using double hashing to compute bit positions
+    """
+
+    DEFAULT_HASHES_COUNT: int = 7
+
+    def __init__(self, size: int, hashes_count: int = DEFAULT_HASHES_COUNT) -> None:
+        """
+        :param size: Size of the filter in bytes
+        :param hashes_count: Number of bits set for every key
+        """
+
+        self._bits: bytearray = bytearray(max(size, 1))
+        self._bits_count: int = len(self._bits) * 8
+        self._hashes_count: int = hashes_count
+
+    def _positions(self, key: int) -> Iterator[int]:
+        first = key & 0xFFFFFFFF
+        # The step has to be odd, otherwise positions of some keys would collapse
+        second = (key >> 32) | 1
+
+        for i in range(self._hashes_count):
+            yield (first + i * second) % self._bits_count
+
+    def add(self, key: int) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: int) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class DuplicateFilter:
+    """
+    Class used for dropping duplicate lines within a bounded amount of memory.
+    While the memory limit is not exceeded, 64-bit digests of lines are kept in memory and duplicates are dropped
+    immediately. Once the limit is exceeded, the digests are spilled into a sorted run on disk and a Bloom filter
+    is used instead: lines which are definitely new are written immediately, lines which might be duplicates are
+    deferred and verified at the end against sorted runs of written lines, comparing their key values
+    (lines written before the Bloom filter has been created are compared only by their digests).
+    Please note that deferred lines which turn out to be unique (false positives) are written after all other lines
+    """
+
+    def __init__(
+            self,
+            options: DeduplicationOptions = DeduplicationOptions(),
+            temporary_directory: Optional[str] = None) -> None:
+        """
+        :param options: Deduplication options
+        :param temporary_directory: Optional directory where spilled runs are stored (by default the system one)
+        """
+
+        self._logger: Logger = logging.getLogger(__name__)
+        self._options: DeduplicationOptions = options
+        self._temporary_directory: Optional[str] = temporary_directory
+        self._runs_directory: Optional[tempfile.TemporaryDirectory] = None
+        self._column_names: List[str] = []
+        self._key_positions: Optional[List[int]] = None
+        self._hashes: Set[int] = set()
+        self._bloom_filter: Optional[BloomFilter] = None
+        self._hash_runs: List[str] = []
+        # Digests and encoded key values of lines written since the Bloom filter has been created
+        self._written_buffer: List[Tuple[int, str]] = []
+        self._written_buffer_size: int = 0
+        self._written_runs: List[str] = []
+        self._deferred_buffer: List[Tuple[int, int, List[str], str]] = []
+        self._deferred_buffer_size: int = 0
+        self._deferred_runs: List[str] = []
+        self._statistics: DeduplicationStatistics = DeduplicationStatistics()
+
+    def __enter__(self) -> 'DuplicateFilter':
+        return self
+
+    def __exit__(
+            self,
+            exception_type: Optional[Type[BaseException]],
+            exception_value: Optional[BaseException],
+            traceback: Optional[TracebackType]) -> None:
+        self.close()
+
+    @property
+    def statistics(self) -> DeduplicationStatistics:
+        """
+        Returns statistics of duplicate line elimination
+        :return: Deduplication statistics
+        """
+
+        return self._statistics
+
+    def set_column_names(self, column_names: Sequence[str]) -> None:
+        """
+        Sets column names used to find key columns (usually read from the last header line)
+        :param column_names: List of column names
+        """
+
+        self._column_names = list(column_names)
+        self._key_positions = None
+
+    def _resolve_key_positions(self) -> List[int]:
+        key_positions = []
+
+        for key_column in self._options.key_columns or ():
+            if key_column in self._column_names:
+                key_positions.append(self._column_names.index(key_column))
+            elif key_column.isdigit():
+                key_positions.append(int(key_column))
+            else:
+                raise ValueError(f'Key column {key_column} does not exist')
+
+        return key_positions
+
+    def _encode(self, values: Sequence[Any]) -> str:
+        if not self._options.key_columns:
+            return encode_values(values)
+
+        if self._key_positions is None:
+            self._key_positions = self._resolve_key_positions()
+
+        return encode_values([values[position] for position in self._key_positions])
+
+    @staticmethod
+    def _hash(encoding: str) -> int:
+        return digest_values(encoding)
+
+    def _create_run_file(self) -> str:
+        if self._runs_directory is None:
+            self._runs_directory = tempfile.TemporaryDirectory(dir=self._temporary_directory)
+
+        self._statistics.spilled_runs += 1
+
+        return os.path.join(self._runs_directory.name, f'run{self._statistics.spilled_runs}')
+
+    def _spill_hashes(self, hashes: array) -> None:
+        if not hashes:
+            return
+
+        run_file_path = self._create_run_file()
+
+        with open(run_file_path, 'wb') as run_file:
+            array('Q', sorted(hashes)).tofile(run_file)
+
+        self._hash_runs.append(run_file_path)
+
+    def _spill_written(self) -> None:
+        if not self._written_buffer:
+            return
+
+        run_file_path = self._create_run_file()
+
+        with open(run_file_path, 'w', encoding='utf-8') as run_file:
+            for entry in sorted(self._written_buffer):
+                run_file.write(json.dumps(entry) + '\n')
+
+        self._written_runs.append(run_file_path)
+        self._written_buffer = []
+        self._written_buffer_size = 0
+
+    def _spill_deferred(self) -> None:
+        if not self._deferred_buffer:
+            return
+
+        run_file_path = self._create_run_file()
+
+        with open(run_file_path, 'w', encoding='utf-8') as run_file:
+            for entry in sorted(self._deferred_buffer, key=lambda deferred_entry: deferred_entry[:2]):
+                run_file.write(json.dumps(entry, default=str) + '\n')
+
+        self._deferred_runs.append(run_file_path)
+        self._deferred_buffer = []
+        self._deferred_buffer_size = 0
+
+    def _switch_to_bloom_filter(self) -> None:
+        self._logger.info(
+            f'Deduplication memory limit has been exceeded after {len(self._hashes)} unique lines, '
+            f'switching to a Bloom filter')
+
+        # Three quarters of the memory limit are used by the filter, the rest by buffers spilled to disk
+        self._bloom_filter = BloomFilter(self._options.memory_limit * 3 // 4)
+
+        for key in self._hashes:
+            self._bloom_filter.add(key)
+
+        self._spill_hashes(array('Q', self._hashes))
+        self._hashes = set()
+
+    def add(self, values: Sequence[Any]) -> bool:
+        """
+        Checks whether a line is a duplicate of one of the previous lines
+        :param values: Processed values of the line
+        :return: Boolean value indicating whether the line has to be written now
+                 (False if it's a duplicate or it has been deferred until the verification)
+        """
+
+        encoding = self._encode(values)
+        key = self._hash(encoding)
+        self._statistics.lines += 1
+
+        if self._bloom_filter is None:
+            if key in self._hashes:
+                self._statistics.duplicates += 1
+
+                return False
+
+            self._hashes.add(key)
+
+            if len(self._hashes) * HASH_SET_ENTRY_SIZE > self._options.memory_limit:
+                self._switch_to_bloom_filter()
+
+            return True
+
+        if key not in self._bloom_filter:
+            self._bloom_filter.add(key)
+            self._written_buffer.append((key, encoding))
+            self._written_buffer_size += DEFERRED_ENTRY_OVERHEAD + len(encoding)
+
+            if self._written_buffer_size > self._options.memory_limit // 8:
+                self._spill_written()
+
+            return True
+
+        self._statistics.deferred += 1
+        self._deferred_buffer.append((key, self._statistics.lines, list(values), encoding))
+        self._deferred_buffer_size += DEFERRED_ENTRY_OVERHEAD + len(encoding) + sum(
+            len(value) if isinstance(value, str) else TYPED_VALUE_SIZE for value in values)
+
+        if self._deferred_buffer_size > self._options.memory_limit // 8:
+            self._spill_deferred()
+
+        return False
+
+    @staticmethod
+    def _read_hash_run(run_file_path: str) -> Iterator[Tuple[int, Optional[str]]]:
+        with open(run_file_path, 'rb') as run_file:
+            while True:
+                hashes = array('Q')
+
+                try:
+                    hashes.fromfile(run_file, RUN_READ_SIZE)
+                except EOFError:
+                    # The last chunk is shorter, but the hashes which have been read are still appended
+                    for key in hashes:
+                        yield key, None
+
+                    return
+
+                for key in hashes:
+                    yield key, None
+
+    @staticmethod
+    def _read_written_run(run_file_path: str) -> Iterator[Tuple[int, Optional[str]]]:
+        with open(run_file_path, encoding='utf-8') as run_file:
+            for run_line in run_file:
+                key, encoding = json.loads(run_line)
+
+                yield key, encoding
+
+    @staticmethod
+    def _read_deferred_run(run_file_path: str) -> Iterator[Tuple[int, int, List[str], str]]:
+        with open(run_file_path, encoding='utf-8') as run_file:
+            for run_line in run_file:
+                key, index, values, encoding = json.loads(run_line)
+
+                yield key, index, values, encoding
+
+    def verify(self) -> Iterator[List[str]]:
+        """
+        Verifies deferred lines and returns those which turned out not to be duplicates
+        :return: Iterator over values of unique deferred lines (in the original order)
+        """
+
+        if not self._deferred_buffer and not self._deferred_runs:
+            return
+
+        self._spill_written()
+        self._spill_deferred()
+
+        written_entries = heapq.merge(
+            *[self._read_hash_run(run) for run in self._hash_runs],
+            *[self._read_written_run(run) for run in self._written_runs],
+            key=lambda written_entry: written_entry[0])
+        deferred_entries = heapq.merge(*[self._read_deferred_run(run) for run in self._deferred_runs])
+        written_entry = next(written_entries, None)
+        group_key: Optional[int] = None
+        # Encoded key values of written and deferred lines with the current hash
+        # (None stands for a line written before the Bloom filter has been created whose values are unknown)
+        group_encodings: Set[Optional[str]] = set()
+        unique_entries: List[Tuple[int, List[str]]] = []
+
+        # Both iterators are sorted by hashes, deferred lines with the same hash are sorted by their positions
+        for key, index, values, encoding in deferred_entries:
+            if key != group_key:
+                group_key = key
+                group_encodings = set()
+
+                while written_entry is not None and written_entry[0] < key:
+                    written_entry = next(written_entries, None)
+
+                while written_entry is not None and written_entry[0] == key:
+                    group_encodings.add(written_entry[1])
+                    written_entry = next(written_entries, None)
+
+            if None in group_encodings or encoding in group_encodings:
+                self._statistics.duplicates += 1
+            else:
+                self._statistics.false_positives += 1
+                unique_entries.append((index, values))
+
+            group_encodings.add(encoding)
+
+        unique_entries.sort(key=lambda unique_entry: unique_entry[0])
+
+        for _, values in unique_entries:
+            yield values
+
+    def close(self) -> None:
+        """
+        Removes spilled runs
+        """
+
+        if self._runs_directory is not None:
+            self._runs_directory.cleanup()
+            self._runs_directory = None
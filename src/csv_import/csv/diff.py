@@ -0,0 +1,326 @@
+import json
+import logging
+import math
+import os
+import tempfile
+from dataclasses import dataclass
+from logging import Logger
+from typing import (Any, Callable, Dict, Iterator, List, Optional, Sequence,
+                    Tuple)
+
+from csv_import.csv.dedup import digest_values, encode_values
+from csv_import.csv.parsers import FileParser, LineParser, ParserOptions
+from csv_import.csv.processors import LineProcessor
+from csv_import.csv.text import TextWriter
+
+DEFAULT_DIFF_MEMORY_LIMIT: int = 256 * 1024 * 1024
+# Approximate number of bytes used by a single entry of the in-memory index (a short key and a 2-tuple)
+INDEX_ENTRY_SIZE: int = 200
+# Partitions of one version are open at the same time, so their number is kept well below the open files limit
+MAX_PARTITIONS: int = 128
+
+
+@dataclass(frozen=True)
+class DiffOptions:
+    """
+    Class used for storing options of comparing two versions of a file
+    """
+
+    # Names (or 0-based positions) of key columns identifying lines
+    key_columns: Tuple[str, ...]
+    memory_limit: int = DEFAULT_DIFF_MEMORY_LIMIT
+
+
+@dataclass
+class DiffStatistics:
+    """
+    Class used for storing results of comparing two versions of a file
+    """
+
+    inserts: int = 0
+    updates: int = 0
+    deletes: int = 0
+    unchanged: int = 0
+    # Number of partitions the files were split into (0 if the old version fitted into memory)
+    partitions: int = 0
+
+
+class _DiffWriter:
+    """
+    Class writing inserted, updated and deleted lines into three output files
+    """
+
+    def __init__(
+            self,
+            inserts_file: TextWriter,
+            updates_file: TextWriter,
+            deletes_file: TextWriter,
+            format_values: Callable[[Sequence[str]], str],
+            statistics: DiffStatistics) -> None:
+        self._inserts_file: TextWriter = inserts_file
+        self._updates_file: TextWriter = updates_file
+        self._deletes_file: TextWriter = deletes_file
+        self._format_values: Callable[[Sequence[str]], str] = format_values
+        self._statistics: DiffStatistics = statistics
+
+    def write_header(self, line: str) -> None:
+        for output_file in (self._inserts_file, self._updates_file, self._deletes_file):
+            output_file.write_line(line)
+
+    def insert(self, values: Sequence[str]) -> None:
+        self._inserts_file.write_line(self._format_values(values))
+        self._statistics.inserts += 1
+
+    def update(self, values: Sequence[str]) -> None:
+        self._updates_file.write_line(self._format_values(values))
+        self._statistics.updates += 1
+
+    def delete(self, values: Sequence[str]) -> None:
+        self._deletes_file.write_line(self._format_values(values))
+        self._statistics.deletes += 1
+
+
+class FileDiffer:
+    """
+    Class used for comparing two versions of a file (e.g. daily snapshots) by key columns.
+    Lines of the old version are indexed by their keys together with 64-bit digests of whole lines
+    (see digest_values, values of different types, e.g. 1 and 1.0, have different digests),
+    so only keys are kept in memory. When the index exceeds the memory limit, both versions are split
+    into partitions by a hash of keys which are compared one by one.
+    Please note that lines are compared after parsing, and incorrect lines are skipped
+    """
+
+    def __init__(
+            self,
+            file_parser: FileParser,
+            options: DiffOptions,
+            format_values: Optional[Callable[[Sequence[str]], str]] = None,
+            temporary_directory: Optional[str] = None) -> None:
+        """
+        :param file_parser: File parser used to parse both versions
+        :param options: Diff options
+        :param format_values: Optional function formatting values of output lines (by default they are formatted
+                              in the same way as by LineProcessor)
+        :param temporary_directory: Optional directory where partitions are stored (by default the system one)
+        """
+
+        self._logger: Logger = logging.getLogger(__name__)
+        self._file_parser: FileParser = file_parser
+        self._options: DiffOptions = options
+        self._parser_options: ParserOptions = file_parser.options
+        self._format_values: Callable[[Sequence[str]], str] = \
+            format_values or LineProcessor([], file_parser.options).format_values
+        self._temporary_directory: Optional[str] = temporary_directory
+
+    def _get_key_positions(self, header_line: Optional[str]) -> List[int]:
+        column_names = LineParser.split(header_line, self._parser_options) if header_line else []
+        key_positions = []
+
+        for key_column in self._options.key_columns:
+            if key_column in column_names:
+                key_positions.append(column_names.index(key_column))
+            elif key_column.isdigit():
+                key_positions.append(int(key_column))
+            else:
+                raise ValueError(f'Key column {key_column} does not exist')
+
+        return key_positions
+
+    @staticmethod
+    def _digest(values: Sequence[Any]) -> int:
+        return digest_values(encode_values(values))
+
+    def _read(
+            self,
+            input_file_path: str,
+            writer: Optional[_DiffWriter] = None) -> Iterator[Tuple[Tuple[str, ...], List[str], int]]:
+        """
+        Reads data lines of a file together with their keys
+        :param input_file_path: Input file path
+        :param writer: Optional writer receiving header lines
+        :return: Iterator over 3-tuples containing keys, parsed values and offsets of lines
+        """
+
+        header_line: Optional[str] = None
+        key_positions: Optional[List[int]] = None
+
+        for parsed_line in self._file_parser.parse(input_file_path):
+            if parsed_line.header:
+                header_line = parsed_line.line
+                key_positions = None
+
+                if writer:
+                    writer.write_header(parsed_line.line)
+
+                continue
+
+            # Skipped lines have already been reported by the file parser
+            if parsed_line.parsed_values is None:
+                continue
+
+            # Key columns are found using the last header line
+            if key_positions is None:
+                key_positions = self._get_key_positions(header_line)
+
+            values = parsed_line.parsed_values
+            yield tuple(values[position] for position in key_positions), values, parsed_line.offset
+
+    def _index(self, old_file_path: str) -> Tuple[Optional[Dict[Tuple[str, ...], Tuple[int, int]]], int]:
+        """
+        Indexes lines of the old version
+        :param old_file_path: Path to the old version
+        :return: 2-tuple containing the index (mapping keys to digests and offsets of lines or None if it exceeded
+                 the memory limit) and the number of bytes indexed
+        """
+
+        index: Dict[Tuple[str, ...], Tuple[int, int]] = {}
+
+        for key, values, offset in self._read(old_file_path):
+            index[key] = (self._digest(values), offset)
+
+            if len(index) * INDEX_ENTRY_SIZE > self._options.memory_limit:
+                return None, offset
+
+        return index, 0
+
+    def _diff_in_memory(
+            self,
+            old_file_path: str,
+            new_file_path: str,
+            index: Dict[Tuple[str, ...], Tuple[int, int]],
+            writer: _DiffWriter,
+            statistics: DiffStatistics) -> None:
+        for key, values, _ in self._read(new_file_path, writer):
+            entry = index.pop(key, None)
+
+            if entry is None:
+                writer.insert(values)
+            elif entry[0] != self._digest(values):
+                writer.update(values)
+            else:
+                statistics.unchanged += 1
+
+        # Lines of the old version which are left in the index have been deleted
+        deleted_offsets = {offset for _, offset in index.values()}
+
+        for _, values, offset in self._read(old_file_path):
+            if offset in deleted_offsets:
+                writer.delete(values)
+
+    def _partition(
+            self,
+            input_file_path: str,
+            partition_file_paths: Sequence[str],
+            writer: Optional[_DiffWriter]) -> None:
+        """
+        Splits data lines of a file into partitions by a hash of their keys
+        :param input_file_path: Input file path
+        :param partition_file_paths: List of partition file paths
+        :param writer: Optional writer receiving header lines
+        """
+
+        partition_files = [open(file_path, 'w', encoding='utf-8') for file_path in partition_file_paths]
+
+        try:
+            for key, values, _ in self._read(input_file_path, writer):
+                partition_file = partition_files[hash(key) % len(partition_files)]
+                partition_file.write(json.dumps([key, values], ensure_ascii=False, default=str) + '\n')
+        finally:
+            for partition_file in partition_files:
+                partition_file.close()
+
+    @staticmethod
+    def _read_partition(partition_file_path: str) -> Iterator[Tuple[Tuple[str, ...], List[str]]]:
+        with open(partition_file_path, encoding='utf-8') as partition_file:
+            for partition_line in partition_file:
+                key, values = json.loads(partition_line)
+
+                yield tuple(key), values
+
+    def _diff_partitioned(
+            self,
+            old_file_path: str,
+            new_file_path: str,
+            partitions_count: int,
+            writer: _DiffWriter,
+            statistics: DiffStatistics) -> None:
+        statistics.partitions = partitions_count
+
+        with tempfile.TemporaryDirectory(dir=self._temporary_directory) as directory:
+            old_partitions = [os.path.join(directory, f'old{index}') for index in range(partitions_count)]
+            new_partitions = [os.path.join(directory, f'new{index}') for index in range(partitions_count)]
+
+            self._partition(old_file_path, old_partitions, None)
+            self._partition(new_file_path, new_partitions, writer)
+
+            for old_partition, new_partition in zip(old_partitions, new_partitions):
+                # Only digests of old lines are kept in memory, deleted lines are read again from the partition
+                index = {
+                    key: (self._digest(values), position)
+                    for position, (key, values) in enumerate(self._read_partition(old_partition))
+                }
+
+                for key, values in self._read_partition(new_partition):
+                    entry = index.pop(key, None)
+
+                    if entry is None:
+                        writer.insert(values)
+                    elif entry[0] != self._digest(values):
+                        writer.update(values)
+                    else:
+                        statistics.unchanged += 1
+
+                deleted_positions = {position for _, position in index.values()}
+
+                for position, (_, values) in enumerate(self._read_partition(old_partition)):
+                    if position in deleted_positions:
+                        writer.delete(values)
+
+    def diff(
+            self,
+            old_file_path: str,
+            new_file_path: str,
+            inserts_file_path: str,
+            updates_file_path: str,
+            deletes_file_path: str) -> DiffStatistics:
+        """
+        Compares two versions of a file and writes inserted, updated and deleted lines into separate files
+        (header lines of the new version are written into all of them)
+        :param old_file_path: Path to the old version
+        :param new_file_path: Path to the new version
+        :param inserts_file_path: Path to the output file with lines which exist only in the new version
+        :param updates_file_path: Path to the output file with new versions of changed lines
+        :param deletes_file_path: Path to the output file with lines which exist only in the old version
+        :return: Diff statistics
+        """
+
+        self._logger.info(f'Started comparing file "{old_file_path}" with "{new_file_path}"')
+
+        statistics = DiffStatistics()
+
+        inserts_file = TextWriter.create(inserts_file_path, encoding=self._parser_options.encoding)
+        updates_file = TextWriter.create(updates_file_path, encoding=self._parser_options.encoding)
+        deletes_file = TextWriter.create(deletes_file_path, encoding=self._parser_options.encoding)
+
+        with inserts_file, updates_file, deletes_file:
+            writer = _DiffWriter(inserts_file, updates_file, deletes_file, self._format_values, statistics)
+            index, indexed_size = self._index(old_file_path)
+
+            if index is not None:
+                self._diff_in_memory(old_file_path, new_file_path, index, writer, statistics)
+            else:
+                # The number of partitions is estimated from the part of the old version which fitted into memory
+                partitions_count = min(
+                    math.ceil(os.path.getsize(old_file_path) / max(indexed_size, 1)) + 1, MAX_PARTITIONS)
+
+                self._logger.info(
+                    f'Index of file "{old_file_path}" exceeded the memory limit, '
+                    f'splitting files into {partitions_count} partitions')
+
+                self._diff_partitioned(old_file_path, new_file_path, partitions_count, writer, statistics)
+
+        self._logger.info(
+            f'Finished comparing file "{old_file_path}" with "{new_file_path}": {statistics.inserts} inserts, '
+            f'{statistics.updates} updates, {statistics.deletes} deletes, {statistics.unchanged} unchanged lines')
+
+        return statistics
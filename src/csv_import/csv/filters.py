@@ -0,0 +1,250 @@
+import ast
+import operator
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+# Function referencing a column by its name or 0-based position, e.g. column('Order date') or column(3)
+COLUMN_FUNCTION: str = 'column'
+
+Predicate = Callable[[Sequence[str]], bool]
+Resolver = Callable[[Union[str, int]], int]
+
+_COMPARISON_OPERATORS: Dict[type, Callable[[Any, Any], bool]] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge
+}
+# Operators used when a constant is compared with a column, e.g. 10 < amount is evaluated as amount > 10
+_REVERSED_OPERATORS: Dict[type, type] = {
+    ast.Eq: ast.Eq,
+    ast.NotEq: ast.NotEq,
+    ast.Lt: ast.Gt,
+    ast.LtE: ast.GtE,
+    ast.Gt: ast.Lt,
+    ast.GtE: ast.LtE
+}
+
+
+def _to_float(value: str) -> Optional[float]:
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class RowFilter:
+    """
+    Class used for filtering rows by an expression evaluated against raw split fields before values are parsed,
+    so rows which don't match cost only splitting of the referenced fields and a few comparisons.
+    Expressions use Python syntax limited to comparisons of columns with constants or other columns,
+    `in` and `not in` with lists of constants, `and`, `or` and `not`, e.g.
+    status == 'ACTIVE' and created >= '2024-01-01'. A column alone matches non-empty values.
+    Columns are referenced by names or by column('name') and column(0) (0-based position).
+    Columns compared with numbers are converted to floats (values which can't be converted never match),
+    otherwise raw strings are compared (ISO dates are compared correctly as strings)
+    """
+
+    def __init__(self, expression: str) -> None:
+        """
+        :param expression: Filter expression
+        """
+
+        self._expression: str = expression
+
+        try:
+            self._tree: ast.expr = ast.parse(expression.strip(), mode='eval').body
+        except SyntaxError as exception:
+            raise ValueError(f'Incorrect row filter "{expression}": {exception.msg}')
+
+        # Expression is compiled once without resolving columns to report errors early
+        self._compile(self._tree, lambda column: 0)
+
+    @property
+    def expression(self) -> str:
+        """
+        Returns the filter expression
+        :return: Filter expression
+        """
+
+        return self._expression
+
+    def bind(self, column_names: Sequence[str], columns_count: Optional[int] = None) -> Tuple[Predicate, int]:
+        """
+        Resolves referenced columns and compiles the expression into a predicate
+        :param column_names: Column names split from the last header line
+        :param columns_count: Optional number of columns used when there are no column names
+        :return: 2-tuple containing the predicate evaluated against split fields and the number of leading fields
+                 it needs (lines having fewer fields can't be evaluated)
+        """
+
+        if column_names:
+            columns_count = len(column_names)
+
+        positions: List[int] = []
+
+        def resolve(column: Union[str, int]) -> int:
+            if isinstance(column, str) and column in column_names:
+                position = column_names.index(column)
+            elif isinstance(column, int) or column.isdigit():
+                position = int(column)
+
+                if columns_count is not None and position >= columns_count:
+                    raise ValueError(f'Column {column} does not exist')
+            else:
+                raise ValueError(f'Column {column} does not exist')
+
+            positions.append(position)
+
+            return position
+
+        predicate = self._compile(self._tree, resolve)
+
+        return predicate, max(positions, default=-1) + 1
+
+    def _error(self) -> ValueError:
+        return ValueError(f'Unsupported row filter "{self._expression}"')
+
+    def _column(self, node: ast.expr, resolve: Resolver) -> Optional[int]:
+        """
+        Resolves a column referenced by a node
+        :return: Position of the column or None if the node doesn't reference a column
+        """
+
+        if isinstance(node, ast.Name):
+            return resolve(node.id)
+
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == COLUMN_FUNCTION:
+            if len(node.args) != 1 or node.keywords:
+                raise self._error()
+
+            column = self._constant(node.args[0])
+
+            if not isinstance(column, (str, int)) or isinstance(column, bool):
+                raise self._error()
+
+            return resolve(column)
+
+        return None
+
+    def _constant(self, node: ast.expr) -> Any:
+        try:
+            return ast.literal_eval(node)
+        except ValueError:
+            raise self._error()
+
+    def _compile(self, node: ast.expr, resolve: Resolver) -> Predicate:
+        if isinstance(node, ast.BoolOp):
+            predicates = [self._compile(value, resolve) for value in node.values]
+
+            if isinstance(node.op, ast.And):
+                return lambda fields: all(predicate(fields) for predicate in predicates)
+
+            return lambda fields: any(predicate(fields) for predicate in predicates)
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            operand = self._compile(node.operand, resolve)
+
+            return lambda fields: not operand(fields)
+
+        if isinstance(node, ast.Compare):
+            comparisons: List[Predicate] = []
+            left = node.left
+
+            # Chained comparisons (e.g. 1 <= amount < 10) are split into pairs
+            for comparison_operator, right in zip(node.ops, node.comparators):
+                comparisons.append(self._compile_comparison(left, comparison_operator, right, resolve))
+                left = right
+
+            if len(comparisons) == 1:
+                return comparisons[0]
+
+            return lambda fields: all(comparison(fields) for comparison in comparisons)
+
+        position = self._column(node, resolve)
+
+        if position is None:
+            raise self._error()
+
+        return lambda fields: fields[position] != ''
+
+    def _compile_comparison(
+            self,
+            left: ast.expr,
+            comparison_operator: ast.cmpop,
+            right: ast.expr,
+            resolve: Resolver) -> Predicate:
+        left_position = self._column(left, resolve)
+        right_position = self._column(right, resolve)
+
+        if isinstance(comparison_operator, (ast.In, ast.NotIn)):
+            if left_position is None or right_position is not None:
+                raise self._error()
+
+            return self._compile_membership(
+                left_position, self._constant(right), isinstance(comparison_operator, ast.NotIn))
+
+        operator_type = type(comparison_operator)
+
+        if operator_type not in _COMPARISON_OPERATORS:
+            raise self._error()
+
+        if left_position is not None and right_position is not None:
+            compare_columns = _COMPARISON_OPERATORS[operator_type]
+            first_position: int = left_position
+            second_position: int = right_position
+
+            return lambda fields: compare_columns(fields[first_position], fields[second_position])
+
+        if left_position is None:
+            if right_position is None:
+                raise self._error()
+
+            # Column is moved to the left side
+            left_position = right_position
+            constant = self._constant(left)
+            operator_type = _REVERSED_OPERATORS[operator_type]
+        else:
+            constant = self._constant(right)
+
+        compare = _COMPARISON_OPERATORS[operator_type]
+        position = left_position
+
+        if _is_number(constant):
+            number = float(constant)
+
+            def compare_number(fields: Sequence[str]) -> bool:
+                value = _to_float(fields[position])
+
+                return value is not None and compare(value, number)
+
+            return compare_number
+
+        if not isinstance(constant, str):
+            raise self._error()
+
+        return lambda fields: compare(fields[position], constant)
+
+    def _compile_membership(self, position: int, constants: Any, negated: bool) -> Predicate:
+        if not isinstance(constants, (tuple, list, set, frozenset)) or not constants:
+            raise self._error()
+
+        if all(_is_number(constant) for constant in constants):
+            numbers = frozenset(float(constant) for constant in constants)
+
+            def contains_number(fields: Sequence[str]) -> bool:
+                return (_to_float(fields[position]) in numbers) != negated
+
+            return contains_number
+
+        if not all(isinstance(constant, str) for constant in constants):
+            raise self._error()
+
+        strings = frozenset(constants)
+
+        return lambda fields: (fields[position] in strings) != negated
@@ -0,0 +1,96 @@
+import json
+import os
+import zlib
+from dataclasses import asdict, dataclass
+from typing import ClassVar, Optional
+
+# Number of bytes preceding the processed prefix used to detect rewritten files
+TAIL_CHECKSUM_SIZE: int = 4096
+
+
+@dataclass(frozen=True)
+class IncrementalState:
+    """
+    Class used for storing the position in an append-only file up to which it has been processed
+    """
+
+    STATE_FILE_EXTENSION: ClassVar[str] = '.state'
+
+    # Byte offset of the first line which hasn't been processed yet
+    offset: int = 0
+    # Index of the first line which hasn't been processed yet
+    line_index: int = 0
+    # CRC32 checksum of the bytes preceding the offset
+    tail_checksum: int = 0
+    tail_size: int = 0
+
+    @staticmethod
+    def state_file_path(input_file_path: str) -> str:
+        """
+        Returns the default path to the state file of an input file
+        :param input_file_path: Input file path
+        :return: Path to the state file
+        """
+
+        return input_file_path + IncrementalState.STATE_FILE_EXTENSION
+
+    @staticmethod
+    def _checksum(input_file_path: str, offset: int, size: int) -> int:
+        with open(input_file_path, 'rb') as input_file:
+            input_file.seek(offset - size)
+
+            return zlib.crc32(input_file.read(size))
+
+    @staticmethod
+    def create(input_file_path: str, offset: int, line_index: int) -> 'IncrementalState':
+        """
+        Creates a state of a file processed up to a byte offset
+        :param input_file_path: Input file path
+        :param offset: Byte offset of the first line which hasn't been processed yet
+        :param line_index: Index of the first line which hasn't been processed yet
+        :return: Created state
+        """
+
+        tail_size = min(offset, TAIL_CHECKSUM_SIZE)
+
+        return IncrementalState(
+            offset, line_index, IncrementalState._checksum(input_file_path, offset, tail_size), tail_size)
+
+    def matches(self, input_file_path: str) -> bool:
+        """
+        Checks whether the processed prefix of a file hasn't been changed (the file has only been appended to)
+        :param input_file_path: Input file path
+        :return: Boolean value indicating whether the processing can be resumed
+        """
+
+        if os.path.getsize(input_file_path) < self.offset:
+            return False
+
+        return self._checksum(input_file_path, self.offset, self.tail_size) == self.tail_checksum
+
+    def save(self, state_file_path: str) -> None:
+        """
+        Saves the state into a file (the file is replaced atomically)
+        :param state_file_path: Path to the state file
+        """
+
+        temporary_file_path = state_file_path + '.tmp'
+
+        with open(temporary_file_path, 'w') as state_file:
+            json.dump(asdict(self), state_file)
+
+        os.replace(temporary_file_path, state_file_path)
+
+    @staticmethod
+    def load(state_file_path: str) -> Optional['IncrementalState']:
+        """
+        Loads a state from a file
+        :param state_file_path: Path to the state file
+        :return: Loaded state or None if the state file doesn't exist
+        """
+
+        if not os.path.exists(state_file_path):
+            return None
+
+        with open(state_file_path) as state_file:
+            return IncrementalState(**json.load(state_file))
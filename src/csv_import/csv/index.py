@@ -0,0 +1,299 @@
+import logging
+import os
+import struct
+from array import array
+from logging import Logger
+from typing import IO, Optional, Tuple
+
+READ_BUFFER_SIZE: int = 1024 * 1024
+LINE_TERMINATOR: bytes = b'\n'
+
+
+class LineIndex:
+    """
+    Sparse index mapping line numbers to byte offsets.
+    It stores the offset of every @step-th line, so locating an arbitrary line requires a single seek and
+    reading at most @step - 1 lines. The index is stored next to the indexed file (in a file with .idx extension)
+    together with the size and the modification time of the indexed file which are used to detect stale indexes
+    """
+
+    DEFAULT_STEP: int = 64
+    FILE_EXTENSION: str = '.idx'
+    _HEADER_FORMAT: str = '<4q'
+
+    def __init__(self, checkpoints: array, step: int, lines_count: int, file_size: int, file_mtime: int) -> None:
+        """
+        :param checkpoints: Array of byte offsets of every @step-th line
+        :param step: Number of lines between two checkpoints
+        :param lines_count: Total number of lines in the indexed file
+        :param file_size: Size of the indexed file
+        :param file_mtime: Modification time of the indexed file (in nanoseconds)
+        """
+
+        self._checkpoints: array = checkpoints
+        self._step: int = step
+        self._lines_count: int = lines_count
+        self._file_size: int = file_size
+        self._file_mtime: int = file_mtime
+
+    @property
+    def step(self) -> int:
+        """
+        Returns the number of lines between two checkpoints
+        :return: Number of lines between two checkpoints
+        """
+
+        return self._step
+
+    @property
+    def lines_count(self) -> int:
+        """
+        Returns the total number of lines in the indexed file
+        :return: Total number of lines
+        """
+
+        return self._lines_count
+
+    def locate(self, line_index: int) -> Tuple[int, int]:
+        """
+        Finds the closest checkpoint preceding a line
+        :param line_index: Index of the line
+        :return: 2-tuple containing the byte offset and the index of the checkpoint line
+        """
+
+        if not 0 <= line_index < self._lines_count:
+            raise IndexError(f'Line # {line_index} is out of range')
+
+        checkpoint = line_index // self._step
+
+        return self._checkpoints[checkpoint], checkpoint * self._step
+
+    def is_valid_for(self, file_path: str) -> bool:
+        """
+        Checks whether the index still corresponds to the file
+        :param file_path: Path to the indexed file
+        :return: Boolean value indicating whether the index is up to date
+        """
+
+        file_stat = os.stat(file_path)
+
+        return file_stat.st_size == self._file_size and file_stat.st_mtime_ns == self._file_mtime
+
+    def save(self, index_file_path: str) -> None:
+        """
+        Saves the index into a file
+        :param index_file_path: Path to the index file
+        """
+
+        with open(index_file_path, 'wb') as index_file:
+            index_file.write(
+                struct.pack(self._HEADER_FORMAT, self._step, self._lines_count, self._file_size, self._file_mtime))
+            self._checkpoints.tofile(index_file)
+
+    @staticmethod
+    def index_file_path(file_path: str) -> str:
+        """
+        Returns the default path to the index of a file
+        :param file_path: Path to the indexed file
+        :return: Path to the index file
+        """
+
+        return file_path + LineIndex.FILE_EXTENSION
+
+    @staticmethod
+    def build(file_path: str, step: int = DEFAULT_STEP) -> 'LineIndex':
+        """
+        Builds an index by scanning a file
+        :param file_path: Path to the file
+        :param step: Number of lines between two checkpoints
+        :return: Built index
+        """
+
+        file_stat = os.stat(file_path)
+        checkpoints = array('q')
+        lines_count = 0
+        position = 0
+        # Offset of the line which starts right after the last found line terminator
+        line_start = 0
+
+        with open(file_path, 'rb') as file:
+            while True:
+                chunk = file.read(READ_BUFFER_SIZE)
+
+                if not chunk:
+                    break
+
+                chunk_position = chunk.find(LINE_TERMINATOR)
+
+                while chunk_position >= 0:
+                    if lines_count % step == 0:
+                        checkpoints.append(line_start)
+
+                    lines_count += 1
+                    line_start = position + chunk_position + 1
+                    chunk_position = chunk.find(LINE_TERMINATOR, chunk_position + 1)
+
+                position += len(chunk)
+
+        # The last line is not terminated
+        if line_start < position:
+            if lines_count % step == 0:
+                checkpoints.append(line_start)
+
+            lines_count += 1
+
+        return LineIndex(checkpoints, step, lines_count, file_stat.st_size, file_stat.st_mtime_ns)
+
+    @staticmethod
+    def load(file_path: str, index_file_path: Optional[str] = None) -> Optional['LineIndex']:
+        """
+        Loads the index of a file if it exists and is up to date
+        :param file_path: Path to the indexed file
+        :param index_file_path: Optional path to the index file (by default the file with .idx extension is used)
+        :return: Loaded index or None if the index doesn't exist or is stale
+        """
+
+        logger: Logger = logging.getLogger(__name__)
+        index_file_path = index_file_path or LineIndex.index_file_path(file_path)
+
+        if not os.path.exists(index_file_path):
+            return None
+
+        with open(index_file_path, 'rb') as index_file:
+            header = index_file.read(struct.calcsize(LineIndex._HEADER_FORMAT))
+            step, lines_count, file_size, file_mtime = struct.unpack(LineIndex._HEADER_FORMAT, header)
+            checkpoints = array('q')
+            checkpoints.frombytes(index_file.read())
+
+        line_index = LineIndex(checkpoints, step, lines_count, file_size, file_mtime)
+
+        if not line_index.is_valid_for(file_path):
+            logger.warning(f'Ignoring stale line index "{index_file_path}"')
+
+            return None
+
+        return line_index
+
+
+def find_line_start(file: IO[bytes], offset: int) -> int:
+    """
+    Finds the first line starting at or after a byte offset
+    :param file: File opened in binary mode
+    :param offset: Byte offset
+    :return: Byte offset of the line start or the file size if there are no lines after the offset
+    """
+
+    if offset <= 0:
+        return 0
+
+    # The byte preceding the offset is checked, so the offset itself is returned if it's a line start
+    position = offset - 1
+    file.seek(position)
+
+    while True:
+        chunk = file.read(READ_BUFFER_SIZE)
+
+        if not chunk:
+            return position
+
+        chunk_position = chunk.find(LINE_TERMINATOR)
+
+        if chunk_position >= 0:
+            return position + chunk_position + 1
+
+        position += len(chunk)
+
+
+def estimate_lines_count(file: IO[bytes], offset: int, file_size: int, sample_size: int = 64 * 1024) -> int:
+    """
+    Estimates the number of lines after a byte offset using the average length of the lines following it
+    :param file: File opened in binary mode
+    :param offset: Byte offset
+    :param file_size: File size
+    :param sample_size: Number of bytes used to compute the average line length
+    :return: Estimated number of lines
+    """
+
+    if offset >= file_size:
+        return 0
+
+    file.seek(offset)
+    chunk = file.read(sample_size)
+    terminators_count = chunk.count(LINE_TERMINATOR)
+
+    if terminators_count == 0 or len(chunk) == file_size - offset:
+        return max(terminators_count + (0 if chunk.endswith(LINE_TERMINATOR) else 1), 1)
+
+    return round((file_size - offset) * terminators_count / len(chunk))
+
+
+def find_tail_offset(file: IO[bytes], lines_count: int, lower_bound: int = 0) -> int:
+    """
+    Finds the byte offset of the last @lines_count lines by scanning a file backwards
+    :param file: File opened in binary mode
+    :param lines_count: Number of the last lines
+    :param lower_bound: Byte offset which the result can't precede (e.g. the end of headers)
+    :return: Byte offset of the first of the last lines
+    """
+
+    file.seek(0, os.SEEK_END)
+    position = file.tell()
+
+    if lines_count <= 0:
+        return position
+
+    # Terminator of the last line doesn't start a new line
+    end = position
+    file.seek(max(end - 1, 0))
+
+    if end > 0 and file.read(1) == LINE_TERMINATOR:
+        end -= 1
+
+    position = end
+    terminators_found = 0
+
+    while position > lower_bound:
+        chunk_start = max(position - READ_BUFFER_SIZE, lower_bound)
+        file.seek(chunk_start)
+        chunk = file.read(position - chunk_start)
+        chunk_position = len(chunk)
+
+        while True:
+            chunk_position = chunk.rfind(LINE_TERMINATOR, 0, chunk_position)
+
+            if chunk_position < 0:
+                break
+
+            terminators_found += 1
+
+            if terminators_found == lines_count:
+                return chunk_start + chunk_position + 1
+
+        position = chunk_start
+
+    return lower_bound
+
+
+def find_last_line_end(file: IO[bytes]) -> int:
+    """
+    Finds the end of the last terminated line (the last line of a file which is still being appended to
+    can be incomplete)
+    :param file: File opened in binary mode
+    :return: Byte offset following the last line terminator or 0 if there are no terminated lines
+    """
+
+    file.seek(0, os.SEEK_END)
+    position = file.tell()
+
+    while position > 0:
+        chunk_start = max(position - READ_BUFFER_SIZE, 0)
+        file.seek(chunk_start)
+        chunk = file.read(position - chunk_start)
+        chunk_position = chunk.rfind(LINE_TERMINATOR)
+
+        if chunk_position >= 0:
+            return chunk_start + chunk_position + 1
+
+        position = chunk_start
+
+    return 0
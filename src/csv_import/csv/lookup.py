@@ -0,0 +1,600 @@
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+from abc import ABC, abstractmethod
+from array import array
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from logging import Logger
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Optional,
+                    Sequence, Tuple)
+
+from csv_import.csv.parsers import LineParser, ParserOptions
+from csv_import.csv.sort import ExternalSorter, SortOptions
+from csv_import.csv.text import TextReader
+
+DEFAULT_LOOKUP_MEMORY_LIMIT: int = 256 * 1024 * 1024
+# Approximate number of bytes used by a single entry of the in-memory index (in addition to its strings)
+INDEX_ENTRY_SIZE: int = 200
+VALUE_OVERHEAD: int = 57
+# Number of recently looked up keys cached by the on-disk index
+LOOKUP_CACHE_SIZE: int = 64 * 1024
+# Number of offsets buffered before they are written to a temporary file while an index file is built
+OFFSETS_BUFFER_SIZE: int = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class LookupOptions:
+    """
+    Class used for storing options of joining lines with a reference file
+    """
+
+    # Path to the reference file (its first line has to contain column names)
+    reference_file_path: str
+    # Name (or 0-based position) of the column of processed lines containing lookup keys
+    key_column: str
+    # Name (or 0-based position) of the key column of the reference file (the same name as key_column by default)
+    reference_key_column: Optional[str] = None
+    # Names (or 0-based positions) of reference columns appended to lines (all except the key column by default)
+    value_columns: Optional[Tuple[str, ...]] = None
+    # Boolean value indicating whether lines without a matching key are dropped (they get None values otherwise)
+    inner_join: bool = False
+    # Reference files whose index exceeds this size are searched on disk instead of being loaded into memory
+    memory_limit: int = DEFAULT_LOOKUP_MEMORY_LIMIT
+    # Boolean value indicating whether the index is kept on disk and reused by next runs
+    cache_index: bool = True
+    # Optional path to the index file (the reference file path with .lookup extension by default)
+    index_file_path: Optional[str] = None
+
+
+@dataclass
+class LookupStatistics:
+    """
+    Class used for storing statistics of lookups
+    """
+
+    lookups: int = 0
+    hits: int = 0
+
+    @property
+    def misses(self) -> int:
+        return self.lookups - self.hits
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converts the statistics into a dictionary which can be serialized into JSON
+        :return: Dictionary containing the statistics
+        """
+
+        return {'lookups': self.lookups, 'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hit_rate}
+
+
+def _find_column(column: str, column_names: Sequence[str]) -> int:
+    if column in column_names:
+        return list(column_names).index(column)
+
+    if column.isdigit() and int(column) < len(column_names):
+        return int(column)
+
+    raise ValueError(f'Column {column} does not exist')
+
+
+class LookupIndex(ABC):
+    """
+    Base class of indexes mapping keys of a reference file to values of its columns
+    """
+
+    FILE_EXTENSION: str = '.lookup'
+    _MAGIC: bytes = b'CSVLKP01'
+    # Magic, reference file size and modification time, number of entries, data offset, offsets offset,
+    # metadata length
+    _HEADER_FORMAT: str = '<8s6q'
+    _KEY_LENGTH_FORMAT: str = '<I'
+
+    def __init__(self, value_names: Sequence[str], options: LookupOptions) -> None:
+        """
+        :param value_names: Names of columns of looked up values
+        :param options: Lookup options
+        """
+
+        self._value_names: List[str] = list(value_names)
+        self._options: LookupOptions = options
+        self._statistics: LookupStatistics = LookupStatistics()
+
+    def __enter__(self) -> 'LookupIndex':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    @property
+    def value_names(self) -> List[str]:
+        """
+        Returns names of columns of looked up values
+        :return: List of column names
+        """
+
+        return self._value_names
+
+    @property
+    def options(self) -> LookupOptions:
+        return self._options
+
+    @property
+    def statistics(self) -> LookupStatistics:
+        return self._statistics
+
+    @abstractmethod
+    def _find(self, key: str) -> Optional[Tuple[str, ...]]:
+        pass
+
+    def lookup(self, key: str) -> Optional[Tuple[str, ...]]:
+        """
+        Looks up values of a key
+        :param key: Key
+        :return: Tuple of values or None if the key doesn't exist
+        """
+
+        values = self._find(key)
+        self._statistics.lookups += 1
+
+        if values is not None:
+            self._statistics.hits += 1
+
+        return values
+
+    def lookup_many(self, keys: Sequence[str]) -> List[Optional[Tuple[str, ...]]]:
+        """
+        Looks up values of several keys at once
+        :param keys: Keys
+        :return: List containing a tuple of values (or None if the key doesn't exist) for every key
+        """
+
+        return [self.lookup(key) for key in keys]
+
+    def fingerprint(self) -> Dict[str, Any]:
+        """
+        Returns settings and the version of the reference file which determine looked up values
+        :return: Dictionary which can be serialized into JSON
+        """
+
+        file_stat = os.stat(self._options.reference_file_path)
+
+        return {
+            'options': asdict(self._options),
+            'reference_file_size': file_stat.st_size,
+            'reference_file_mtime': file_stat.st_mtime_ns
+        }
+
+    def close(self) -> None:
+        """
+        Releases resources used by the index and logs statistics of lookups
+        """
+
+        statistics = self._statistics
+
+        if statistics.lookups:
+            logging.getLogger(__name__).info(
+                f'Looked up {statistics.lookups} keys: {statistics.hits} hits, {statistics.misses} misses '
+                f'(hit rate {statistics.hit_rate:.1%})')
+
+    @staticmethod
+    def index_file_path(options: LookupOptions) -> str:
+        """
+        Returns the path to the index file of a reference file
+        :param options: Lookup options
+        :return: Path to the index file
+        """
+
+        return options.index_file_path or options.reference_file_path + LookupIndex.FILE_EXTENSION
+
+    @staticmethod
+    def _metadata(options: LookupOptions, reference_options: ParserOptions) -> Dict[str, Any]:
+        return {
+            'reference_key_column': options.reference_key_column or options.key_column,
+            'value_columns': list(options.value_columns) if options.value_columns else None,
+            'reference_options': {
+                name: value for name, value in asdict(reference_options).items()
+                if name in ('header_lines', 'line_terminator', 'field_terminator', 'field_enclosing_value', 'encoding')
+            }
+        }
+
+    @staticmethod
+    def create(options: LookupOptions, reference_options: ParserOptions) -> 'LookupIndex':
+        """
+        Creates an index of a reference file reusing the cached index file if it's up to date.
+        Reference files are loaded into a hash index if they fit into the memory limit, otherwise entries are sorted
+        by an external sort into an index file which is memory-mapped and binary searched
+        :param options: Lookup options
+        :param reference_options: Parser options of the reference file
+        :return: Lookup index
+        """
+
+        logger: Logger = logging.getLogger(__name__)
+        index_file_path = LookupIndex.index_file_path(options)
+        metadata = LookupIndex._metadata(options, reference_options)
+
+        if options.cache_index:
+            index = LookupIndex._load(index_file_path, options, metadata)
+
+            if index is not None:
+                logger.info(f'Loaded lookup index "{index_file_path}"')
+
+                return index
+
+        logger.info(f'Started indexing reference file "{options.reference_file_path}"')
+
+        file_stat = os.stat(options.reference_file_path)
+        value_names, entries = LookupIndex._read(options, reference_options)
+        entries_size = 0
+        hash_entries: Dict[str, Tuple[str, ...]] = {}
+        sorter: Optional[ExternalSorter] = None
+
+        try:
+            for key, values in entries:
+                if sorter is not None:
+                    sorter.add([key, *values])
+                    continue
+
+                # The first line of a key wins
+                if key in hash_entries:
+                    continue
+
+                hash_entries[key] = values
+                entries_size += INDEX_ENTRY_SIZE + len(key) + sum(VALUE_OVERHEAD + len(value) for value in values)
+
+                if entries_size > options.memory_limit:
+                    logger.info('Reference file does not fit into memory, it will be searched on disk')
+                    sorter = ExternalSorter(SortOptions(key_columns=('0',), memory_limit=options.memory_limit))
+
+                    # The sort is stable, so entries added first still win
+                    for hash_key, hash_values in hash_entries.items():
+                        sorter.add([hash_key, *hash_values])
+
+                    hash_entries = {}
+
+            if sorter is None:
+                if options.cache_index:
+                    LookupIndex._write(
+                        index_file_path, sorted(hash_entries.items()), file_stat, metadata, value_names)
+
+                logger.info(f'Finished indexing reference file "{options.reference_file_path}" in memory')
+
+                return HashLookupIndex(hash_entries, value_names, options)
+
+            if not options.cache_index:
+                # The index file is needed for searching, so it's written to a temporary file removed on close
+                file_descriptor, index_file_path = tempfile.mkstemp(suffix=LookupIndex.FILE_EXTENSION)
+                os.close(file_descriptor)
+
+            sorted_entries = ((values[0], values[1:]) for values in sorter.sorted_values())
+            LookupIndex._write(index_file_path, sorted_entries, file_stat, metadata, value_names)
+        finally:
+            if sorter is not None:
+                sorter.close()
+
+        logger.info(f'Finished indexing reference file "{options.reference_file_path}" into "{index_file_path}"')
+
+        return SortedLookupIndex(index_file_path, value_names, options, remove_on_close=not options.cache_index)
+
+    @staticmethod
+    def _read(
+            options: LookupOptions,
+            reference_options: ParserOptions) -> Tuple[List[str], Iterator[Tuple[str, Tuple[str, ...]]]]:
+        """
+        Starts reading a reference file
+        :return: 2-tuple containing names of value columns and an iterator of keys and values
+        """
+
+        column_names: List[str] = []
+
+        reference_file = TextReader.create(options.reference_file_path, reference_options.encoding)
+
+        with reference_file:
+            for _ in range(reference_options.header_lines):
+                header_line = reference_file.read_line()
+
+                if header_line:
+                    column_names = LineParser.split(header_line, reference_options)
+
+        key_position = _find_column(options.reference_key_column or options.key_column, column_names)
+        value_positions = [_find_column(column, column_names) for column in options.value_columns] \
+            if options.value_columns else [
+                position for position in range(len(column_names)) if position != key_position]
+        value_names = [column_names[position] for position in value_positions]
+
+        return value_names, LookupIndex._read_entries(options, reference_options, key_position, value_positions)
+
+    @staticmethod
+    def _read_entries(
+            options: LookupOptions,
+            reference_options: ParserOptions,
+            key_position: int,
+            value_positions: List[int]) -> Iterator[Tuple[str, Tuple[str, ...]]]:
+        logger: Logger = logging.getLogger(__name__)
+        values_count = max([key_position] + value_positions) + 1
+        skipped_lines = 0
+
+        reference_file = TextReader.create(options.reference_file_path, reference_options.encoding)
+
+        with reference_file:
+            for _ in range(reference_options.header_lines):
+                reference_file.read_line()
+
+            while True:
+                line = reference_file.read_line()
+
+                if not line:
+                    break
+
+                values = LineParser.split(line, reference_options)
+
+                # Lines missing key or value columns (e.g. empty lines) are skipped
+                if len(values) < values_count:
+                    skipped_lines += 1
+                    continue
+
+                yield values[key_position], tuple(values[position] for position in value_positions)
+
+        if skipped_lines:
+            logger.warning(f'Skipped {skipped_lines} lines of reference file "{options.reference_file_path}"')
+
+    @staticmethod
+    def _write(
+            index_file_path: str,
+            entries: Iterable[Tuple[str, Sequence[str]]],
+            file_stat: os.stat_result,
+            metadata: Dict[str, Any],
+            value_names: Sequence[str]) -> None:
+        """
+        Writes sorted entries into an index file: a header, metadata, records (a key length, a key and JSON values)
+        and offsets of records. The file is replaced atomically, so concurrent runs never read incomplete indexes
+        """
+
+        temporary_file_path = f'{index_file_path}.{os.getpid()}.tmp'
+        metadata_bytes = json.dumps({**metadata, 'value_names': list(value_names)}).encode('utf-8')
+        header_size = struct.calcsize(LookupIndex._HEADER_FORMAT)
+        data_offset = header_size + len(metadata_bytes)
+        offsets = array('q')
+        entries_count = 0
+        previous_key: Optional[str] = None
+        position = data_offset
+
+        with open(temporary_file_path, 'wb') as index_file, tempfile.TemporaryFile() as offsets_file:
+            index_file.write(b'\0' * header_size + metadata_bytes)
+
+            for key, values in entries:
+                # Duplicate keys follow the first line of the key
+                if key == previous_key:
+                    continue
+
+                previous_key = key
+                key_bytes = key.encode('utf-8')
+                record = struct.pack(LookupIndex._KEY_LENGTH_FORMAT, len(key_bytes)) + key_bytes + \
+                    json.dumps(list(values), ensure_ascii=False).encode('utf-8')
+                index_file.write(record)
+                offsets.append(position)
+                position += len(record)
+                entries_count += 1
+
+                if len(offsets) >= OFFSETS_BUFFER_SIZE:
+                    offsets.tofile(offsets_file)
+                    offsets = array('q')
+
+            # The last offset marks the end of the last record
+            offsets.append(position)
+            offsets.tofile(offsets_file)
+            # Offsets are aligned to be read as an array of 8-byte integers
+            padding = -position % 8
+            index_file.write(b'\0' * padding)
+            offsets_offset = position + padding
+            offsets_file.seek(0)
+
+            for chunk in iter(lambda: offsets_file.read(OFFSETS_BUFFER_SIZE), b''):
+                index_file.write(chunk)
+
+            index_file.seek(0)
+            index_file.write(struct.pack(
+                LookupIndex._HEADER_FORMAT,
+                LookupIndex._MAGIC,
+                file_stat.st_size,
+                file_stat.st_mtime_ns,
+                entries_count,
+                data_offset,
+                offsets_offset,
+                len(metadata_bytes)))
+
+        os.replace(temporary_file_path, index_file_path)
+
+    @staticmethod
+    def _read_header(index_file_path: str) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+        with open(index_file_path, 'rb') as index_file:
+            header = struct.unpack(
+                LookupIndex._HEADER_FORMAT, index_file.read(struct.calcsize(LookupIndex._HEADER_FORMAT)))
+            metadata = json.loads(index_file.read(header[6]).decode('utf-8'))
+
+        return header, metadata
+
+    @staticmethod
+    def _load(index_file_path: str, options: LookupOptions, metadata: Dict[str, Any]) -> Optional['LookupIndex']:
+        """
+        Loads a cached index file if it's up to date
+        :return: Loaded index or None if the index doesn't exist or is stale
+        """
+
+        logger: Logger = logging.getLogger(__name__)
+
+        if not os.path.exists(index_file_path):
+            return None
+
+        try:
+            header, index_metadata = LookupIndex._read_header(index_file_path)
+        except (struct.error, ValueError):
+            logger.warning(f'Ignoring corrupted lookup index "{index_file_path}"')
+
+            return None
+
+        magic, file_size, file_mtime, entries_count, data_offset, offsets_offset, _ = header
+        file_stat = os.stat(options.reference_file_path)
+        value_names = index_metadata.pop('value_names')
+
+        if magic != LookupIndex._MAGIC or file_size != file_stat.st_size or file_mtime != file_stat.st_mtime_ns or \
+                index_metadata != metadata:
+            logger.warning(f'Ignoring stale lookup index "{index_file_path}"')
+
+            return None
+
+        if entries_count * INDEX_ENTRY_SIZE + offsets_offset - data_offset > options.memory_limit:
+            return SortedLookupIndex(index_file_path, value_names, options)
+
+        entries: Dict[str, Tuple[str, ...]] = {}
+
+        sorted_index = SortedLookupIndex(index_file_path, value_names, options)
+
+        with sorted_index:
+            for key, values in sorted_index.entries():
+                entries[key] = values
+
+        return HashLookupIndex(entries, value_names, options)
+
+
+class HashLookupIndex(LookupIndex):
+    """
+    Lookup index keeping all entries of a reference file in a dictionary
+    """
+
+    def __init__(self, entries: Dict[str, Tuple[str, ...]], value_names: Sequence[str], options: LookupOptions) -> None:
+        """
+        :param entries: Dictionary mapping keys to tuples of values
+        :param value_names: Names of columns of looked up values
+        :param options: Lookup options
+        """
+
+        super().__init__(value_names, options)
+
+        self._entries: Dict[str, Tuple[str, ...]] = entries
+
+    def _find(self, key: str) -> Optional[Tuple[str, ...]]:
+        return self._entries.get(key)
+
+
+class SortedLookupIndex(LookupIndex):
+    """
+    Lookup index binary searching a memory-mapped index file with entries sorted by keys.
+    Recently looked up keys are cached, and batches of keys are searched in the order of keys,
+    so pages of the index file are read sequentially
+    """
+
+    def __init__(
+            self,
+            index_file_path: str,
+            value_names: Sequence[str],
+            options: LookupOptions,
+            remove_on_close: bool = False) -> None:
+        """
+        :param index_file_path: Path to the index file
+        :param value_names: Names of columns of looked up values
+        :param options: Lookup options
+        :param remove_on_close: Boolean value indicating whether the index file is temporary
+        """
+
+        super().__init__(value_names, options)
+
+        header, _ = LookupIndex._read_header(index_file_path)
+        _, _, entries_count, _, offsets_offset, _ = header[1:]
+
+        self._index_file_path: str = index_file_path
+        self._remove_on_close: bool = remove_on_close
+        self._entries_count: int = entries_count
+        self._file = open(index_file_path, 'rb')
+        self._mmap: mmap.mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._offsets: memoryview = \
+            memoryview(self._mmap)[offsets_offset:offsets_offset + 8 * (entries_count + 1)].cast('q')
+        self._key_length_size: int = struct.calcsize(LookupIndex._KEY_LENGTH_FORMAT)
+        self._cached_find: Callable[[str], Optional[Tuple[str, ...]]] = \
+            lru_cache(maxsize=LOOKUP_CACHE_SIZE)(self._search)
+
+    def _key(self, position: int) -> bytes:
+        offset = self._offsets[position]
+        key_length = struct.unpack_from(LookupIndex._KEY_LENGTH_FORMAT, self._mmap, offset)[0]
+        key_offset = offset + self._key_length_size
+
+        return self._mmap[key_offset:key_offset + key_length]
+
+    def _values(self, position: int) -> Tuple[str, ...]:
+        offset = self._offsets[position]
+        key_length = struct.unpack_from(LookupIndex._KEY_LENGTH_FORMAT, self._mmap, offset)[0]
+        values_offset = offset + self._key_length_size + key_length
+
+        return tuple(json.loads(self._mmap[values_offset:self._offsets[position + 1]].decode('utf-8')))
+
+    def _bisect(self, key: bytes, low: int = 0) -> int:
+        high = self._entries_count
+
+        while low < high:
+            middle = (low + high) // 2
+
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    def _search(self, key: str) -> Optional[Tuple[str, ...]]:
+        key_bytes = key.encode('utf-8')
+        position = self._bisect(key_bytes)
+
+        if position < self._entries_count and self._key(position) == key_bytes:
+            return self._values(position)
+
+        return None
+
+    def _find(self, key: str) -> Optional[Tuple[str, ...]]:
+        return self._cached_find(key)
+
+    def lookup_many(self, keys: Sequence[str]) -> List[Optional[Tuple[str, ...]]]:
+        found: Dict[str, Optional[Tuple[str, ...]]] = {}
+        low = 0
+
+        # Every search starts where the previous one (of a smaller key) ended
+        for key in sorted(set(keys), key=lambda key: key.encode('utf-8')):
+            key_bytes = key.encode('utf-8')
+            low = self._bisect(key_bytes, low)
+            found[key] = self._values(low) if low < self._entries_count and self._key(low) == key_bytes else None
+
+        results = [found[key] for key in keys]
+        self._statistics.lookups += len(keys)
+        self._statistics.hits += sum(1 for values in results if values is not None)
+
+        return results
+
+    def entries(self) -> Iterable[Tuple[str, Tuple[str, ...]]]:
+        """
+        Returns all entries of the index
+        :return: Iterator of keys and values in the order of keys
+        """
+
+        for position in range(self._entries_count):
+            yield self._key(position).decode('utf-8'), self._values(position)
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+
+        self._cached_find = self._search
+        self._offsets.release()
+        self._mmap.close()
+        self._file.close()
+
+        if self._remove_on_close:
+            os.remove(self._index_file_path)
+
+        super().close()
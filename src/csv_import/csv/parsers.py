@@ -1,10 +1,24 @@
 import logging
+import os
+import random
 import re
 from abc import ABC, abstractmethod
+from array import array
+from collections import deque
 from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
 from logging import Logger
-from typing import Iterator, List, Optional, Pattern, Sequence
-
+from typing import (Any, Callable, Deque, Dict, FrozenSet, Iterator, List,
+                    Optional, Pattern, Sequence, Set, Tuple, Union, overload)
+
+from csv_import.csv.filters import RowFilter
+from csv_import.csv.incremental import IncrementalState
+from csv_import.csv.index import (LineIndex, estimate_lines_count,
+                                  find_last_line_end, find_line_start,
+                                  find_tail_offset)
+from csv_import.csv.progress import LOG, NONE, ProgressReporter
+from csv_import.csv.rejects import RejectSink
 from csv_import.csv.text import TextReader
 
 
@@ -12,6 +26,14 @@ class ParsingError(Exception):
     pass
 
 
+class RecordTooLargeError(ParsingError):
+    pass
+
+
+class FieldTooLargeError(ParsingError):
+    pass
+
+
 @dataclass(frozen=True)
 class ParserOptions:
     """
@@ -22,6 +44,32 @@ class ParserOptions:
     line_terminator: str = '\n'
     field_terminator: str = '\t'
     field_enclosing_value: str = ''
+    reject_file_path: Optional[str] = None
+    error_summary_interval: float = 10.0
+    error_sample_size: int = 10
+    head: Optional[int] = None
+    tail: Optional[int] = None
+    sample: Optional[float] = None
+    sample_seed: Optional[int] = None
+    # Encoding of input files (the platform one by default)
+    encoding: Optional[str] = None
+    # Progress reporting mode (none, log, tty or json) and the minimal number of seconds between two reports
+    progress: str = LOG
+    progress_interval: Optional[float] = None
+    # Names (or 0-based positions) of columns which are parsed (all by default) and of columns which are skipped
+    columns: Optional[Tuple[str, ...]] = None
+    exclude_columns: Optional[Tuple[str, ...]] = None
+    # Expression selecting rows which are parsed (see RowFilter), it's evaluated against raw fields
+    row_filter: Optional[str] = None
+    # Values are parsed on first access (see LazyParsedLine), and in the strict mode all of them are validated
+    # once the line has been consumed, so errors of values which weren't accessed are reported too
+    lazy_parsing: bool = False
+    strict_lazy_parsing: bool = False
+    # Maximum size of a line in bytes (excluding the line terminator) and of a field in chars.
+    # Longer lines are streamed to the reject file without being read into memory, and lines with longer fields
+    # are rejected, by default sizes are not limited
+    max_record_size: Optional[int] = None
+    max_field_size: Optional[int] = None
 
 
 class ValueParser(ABC):
@@ -30,15 +78,29 @@ class ValueParser(ABC):
     """
 
     @abstractmethod
-    def parse(self, string: str) -> str:
+    def parse(self, string: str) -> Any:
         """
         Parses string value passed as an argument
         :param string: String to parse
-        :return: Parsed result
+        :return: Parsed result (a string or a typed value, e.g. an integer or a date)
         """
 
         raise NotImplementedError()
 
+    def try_parse(self, string: str) -> Optional[Any]:
+        """
+        Parses string value passed as an argument without raising exceptions.
+        Line parsers use this method on their hot path, so subclasses should override it whenever
+        the failure can be detected without raising an exception
+        :param string: String to parse
+        :return: Parsed result or None if the string cannot be parsed
+        """
+
+        try:
+            return self.parse(string)
+        except Exception:
+            return None
+
 
 class NumberParser(ValueParser):
     """
@@ -57,13 +119,21 @@ class NumberParser(ValueParser):
         self._default_value: Optional[int] = default_value
 
     def parse(self, string: str) -> str:
+        result = self.try_parse(string)
+
+        if result is None:
+            raise ParsingError(f'{string} is not a number')
+
+        return result
+
+    def try_parse(self, string: str) -> Optional[str]:
         if self._number_regex.match(string):
             return string
 
         if self._default_value:
             return str(self._default_value)
 
-        raise ParsingError(f'{string} is not a number')
+        return None
 
 
 class StringParser(ValueParser):
@@ -86,6 +156,9 @@ class StringParser(ValueParser):
 
         return string
 
+    def try_parse(self, string: str) -> Optional[str]:
+        return self.parse(string)
+
 
 class EchoValueParser(ValueParser):
     """
@@ -95,6 +168,179 @@ class EchoValueParser(ValueParser):
     def parse(self, string: str) -> str:
         return string
 
+    def try_parse(self, string: str) -> Optional[str]:
+        return string
+
+
+class IntegerParser(ValueParser):
+    """
+    Class for parsing integer values into int objects (optionally containing thousands separators, e.g. 10,000)
+    """
+
+    def __init__(self, thousands_separator: Optional[str] = None, default_value: Optional[int] = None) -> None:
+        """
+        :param thousands_separator: Optional symbol separating groups of thousands
+        :param default_value: Default value used in the case when a string cannot be parsed
+        """
+
+        self._thousands_separator: Optional[str] = thousands_separator
+        self._default_value: Optional[int] = default_value
+        self._integer_regex: Pattern[str] = re.compile(r'[+-]?\d+', re.ASCII)
+        self._grouped_integer_regex: Optional[Pattern[str]] = re.compile(
+            r'[+-]?\d{1,3}(?:' + re.escape(thousands_separator) + r'\d{3})+', re.ASCII) if thousands_separator else None
+
+    def parse(self, string: str) -> int:
+        result = self.try_parse(string)
+
+        if result is None:
+            raise ParsingError(f'{string} is not an integer')
+
+        return result
+
+    def try_parse(self, string: str) -> Optional[int]:
+        string = string.strip()
+
+        if self._integer_regex.fullmatch(string):
+            return int(string)
+
+        if self._grouped_integer_regex is not None and self._grouped_integer_regex.fullmatch(string):
+            return int(string.replace(self._thousands_separator or '', ''))
+
+        return self._default_value
+
+
+class FloatParser(ValueParser):
+    """
+    Class for parsing real values into float objects
+    """
+
+    def __init__(
+            self,
+            decimal_separator: str = '.',
+            thousands_separator: Optional[str] = None,
+            default_value: Optional[Any] = None) -> None:
+        """
+        :param decimal_separator: Symbol separating the integer part from the fractional part
+        :param thousands_separator: Optional symbol separating groups of thousands
+        :param default_value: Default value used in the case when a string cannot be parsed
+        """
+
+        self._decimal_separator: str = decimal_separator
+        self._thousands_separator: Optional[str] = thousands_separator
+        self._default_value: Optional[Any] = default_value
+        self._number_regex: Pattern[str] = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?', re.ASCII)
+
+    def _convert(self, string: str) -> Any:
+        return float(string)
+
+    def parse(self, string: str) -> Any:
+        result = self.try_parse(string)
+
+        if result is None:
+            raise ParsingError(f'{string} is not a number')
+
+        return result
+
+    def try_parse(self, string: str) -> Optional[Any]:
+        string = string.strip()
+
+        if self._thousands_separator:
+            string = string.replace(self._thousands_separator, '')
+
+        if self._decimal_separator != '.':
+            string = string.replace(self._decimal_separator, '.')
+
+        if self._number_regex.fullmatch(string):
+            return self._convert(string)
+
+        return self._default_value
+
+
+class DecimalParser(FloatParser):
+    """
+    Class for parsing real values into Decimal objects (keeping all digits, e.g. of monetary amounts)
+    """
+
+    def _convert(self, string: str) -> Any:
+        return Decimal(string)
+
+
+class DateTimeParser(ValueParser):
+    """
+    Class for parsing timestamps into datetime objects.
+    Formats are tried starting with the one which has parsed the previous value, and results are memoized,
+    so repeated timestamps (typical for logs and daily snapshots) are parsed only once
+    """
+
+    DEFAULT_CACHE_SIZE: int = 4096
+
+    def __init__(self, formats: Optional[Sequence[str]] = None, cache_size: int = DEFAULT_CACHE_SIZE) -> None:
+        """
+        :param formats: Optional list of strptime formats (by default ISO 8601 values are parsed)
+        :param cache_size: Maximum number of memoized values (the cache is cleared when it gets full)
+        """
+
+        self._formats: List[str] = list(formats or [])
+        self._cache_size: int = cache_size
+        self._cache: Dict[str, Optional[Any]] = {}
+
+    def _convert(self, value: datetime) -> Any:
+        return value
+
+    def _parse_formats(self, string: str) -> Optional[datetime]:
+        if not self._formats:
+            try:
+                return datetime.fromisoformat(string)
+            except ValueError:
+                return None
+
+        for position, date_format in enumerate(self._formats):
+            try:
+                value = datetime.strptime(string, date_format)
+            except ValueError:
+                continue
+
+            # The successful format is tried first next time
+            if position:
+                self._formats.insert(0, self._formats.pop(position))
+
+            return value
+
+        return None
+
+    def parse(self, string: str) -> Any:
+        result = self.try_parse(string)
+
+        if result is None:
+            raise ParsingError(f'{string} is not a timestamp')
+
+        return result
+
+    def try_parse(self, string: str) -> Optional[Any]:
+        try:
+            return self._cache[string]
+        except KeyError:
+            pass
+
+        value = self._parse_formats(string.strip())
+        result = self._convert(value) if value is not None else None
+
+        if len(self._cache) >= self._cache_size:
+            self._cache.clear()
+
+        self._cache[string] = result
+
+        return result
+
+
+class DateParser(DateTimeParser):
+    """
+    Class for parsing dates into date objects
+    """
+
+    def _convert(self, value: datetime) -> Any:
+        return value.date()
+
 
 @dataclass
 class Line:
@@ -102,11 +348,27 @@ class Line:
     Class used for storing input data used by line parsers
     """
 
-    __slots__ = ['file', 'index', 'header', 'line']
+    __slots__ = ['file', 'index', 'header', 'line', 'offset']
     file: TextReader
     index: int
     header: bool
     line: str
+    offset: int
+
+    def __init__(self, file: TextReader, index: int, header: bool, line: str, offset: int = 0) -> None:
+        """
+        :param file: File the line was read from
+        :param index: Index of the line in the file
+        :param header: Boolean value indicating whether the line is a header
+        :param line: Raw line
+        :param offset: Byte offset of the line from the beginning of the file
+        """
+
+        self.file = file
+        self.index = index
+        self.header = header
+        self.line = line
+        self.offset = offset
 
 
 @dataclass
@@ -115,13 +377,22 @@ class ParsedLine(Line):
     Class used for storing result of parsing
     """
 
-    def __init__(self, input_line: Line, parsed_values: Optional[List[str]] = None) -> None:
+    def __init__(
+            self,
+            input_line: Line,
+            parsed_values: Optional[List[Any]] = None,
+            error: Optional[Exception] = None,
+            recovered: bool = False) -> None:
         """
         :param input_line: Line used as an input for a parser
         :param parsed_values: List of parsed values found in an input line
+        :param error: Error which caused the line to be skipped
+        :param recovered: Boolean value indicating whether the line was parsed by a recovery parser
         """
         self._input_line: Line = input_line
         self.parsed_values = parsed_values
+        self.error = error
+        self.recovered = recovered
 
     @property
     def file(self) -> TextReader:
@@ -139,10 +410,165 @@ class ParsedLine(Line):
     def line(self) -> str:
         return self._input_line.line
 
+    @property
+    def offset(self) -> int:
+        return self._input_line.offset
+
     def skipped(self) -> bool:
         return self.parsed_values is None
 
-    parsed_values: Optional[List[str]] = None
+    def value(self, position: int) -> Any:
+        """
+        Returns a single parsed value
+        :param position: Position of the value
+        :return: Parsed value
+        """
+
+        if self.parsed_values is None:
+            raise ParsingError(f'Line # {self.index}: {self.line}. Line has been skipped')
+
+        return self.parsed_values[position]
+
+    parsed_values: Optional[List[Any]] = None
+    error: Optional[Exception] = None
+    recovered: bool = False
+
+
+class LazyParsedLine(ParsedLine):
+    """
+    Class used for storing a line whose values are parsed on first access.
+    It keeps raw split values, and each of them is parsed by its value parser once and cached.
+    A value which can't be parsed makes the line skipped: its error is stored, and parsed_values returns None
+    """
+
+    _UNPARSED: Any = object()
+    _parsed_values: Optional[List[Any]] = None
+
+    def __init__(self, input_line: Line, values: Sequence[str], value_parsers: Sequence[ValueParser]) -> None:
+        """
+        :param input_line: Line used as an input for a parser
+        :param values: List of raw values split from the line
+        :param value_parsers: List of single-value parsers corresponding to the values
+        """
+
+        super().__init__(input_line)
+
+        self._values: Sequence[str] = values
+        self._value_parsers: Sequence[ValueParser] = value_parsers
+        self._cached_values: List[Any] = [self._UNPARSED] * len(values)
+
+    @property  # type: ignore
+    def parsed_values(self) -> Optional[List[Any]]:
+        """
+        Returns all parsed values parsing the ones which haven't been accessed yet
+        :return: List of parsed values or None if any of them can't be parsed
+        """
+
+        if self._parsed_values is None and self.error is None:
+            try:
+                for position in range(len(self._values)):
+                    self.value(position)
+            except Exception:
+                return None
+
+            self._parsed_values = list(self._cached_values)
+
+        return self._parsed_values
+
+    @parsed_values.setter
+    def parsed_values(self, parsed_values: Optional[List[Any]]) -> None:
+        self._parsed_values = parsed_values
+
+    def value(self, position: int) -> Any:
+        """
+        Returns a single value parsing it on first access
+        :param position: Position of the value
+        :return: Parsed value
+        :raises: Error of the value parser if the value can't be parsed (the line becomes skipped)
+        """
+
+        if self._parsed_values is not None:
+            return self._parsed_values[position]
+
+        if self.error is not None:
+            raise self.error
+
+        value = self._cached_values[position]
+
+        if value is self._UNPARSED:
+            value = self._value_parsers[position].try_parse(self._values[position])
+
+            if value is None:
+                try:
+                    value = self._value_parsers[position].parse(self._values[position])
+                except Exception as exception:
+                    self.error = exception
+
+                    raise
+
+            self._cached_values[position] = value
+
+        return value
+
+    def validate(self) -> bool:
+        """
+        Parses values which haven't been accessed yet
+        :return: Boolean value indicating whether all values have been parsed
+        """
+
+        return self.parsed_values is not None
+
+
+class SplitFields(Sequence[str]):
+    """
+    Read-only list of values split from a line (see LineParser.split_offsets).
+    It keeps the line and offsets of values, and a string of a value is created only when the value is accessed
+    """
+
+    __slots__ = ['_string', '_offsets']
+
+    def __init__(self, string: str, offsets: array) -> None:
+        """
+        :param string: Split string
+        :param offsets: Array of (start, end) offset pairs of values in the string
+        """
+
+        self._string: str = string
+        self._offsets: array = offsets
+
+    @property
+    def offsets(self) -> array:
+        """
+        Returns offsets of values
+        :return: Array of (start, end) offset pairs of values in the split string
+        """
+
+        return self._offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) // 2
+
+    @overload
+    def __getitem__(self, position: int) -> str:
+        ...
+
+    @overload
+    def __getitem__(self, position: slice) -> List[str]:
+        ...
+
+    def __getitem__(self, position: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(position, slice):
+            return [self[index] for index in range(len(self))[position]]
+
+        # Negative positions are handled by the array as well
+        return self._string[self._offsets[2 * position]:self._offsets[2 * position + 1]]
+
+    def __iter__(self) -> Iterator[str]:
+        string = self._string
+        offsets = self._offsets
+
+        for index in range(0, len(offsets), 2):
+            yield string[offsets[index]:offsets[index + 1]]
 
 
 class LineParser:
@@ -175,6 +601,22 @@ class LineParser:
         self._options: ParserOptions = options
         self._skip_incorrect_lines: bool = skip_incorrect_lines
         self._next_line_processor: Optional[LineParser] = next_line_parser
+        # Subclasses written before the exception-free protocol override only _parse and signal errors by raising
+        self._raising_parse: bool = type(self)._parse is not LineParser._parse
+        # Lines are parsed lazily only by parsers which parse values using their own value parsers
+        self._lazy_parsing: bool = (
+            options.lazy_parsing and not self._raising_parse and type(self)._try_parse is LineParser._try_parse)
+        self._last_error: Optional[Exception] = None
+        self._all_value_parsers: Sequence[ValueParser] = value_parsers
+        self._projection: Optional[List[int]] = None
+        self._max_values: Optional[int] = None
+        self._field_counts: Optional[FrozenSet[int]] = None if self._raising_parse else frozenset([len(value_parsers)])
+        # The number of fields is checked by _try_parse anyway, so lines are checked by can_parse in advance
+        # only to skip parsers of a chain or when subclasses check or parse lines differently
+        self._check_can_parse: bool = next_line_parser is not None or \
+            type(self).can_parse is not LineParser.can_parse or \
+            type(self).field_counts is not LineParser.field_counts or \
+            type(self)._try_parse is not LineParser._try_parse
 
     @property
     def value_parsers(self) -> Sequence[ValueParser]:
@@ -185,20 +627,156 @@ class LineParser:
 
         return self._value_parsers
 
-    def _parse(self, line: Line, values: List[str]) -> List[str]:
+    @property
+    def supports_projection(self) -> bool:
+        """
+        Returns a boolean value indicating whether the parser is able to split and parse only projected columns.
+        Parsers overriding the parsing logic get all values, and their results are projected by the file parser
+        :return: Boolean value indicating whether the parser supports projection
+        """
+
+        if self._raising_parse or type(self).parse is not LineParser.parse:
+            return False
+
+        return self._next_line_processor is None or self._next_line_processor.supports_projection
+
+    def set_projection(self, projection: Optional[Sequence[int]]) -> None:
+        """
+        Sets positions of columns which are parsed, the rest of columns are skipped without parsing
+        and fields following the last projected column are not even split
+        :param projection: List of column positions or None to parse all columns.
+                           Value parsers passed to the constructor always correspond to all columns
+        """
+
+        if self._next_line_processor is not None:
+            self._next_line_processor.set_projection(projection)
+
+        if projection is None:
+            self._value_parsers = self._all_value_parsers
+            self._projection = None
+            self._max_values = None
+            self._update_field_counts()
+
+            return
+
+        if len(self._all_value_parsers) <= max(projection):
+            raise ValueError(
+                f'Expected at least {max(projection) + 1} value parsers for projected columns, '
+                f'got {len(self._all_value_parsers)}')
+
+        self._value_parsers = [self._all_value_parsers[position] for position in projection]
+
+        self._projection = list(projection)
+        self._max_values = max(projection) + 1
+        self._update_field_counts()
+
+    def _update_field_counts(self) -> None:
+        if self._field_counts is not None:
+            self._field_counts = frozenset([len(self._value_parsers)])
+
+    @property
+    def field_counts(self) -> Optional[FrozenSet[int]]:
+        """
+        Returns the numbers of fields this parser is able to handle.
+        It's used by dispatchers to route lines to parsers without calling them
+        :return: Set of supported field counts or None if the parser can handle any number of fields
+        """
+
+        return self._field_counts
+
+    def can_parse(self, line: Line, values: Sequence[str]) -> bool:
+        """
+        Cheaply checks whether the parser is able to handle a line before trying to parse it
+        :param line: Line object containing a line to parse
+        :param values: List of values split from the line
+        :return: Boolean value indicating whether the parser can handle the line
+        """
+
+        field_counts = self.field_counts
+
+        return field_counts is None or len(values) in field_counts
+
+    def _try_parse(self, line: Line, values: Sequence[str]) -> Optional[List[Any]]:
+        """
+        Parses a list of values split from a line without raising exceptions
+        :param line: Line object containing a line to parse
+        :param values: List of values split from the line
+        :return: List of parsed values or None if the line cannot be parsed
+        """
+
+        if self._raising_parse:
+            try:
+                return self._parse(line, values)
+            except Exception as exception:
+                self._last_error = exception
+
+                return None
+
         if len(values) != len(self._value_parsers):
-            raise ParsingError(
-                f'Line # {line.index}: {line.line}. Expected {len(self._value_parsers)} values, got {len(values)}')
+            return None
+
+        parsed_values: List[Any] = []
+        append_value = parsed_values.append
+
+        for value_parser, value in zip(self._value_parsers, values):
+            result_value = value_parser.try_parse(value)
+
+            if result_value is None:
+                return None
+
+            append_value(result_value)
+
+        return parsed_values
+
+    def _error(self, line: Line, values: Sequence[str]) -> Exception:
+        """
+        Creates an error describing why a line could not be parsed.
+        It's called only once the line has been rejected, so it's allowed to be slow
+        :param line: Line object containing a line which could not be parsed
+        :param values: List of values split from the line
+        :return: Error describing the failure
+        """
+
+        if self._last_error is not None:
+            error, self._last_error = self._last_error, None
 
-        parsed_values = []
+            return error
+
+        if len(values) != len(self._value_parsers):
+            return ParsingError(
+                f'Line # {line.index}: {line.line}. Expected {len(self._value_parsers)} values, got {len(values)}')
 
         for value_parser, value in zip(self._value_parsers, values):
-            result_value = value_parser.parse(value)
+            try:
+                value_parser.parse(value)
+            except Exception as exception:
+                return exception
+
+        return ParsingError(f'Line # {line.index}: {line.line}. Line cannot be parsed')
 
-            parsed_values.append(result_value)
+    def _parse(self, line: Line, values: Sequence[str]) -> List[Any]:
+        parsed_values = self._try_parse(line, values) if self.can_parse(line, values) else None
+
+        if parsed_values is None:
+            raise self._error(line, values)
 
         return parsed_values
 
+    def _check_field_sizes(self, line: Line, fields: Sequence[str]) -> Optional[ParsingError]:
+        max_field_size = self._options.max_field_size or 0
+
+        # Fields of lines which aren't longer than the limit cannot exceed it, so they aren't measured
+        if len(line.line) <= max_field_size:
+            return None
+
+        for position, field in enumerate(fields):
+            if len(field) > max_field_size:
+                return FieldTooLargeError(
+                    f'Line # {line.index}: value # {position} has {len(field)} chars, '
+                    f'the maximum field size is {max_field_size}')
+
+        return None
+
     @staticmethod
     def char_list_to_string(char_array: List[str]) -> str:
         value = ''.join(char_array)
@@ -212,56 +790,100 @@ class LineParser:
         :return: ParsedLine object containing the parsed line
         """
 
-        values = LineParser.split(line.line, self._options)
+        # Strings are created only for projected values, and lazily parsed values create them on access
+        if self._projection is None and not self._lazy_parsing:
+            fields: Sequence[str] = LineParser.split(line.line, self._options)
+        else:
+            fields = LineParser.split_fields(line.line, self._options, self._max_values)
 
-        try:
-            parsed_values = self._parse(line, values)
-            parsed_line = ParsedLine(line, parsed_values)
+        values = fields
+        parsed_values = None
 
-            return parsed_line
-        except Exception:
-            if self._skip_incorrect_lines:
-                self._logger.warning(
-                    f'Skipping line # {line.index}: {line.line}')
+        if self._options.max_field_size is not None:
+            field_error = self._check_field_sizes(line, fields)
+
+            if field_error is not None:
+                self._last_error = None
 
-                return ParsedLine(line)
+                if self._skip_incorrect_lines:
+                    return ParsedLine(line, error=field_error)
 
-            if self._next_line_processor:
-                return self._next_line_processor.parse(line)
+                raise field_error
 
-            raise
+        if self._projection is not None and self._max_values is not None and len(fields) < self._max_values:
+            self._last_error = ParsingError(
+                f'Line # {line.index}: {line.line}. Expected at least {self._max_values} values, got {len(fields)}')
+        else:
+            if self._projection is not None:
+                values = [fields[position] for position in self._projection]
+
+            # Field count is checked eagerly, values are parsed once they are accessed
+            if self._lazy_parsing and self.can_parse(line, values):
+                return LazyParsedLine(line, values, self._value_parsers)
+
+            if not self._check_can_parse or self.can_parse(line, values):
+                parsed_values = self._try_parse(line, values)
+
+        if parsed_values is not None:
+            return ParsedLine(line, parsed_values)
+
+        # Skipped lines are reported by the file parser in an aggregated form
+        if self._skip_incorrect_lines:
+            return ParsedLine(line, error=self._error(line, values))
+
+        if self._next_line_processor:
+            self._last_error = None
+
+            parsed_line = self._next_line_processor.parse(line)
+            parsed_line.recovered = not parsed_line.skipped()
+
+            return parsed_line
+
+        raise self._error(line, values)
 
     @staticmethod
-    def split(string: str, parser_options: ParserOptions) -> List[str]:
+    def split(string: str, parser_options: ParserOptions, max_values: Optional[int] = None) -> List[str]:
         """
         Splits an input string into a list of values using separator set in parsing options
         :param string: Input string
         :param parser_options: Parser options
+        :param max_values: Optional maximal number of leading values to split (the rest of the string is ignored)
         :return: List of split values
         """
 
         buffer: List[str] = []
         values: List[str] = []
         inside_field = False
+        truncated = False
+        # Options and methods used for every char are looked up once
+        field_terminator = parser_options.field_terminator
+        field_enclosing_value = parser_options.field_enclosing_value
+        char_list_to_string = LineParser.char_list_to_string
+        append_char = buffer.append
 
         string = string.strip(parser_options.line_terminator)
 
         for char in string:
-            if not inside_field and char == parser_options.field_terminator:
-                value = LineParser.char_list_to_string(buffer)
+            if not inside_field and char == field_terminator:
+                value = char_list_to_string(buffer)
                 values.append(value)
                 buffer = []
-            elif char == parser_options.field_enclosing_value:
+                append_char = buffer.append
+
+                if max_values is not None and len(values) >= max_values:
+                    truncated = True
+                    break
+            elif char == field_enclosing_value:
                 inside_field = False if inside_field else True
             else:
-                buffer.append(char)
+                append_char(char)
 
         if buffer:
             value = LineParser.char_list_to_string(buffer)
             values.append(value)
 
         # In the case of an empty string return an empty list
-        if len(values) == 1 and values[0] == '':
+        if not truncated and len(values) == 1 and values[0] == '':
             return []
 
         strippable_chars = ' ' + parser_options.field_enclosing_value + parser_options.line_terminator
@@ -269,31 +891,559 @@ class LineParser:
 
         return values
 
-
-class FileParser:
-    """
-    Base class used for parsing files
-    """
-
-    def __init__(self, line_parser: LineParser, options: ParserOptions) -> None:
+    @staticmethod
+    def split_offsets(
+            string: str,
+            parser_options: ParserOptions,
+            max_values: Optional[int] = None) -> Optional[array]:
         """
-        :param line_parser: Line parser used to parse lines of an input file
-        :param options: Parser options
+        Splits an input string the same way as split does, but instead of creating strings of values
+        returns their offsets in the input string already adjusted for enclosing chars and trimmed whitespaces,
+        so strings are created only for values which are used afterwards
+        :param string: Input string
+        :param parser_options: Parser options
+        :param max_values: Optional maximal number of leading values to split (the rest of the string is ignored)
+        :return: Array of (start, end) offset pairs of values or None if a value isn't a slice of the input string
+                 (it contains enclosing chars in the middle, which are removed by split)
         """
 
-        self._logger: Logger = logging.getLogger(__name__)
-        self._line_parser = line_parser
-        self._options: ParserOptions = options
+        field_terminator = parser_options.field_terminator
+        enclosing_value = parser_options.field_enclosing_value
+        strippable_chars = ' ' + enclosing_value + parser_options.line_terminator
+        find = string.find
+        offsets = array('I')
+        values_count = 0
+        truncated = False
+        last_value = False
+        first_value_empty = False
+
+        line_start = len(string) - len(string.lstrip(parser_options.line_terminator))
+        line_end = max(len(string.rstrip(parser_options.line_terminator)), line_start)
+        # Lines without enclosing chars are split using str.find only
+        enclosed = bool(enclosing_value) and find(enclosing_value, line_start, line_end) >= 0
+        position = line_start
+
+        while True:
+            end = find(field_terminator, position, line_end)
+
+            # Field terminators between enclosing chars are a part of values
+            if enclosed:
+                enclosing_start = find(enclosing_value, position, line_end)
+
+                while enclosing_start >= 0 and (end < 0 or enclosing_start < end):
+                    enclosing_end = find(enclosing_value, enclosing_start + 1, line_end)
+
+                    if enclosing_end < 0:
+                        end = -1
+                        break
+
+                    end = find(field_terminator, enclosing_end + 1, line_end)
+                    enclosing_start = find(enclosing_value, enclosing_end + 1, line_end)
+
+            # The last value is split only when it isn't empty (enclosing chars are not a part of values)
+            if end < 0:
+                end = line_end
+                last_value = True
+
+                if end == position or (enclosed and end - position == string.count(enclosing_value, position, end)):
+                    break
+            elif values_count == 0:
+                first_value_empty = end == position or (
+                    enclosed and end - position == string.count(enclosing_value, position, end))
 
-    @property
-    def line_parser(self) -> LineParser:
-        """
-        Returns a line parser used by this parser
-        :return: Line parser
+            value_start = position
+            value_end = end
+
+            while value_start < value_end and string[value_start] in strippable_chars:
+                value_start += 1
+
+            while value_end > value_start and string[value_end - 1] in strippable_chars:
+                value_end -= 1
+
+            if enclosed and find(enclosing_value, value_start, value_end) >= 0:
+                return None
+
+            offsets.append(value_start)
+            offsets.append(value_end)
+            values_count += 1
+            position = end + 1
+
+            if last_value:
+                break
+
+            if max_values is not None and values_count >= max_values:
+                truncated = True
+                break
+
+        # In the case of an empty string return an empty list
+        if not truncated and values_count == 1 and first_value_empty:
+            return array('I')
+
+        return offsets
+
+    @staticmethod
+    def split_fields(string: str, parser_options: ParserOptions, max_values: Optional[int] = None) -> Sequence[str]:
+        """
+        Splits an input string into a list of values whose strings are created only when they are accessed.
+        Lines containing enclosing chars are split by split, because finding offsets of enclosed values
+        isn't faster than creating the values
+        :param string: Input string
+        :param parser_options: Parser options
+        :param max_values: Optional maximal number of leading values to split (the rest of the string is ignored)
+        :return: List of split values
+        """
+
+        offsets = None
+
+        if not parser_options.field_enclosing_value or parser_options.field_enclosing_value not in string:
+            offsets = LineParser.split_offsets(string, parser_options, max_values)
+
+        if offsets is None:
+            return LineParser.split(string, parser_options, max_values)
+
+        return SplitFields(string, offsets)
+
+
+class LineParserDispatcher(LineParser):
+    """
+    Line parser routing each line to recovery parsers able to handle it using cheap line features
+    (number of fields and empty-ness) instead of trying every parser of a chain one by one.
+    Routing tables are built lazily for every field count and reused afterwards
+    """
+
+    def __init__(
+            self,
+            line_parsers: Sequence[LineParser],
+            options: ParserOptions,
+            skip_incorrect_lines: bool = True,
+            next_line_parser: Optional[LineParser] = None) -> None:
+        """
+        :param line_parsers: List of line parsers in the order they should be tried.
+                             Please note that @next_line_parser of these parsers are not used by the dispatcher
+        :param options: Parsing options
+        :param skip_incorrect_lines: Boolean value denoting whether the dispatcher should skip lines which could not
+                                     be handled by any of the parsers or halt immediately
+        :param next_line_parser: Optional parser used in the case of none of the parsers were able to parse a line
+        """
+
+        value_parsers = line_parsers[0].value_parsers if line_parsers else []
+
+        super().__init__(value_parsers, options, skip_incorrect_lines, next_line_parser)
+
+        self._line_parsers: Sequence[LineParser] = line_parsers
+        # Lines are routed by _try_parse anyway, so they aren't routed in advance by can_parse
+        self._check_can_parse = next_line_parser is not None
+        self._routes: Dict[int, List[LineParser]] = {}
+        self._last_line_parser: Optional[LineParser] = None
+
+    @property
+    def line_parsers(self) -> Sequence[LineParser]:
+        """
+        Returns the list of line parsers used by this dispatcher
+        :return: List of line parsers
+        """
+
+        return self._line_parsers
+
+    @property
+    def field_counts(self) -> Optional[FrozenSet[int]]:
+        field_counts: FrozenSet[int] = frozenset()
+
+        for line_parser in self._line_parsers:
+            line_parser_field_counts = line_parser.field_counts
+
+            if line_parser_field_counts is None:
+                return None
+
+            field_counts |= line_parser_field_counts
+
+        return field_counts
+
+    def route(self, line: Line, values: Sequence[str]) -> List[LineParser]:
+        """
+        Returns the list of parsers which might be able to handle a line
+        :param line: Line object containing a line to parse
+        :param values: List of values split from the line
+        :return: List of candidate parsers
+        """
+
+        field_count = len(values)
+
+        # Lines consisting of whitespaces only are routed as empty lines
+        if field_count == 1 and not values[0]:
+            field_count = 0
+
+        candidates = self._routes.get(field_count)
+
+        if candidates is None:
+            candidates = [
+                line_parser
+                for line_parser in self._line_parsers
+                if line_parser.field_counts is None or field_count in line_parser.field_counts  # type: ignore
+            ]
+            self._routes[field_count] = candidates
+
+        return candidates
+
+    def can_parse(self, line: Line, values: Sequence[str]) -> bool:
+        return bool(self.route(line, values))
+
+    def _dispatch(self, line: Line, values: Sequence[str]) -> Tuple[Optional[List[Any]], Optional[LineParser], int]:
+        """
+        Tries candidate parsers one by one until one of them parses a line
+        :param line: Line object containing a line to parse
+        :param values: List of values split from the line
+        :return: 3-tuple containing parsed values (or None), the parser which parsed the line (or None) and
+                 the number of parsers tried
+        """
+
+        self._last_error = None
+        self._last_line_parser = None
+        attempts = 0
+
+        for line_parser in self.route(line, values):
+            if not line_parser.can_parse(line, values):
+                continue
+
+            attempts += 1
+            parsed_values = line_parser._try_parse(line, values)
+
+            if parsed_values is not None:
+                self._last_line_parser = line_parser
+
+                return parsed_values, line_parser, attempts
+
+            self._last_error = line_parser._error(line, values) if line_parser._raising_parse else None
+
+        return None, None, attempts
+
+    def _try_parse(self, line: Line, values: Sequence[str]) -> Optional[List[Any]]:
+        parsed_values, _, _ = self._dispatch(line, values)
+
+        return parsed_values
+
+    def parse(self, line: Line) -> ParsedLine:
+        parsed_line = super().parse(line)
+
+        # Lines parsed by any parser but the first one are considered to be recovered
+        if self._last_line_parser is not None and self._last_line_parser is not self._line_parsers[0]:
+            parsed_line.recovered = True
+
+        return parsed_line
+
+
+@dataclass(frozen=True)
+class LineParserStatistics:
+    """
+    Class used for storing statistics of a line parser used by an adaptive dispatcher
+    """
+
+    line_parser: LineParser
+    position: int
+    hits: int
+    window_hits: int
+
+
+class AdaptiveLineParserDispatcher(LineParserDispatcher):
+    """
+    Line parser dispatcher counting hits of every parser over a sliding window of the last lines and
+    periodically moving the most successful parsers to the front of the routing tables.
+    The order changes only every @window_size lines and depends only on the lines parsed before,
+    so parsing the same file always gives the same results.
+    Please note that reordering can change the result of a line only when several parsers are able to parse it
+    or parsers have side effects (e.g. read next lines), so such parsers should be kept in LineParserDispatcher
+    """
+
+    DEFAULT_WINDOW_SIZE: int = 1000
+
+    def __init__(
+            self,
+            line_parsers: Sequence[LineParser],
+            options: ParserOptions,
+            skip_incorrect_lines: bool = True,
+            next_line_parser: Optional[LineParser] = None,
+            window_size: int = DEFAULT_WINDOW_SIZE) -> None:
+        """
+        :param line_parsers: List of line parsers in the initial order
+        :param options: Parsing options
+        :param skip_incorrect_lines: Boolean value denoting whether the dispatcher should skip lines which could not
+                                     be handled by any of the parsers or halt immediately
+        :param next_line_parser: Optional parser used in the case of none of the parsers were able to parse a line
+        :param window_size: Number of the last lines used to compute success rates of parsers
+        """
+
+        super().__init__(line_parsers, options, skip_incorrect_lines, next_line_parser)
+
+        self._window_size: int = window_size
+        self._window: Deque[int] = deque()
+        self._positions: Dict[int, int] = {
+            id(line_parser): position for position, line_parser in enumerate(line_parsers)
+        }
+        self._hits: List[int] = [0] * len(line_parsers)
+        self._window_hits: List[int] = [0] * len(line_parsers)
+        self._lines: int = 0
+        self._misses: int = 0
+        self._attempts: int = 0
+
+    @property
+    def lines(self) -> int:
+        """
+        Returns the number of lines passed to the dispatcher
+        :return: Number of lines
+        """
+
+        return self._lines
+
+    @property
+    def misses(self) -> int:
+        """
+        Returns the number of lines which could not be parsed by any of the parsers
+        :return: Number of lines
+        """
+
+        return self._misses
+
+    @property
+    def attempts(self) -> int:
+        """
+        Returns the total number of parsing attempts, i.e. the number of times parsers were called
+        :return: Number of parsing attempts
+        """
+
+        return self._attempts
+
+    @property
+    def statistics(self) -> List[LineParserStatistics]:
+        """
+        Returns statistics of parsers ordered by their current success rate
+        :return: List of parsers' statistics
+        """
+
+        return [
+            LineParserStatistics(
+                line_parser=self._line_parsers[position],
+                position=position,
+                hits=self._hits[position],
+                window_hits=self._window_hits[position]
+            )
+            for position in sorted(range(len(self._line_parsers)), key=self._rank)
+        ]
+
+    def _rank(self, position: int) -> Tuple[int, int]:
+        # Ties are resolved using the initial order
+        return -self._window_hits[position], position
+
+    def _reorder(self) -> None:
+        for candidates in self._routes.values():
+            candidates.sort(key=lambda line_parser: self._rank(self._positions[id(line_parser)]))
+
+    def _try_parse(self, line: Line, values: Sequence[str]) -> Optional[List[Any]]:
+        parsed_values, line_parser, attempts = self._dispatch(line, values)
+        position = self._positions[id(line_parser)] if line_parser is not None else -1
+
+        self._lines += 1
+        self._attempts += attempts
+
+        if position < 0:
+            self._misses += 1
+        else:
+            self._hits[position] += 1
+            self._window_hits[position] += 1
+
+        self._window.append(position)
+
+        if len(self._window) > self._window_size:
+            expired_position = self._window.popleft()
+
+            if expired_position >= 0:
+                self._window_hits[expired_position] -= 1
+
+        if self._lines % self._window_size == 0:
+            self._reorder()
+
+        return parsed_values
+
+
+def resolve_projection(
+        column_names: Sequence[str],
+        options: ParserOptions,
+        columns_count: Optional[int] = None) -> Optional[List[int]]:
+    """
+    Resolves positions of columns selected by columns and exclude_columns parsing options
+    :param column_names: Column names split from the last header line (columns are also selected by 0-based positions)
+    :param options: Parser options
+    :param columns_count: Optional number of columns used when there are no column names (e.g. the number of values
+                          of the first data line)
+    :return: List of positions of projected columns in the selection order or None if all columns are parsed
+    """
+
+    if not options.columns and not options.exclude_columns:
+        return None
+
+    if column_names:
+        columns_count = len(column_names)
+
+    def find(column: str) -> int:
+        if column in column_names:
+            return column_names.index(column)
+
+        if column.isdigit() and (columns_count is None or int(column) < columns_count):
+            return int(column)
+
+        raise ValueError(f'Column {column} does not exist')
+
+    if options.columns:
+        projection = [find(column) for column in options.columns]
+    elif columns_count is not None:
+        projection = list(range(columns_count))
+    else:
+        raise ValueError('Columns can be excluded only when the number of columns is known')
+
+    excluded_positions = {find(column) for column in options.exclude_columns or ()}
+    projection = [position for position in projection if position not in excluded_positions]
+
+    if not projection:
+        raise ValueError('No columns are selected')
+
+    return projection
+
+
+class FileParser:
+    """
+    Base class used for parsing files
+    """
+
+    # Maximum number of random offsets drawn per sampled line when sampling without a line index
+    SAMPLE_ATTEMPTS_PER_LINE: int = 10
+
+    def __init__(self, line_parser: LineParser, options: ParserOptions) -> None:
+        """
+        :param line_parser: Line parser used to parse lines of an input file
+        :param options: Parser options
+        """
+
+        self._logger: Logger = logging.getLogger(__name__)
+        self._line_parser = line_parser
+        self._options: ParserOptions = options
+        self._row_filter: Optional[RowFilter] = RowFilter(options.row_filter) if options.row_filter else None
+
+    @property
+    def line_parser(self) -> LineParser:
+        """
+        Returns a line parser used by this parser
+        :return: Line parser
         """
 
         return self._line_parser
 
+    @property
+    def options(self) -> ParserOptions:
+        """
+        Returns parser options used by this parser
+        :return: Parser options
+        """
+
+        return self._options
+
+    def projection(self, input_file_path: str) -> Optional[List[int]]:
+        """
+        Returns positions of columns selected by parser options using the last header line of an input file
+        (or the first data line if the file has no header)
+        :param input_file_path: String containing path to the input file
+        :return: List of positions of projected columns or None if all columns are parsed
+        """
+
+        if not self._options.columns and not self._options.exclude_columns:
+            return None
+
+        column_names, columns_count = self._read_columns(input_file_path)
+
+        return resolve_projection(column_names, self._options, columns_count)
+
+    def _read_columns(self, input_file_path: str) -> Tuple[List[str], int]:
+        """
+        Reads column names from the last header line of an input file
+        :return: 2-tuple containing column names and the number of values of the first data line
+        """
+
+        column_names: List[str] = []
+        # Oversized lines are rejected by parsing, so their beginnings are enough here
+        input_file = TextReader.create(input_file_path, self._options.encoding, self._options.max_record_size)
+
+        with input_file:
+            for _ in range(self._options.header_lines):
+                header_line = input_file.read_line()
+
+                if header_line:
+                    column_names = LineParser.split(header_line, self._options)
+
+            first_line = input_file.read_line()
+
+        return column_names, len(LineParser.split(first_line, self._options))
+
+    @staticmethod
+    def _split_raw_fields(string: str, options: ParserOptions) -> List[str]:
+        """
+        Splits a line into raw fields keeping enclosing chars and whitespaces, so they can be joined back
+        :param string: Line without its line terminator
+        :param options: Parser options
+        :return: List of raw fields
+        """
+
+        field_terminator = options.field_terminator
+        enclosing_value = options.field_enclosing_value
+        fields = []
+        enclosed = False
+        field_start = 0
+        position = 0
+
+        while position < len(string):
+            if enclosing_value and string.startswith(enclosing_value, position):
+                # Doubled enclosing chars inside of enclosed values switch the state twice
+                enclosed = not enclosed
+                position += len(enclosing_value)
+            elif not enclosed and string.startswith(field_terminator, position):
+                fields.append(string[field_start:position])
+                position += len(field_terminator)
+                field_start = position
+            else:
+                position += 1
+
+        fields.append(string[field_start:])
+
+        return fields
+
+    def _project_header(self, input_line: Line, projection: List[int]) -> Line:
+        line = input_line.line
+        content = line.rstrip('\n' + self._options.line_terminator)
+        fields = self._split_raw_fields(content, self._options)
+
+        # Header lines which aren't column names (e.g. a title) are kept as they are
+        if len(fields) <= max(projection) or len(LineParser.split(line, self._options)) <= max(projection):
+            return input_line
+
+        # Raw fields are sliced, so enclosing chars and the line terminator are kept
+        projected_line = self._options.field_terminator.join(fields[position] for position in projection)
+
+        return Line(input_line.file, input_line.index, True, projected_line + line[len(content):], input_line.offset)
+
+    def _project_values(self, parsed_line: ParsedLine, projection: List[int]) -> ParsedLine:
+        values = parsed_line.parsed_values
+
+        if values is None:
+            return parsed_line
+
+        if len(values) <= max(projection):
+            return ParsedLine(
+                parsed_line,
+                error=ParsingError(
+                    f'Line # {parsed_line.index}: {parsed_line.line}. '
+                    f'Expected at least {max(projection) + 1} values, got {len(values)}'))
+
+        parsed_line.parsed_values = [values[position] for position in projection]
+
+        return parsed_line
+
     def parse(self, input_file_path: str) -> Iterator[ParsedLine]:
         """
         Parses an input file and returns an iterable sequence of parsed lines
@@ -301,30 +1451,350 @@ class FileParser:
         :return: Iterator of parsed lines
         """
 
-        self._logger.info(f'Started parsing file "{input_file_path}"')
+        return self._parse(input_file_path, self._read_lines)
 
-        with TextReader.create(input_file_path) as input_file:
-            while True:
-                input_line = input_file.read_line()
+    def parse_range(self, input_file_path: str, start_offset: int, end_offset: int) -> Iterator[ParsedLine]:
+        """
+        Parses data lines starting within a byte range of an input file.
+        The range is realigned on the next line start, and lines are treated as data lines,
+        so the range should start after header lines. It's used for parsing a file in parallel
+        :param input_file_path: String containing path to the input file
+        :param start_offset: Byte offset of the range start
+        :param end_offset: Byte offset of the range end
+        :return: Iterator of parsed lines
+        """
 
-                if not input_line:
-                    break
+        # Ranges are parsed by worker processes which would interleave their progress reports
+        return self._parse(
+            input_file_path,
+            lambda input_file: self._read_range(input_file, start_offset, end_offset),
+            progress=NONE)
 
-                if input_file.current_line_index % 1000 == 0:
-                    self._logger.info(f'Parsed {input_file.current_line_index} lines')
+    def parse_incremental(
+            self,
+            input_file_path: str,
+            state: Optional[IncrementalState] = None) -> Iterator[ParsedLine]:
+        """
+        Parses lines of an append-only file which haven't been processed yet.
+        The file is parsed up to the end of the last terminated line (an incomplete last line is left for
+        the next run). When a state is passed, parsing starts at its offset and header lines are not read
+        :param input_file_path: String containing path to the input file
+        :param state: Optional state of the previous run (the file is parsed from the beginning if it's missing)
+        :return: Iterator of parsed lines
+        """
+
+        with open(input_file_path, 'rb') as binary_file:
+            end_offset = find_last_line_end(binary_file)
+
+        return self._parse(
+            input_file_path,
+            lambda input_file: self._read_incremental(input_file, state, end_offset))
+
+    def _parse(
+            self,
+            input_file_path: str,
+            read_lines: Callable[[TextReader], Iterator[Line]],
+            progress: Optional[str] = None) -> Iterator[ParsedLine]:
+        self._logger.info(f'Started parsing file "{input_file_path}"')
 
-                header = input_file.current_line_index + 1 <= self._options.header_lines
-                input_line = Line(file=input_file, index=input_file.current_line_index, header=header, line=input_line)
+        progress_reporter = ProgressReporter(
+            os.path.getsize(input_file_path),
+            progress or self._options.progress,
+            self._options.progress_interval)
+        lines_count = 0
+
+        # Rows are filtered using raw fields, so lines which don't match aren't parsed at all
+        row_filter: Optional[Callable[[Sequence[str]], bool]] = None
+        filter_values_count = 0
+        filtered_lines_count = 0
+
+        if self._row_filter is not None:
+            row_filter, filter_values_count = self._row_filter.bind(*self._read_columns(input_file_path))
+
+        # Parsers which don't support projection parse all columns, and their values are projected afterwards
+        projection = self.projection(input_file_path)
+        project_values = projection is not None and not self._line_parser.supports_projection
+
+        if self._line_parser.supports_projection:
+            self._line_parser.set_projection(projection)
+
+        reject_sink = RejectSink.create(
+            self._options.reject_file_path,
+            self._options.error_summary_interval,
+            self._options.error_sample_size)
+
+        oversized_lines_count = 0
+        input_file = TextReader.create(input_file_path, self._options.encoding, self._options.max_record_size)
+
+        with input_file, reject_sink:
+            for input_line in read_lines(input_file):
+                lines_count += 1
+
+                # Lines are read lazily, so the rest of an oversized line is streamed before the next one is read
+                if input_file.truncated:
+                    oversized_lines_count += 1
+                    reject_sink.reject_oversized(
+                        input_line.index,
+                        input_line.offset,
+                        input_line.line,
+                        input_file.read_remainder(),
+                        RecordTooLargeError(
+                            f'Line # {input_line.index} exceeds the maximum record size '
+                            f'of {self._options.max_record_size} bytes'))
+                    progress_reporter.update(lines_count, input_file.position)
 
-                if header:
-                    parsed_line = ParsedLine(input_line)
+                    continue
+
+                progress_reporter.update(lines_count, input_file.position)
+
+                if input_line.header:
+                    parsed_line = ParsedLine(
+                        self._project_header(input_line, projection) if projection is not None else input_line)
                 else:
-                    parsed_line = self._line_parser.parse(input_line)
+                    if row_filter is not None:
+                        fields = LineParser.split_fields(input_line.line, self._options, filter_values_count)
+
+                        # Lines missing filtered fields are left to the line parser which rejects them
+                        if len(fields) >= filter_values_count and not row_filter(fields):
+                            filtered_lines_count += 1
+                            continue
+
+                    try:
+                        parsed_line = self._line_parser.parse(input_line)
+                    except Exception as exception:
+                        reject_sink.reject(input_line.index, input_line.offset, input_line.line, exception)
+                        raise
+
+                    if project_values and projection is not None:
+                        parsed_line = self._project_values(parsed_line, projection)
+
+                    if parsed_line.error is not None:
+                        reject_sink.reject(input_line.index, input_line.offset, input_line.line, parsed_line.error)
 
                 yield parsed_line
 
+                # Errors of lazily parsed values are known only after the line has been consumed
+                if isinstance(parsed_line, LazyParsedLine):
+                    if self._options.strict_lazy_parsing:
+                        parsed_line.validate()
+
+                    if parsed_line.error is not None:
+                        reject_sink.reject(input_line.index, input_line.offset, input_line.line, parsed_line.error)
+
+            progress_reporter.finish(lines_count, input_file.position)
+
+        if filtered_lines_count:
+            self._logger.info(f'Filtered out {filtered_lines_count} lines of "{input_file_path}"')
+
+        if oversized_lines_count:
+            self._logger.warning(
+                f'Rejected {oversized_lines_count} lines of "{input_file_path}" exceeding the maximum record size '
+                f'of {self._options.max_record_size} bytes')
+
         self._logger.info(f'Finished parsing file "{input_file_path}"')
 
+    def _read_range(self, input_file: TextReader, start_offset: int, end_offset: int) -> Iterator[Line]:
+        with open(input_file.file_path, 'rb') as binary_file:
+            line_start = find_line_start(binary_file, start_offset)
+
+        input_file.seek(line_start, 0 if line_start == 0 else None)
+
+        # Lines starting before the range end are parsed completely even if they cross it
+        while input_file.position < end_offset:
+            input_line = self._read_line(input_file)
+
+            if input_line is None:
+                return
+
+            yield input_line
+
+    def _read_incremental(
+            self,
+            input_file: TextReader,
+            state: Optional[IncrementalState],
+            end_offset: int) -> Iterator[Line]:
+        if state is None:
+            for _ in range(self._options.header_lines):
+                if input_file.position >= end_offset:
+                    return
+
+                input_line = self._read_line(input_file, header=True)
+
+                if input_line is None:
+                    return
+
+                yield input_line
+        else:
+            input_file.seek(state.offset, state.line_index)
+
+        while input_file.position < end_offset:
+            input_line = self._read_line(input_file)
+
+            if input_line is None:
+                return
+
+            yield input_line
+
+    @staticmethod
+    def _read_line(input_file: TextReader, header: bool = False) -> Optional[Line]:
+        input_line = input_file.read_line()
+
+        if not input_line:
+            return None
+
+        return Line(
+            file=input_file,
+            index=input_file.current_line_index,
+            header=header,
+            line=input_line,
+            offset=input_file.current_line_offset)
+
+    def _read_lines(self, input_file: TextReader) -> Iterator[Line]:
+        """
+        Reads header lines and then data lines selected by head, tail and sample options.
+        Please note that data lines are read lazily: the next line is read only after the previous one has been parsed
+        :param input_file: Input file
+        :return: Iterator of lines
+        """
+
+        # Header lines are always read from the beginning of the file
+        for _ in range(self._options.header_lines):
+            input_line = self._read_line(input_file, header=True)
+
+            if input_line is None:
+                return
+
+            yield input_line
+
+        if self._options.tail is not None:
+            data_lines = self._read_tail(input_file, self._options.tail)
+        elif self._options.sample is not None:
+            data_lines = self._read_sample(input_file, self._options.sample)
+        else:
+            data_lines = self._read_all(input_file)
+
+        for data_lines_count, input_line in enumerate(data_lines):
+            if self._options.head is not None and data_lines_count >= self._options.head:
+                return
+
+            yield input_line
+
+    def _read_all(self, input_file: TextReader) -> Iterator[Line]:
+        while True:
+            input_line = self._read_line(input_file)
+
+            if input_line is None:
+                return
+
+            yield input_line
+
+    def _read_tail(self, input_file: TextReader, tail: int) -> Iterator[Line]:
+        """
+        Reads the last @tail lines seeking directly to them using the line index (if it exists) or
+        scanning the file backwards from its end
+        """
+
+        first_data_line_index = input_file.current_line_index + 1
+        line_index = LineIndex.load(input_file.file_path)
+
+        if line_index:
+            first_line_index = max(line_index.lines_count - tail, first_data_line_index)
+
+            if first_line_index >= line_index.lines_count:
+                return
+
+            self._seek_line(input_file, line_index, first_line_index)
+        else:
+            with open(input_file.file_path, 'rb') as binary_file:
+                offset = find_tail_offset(binary_file, tail, input_file.position)
+
+            input_file.seek(offset)
+
+        yield from self._read_all(input_file)
+
+    @staticmethod
+    def _seek_line(input_file: TextReader, line_index: LineIndex, target_line_index: int) -> None:
+        # Lines close to the current one are reached by reading forward instead of seeking
+        distance = target_line_index - input_file.current_line_index
+
+        if input_file.current_line_index < 0 or not 0 < distance <= line_index.step:
+            offset, checkpoint_line_index = line_index.locate(target_line_index)
+            input_file.seek(offset, checkpoint_line_index)
+
+        while input_file.current_line_index + 1 < target_line_index:
+            input_file.read_line()
+
+    @staticmethod
+    def _get_sample_size(sample: float, population_size: int) -> int:
+        # Values less than one are treated as rates, other values as numbers of lines
+        sample_size = round(sample * population_size) if sample < 1 else int(sample)
+
+        return min(sample_size, population_size)
+
+    def _read_sample(self, input_file: TextReader, sample: float) -> Iterator[Line]:
+        """
+        Reads a random sample of lines seeking directly to them.
+        When the line index exists lines are sampled uniformly, otherwise random byte offsets are realigned
+        on the next line start (so lines following long lines are more likely to be sampled).
+        Offsets falling into an already sampled line are drawn again, but the number of attempts is limited,
+        so a sample of a file whose size was overestimated may be smaller (it's reported in the log)
+        """
+
+        random_generator = random.Random(self._options.sample_seed)
+        first_data_line_index = input_file.current_line_index + 1
+        line_index = LineIndex.load(input_file.file_path)
+
+        if line_index:
+            population = range(first_data_line_index, line_index.lines_count)
+            sample_size = self._get_sample_size(sample, len(population))
+
+            for target_line_index in sorted(random_generator.sample(population, sample_size)):
+                # The line has already been consumed by a parser reading multi-line records
+                if target_line_index <= input_file.current_line_index:
+                    continue
+
+                self._seek_line(input_file, line_index, target_line_index)
+                input_line = self._read_line(input_file)
+
+                if input_line is not None:
+                    yield input_line
+
+            return
+
+        data_offset = input_file.position
+        file_size = os.path.getsize(input_file.file_path)
+
+        with open(input_file.file_path, 'rb') as binary_file:
+            population_size = estimate_lines_count(binary_file, data_offset, file_size)
+            sample_size = self._get_sample_size(sample, population_size)
+            line_starts: Set[int] = set()
+
+            for _ in range(sample_size * self.SAMPLE_ATTEMPTS_PER_LINE):
+                if len(line_starts) >= sample_size:
+                    break
+
+                line_start = find_line_start(binary_file, random_generator.randrange(data_offset, file_size))
+
+                # There are no more lines after the offset
+                if line_start < file_size:
+                    line_starts.add(line_start)
+
+            if len(line_starts) < sample_size:
+                self._logger.warning(
+                    f'Sampled {len(line_starts)} lines of "{input_file.file_path}" instead of {sample_size}, '
+                    f'build a line index to sample lines exactly')
+
+            for line_start in sorted(line_starts):
+                # The line has already been consumed by a parser reading multi-line records
+                if line_start < input_file.position:
+                    continue
+
+                input_file.seek(line_start)
+                input_line = self._read_line(input_file)
+
+                if input_line is not None:
+                    yield input_line
+
 
 class FileParserFactory:
     """
@@ -344,24 +1814,32 @@ class FileParserFactory:
 
         self._logger.info(f'Started creating a file parser for "{input_file_path}"')
 
-        with TextReader.create(input_file_path) as input_file_reader:
+        with TextReader.create(input_file_path, options.encoding, options.max_record_size) as input_file_reader:
+            column_names: List[str] = []
+
             for _ in range(options.header_lines):
-                input_file_reader.read_line()
+                header_line = input_file_reader.read_line()
+
+                if header_line:
+                    column_names = LineParser.split(header_line, options)
 
             value_parsers: List[ValueParser] = []
             first_line = input_file_reader.read_line()
             values = LineParser.split(first_line, options)
+            projection = resolve_projection(column_names, options, len(values))
             number_parser = NumberParser()
             string_parser = StringParser()
+            echo_parser = EchoValueParser()
 
-            for value in values:
+            for position, value in enumerate(values):
                 value = value.strip(' ' + options.field_enclosing_value)
 
-                try:
-                    number_parser.parse(value)
+                # Only projected columns are sniffed, skipped columns get parsers which are never called
+                if projection is not None and position not in projection:
+                    value_parsers.append(echo_parser)
+                elif number_parser.try_parse(value) is not None:
                     value_parsers.append(number_parser)
-                    continue
-                except Exception:
+                else:
                     value_parsers.append(string_parser)
 
             if not value_parsers:
@@ -0,0 +1,265 @@
+import json
+import locale
+import os
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import IO, Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from csv_import.csv.parsers import LineParser, ParserOptions
+from csv_import.csv.processors import LineProcessor
+from csv_import.csv.sinks import OutputSink
+
+HASH: str = 'hash'
+ROWS: str = 'rows'
+BYTES: str = 'bytes'
+
+MANIFEST_FILE_SUFFIX: str = '.manifest.json'
+
+
+@dataclass(frozen=True)
+class PartitionOptions:
+    """
+    Class used for storing options of partitioned output
+    """
+
+    # Partitioning mode: by a hash of key columns, by the number of rows or by the size in bytes
+    mode: str = HASH
+    # Number of partitions (used only by hash mode)
+    partitions_count: int = 4
+    # Maximum number of rows or bytes in a partition (used only by rows and bytes modes)
+    partition_size: int = 1000000
+    # Names (or 0-based positions) of key columns hashed by hash mode, all values are hashed if not set
+    key_columns: Optional[Tuple[str, ...]] = None
+    # Boolean value indicating whether header lines are written into every partition or only into the first one
+    repeat_header: bool = True
+    max_open_files: int = 64
+    buffer_size: int = 1024 * 1024
+
+
+@dataclass
+class _Partition:
+    """
+    Class used for buffering lines of a single partition
+    """
+
+    index: int
+    file_path: str
+    rows: int = 0
+    size: int = 0
+    data_offset: int = 0
+    created: bool = False
+    buffer: List[bytes] = field(default_factory=list)
+    buffer_size: int = 0
+
+    def append(self, data: bytes) -> None:
+        self.buffer.append(data)
+        self.buffer_size += len(data)
+        self.size += len(data)
+        self.rows += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'file': os.path.basename(self.file_path),
+            'rows': self.rows,
+            'size': self.size,
+            # Data lines occupy bytes [data_offset, size) of the partition file, the rest are header lines
+            'data_offset': self.data_offset
+        }
+
+
+class PartitionedSink(OutputSink):
+    """
+    Output sink splitting output lines into several files which can be loaded in parallel:
+      - by a hash of key columns into a fixed number of partitions,
+      - by the number of rows or by the size in bytes into consecutive partitions.
+    Lines of every partition are buffered, and the number of simultaneously open files is limited
+    (the least recently used files are closed and reopened later in the append mode).
+    A manifest containing the number of rows and the size of every partition is written next to partitions
+    """
+
+    def __init__(
+            self,
+            output_file_path: str,
+            partition_options: PartitionOptions = PartitionOptions(),
+            options: ParserOptions = ParserOptions(),
+            format_values: Optional[Callable[[Sequence[str]], str]] = None,
+            format_header: Optional[Callable[[str], Optional[str]]] = None) -> None:
+        """
+        :param output_file_path: Output file path (partitions are named after it, e.g. output.00001.csv)
+        :param partition_options: Partition options
+        :param options: Parser options used to split the header line and to format values
+        :param format_values: Optional function formatting processed values (by default they are formatted
+                              in the same way as by LineProcessor)
+        :param format_header: Optional function formatting header lines, it returns None for output dialects
+                              without header lines (by default header lines are written as they are)
+        """
+
+        if partition_options.mode not in (HASH, ROWS, BYTES):
+            raise ValueError(f'Unsupported partitioning mode "{partition_options.mode}"')
+
+        self._output_file_path: str = output_file_path
+        self._partition_options: PartitionOptions = partition_options
+        self._options: ParserOptions = options
+        self._format_values: Callable[[Sequence[str]], str] = \
+            format_values or LineProcessor([], options).format_values
+        self._format_header: Optional[Callable[[str], Optional[str]]] = format_header
+        self._encoding: str = options.encoding or locale.getpreferredencoding(False)
+        self._header: bytes = b''
+        self._column_names: List[str] = []
+        self._key_positions: Optional[List[int]] = None
+        self._partitions: List[_Partition] = []
+        self._open_files: 'OrderedDict[int, IO[bytes]]' = OrderedDict()
+
+    @property
+    def manifest_file_path(self) -> str:
+        """
+        Returns the path to the manifest file
+        :return: Path to the manifest file
+        """
+
+        return os.path.splitext(self._output_file_path)[0] + MANIFEST_FILE_SUFFIX
+
+    def partition_file_path(self, index: int) -> str:
+        """
+        Returns the path to a partition file
+        :param index: Index of the partition
+        :return: Path to the partition file
+        """
+
+        root, extension = os.path.splitext(self._output_file_path)
+
+        return f'{root}.{index:05d}{extension}'
+
+    def _encode(self, line: str) -> bytes:
+        if not line.endswith('\n'):
+            line += '\n'
+
+        return line.encode(self._encoding)
+
+    def write_header(self, line: str) -> None:
+        formatted_line = self._format_header(line) if self._format_header is not None else line
+
+        if formatted_line is not None:
+            self._header += self._encode(formatted_line)
+
+        self._column_names = LineParser.split(line, self._options)
+        self._key_positions = None
+
+    def _create_partition(self) -> _Partition:
+        index = len(self._partitions)
+        header = self._header if index == 0 or self._partition_options.repeat_header else b''
+        partition = _Partition(index, self.partition_file_path(index), size=len(header), data_offset=len(header))
+
+        if header:
+            partition.buffer.append(header)
+            partition.buffer_size = len(header)
+
+        self._partitions.append(partition)
+
+        return partition
+
+    def _create_partitions(self) -> None:
+        # All partitions of hash mode are created at once, other modes create partitions when they get full
+        partitions_count = self._partition_options.partitions_count if self._partition_options.mode == HASH else 1
+
+        for _ in range(partitions_count):
+            self._create_partition()
+
+    def _get_key_positions(self, values_count: int) -> List[int]:
+        if self._key_positions is None:
+            if not self._partition_options.key_columns:
+                self._key_positions = list(range(values_count))
+            else:
+                self._key_positions = []
+
+                for key_column in self._partition_options.key_columns:
+                    if key_column in self._column_names:
+                        self._key_positions.append(self._column_names.index(key_column))
+                    elif key_column.isdigit():
+                        self._key_positions.append(int(key_column))
+                    else:
+                        raise ValueError(f'Key column {key_column} does not exist')
+
+        return self._key_positions
+
+    def _get_partition(self, values: Sequence[str], data: bytes) -> _Partition:
+        if not self._partitions:
+            self._create_partitions()
+
+        if self._partition_options.mode == HASH:
+            key = '\x1f'.join(str(values[position]) for position in self._get_key_positions(len(values)))
+
+            # CRC32 is used instead of the built-in hash to get the same partitions in every run
+            return self._partitions[zlib.crc32(key.encode(self._encoding)) % len(self._partitions)]
+
+        partition = self._partitions[-1]
+
+        if self._partition_options.mode == ROWS:
+            full = partition.rows >= self._partition_options.partition_size
+        else:
+            full = partition.rows > 0 and partition.size + len(data) > self._partition_options.partition_size
+
+        if full:
+            self._flush(partition)
+            self._close_file(partition.index)
+            partition = self._create_partition()
+
+        return partition
+
+    def write_values(self, values: Sequence[Any]) -> None:
+        data = self._encode(self._format_values(values))
+        partition = self._get_partition(values, data)
+        partition.append(data)
+
+        if partition.buffer_size >= self._partition_options.buffer_size:
+            self._flush(partition)
+
+    def _close_file(self, index: int) -> None:
+        output_file = self._open_files.pop(index, None)
+
+        if output_file is not None:
+            output_file.close()
+
+    def _get_file(self, partition: _Partition) -> IO[bytes]:
+        output_file = self._open_files.get(partition.index)
+
+        if output_file is not None:
+            self._open_files.move_to_end(partition.index)
+
+            return output_file
+
+        if len(self._open_files) >= self._partition_options.max_open_files:
+            self._close_file(next(iter(self._open_files)))
+
+        output_file = open(partition.file_path, 'ab' if partition.created else 'wb')
+        partition.created = True
+        self._open_files[partition.index] = output_file
+
+        return output_file
+
+    def _flush(self, partition: _Partition) -> None:
+        # Partitions which are still empty are created to have files for all partitions in the manifest
+        if not partition.buffer and partition.created:
+            return
+
+        self._get_file(partition).write(b''.join(partition.buffer))
+        partition.buffer = []
+        partition.buffer_size = 0
+
+    def close(self) -> None:
+        # Files without data lines still get partitions containing header lines
+        if not self._partitions:
+            self._create_partitions()
+
+        for partition in self._partitions:
+            self._flush(partition)
+            self._close_file(partition.index)
+
+        manifest: Dict[str, Any] = {
+            'mode': self._partition_options.mode,
+            'partitions': [partition.to_dict() for partition in self._partitions]
+        }
+
+        with open(self.manifest_file_path, 'w') as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
@@ -1,10 +1,21 @@
+import json
 import logging
+import re
 from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
 from logging import Logger
-from typing import List, Optional, Sequence
-
-from csv_import.csv.parsers import (FileParser, FileParserFactory, ParsedLine,
-                                    ParserOptions)
+from typing import (Any, Dict, Iterator, List, Optional, Pattern, Sequence,
+                    Tuple, Union)
+
+from csv_import.csv.cache import CacheOptions, ResultCache
+from csv_import.csv.dedup import (DeduplicationOptions,
+                                  DeduplicationStatistics, DuplicateFilter)
+from csv_import.csv.incremental import IncrementalState
+from csv_import.csv.lookup import LookupIndex, LookupOptions
+from csv_import.csv.parsers import (FileParser, FileParserFactory, LineParser,
+                                    ParsedLine, ParserOptions)
+from csv_import.csv.sinks import OutputSink
+from csv_import.csv.sort import ExternalSorter, SortOptions
 from csv_import.csv.text import TextWriter
 
 
@@ -18,10 +29,10 @@ class ValueProcessor(ABC):
     """
 
     @abstractmethod
-    def process(self, string: str) -> str:
+    def process(self, string: Any) -> Any:
         """
         Processes single value
-        :param string: Input value
+        :param string: Input value (a string or a typed value returned by a value parser)
         :return: Processed value
         """
 
@@ -33,10 +44,267 @@ class EchoValueProcessor(ValueProcessor):
     Dummy class which doesn't contain any additional logic and just returns input value as is
     """
 
-    def process(self, string: str) -> str:
+    def process(self, string: Any) -> Any:
         return string
 
 
+# Parser options which don't change outputs of processing (they are not a part of cache fingerprints)
+CACHE_IGNORED_OPTIONS: Tuple[str, ...] = (
+    'reject_file_path', 'error_summary_interval', 'error_sample_size', 'progress', 'progress_interval')
+
+ENCLOSED: str = 'enclosed'
+MINIMAL: str = 'minimal'
+TSV: str = 'tsv'
+NDJSON: str = 'ndjson'
+
+
+def format_value(value: Any) -> str:
+    """
+    Formats a single typed value (e.g. dates are formatted as YYYY-MM-DD)
+    :param value: Processed value
+    :return: Formatted value
+    """
+
+    return '' if value is None else str(value)
+
+
+@dataclass(frozen=True)
+class OutputOptions:
+    """
+    Class used for storing options of output lines
+    """
+
+    # Output dialect: every value enclosed (the default), values enclosed only when it's needed,
+    # TSV with escaped special chars or newline delimited JSON
+    dialect: str = ENCLOSED
+    # Field terminator and enclosing value of output lines (the input ones by default)
+    field_terminator: Optional[str] = None
+    field_enclosing_value: Optional[str] = None
+    # Char escaping enclosing values inside of enclosed values (enclosing values are doubled by default)
+    escape_char: Optional[str] = None
+
+
+class OutputFormatter(ABC):
+    """
+    Base class for formatters of output lines
+    """
+
+    @abstractmethod
+    def format_values(self, values: Sequence[Any]) -> str:
+        """
+        Formats processed values of a data line
+        :param values: List of processed values
+        :return: Formatted line
+        """
+
+        raise NotImplementedError()
+
+    def format_header(self, line: str) -> Optional[str]:
+        """
+        Formats a header line
+        :param line: Raw header line
+        :return: Formatted header line or None if the dialect doesn't have header lines
+        """
+
+        return line
+
+    @staticmethod
+    def create(output_options: OutputOptions, options: ParserOptions) -> 'OutputFormatter':
+        """
+        Creates a formatter of an output dialect
+        :param output_options: Output options
+        :param options: Parser options of the input file
+        :return: Output formatter
+        """
+
+        field_terminator = options.field_terminator if output_options.field_terminator is None else \
+            output_options.field_terminator
+        field_enclosing_value = options.field_enclosing_value if output_options.field_enclosing_value is None else \
+            output_options.field_enclosing_value
+
+        if output_options.dialect == ENCLOSED:
+            return EnclosedFormatter(field_terminator, field_enclosing_value, options)
+
+        if output_options.dialect == MINIMAL:
+            return MinimalQuotingFormatter(
+                field_terminator, field_enclosing_value or '"', output_options.escape_char, options)
+
+        if output_options.dialect == TSV:
+            return TsvFormatter(options)
+
+        if output_options.dialect == NDJSON:
+            return NdjsonFormatter(options)
+
+        raise ValueError(f'Unsupported output dialect "{output_options.dialect}"')
+
+
+class EnclosedFormatter(OutputFormatter):
+    """
+    Formatter enclosing every value (values are not escaped)
+    """
+
+    def __init__(self, field_terminator: str, field_enclosing_value: str, options: ParserOptions) -> None:
+        """
+        :param field_terminator: Output field terminator
+        :param field_enclosing_value: Output enclosing value
+        :param options: Parser options used to split header lines
+        """
+
+        self._field_enclosing_value: str = field_enclosing_value
+        self._separator: str = field_enclosing_value + field_terminator + field_enclosing_value
+        self._header_formatter: Optional[OutputFormatter] = None
+
+        # Header lines are written as they are unless the output format differs from the input one
+        if field_terminator != options.field_terminator or field_enclosing_value != options.field_enclosing_value:
+            self._header_formatter = _HeaderFormatter(self, options)
+
+    def format_values(self, values: Sequence[Any]) -> str:
+        if not values:
+            return ''
+
+        return self._field_enclosing_value + self._separator.join([
+            value if isinstance(value, str) else format_value(value) for value in values
+        ]) + self._field_enclosing_value
+
+    def format_header(self, line: str) -> Optional[str]:
+        if self._header_formatter is None:
+            return line
+
+        return self._header_formatter.format_header(line)
+
+
+class MinimalQuotingFormatter(OutputFormatter):
+    """
+    Formatter enclosing only values containing a field terminator, an enclosing value, an escape char or
+    a line break. Enclosing values inside of enclosed values are doubled or escaped with an escape char
+    """
+
+    def __init__(
+            self,
+            field_terminator: str,
+            field_enclosing_value: str,
+            escape_char: Optional[str],
+            options: ParserOptions) -> None:
+        """
+        :param field_terminator: Output field terminator
+        :param field_enclosing_value: Output enclosing value
+        :param escape_char: Optional char escaping enclosing values (they are doubled if it's not set)
+        :param options: Parser options used to split header lines
+        """
+
+        self._field_terminator: str = field_terminator
+        self._field_enclosing_value: str = field_enclosing_value
+        self._special_chars: Pattern[str] = re.compile(
+            '[' + re.escape(field_enclosing_value + '\r\n' + (escape_char or '')) + ']')
+        self._escapes: Dict[int, str] = {ord(field_enclosing_value): (escape_char or field_enclosing_value) +
+                                         field_enclosing_value}
+        self._header_formatter: OutputFormatter = _HeaderFormatter(self, options)
+
+        if escape_char:
+            self._escapes[ord(escape_char)] = escape_char + escape_char
+
+    def _format_value(self, value: str) -> str:
+        if self._field_terminator not in value and not self._special_chars.search(value):
+            return value
+
+        return self._field_enclosing_value + value.translate(self._escapes) + self._field_enclosing_value
+
+    def format_values(self, values: Sequence[Any]) -> str:
+        strings = [value if isinstance(value, str) else format_value(value) for value in values]
+        line = self._field_terminator.join(strings)
+
+        # Values are checked one by one only when the joined line contains special chars
+        if line.count(self._field_terminator) == max(len(strings) - 1, 0) and not self._special_chars.search(line):
+            return line
+
+        return self._field_terminator.join([self._format_value(string) for string in strings])
+
+    def format_header(self, line: str) -> Optional[str]:
+        return self._header_formatter.format_header(line)
+
+
+class TsvFormatter(OutputFormatter):
+    """
+    Formatter of tab separated values escaping backslashes, tabs and line breaks with backslashes
+    and writing None values as \\N (the text format of PostgreSQL COPY and MySQL LOAD DATA)
+    """
+
+    NULL: str = '\\N'
+    SPECIAL_CHARS: Pattern[str] = re.compile(r'[\\\n\r]')
+    ESCAPES: Dict[int, str] = {ord('\\'): '\\\\', ord('\t'): '\\t', ord('\n'): '\\n', ord('\r'): '\\r'}
+
+    def __init__(self, options: ParserOptions) -> None:
+        """
+        :param options: Parser options used to split header lines
+        """
+
+        self._header_formatter: OutputFormatter = _HeaderFormatter(self, options)
+
+    def format_values(self, values: Sequence[Any]) -> str:
+        strings = [value if isinstance(value, str) else format_value(value) for value in values]
+        line = '\t'.join(strings)
+
+        # Values are escaped one by one only when the joined line contains special chars
+        if line.count('\t') == max(len(strings) - 1, 0) and not self.SPECIAL_CHARS.search(line) and None not in values:
+            return line
+
+        return '\t'.join([
+            self.NULL if value is None else string.translate(self.ESCAPES) for value, string in zip(values, strings)
+        ])
+
+    def format_header(self, line: str) -> Optional[str]:
+        return self._header_formatter.format_header(line)
+
+
+class NdjsonFormatter(OutputFormatter):
+    """
+    Formatter writing every line as a JSON object keyed by column names of the last header line
+    (or as a JSON array if there are no header lines). Typed values are written as JSON numbers,
+    and values which can't be represented in JSON (e.g. dates) are written as strings
+    """
+
+    def __init__(self, options: ParserOptions) -> None:
+        """
+        :param options: Parser options used to split header lines
+        """
+
+        self._options: ParserOptions = options
+        self._column_names: Optional[List[str]] = None
+
+    def format_values(self, values: Sequence[Any]) -> str:
+        if self._column_names is not None and len(self._column_names) != len(values):
+            raise ProcessingError(f'Expected {len(self._column_names)} number of values (got {len(values)})')
+
+        document: Any = dict(zip(self._column_names, values)) if self._column_names is not None else list(values)
+
+        try:
+            return json.dumps(
+                document, ensure_ascii=False, allow_nan=False, separators=(',', ':'), default=format_value)
+        except ValueError as exception:
+            raise ProcessingError(f'Values {values} cannot be written as JSON: {exception}')
+
+    def format_header(self, line: str) -> Optional[str]:
+        self._column_names = LineParser.split(line, self._options)
+
+        return None
+
+
+class _HeaderFormatter(OutputFormatter):
+    """
+    Formatter of header lines formatting column names in the same way as values of data lines
+    """
+
+    def __init__(self, formatter: OutputFormatter, options: ParserOptions) -> None:
+        self._formatter: OutputFormatter = formatter
+        self._options: ParserOptions = options
+
+    def format_values(self, values: Sequence[Any]) -> str:
+        return self._formatter.format_values(values)
+
+    def format_header(self, line: str) -> Optional[str]:
+        return self.format_values(LineParser.split(line, self._options))
+
+
 class LineProcessor:
     """
     Base class for all line processors
@@ -46,17 +314,22 @@ class LineProcessor:
             self,
             value_processors: Sequence[ValueProcessor],
             options: ParserOptions,
-            skip_incorrect_lines: bool = True) -> None:
+            skip_incorrect_lines: bool = True,
+            formatter: Optional[OutputFormatter] = None) -> None:
         """
         :param value_processors: A list of single-value processors
         :param options: Parser options
         :param skip_incorrect_lines: Boolean value indicating whether processor needs to ignore incorrect lines
+        :param formatter: Optional formatter of output lines (by default every value is enclosed
+                          using the field terminator and the enclosing value of the input file)
         """
 
         self._logger: Logger = logging.getLogger(__name__)
         self._value_processors: Sequence[ValueProcessor] = value_processors
         self._options: ParserOptions = options
         self._skip_incorrect_lines: bool = skip_incorrect_lines
+        self._formatter: OutputFormatter = \
+            formatter or EnclosedFormatter(options.field_terminator, options.field_enclosing_value, options)
 
     @property
     def value_processors(self) -> Sequence[ValueProcessor]:
@@ -67,9 +340,12 @@ class LineProcessor:
 
         return self._value_processors
 
-    def process(self, line: ParsedLine) -> Optional[str]:
-        if line.header:
-            return line.line
+    def process_values(self, line: ParsedLine) -> Optional[List[Any]]:
+        """
+        Processes values of a data line without formatting them (typed values are passed to sinks as they are)
+        :param line: Parsed line
+        :return: List of processed values or None if the line has to be skipped
+        """
 
         parsed_values_length = len(line.parsed_values) if line.parsed_values else 0
 
@@ -80,22 +356,168 @@ class LineProcessor:
             raise ProcessingError(
                 f'Expected {len(self._value_processors)} number of values (got {parsed_values_length})')
 
-        processed_values: List[str] = []
+        processed_values: List[Any] = []
 
         for i in range(len(self._value_processors)):
             value = line.parsed_values[i]
             value_processor = self._value_processors[i]
             processed_value = value_processor.process(value)
-            processed_value = \
-                self._options.field_enclosing_value + \
-                processed_value + \
-                self._options.field_enclosing_value
 
             processed_values.append(processed_value)
 
-        processed_line = self._options.field_terminator.join(processed_values)
+        return processed_values
+
+    @property
+    def formatter(self) -> OutputFormatter:
+        """
+        Returns the formatter of output lines
+        :return: Output formatter
+        """
+
+        return self._formatter
+
+    def process_header(self, line: str) -> str:
+        """
+        Processes a header line before it's formatted (e.g. appends names of added columns).
+        Header lines are processed before values of data lines
+        :param line: Raw header line
+        :return: Processed raw header line
+        """
+
+        return line
+
+    def process(self, line: ParsedLine) -> Optional[str]:
+        if line.header:
+            return self.format_header(self.process_header(line.line))
+
+        processed_values = self.process_values(line)
+
+        if processed_values is None:
+            return None
+
+        return self.format_values(processed_values)
+
+    @staticmethod
+    def format_value(value: Any) -> str:
+        """
+        Formats a single typed value (e.g. dates are formatted as YYYY-MM-DD)
+        :param value: Processed value
+        :return: Formatted value
+        """
+
+        return format_value(value)
 
-        return processed_line
+    def format_values(self, processed_values: Sequence[Any]) -> str:
+        """
+        Formats processed values of a data line
+        :param processed_values: List of processed values
+        :return: Formatted line
+        """
+
+        return self._formatter.format_values(processed_values)
+
+    def format_header(self, line: str) -> Optional[str]:
+        """
+        Formats a header line
+        :param line: Raw header line
+        :return: Formatted header line or None if the output dialect doesn't have header lines
+        """
+
+        return self._formatter.format_header(line)
+
+
+class LookupLineProcessor(LineProcessor):
+    """
+    Line processor joining lines with a reference file: values of the key column are looked up in the index
+    of the reference file, and the found values are appended to lines (with their column names appended
+    to the last header line). Lines without a matching key get None values or are dropped by inner joins
+    """
+
+    def __init__(
+            self,
+            value_processors: Sequence[ValueProcessor],
+            options: ParserOptions,
+            lookup_index: LookupIndex,
+            skip_incorrect_lines: bool = True,
+            formatter: Optional[OutputFormatter] = None) -> None:
+        """
+        :param value_processors: A list of single-value processors
+        :param options: Parser options
+        :param lookup_index: Index of the reference file
+        :param skip_incorrect_lines: Boolean value indicating whether processor needs to ignore incorrect lines
+        :param formatter: Optional formatter of output lines
+        """
+
+        super().__init__(value_processors, options, skip_incorrect_lines, formatter)
+
+        self._lookup_index: LookupIndex = lookup_index
+        self._lookup_options: LookupOptions = lookup_index.options
+        self._header_lines: int = 0
+        self._key_position: Optional[int] = None
+        self._missing_values: List[Any] = [None] * len(lookup_index.value_names)
+
+    @property
+    def lookup_index(self) -> LookupIndex:
+        return self._lookup_index
+
+    def process_header(self, line: str) -> str:
+        self._header_lines += 1
+
+        # Only the last header line contains column names
+        if self._header_lines != self._options.header_lines:
+            return line
+
+        column_names = LineParser.split(line, self._options)
+        key_column = self._lookup_options.key_column
+
+        if key_column in column_names:
+            self._key_position = column_names.index(key_column)
+        elif key_column.isdigit() and int(key_column) < len(column_names):
+            self._key_position = int(key_column)
+        else:
+            raise ValueError(f'Column {key_column} does not exist')
+
+        line_terminator = self._options.line_terminator
+        terminated = line.endswith(line_terminator)
+        field_terminator = self._options.field_terminator
+        field_enclosing_value = self._options.field_enclosing_value
+        # Names are enclosed only if they contain the field terminator
+        added_columns = ''.join(
+            field_terminator + (
+                field_enclosing_value + value_name + field_enclosing_value
+                if field_terminator in value_name else value_name)
+            for value_name in self._lookup_index.value_names)
+
+        return (line[:-len(line_terminator)] if terminated else line) + added_columns + \
+            (line_terminator if terminated else '')
+
+    def process_values(self, line: ParsedLine) -> Optional[List[Any]]:
+        processed_values = super().process_values(line)
+
+        if processed_values is None:
+            return None
+
+        if self._key_position is None:
+            # Files without header lines reference the key column by its position
+            key_column = self._lookup_options.key_column
+
+            if not key_column.isdigit():
+                raise ProcessingError(f'Column {key_column} does not exist')
+
+            self._key_position = int(key_column)
+
+        key = processed_values[self._key_position]
+        values = self._lookup_index.lookup(key if isinstance(key, str) else format_value(key))
+
+        if values is None:
+            if self._lookup_options.inner_join:
+                return None
+
+            processed_values.extend(self._missing_values)
+        else:
+            processed_values.extend(values)
+
+        return processed_values
 
 
 class FileProcessor:
@@ -103,15 +525,30 @@ class FileProcessor:
     Base class for file processors
     """
 
-    def __init__(self, file_parser: FileParser, line_processor: LineProcessor) -> None:
+    def __init__(
+            self,
+            file_parser: FileParser,
+            line_processor: LineProcessor,
+            deduplication_options: Optional[DeduplicationOptions] = None,
+            sort_options: Optional[SortOptions] = None,
+            result_cache: Optional[ResultCache] = None) -> None:
         """
         :param file_parser: File parser
         :param line_processor: Line processor
+        :param deduplication_options: Optional deduplication options (duplicate lines are written if not set)
+        :param sort_options: Optional sort options (lines are written in the input order if not set)
+        :param result_cache: Optional cache of outputs used to skip processing of unchanged files
+                             (its settings have to describe the parser and the line processor)
         """
 
         self._logger: Logger = logging.getLogger(__name__)
         self._file_parser: FileParser = file_parser
         self._line_processor: LineProcessor = line_processor
+        self._deduplication_options: Optional[DeduplicationOptions] = deduplication_options
+        self._sort_options: Optional[SortOptions] = sort_options
+        self._result_cache: Optional[ResultCache] = result_cache
+        self._deduplication_statistics: Optional[DeduplicationStatistics] = None
+        self._incremental_state: Optional[IncrementalState] = None
 
     @property
     def line_processor(self) -> LineProcessor:
@@ -122,25 +559,248 @@ class FileProcessor:
 
         return self._line_processor
 
-    def process(self, input_file_path: str, output_file_path: str) -> None:
+    @property
+    def deduplication_statistics(self) -> Optional[DeduplicationStatistics]:
+        """
+        Returns deduplication statistics of the last processed file
+        :return: Deduplication statistics or None if deduplication is disabled
+        """
+
+        return self._deduplication_statistics
+
+    @property
+    def incremental_state(self) -> Optional[IncrementalState]:
+        """
+        Returns the state of the last incremental processing
+        :return: Incremental state or None if nothing has been processed incrementally
+        """
+
+        return self._incremental_state
+
+    def _load_incremental_state(self, input_file_path: str, state_file_path: str) -> Optional[IncrementalState]:
+        """
+        Loads the state of the previous incremental processing
+        :param input_file_path: Input file path
+        :param state_file_path: Path to the state file
+        :return: Incremental state or None if the file has to be processed from the beginning
+        """
+
+        state = IncrementalState.load(state_file_path)
+
+        if state is not None and not state.matches(input_file_path):
+            self._logger.warning(f'File "{input_file_path}" has been rewritten, processing it from the beginning')
+
+            return None
+
+        return state
+
+    def _parse_incremental(self, input_file_path: str, state: Optional[IncrementalState]) -> Iterator[ParsedLine]:
+        """
+        Parses lines which haven't been processed yet and updates the incremental state
+        :param input_file_path: Input file path
+        :param state: State of the previous incremental processing
+        :return: Iterator of parsed lines
+        """
+
+        last_parsed_line: Optional[ParsedLine] = None
+
+        for parsed_line in self._file_parser.parse_incremental(input_file_path, state):
+            last_parsed_line = parsed_line
+
+            yield parsed_line
+
+        if last_parsed_line is not None:
+            # Line parsers can read next lines, so the position is taken from the file and not from the last line
+            input_file = last_parsed_line.file
+            self._incremental_state = IncrementalState.create(
+                input_file_path, input_file.position, input_file.current_line_index + 1)
+
+            self._logger.info(
+                f'Processed file "{input_file_path}" up to line # {self._incremental_state.line_index} '
+                f'(byte {self._incremental_state.offset})')
+
+    def _parse(self, input_file_path: str, state_file_path: Optional[str]) -> Tuple[Iterator[ParsedLine], bool]:
+        """
+        Starts parsing an input file
+        :param input_file_path: Input file path
+        :param state_file_path: Optional path to a state file enabling incremental processing
+        :return: 2-tuple containing an iterator of parsed lines and a boolean value indicating
+                 whether the previous processing is resumed (so the output has to be appended to)
+        """
+
+        if state_file_path is None:
+            return self._file_parser.parse(input_file_path), False
+
+        state = self._load_incremental_state(input_file_path, state_file_path)
+        self._incremental_state = state
+
+        return self._parse_incremental(input_file_path, state), state is not None
+
+    def _save_incremental_state(self, state_file_path: Optional[str]) -> None:
+        # The state is saved only after the output has been written completely
+        if state_file_path is not None and self._incremental_state is not None:
+            self._incremental_state.save(state_file_path)
+
+    def _parse_values(self, parsed_lines: Iterator[ParsedLine]) -> Iterator[Union[str, List[Any]]]:
+        """
+        Processes parsed lines dropping incorrect lines
+        :param parsed_lines: Iterator of parsed lines
+        :return: Iterator over raw header lines and processed values of data lines
+        """
+
+        for parsed_line in parsed_lines:
+            if parsed_line.header:
+                yield self._line_processor.process_header(parsed_line.line)
+                continue
+
+            processed_values = self._line_processor.process_values(parsed_line)
+
+            # Skip incorrect lines
+            if processed_values is not None:
+                yield processed_values
+
+    def _drop_duplicates(
+            self,
+            items: Iterator[Union[str, List[Any]]],
+            options: DeduplicationOptions) -> Iterator[Union[str, List[Any]]]:
+        """
+        Drops duplicate lines
+        :param items: Iterator over raw header lines and processed values of data lines
+        :param options: Deduplication options
+        :return: Iterator over raw header lines and processed values of unique data lines
+        """
+
+        with DuplicateFilter(options) as duplicate_filter:
+            for item in items:
+                if isinstance(item, str):
+                    duplicate_filter.set_column_names(LineParser.split(item, self._file_parser.options))
+                    yield item
+                elif duplicate_filter.add(item):
+                    yield item
+
+            yield from duplicate_filter.verify()
+
+            statistics = duplicate_filter.statistics
+            self._deduplication_statistics = statistics
+            self._logger.info(
+                f'Dropped {statistics.duplicates} duplicate lines out of {statistics.lines} '
+                f'({statistics.deferred} lines verified, {statistics.false_positives} false positives, '
+                f'{statistics.spilled_runs} runs spilled to disk)')
+
+    def _sort(self, items: Iterator[Union[str, List[Any]]], options: SortOptions) -> Iterator[Union[str, List[Any]]]:
+        """
+        Sorts data lines by key columns (header lines are returned first)
+        :param items: Iterator over raw header lines and processed values of data lines
+        :param options: Sort options
+        :return: Iterator over raw header lines and processed values of sorted data lines
+        """
+
+        with ExternalSorter(options) as sorter:
+            for item in items:
+                if isinstance(item, str):
+                    sorter.set_column_names(LineParser.split(item, self._file_parser.options))
+                    yield item
+                else:
+                    sorter.add(item)
+
+            yield from sorter.sorted_values()
+
+    def _process_values(self, parsed_lines: Iterator[ParsedLine]) -> Iterator[Union[str, List[Any]]]:
+        """
+        Processes parsed lines dropping incorrect (and optionally duplicate) lines and optionally sorting them
+        :param parsed_lines: Iterator of parsed lines
+        :return: Iterator over raw header lines and processed values of data lines
+        """
+
+        items = self._parse_values(parsed_lines)
+
+        if self._deduplication_options:
+            items = self._drop_duplicates(items, self._deduplication_options)
+
+        if self._sort_options:
+            items = self._sort(items, self._sort_options)
+
+        return items
+
+    def process(self, input_file_path: str, output_file_path: str, state_file_path: Optional[str] = None) -> None:
         """
         Processes an input file
         :param input_file_path: Input file path
         :param output_file_path: Output file path
+        :param state_file_path: Optional path to a state file enabling incremental processing of append-only files:
+                                only lines appended since the previous run are processed and appended to the output
         """
 
         self._logger.info(f'Started processing file "{input_file_path}" into "{output_file_path}"')
 
-        with TextWriter.create(output_file_path) as output_file:
-            for parsed_line in self._file_parser.parse(input_file_path):
-                processed_line = self._line_processor.process(parsed_line)
+        # Incremental processing appends to outputs, so it doesn't use the cache
+        fingerprint: Optional[str] = None
+        reject_file_path = self._file_parser.options.reject_file_path
+
+        if self._result_cache is not None and state_file_path is None:
+            fingerprint = self._result_cache.fingerprint(input_file_path)
+
+            if self._result_cache.restore(fingerprint, output_file_path, reject_file_path):
+                self._logger.info(f'Restored output of file "{input_file_path}" from the cache')
+
+                return
+
+        parsed_lines, resumed = self._parse(input_file_path, state_file_path)
+
+        encoding = self._file_parser.options.encoding
+
+        with TextWriter.create(output_file_path, append=resumed, encoding=encoding) as output_file:
+            if self._deduplication_options or self._sort_options:
+                for item in self._process_values(parsed_lines):
+                    output_line = self._line_processor.format_header(item) if isinstance(item, str) else \
+                        self._line_processor.format_values(item)
+
+                    if output_line is not None:
+                        output_file.write_line(output_line)
+            else:
+                for parsed_line in parsed_lines:
+                    processed_line = self._line_processor.process(parsed_line)
 
-                # Skip incorrect lines
-                if processed_line is not None:
-                    output_file.write_line(processed_line)
+                    # Skip incorrect lines (and header lines of dialects without them)
+                    if processed_line is not None:
+                        output_file.write_line(processed_line)
+
+        self._save_incremental_state(state_file_path)
+
+        if self._result_cache is not None and fingerprint is not None:
+            self._result_cache.store(fingerprint, output_file_path, reject_file_path)
 
         self._logger.info(f'Finished processing file "{input_file_path}" to "{output_file_path}"')
 
+    def process_into(
+            self,
+            input_file_path: str,
+            output_sink: OutputSink,
+            state_file_path: Optional[str] = None) -> None:
+        """
+        Processes an input file writing processed values into an output sink instead of a text file
+        :param input_file_path: Input file path
+        :param output_sink: Output sink
+        :param state_file_path: Optional path to a state file enabling incremental processing of append-only files:
+                                only lines appended since the previous run are written into the sink
+                                (header lines are written only in the first run)
+        """
+
+        self._logger.info(f'Started processing file "{input_file_path}" into {type(output_sink).__name__}')
+
+        parsed_lines, _ = self._parse(input_file_path, state_file_path)
+
+        with output_sink:
+            for item in self._process_values(parsed_lines):
+                if isinstance(item, str):
+                    output_sink.write_header(item)
+                else:
+                    output_sink.write_values(item)
+
+        self._save_incremental_state(state_file_path)
+
+        self._logger.info(f'Finished processing file "{input_file_path}" into {type(output_sink).__name__}')
+
 
 class FileProcessorFactory:
     """
@@ -152,20 +812,56 @@ class FileProcessorFactory:
         :param file_parser_factory: Factory to create a file parser
         """
 
+        self._logger: Logger = logging.getLogger(__name__)
         self._file_parser_factory: FileParserFactory = file_parser_factory
 
-    def create(self, input_file_path: str, options: ParserOptions) -> FileProcessor:
+    def create(
+            self,
+            input_file_path: str,
+            options: ParserOptions,
+            deduplication_options: Optional[DeduplicationOptions] = None,
+            sort_options: Optional[SortOptions] = None,
+            output_options: Optional[OutputOptions] = None,
+            cache_options: Optional[CacheOptions] = None,
+            lookup_index: Optional[LookupIndex] = None) -> FileProcessor:
         """
         Creates a file processor
         :param input_file_path: Input file path
         :param options: Parser options
+        :param deduplication_options: Optional deduplication options
+        :param sort_options: Optional sort options
+        :param output_options: Optional output options (every value is enclosed by default)
+        :param cache_options: Optional options of the cache of outputs (outputs are not cached if not set)
+        :param lookup_index: Optional index of a reference file joined with lines
         :return: Created file processor
         """
 
         file_parser = self._file_parser_factory.create(input_file_path, options)
-        value_processors_count = len(file_parser.line_parser.value_parsers)
+        projection = file_parser.projection(input_file_path)
+        value_processors_count = \
+            len(projection) if projection is not None else len(file_parser.line_parser.value_parsers)
         value_processors = [EchoValueProcessor() for _ in range(value_processors_count)]
-        line_processor = LineProcessor(value_processors, options)
-        file_processor = FileProcessor(file_parser, line_processor)
+        formatter = OutputFormatter.create(output_options, options) if output_options is not None else None
+        line_processor = LineProcessor(value_processors, options, formatter=formatter) if lookup_index is None else \
+            LookupLineProcessor(value_processors, options, lookup_index, formatter=formatter)
+        result_cache: Optional[ResultCache] = None
+
+        # Lines sampled without a seed differ between runs, so their outputs aren't cached
+        if cache_options is not None and options.sample is not None and options.sample_seed is None:
+            self._logger.info('Outputs of lines sampled without a seed are not cached')
+        elif cache_options is not None:
+            result_cache = ResultCache(cache_options, {
+                'parser_factory': ResultCache.source_hash(type(self._file_parser_factory)),
+                'parser_options': {
+                    name: value for name, value in asdict(options).items() if name not in CACHE_IGNORED_OPTIONS
+                },
+                'deduplication_options': asdict(deduplication_options) if deduplication_options else None,
+                'sort_options': asdict(sort_options) if sort_options else None,
+                'output_options': asdict(output_options) if output_options else None,
+                'lookup': lookup_index.fingerprint() if lookup_index else None
+            })
+
+        file_processor = FileProcessor(
+            file_parser, line_processor, deduplication_options, sort_options, result_cache)
 
         return file_processor
@@ -0,0 +1,561 @@
+import hashlib
+import logging
+import math
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from logging import Logger
+from typing import Any, Dict, Iterator, List, Optional, Pattern, Tuple
+
+from csv_import.csv.parsers import FileParser, LineParser, ParsedLine
+from csv_import.csv.sql import (MYSQL, POSTGRESQL, SQLITE, quote_identifier,
+                                quote_table)
+
+# Inferred column types
+BOOLEAN: str = 'boolean'
+INTEGER: str = 'integer'
+DECIMAL: str = 'decimal'
+DOUBLE: str = 'double'
+DATE: str = 'date'
+TIMESTAMP: str = 'timestamp'
+TEXT: str = 'text'
+
+_BOOLEAN_VALUES: frozenset = frozenset(('true', 'false', 't', 'f', 'yes', 'no', 'y', 'n'))
+_NUMBER_REGEX: Pattern = re.compile(r'[+-]?(?=\.?\d)(\d*)(?:\.(\d*))?([eE][+-]?\d+)?')
+_DATE_REGEX: Pattern = re.compile(r'\d{4}-\d{2}-\d{2}')
+# Dates without times are valid timestamps as well
+_TIMESTAMP_REGEX: Pattern = re.compile(r'(\d{4}-\d{2}-\d{2})(?:[ T]([01]\d|2[0-3]):[0-5]\d:[0-5]\d(\.\d+)?)?')
+
+# Maximum precision of DECIMAL columns of MySQL (larger numbers are stored as DOUBLE)
+_MYSQL_MAX_DECIMAL_PRECISION: int = 65
+# Maximum length of VARCHAR columns (longer values are stored as TEXT)
+_MAX_VARCHAR_LENGTH: Dict[str, int] = {POSTGRESQL: 10485760, MYSQL: 16383}
+_INTEGER_TYPES: List[Tuple[int, str]] = [(2 ** 15, 'SMALLINT'), (2 ** 31, 'INTEGER'), (2 ** 63, 'BIGINT')]
+
+
+def _valid_date(string: str) -> bool:
+    try:
+        date.fromisoformat(string)
+    except ValueError:
+        return False
+
+    return True
+
+
+class HyperLogLog:
+    """
+    HyperLogLog sketch estimating the number of distinct values in constant memory
+    (2 ** precision one-byte registers, the standard error is about 1.04 / sqrt(2 ** precision))
+    """
+
+    def __init__(self, precision: int = 14) -> None:
+        """
+        :param precision: Number of bits of a hash selecting a register (between 4 and 16)
+        """
+
+        if not 4 <= precision <= 16:
+            raise ValueError('Precision of HyperLogLog has to be between 4 and 16')
+
+        self._precision: int = precision
+        self._rank_bits: int = 64 - precision
+        self._rank_mask: int = (1 << self._rank_bits) - 1
+        self._registers: bytearray = bytearray(1 << precision)
+
+    def add(self, value: str) -> None:
+        """
+        Adds a value to the sketch
+        :param value: Value
+        """
+
+        value_hash = int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+        register = value_hash >> self._rank_bits
+        # Rank is the position of the leftmost 1 bit in the rest of the hash
+        rank = self._rank_bits - (value_hash & self._rank_mask).bit_length() + 1
+
+        if rank > self._registers[register]:
+            self._registers[register] = rank
+
+    def merge(self, sketch: 'HyperLogLog') -> None:
+        """
+        Adds values of another sketch (e.g. a sketch of another part of the same file)
+        :param sketch: Sketch with the same precision
+        """
+
+        if sketch._precision != self._precision:
+            raise ValueError('Only sketches with the same precision can be merged')
+
+        self._registers = bytearray(map(max, self._registers, sketch._registers))
+
+    def count(self) -> int:
+        """
+        Estimates the number of distinct values
+        :return: Estimated number of distinct values
+        """
+
+        registers_count = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / registers_count)
+        estimate = alpha * registers_count ** 2 / sum(2.0 ** -register for register in self._registers)
+        empty_registers = self._registers.count(0)
+
+        # Small cardinalities are estimated by linear counting
+        if estimate <= 2.5 * registers_count and empty_registers:
+            estimate = registers_count * math.log(registers_count / empty_registers)
+
+        return round(estimate)
+
+
+class TopValues:
+    """
+    Misra-Gries summary finding the most frequent values using a fixed number of counters.
+    Every value occurring more often than the number of values divided by the number of counters is kept,
+    and counts are underestimated by at most the number of times counters were decremented
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """
+        :param capacity: Maximum number of counters
+        """
+
+        self._capacity: int = capacity
+        self._counters: Dict[str, int] = {}
+        self._decrements: int = 0
+
+    @property
+    def max_error(self) -> int:
+        """
+        Returns the maximum difference between reported and real counts
+        :return: Maximum error of counts
+        """
+
+        return self._decrements
+
+    def add(self, value: str) -> None:
+        """
+        Adds a value to the summary
+        :param value: Value
+        """
+
+        counters = self._counters
+
+        if value in counters:
+            counters[value] += 1
+        elif len(counters) < self._capacity:
+            counters[value] = 1
+        else:
+            # Decrementing all counters costs as many operations as counted values, so it's O(1) amortized
+            self._decrements += 1
+
+            for key, count in list(counters.items()):
+                if count == 1:
+                    del counters[key]
+                else:
+                    counters[key] = count - 1
+
+    def most_common(self, count: int) -> List[Tuple[str, int]]:
+        """
+        Returns the most frequent values
+        :param count: Number of values
+        :return: List of 2-tuples containing values and their (lower bounds of) counts
+        """
+
+        return sorted(self._counters.items(), key=lambda item: (-item[1], item[0]))[:count]
+
+
+@dataclass(frozen=True)
+class ProfileOptions:
+    """
+    Class used for storing options of column profiling
+    """
+
+    # Number of the most frequent values reported for every column
+    top_values: int = 10
+    # Number of counters used to find the most frequent values (more counters give more accurate counts)
+    top_values_capacity: int = 1000
+    # Precision of HyperLogLog sketches estimating numbers of distinct values (16 KiB per column by default)
+    distinct_precision: int = 14
+
+
+class ColumnProfile:
+    """
+    Class collecting statistics of a single column in constant memory: the inferred type, min and max values,
+    the maximum length in bytes, numbers of nulls and empty values, an estimate of the number of distinct values
+    and the most frequent values. Typed values (e.g. integers or dates) are profiled by their string forms
+    """
+
+    def __init__(self, name: str, options: ProfileOptions = ProfileOptions()) -> None:
+        """
+        :param name: Column name
+        :param options: Profile options
+        """
+
+        self._name: str = name
+        self._options: ProfileOptions = options
+        self.count: int = 0
+        self.nulls: int = 0
+        self.empty: int = 0
+        self.max_byte_length: int = 0
+        self._min: Optional[str] = None
+        self._max: Optional[str] = None
+        self._min_number: Optional[Decimal] = None
+        self._max_number: Optional[Decimal] = None
+        # Types are ruled out by the first value which doesn't match them
+        self._boolean: bool = True
+        self._integer: bool = True
+        self._number: bool = True
+        self._exponent: bool = False
+        self._date: bool = True
+        self._timestamp: bool = True
+        self._integer_digits: int = 0
+        self._scale: int = 0
+        self._distinct: HyperLogLog = HyperLogLog(options.distinct_precision)
+        self._top_values: TopValues = TopValues(options.top_values_capacity)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def add(self, value: Any) -> None:
+        """
+        Adds a value to the profile
+        :param value: Parsed value (None values are counted as nulls)
+        """
+
+        self.count += 1
+
+        if value is None:
+            self.nulls += 1
+            return
+
+        string = value if isinstance(value, str) else str(value)
+
+        if not string:
+            self.empty += 1
+            return
+
+        byte_length = len(string) if string.isascii() else len(string.encode('utf-8'))
+
+        if byte_length > self.max_byte_length:
+            self.max_byte_length = byte_length
+
+        if self._min is None or string < self._min:
+            self._min = string
+
+        if self._max is None or string > self._max:
+            self._max = string
+
+        self._distinct.add(string)
+        self._top_values.add(string)
+
+        if self._boolean and string.lower() not in _BOOLEAN_VALUES:
+            self._boolean = False
+
+        if self._number:
+            self._add_number(string)
+
+        if self._date and not (_DATE_REGEX.fullmatch(string) and _valid_date(string)):
+            self._date = False
+
+        if self._timestamp and not self._date:
+            match = _TIMESTAMP_REGEX.fullmatch(string)
+
+            if match is None or not _valid_date(match.group(1)):
+                self._timestamp = False
+
+    def _add_number(self, string: str) -> None:
+        match = _NUMBER_REGEX.fullmatch(string)
+
+        # Leading zeros (e.g. in postal codes or identifiers) would be lost by numeric columns
+        if match is None or (len(match.group(1)) > 1 and match.group(1)[0] == '0'):
+            self._number = False
+            self._integer = False
+            return
+
+        integer_part, fraction, exponent = match.groups()
+
+        if fraction is not None or exponent is not None:
+            self._integer = False
+
+        if exponent is not None:
+            self._exponent = True
+
+        self._integer_digits = max(self._integer_digits, len(integer_part.lstrip('0')))
+        self._scale = max(self._scale, len(fraction or ''))
+        number = Decimal(string)
+
+        if self._min_number is None or number < self._min_number:
+            self._min_number = number
+
+        if self._max_number is None or number > self._max_number:
+            self._max_number = number
+
+    @property
+    def type(self) -> str:
+        """
+        Returns the inferred type of values
+        :return: Inferred type (text if there are no values)
+        """
+
+        if self.count == self.nulls + self.empty:
+            return TEXT
+
+        if self._boolean:
+            return BOOLEAN
+
+        if self._integer:
+            return INTEGER
+
+        if self._number:
+            return DOUBLE if self._exponent else DECIMAL
+
+        if self._date:
+            return DATE
+
+        if self._timestamp:
+            return TIMESTAMP
+
+        return TEXT
+
+    @property
+    def min(self) -> Optional[str]:
+        """
+        Returns the minimal value (compared as a number for numeric types and as a string otherwise)
+        :return: Minimal value or None if there are no values
+        """
+
+        if self.type in (INTEGER, DECIMAL, DOUBLE):
+            return str(self._min_number)
+
+        return self._min
+
+    @property
+    def max(self) -> Optional[str]:
+        """
+        Returns the maximal value (compared as a number for numeric types and as a string otherwise)
+        :return: Maximal value or None if there are no values
+        """
+
+        if self.type in (INTEGER, DECIMAL, DOUBLE):
+            return str(self._max_number)
+
+        return self._max
+
+    @property
+    def distinct(self) -> int:
+        """
+        Returns an estimate of the number of distinct non-empty values
+        :return: Estimated number of distinct values
+        """
+
+        return self._distinct.count()
+
+    def top_values(self) -> List[Tuple[str, int]]:
+        """
+        Returns the most frequent non-empty values
+        :return: List of 2-tuples containing values and their (lower bounds of) counts
+        """
+
+        return self._top_values.most_common(self._options.top_values)
+
+    def sql_type(self, dialect: str = POSTGRESQL) -> str:
+        """
+        Returns the SQL type suggested for the column
+        :param dialect: SQL dialect
+        :return: SQL type
+        """
+
+        column_type = self.type
+
+        if column_type == INTEGER:
+            return self._integer_sql_type(dialect)
+
+        if column_type == DECIMAL:
+            precision = max(self._integer_digits + self._scale, 1)
+
+            if dialect == SQLITE:
+                return 'NUMERIC'
+
+            if dialect == MYSQL and precision > _MYSQL_MAX_DECIMAL_PRECISION:
+                return 'DOUBLE'
+
+            return f'DECIMAL({precision}, {self._scale})'
+
+        if column_type == DOUBLE:
+            return {POSTGRESQL: 'DOUBLE PRECISION', MYSQL: 'DOUBLE', SQLITE: 'REAL'}[dialect]
+
+        if column_type == BOOLEAN:
+            return 'BOOLEAN'
+
+        if column_type == DATE:
+            return 'DATE'
+
+        if column_type == TIMESTAMP:
+            return 'DATETIME(6)' if dialect == MYSQL else 'TIMESTAMP'
+
+        if dialect == SQLITE or self.max_byte_length > _MAX_VARCHAR_LENGTH[dialect]:
+            return 'LONGTEXT' if dialect == MYSQL else 'TEXT'
+
+        # Lengths in bytes are upper bounds of lengths in chars
+        return f'VARCHAR({max(self.max_byte_length, 1)})'
+
+    def _integer_sql_type(self, dialect: str) -> str:
+        minimum = int(self._min_number or 0)
+        maximum = int(self._max_number or 0)
+
+        for limit, sql_type in _INTEGER_TYPES:
+            if -limit <= minimum and maximum < limit:
+                return 'INTEGER' if dialect == SQLITE else sql_type
+
+        return 'NUMERIC' if dialect == SQLITE else f'DECIMAL({self._integer_digits}, 0)'
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converts the profile into a dictionary which can be serialized into JSON
+        :return: Dictionary containing the profile
+        """
+
+        return {
+            'name': self._name,
+            'type': self.type,
+            'count': self.count,
+            'nulls': self.nulls,
+            'empty': self.empty,
+            'min': self.min,
+            'max': self.max,
+            'max_byte_length': self.max_byte_length,
+            'distinct': self.distinct,
+            'top_values': self.top_values(),
+            'top_values_max_error': self._top_values.max_error
+        }
+
+
+@dataclass
+class FileProfile:
+    """
+    Class used for storing profiles of columns of a file
+    """
+
+    lines: int = 0
+    skipped: int = 0
+    columns: List[ColumnProfile] = field(default_factory=list)
+
+    def create_table(self, table: str, dialect: str = POSTGRESQL) -> str:
+        """
+        Creates a CREATE TABLE statement suggested by the profile.
+        Columns containing nulls or empty values (which are loaded as NULL values into non-text columns) are nullable
+        :param table: Table name (optionally prefixed with a schema name)
+        :param dialect: SQL dialect
+        :return: CREATE TABLE statement
+        """
+
+        definitions = []
+
+        for column in self.columns:
+            nullable = column.nulls or column.empty or not column.count
+            definitions.append(
+                f'    {quote_identifier(column.name, dialect)} {column.sql_type(dialect)}' +
+                ('' if nullable else ' NOT NULL'))
+
+        return f'CREATE TABLE {quote_table(table, dialect)} (\n' + ',\n'.join(definitions) + '\n);\n'
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converts the profile into a dictionary which can be serialized into JSON
+        :return: Dictionary containing the profile
+        """
+
+        return {
+            'lines': self.lines,
+            'skipped': self.skipped,
+            'columns': [column.to_dict() for column in self.columns]
+        }
+
+
+class FileProfiler:
+    """
+    Class used for profiling columns of parsed lines in a single pass.
+    Profiling can be combined with other processing of the same lines by observe() or run on its own by profile()
+    """
+
+    def __init__(self, file_parser: FileParser, options: ProfileOptions = ProfileOptions()) -> None:
+        """
+        :param file_parser: File parser
+        :param options: Profile options
+        """
+
+        self._logger: Logger = logging.getLogger(__name__)
+        self._file_parser: FileParser = file_parser
+        self._options: ProfileOptions = options
+        self._column_names: List[str] = []
+        self._profile: FileProfile = FileProfile()
+
+    @property
+    def result(self) -> FileProfile:
+        """
+        Returns the profile of observed lines
+        :return: File profile
+        """
+
+        return self._profile
+
+    def _add_columns(self, count: int) -> None:
+        columns = self._profile.columns
+
+        for position in range(len(columns), count):
+            name = self._column_names[position] if position < len(self._column_names) else str(position)
+            columns.append(ColumnProfile(name, self._options))
+
+    def add(self, parsed_line: ParsedLine) -> None:
+        """
+        Adds a parsed line to the profile
+        :param parsed_line: Parsed line (header lines name columns)
+        """
+
+        if parsed_line.header:
+            # Header lines are projected by the file parser, so names correspond to parsed values
+            self._column_names = LineParser.split(parsed_line.line, self._file_parser.options)
+
+            return
+
+        self._profile.lines += 1
+        values = parsed_line.parsed_values
+
+        if values is None:
+            self._profile.skipped += 1
+            return
+
+        columns = self._profile.columns
+
+        if len(values) > len(columns):
+            self._add_columns(len(values))
+
+        for column, value in zip(columns, values):
+            column.add(value)
+
+    def observe(self, parsed_lines: Iterator[ParsedLine]) -> Iterator[ParsedLine]:
+        """
+        Profiles parsed lines passing through the iterator
+        :param parsed_lines: Iterator of parsed lines
+        :return: Iterator of the same parsed lines
+        """
+
+        for parsed_line in parsed_lines:
+            self.add(parsed_line)
+
+            yield parsed_line
+
+    def profile(self, input_file_path: str) -> FileProfile:
+        """
+        Profiles columns of an input file
+        :param input_file_path: Input file path
+        :return: File profile
+        """
+
+        self._logger.info(f'Started profiling file "{input_file_path}"')
+
+        for parsed_line in self._file_parser.parse(input_file_path):
+            self.add(parsed_line)
+
+        self._logger.info(f'Finished profiling file "{input_file_path}"')
+
+        return self._profile
@@ -0,0 +1,130 @@
+import json
+import logging
+import sys
+import time
+from logging import Logger
+from typing import IO, Any, Dict, Optional
+
+NONE: str = 'none'
+LOG: str = 'log'
+TTY: str = 'tty'
+JSON: str = 'json'
+
+# Minimal number of seconds between two reports used when the interval is not set
+DEFAULT_INTERVALS: Dict[str, float] = {
+    NONE: float('inf'),
+    LOG: 10.0,
+    TTY: 0.5,
+    JSON: 1.0
+}
+
+BYTES_IN_MEGABYTE: int = 1024 * 1024
+
+
+class ProgressReporter:
+    """
+    Class used for reporting progress of processing a file based on the byte position of the reader and the file size.
+    Reports contain the number of rows, throughput in rows and megabytes per second, the percentage done and ETA.
+    They are written to the log, as a single progress line refreshed in a terminal or as JSON events (one per line).
+    Reports are throttled by wall time, so a call per line costs a single clock read
+    """
+
+    def __init__(
+            self,
+            total_size: int,
+            mode: str = LOG,
+            interval: Optional[float] = None,
+            stream: Optional[IO[str]] = None) -> None:
+        """
+        :param total_size: Size of the processed file (or its part) in bytes
+        :param mode: Reporting mode: none, log, tty or json
+        :param interval: Minimal number of seconds between two reports (by default it depends on the mode)
+        :param stream: Stream receiving tty and json reports (standard error by default)
+        """
+
+        if mode not in DEFAULT_INTERVALS:
+            raise ValueError(f'Unsupported progress mode "{mode}"')
+
+        self._logger: Logger = logging.getLogger(__name__)
+        self._total_size: int = total_size
+        self._mode: str = mode
+        self._interval: float = interval if interval is not None else DEFAULT_INTERVALS[mode]
+        self._stream: IO[str] = stream or sys.stderr
+        self._start_time: float = time.monotonic()
+        self._start_position: Optional[int] = None
+        self._next_report_time: float = self._start_time + self._interval
+
+    def update(self, rows: int, position: int) -> None:
+        """
+        Registers progress and reports it if the interval has elapsed since the previous report
+        :param rows: Number of rows processed so far
+        :param position: Byte position of the reader
+        """
+
+        # Throughput is measured from the first position, e.g. an incremental run starts in the middle of the file
+        if self._start_position is None:
+            self._start_position = position
+
+        now = time.monotonic()
+
+        if now < self._next_report_time:
+            return
+
+        self._next_report_time = now + self._interval
+        self._report(self._snapshot(now, rows, position), final=False)
+
+    def finish(self, rows: int, position: int) -> None:
+        """
+        Reports the final progress
+        :param rows: Number of processed rows
+        :param position: Byte position of the reader
+        """
+
+        if self._mode == NONE:
+            return
+
+        self._report(self._snapshot(time.monotonic(), rows, position), final=True)
+
+    def _snapshot(self, now: float, rows: int, position: int) -> Dict[str, Any]:
+        elapsed = max(now - self._start_time, 1e-9)
+        bytes_per_second = (position - (self._start_position or 0)) / elapsed
+        remaining_size = max(self._total_size - position, 0)
+
+        return {
+            'rows': rows,
+            'bytes': position,
+            'total_bytes': self._total_size,
+            'percent': 100.0 * position / self._total_size if self._total_size else 100.0,
+            'rows_per_second': rows / elapsed,
+            'megabytes_per_second': bytes_per_second / BYTES_IN_MEGABYTE,
+            'elapsed_seconds': elapsed,
+            'eta_seconds': remaining_size / bytes_per_second if bytes_per_second > 0 else None
+        }
+
+    @staticmethod
+    def _format_eta(eta_seconds: Optional[float]) -> str:
+        if eta_seconds is None:
+            return '?'
+
+        minutes, seconds = divmod(int(eta_seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+
+        return f'{hours}:{minutes:02d}:{seconds:02d}'
+
+    def _format(self, snapshot: Dict[str, Any]) -> str:
+        return (
+            f'{snapshot["rows"]} rows, {snapshot["percent"]:.1f}%, '
+            f'{snapshot["rows_per_second"]:.0f} rows/s, {snapshot["megabytes_per_second"]:.1f} MB/s, '
+            f'ETA {self._format_eta(snapshot["eta_seconds"])}')
+
+    def _report(self, snapshot: Dict[str, Any], final: bool) -> None:
+        if self._mode == LOG:
+            self._logger.info(f'Processed {self._format(snapshot)}')
+        elif self._mode == TTY:
+            # The line is refreshed in place and terminated only by the final report
+            self._stream.write(f'\r{self._format(snapshot)}\x1b[K' + ('\n' if final else ''))
+            self._stream.flush()
+        elif self._mode == JSON:
+            event = {'event': 'finished' if final else 'progress', **snapshot}
+            self._stream.write(json.dumps(event) + '\n')
+            self._stream.flush()
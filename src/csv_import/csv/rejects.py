@@ -0,0 +1,294 @@
+import logging
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, replace
+from logging import Logger
+from types import TracebackType
+from typing import IO, Dict, Iterable, List, Optional, Type
+
+REJECT_FILE_BUFFER_SIZE: int = 1024 * 1024
+# Number of leading chars of oversized lines kept in samples written to the log
+OVERSIZED_LINE_PREVIEW_SIZE: int = 1024
+
+
+@dataclass(frozen=True)
+class RejectedLine:
+    """
+    Class used for storing information about a line which could not be parsed
+    """
+
+    index: int
+    offset: int
+    reason: str
+    message: str
+    line: str
+
+
+class ErrorAggregator:
+    """
+    Class used for aggregating parsing errors into rate-limited summaries instead of logging every single error
+    """
+
+    def __init__(self, summary_interval: float = 10.0, sample_size: int = 10, seed: Optional[int] = None) -> None:
+        """
+        :param summary_interval: Minimal number of seconds between two summaries written to the log
+                                 (infinity disables summaries, only the final one is written)
+        :param sample_size: Number of example lines kept in the reservoir sample
+        :param seed: Optional seed used by the reservoir sampling (makes samples reproducible)
+        """
+
+        self._logger: Logger = logging.getLogger(__name__)
+        self._summary_interval: float = summary_interval
+        self._sample_size: int = sample_size
+        self._random: random.Random = random.Random(seed)
+        self._counts: Counter = Counter()
+        self._total: int = 0
+        self._samples: List[RejectedLine] = []
+        # The first rejected line is reported immediately
+        self._last_summary_time: float = float('-inf')
+        self._last_summary_total: int = 0
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        """
+        Returns the number of rejected lines per error type
+        :return: Dictionary mapping error types to the number of rejected lines
+        """
+
+        return dict(self._counts)
+
+    @property
+    def total(self) -> int:
+        """
+        Returns the total number of rejected lines
+        :return: Total number of rejected lines
+        """
+
+        return self._total
+
+    @property
+    def samples(self) -> List[RejectedLine]:
+        """
+        Returns a uniform random sample of rejected lines
+        :return: List of sampled rejected lines
+        """
+
+        return list(self._samples)
+
+    def add(self, rejected_line: RejectedLine) -> None:
+        """
+        Registers a rejected line
+        :param rejected_line: Rejected line
+        """
+
+        self._counts[rejected_line.reason] += 1
+        self._total += 1
+
+        # Reservoir sampling (algorithm R)
+        if len(self._samples) < self._sample_size:
+            self._samples.append(rejected_line)
+        else:
+            sample_index = self._random.randrange(self._total)
+
+            if sample_index < self._sample_size:
+                self._samples[sample_index] = rejected_line
+
+        now = time.monotonic()
+
+        # An infinite interval would be elapsed since the initial summary time of minus infinity
+        if self._summary_interval != float('inf') and now - self._last_summary_time >= self._summary_interval:
+            self._log_summary(now)
+
+    def _format_counts(self) -> str:
+        return ', '.join(f'{reason}: {count}' for reason, count in self._counts.most_common())
+
+    def _log_summary(self, now: float) -> None:
+        self._logger.warning(
+            'Skipped %d lines (%d since the last summary): %s',
+            self._total, self._total - self._last_summary_total, self._format_counts())
+
+        self._last_summary_time = now
+        self._last_summary_total = self._total
+
+    def close(self) -> None:
+        """
+        Writes the final summary including sampled lines to the log
+        """
+
+        if not self._total:
+            return
+
+        self._logger.warning('Skipped %d lines in total: %s', self._total, self._format_counts())
+
+        for sample in sorted(self._samples, key=lambda sample: sample.index):
+            self._logger.warning(
+                'Skipped line # %d (byte %d, %s): %s',
+                sample.index, sample.offset, sample.reason, sample.line.rstrip('\r\n'))
+
+
+class RejectWriter:
+    """
+    Class used for writing rejected lines into a reject file.
+    Each record has the following tab separated format: line index, byte offset, reason, raw line
+    """
+
+    def __init__(self, file_path: str, buffer_size: int = REJECT_FILE_BUFFER_SIZE) -> None:
+        """
+        :param file_path: Path to the reject file
+        :param buffer_size: Size of the write buffer
+        """
+
+        self._file_path: str = file_path
+        self._buffer_size: int = buffer_size
+        self._file: Optional[IO[str]] = None
+
+    def __enter__(self) -> 'RejectWriter':
+        self._file = open(self._file_path, 'w', buffering=self._buffer_size)
+
+        return self
+
+    def __exit__(
+            self,
+            exception_type: Optional[Type[BaseException]],
+            exception_value: Optional[BaseException],
+            traceback: Optional[TracebackType]) -> None:
+        self.close()
+
+    def write(self, rejected_line: RejectedLine) -> None:
+        """
+        Writes a rejected line to the reject file
+        :param rejected_line: Rejected line
+        """
+
+        self.write_chunks(rejected_line, [])
+
+    def write_chunks(self, rejected_line: RejectedLine, chunks: Iterable[str]) -> None:
+        """
+        Writes a rejected line whose rest is read in chunks (e.g. an oversized line) to the reject file
+        :param rejected_line: Rejected line containing the beginning of the line
+        :param chunks: Chunks of the rest of the line
+        """
+
+        if self._file is None:
+            raise IOError(f'Cannot write to file {self._file_path}')
+
+        reason = rejected_line.reason
+
+        if rejected_line.message:
+            reason = f'{reason}: {rejected_line.message}'
+
+        reason = reason.replace('\t', ' ').replace('\r', ' ').replace('\n', ' ')
+
+        self._file.write(f'{rejected_line.index}\t{rejected_line.offset}\t{reason}\t{rejected_line.line}')
+        last_chunk = rejected_line.line
+
+        for chunk in chunks:
+            self._file.write(chunk)
+            last_chunk = chunk
+
+        if not last_chunk.endswith('\n'):
+            self._file.write('\n')
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+class RejectSink:
+    """
+    Class combining an error aggregator and an optional reject file
+    """
+
+    def __init__(self, aggregator: ErrorAggregator, writer: Optional[RejectWriter] = None) -> None:
+        """
+        :param aggregator: Error aggregator used for writing summaries to the log
+        :param writer: Optional reject file writer
+        """
+
+        self._aggregator: ErrorAggregator = aggregator
+        self._writer: Optional[RejectWriter] = writer
+
+    @property
+    def aggregator(self) -> ErrorAggregator:
+        """
+        Returns the error aggregator used by this sink
+        :return: Error aggregator
+        """
+
+        return self._aggregator
+
+    def __enter__(self) -> 'RejectSink':
+        if self._writer:
+            self._writer.__enter__()
+
+        return self
+
+    def __exit__(
+            self,
+            exception_type: Optional[Type[BaseException]],
+            exception_value: Optional[BaseException],
+            traceback: Optional[TracebackType]) -> None:
+        self.close()
+
+    def reject(self, index: int, offset: int, line: str, error: BaseException) -> None:
+        """
+        Registers a line which could not be parsed
+        :param index: Line index
+        :param offset: Byte offset of the line
+        :param line: Raw line
+        :param error: Error which caused the rejection
+        """
+
+        rejected_line = RejectedLine(
+            index=index, offset=offset, reason=type(error).__name__, message=str(error), line=line)
+
+        self._aggregator.add(rejected_line)
+
+        if self._writer:
+            self._writer.write(rejected_line)
+
+    def reject_oversized(
+            self,
+            index: int,
+            offset: int,
+            line: str,
+            chunks: Iterable[str],
+            error: BaseException) -> None:
+        """
+        Registers an oversized line which is streamed to the reject file in chunks
+        (only its beginning is kept in samples written to the log)
+        :param index: Line index
+        :param offset: Byte offset of the line
+        :param line: Beginning of the raw line
+        :param chunks: Chunks of the rest of the line (they are consumed even if there is no reject file)
+        :param error: Error which caused the rejection
+        """
+
+        rejected_line = RejectedLine(
+            index=index, offset=offset, reason=type(error).__name__, message=str(error), line=line)
+
+        self._aggregator.add(replace(rejected_line, line=line[:OVERSIZED_LINE_PREVIEW_SIZE]))
+
+        if self._writer:
+            self._writer.write_chunks(rejected_line, chunks)
+        else:
+            for _ in chunks:
+                pass
+
+    def close(self) -> None:
+        self._aggregator.close()
+
+        if self._writer:
+            self._writer.close()
+
+    @staticmethod
+    def create(
+            reject_file_path: Optional[str] = None,
+            summary_interval: float = 10.0,
+            sample_size: int = 10) -> 'RejectSink':
+        aggregator = ErrorAggregator(summary_interval, sample_size)
+        writer = RejectWriter(reject_file_path) if reject_file_path else None
+
+        return RejectSink(aggregator, writer)
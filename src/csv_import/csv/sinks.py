@@ -0,0 +1,53 @@
+from abc import ABC, abstractmethod
+from types import TracebackType
+from typing import Any, Optional, Sequence, Type
+
+
+class OutputSink(ABC):
+    """
+    Base class for all output sinks receiving processed lines from file processors
+    """
+
+    def __enter__(self) -> 'OutputSink':
+        self.open()
+
+        return self
+
+    def __exit__(
+            self,
+            exception_type: Optional[Type[BaseException]],
+            exception_value: Optional[BaseException],
+            traceback: Optional[TracebackType]) -> None:
+        self.close()
+
+    def open(self) -> None:
+        """
+        Prepares the sink for writing
+        """
+
+        pass
+
+    def close(self) -> None:
+        """
+        Flushes all buffered data and releases resources used by the sink
+        """
+
+        pass
+
+    @abstractmethod
+    def write_header(self, line: str) -> None:
+        """
+        Writes a header line
+        :param line: Raw header line
+        """
+
+        raise NotImplementedError()
+
+    @abstractmethod
+    def write_values(self, values: Sequence[Any]) -> None:
+        """
+        Writes processed values of a single line
+        :param values: List of processed values
+        """
+
+        raise NotImplementedError()
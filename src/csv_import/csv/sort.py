@@ -0,0 +1,274 @@
+import heapq
+import json
+import logging
+import os
+import tempfile
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from logging import Logger
+from types import TracebackType
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Optional,
+                    Sequence, Tuple, Type)
+
+DEFAULT_SORT_MEMORY_LIMIT: int = 64 * 1024 * 1024
+# Approximate number of bytes used by a line kept in memory (in addition to the length of its values)
+LINE_OVERHEAD: int = 56
+VALUE_OVERHEAD: int = 57
+# Approximate length of a typed value (e.g. an integer or a date) which isn't a string
+TYPED_VALUE_SIZE: int = 32
+# Maximum number of runs merged at once (runs are merged in several passes if there are more of them)
+MAX_MERGED_RUNS: int = 256
+RUN_BUFFER_SIZE: int = 1024 * 1024
+
+# Key types use the same names as column types of the columnar output
+KEY_TYPES: Dict[str, Callable[[str], Any]] = {
+    'int64': int,
+    'float64': float,
+    'str': str
+}
+
+
+@dataclass(frozen=True)
+class SortOptions:
+    """
+    Class used for storing options of sorting processed lines
+    """
+
+    # Names (or 0-based positions) of key columns
+    key_columns: Tuple[str, ...]
+    # Types of key columns (int64, float64 or str), all key columns are compared as strings if not set
+    key_types: Optional[Tuple[str, ...]] = None
+    # Maximum size of a single run kept in memory
+    memory_limit: int = DEFAULT_SORT_MEMORY_LIMIT
+    # Number of worker processes sorting and writing runs
+    workers: int = 1
+
+
+class SortKey:
+    """
+    Callable class computing sort keys of lines (it's a class and not a closure to be picklable)
+    """
+
+    def __init__(self, positions: Sequence[int], key_types: Sequence[str]) -> None:
+        """
+        :param positions: Positions of key columns
+        :param key_types: Types of key columns
+        """
+
+        self._positions: List[int] = list(positions)
+        self._key_types: List[str] = list(key_types)
+
+    def __call__(self, values: Sequence[str]) -> Tuple[Tuple[bool, Any], ...]:
+        key = []
+
+        for position, key_type in zip(self._positions, self._key_types):
+            value = values[position]
+
+            # Empty values are placed before all other values and are never converted
+            if value is None or value == '':
+                key.append((False, ''))
+                continue
+
+            try:
+                key.append((True, KEY_TYPES[key_type](value)))
+            except ValueError:
+                raise ValueError(f'Value {value} of column # {position} is not of type {key_type}')
+
+        return tuple(key)
+
+
+def _write_run(run_file_path: str, lines: List[List[str]], sort_key: SortKey) -> str:
+    lines.sort(key=sort_key)
+
+    with open(run_file_path, 'w', encoding='utf-8', buffering=RUN_BUFFER_SIZE) as run_file:
+        for values in lines:
+            # Typed values without a JSON representation (e.g. dates) are stored in the same way as they are formatted
+            run_file.write(json.dumps(values, ensure_ascii=False, default=str) + '\n')
+
+    return run_file_path
+
+
+def _read_run(run_file_path: str) -> Iterator[List[str]]:
+    with open(run_file_path, encoding='utf-8', buffering=RUN_BUFFER_SIZE) as run_file:
+        for run_line in run_file:
+            yield json.loads(run_line)
+
+
+class ExternalSorter:
+    """
+    Class used for sorting lines which don't fit into memory.
+    Lines are collected into runs of a limited size which are sorted and spilled to temporary files
+    (optionally by worker processes) and then k-way merged.
+    Please note that every worker process keeps one run in memory, so memory usage grows with the number of workers
+    """
+
+    def __init__(self, options: SortOptions, temporary_directory: Optional[str] = None) -> None:
+        """
+        :param options: Sort options
+        :param temporary_directory: Optional directory where runs are stored (by default the system one)
+        """
+
+        if options.key_types and len(options.key_types) != len(options.key_columns):
+            raise ValueError('Number of key types does not match the number of key columns')
+
+        for key_type in options.key_types or ():
+            if key_type not in KEY_TYPES:
+                raise ValueError(f'Unknown key type {key_type}')
+
+        self._logger: Logger = logging.getLogger(__name__)
+        self._options: SortOptions = options
+        self._temporary_directory: Optional[str] = temporary_directory
+        self._runs_directory: Optional[tempfile.TemporaryDirectory] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._column_names: List[str] = []
+        self._sort_key: Optional[SortKey] = None
+        self._lines: List[List[str]] = []
+        self._lines_size: int = 0
+        self._runs: List[str] = []
+        self._pending_runs: List[Future] = []
+        self._runs_count: int = 0
+
+    def __enter__(self) -> 'ExternalSorter':
+        return self
+
+    def __exit__(
+            self,
+            exception_type: Optional[Type[BaseException]],
+            exception_value: Optional[BaseException],
+            traceback: Optional[TracebackType]) -> None:
+        self.close()
+
+    @property
+    def runs_count(self) -> int:
+        """
+        Returns the number of runs spilled to disk
+        :return: Number of spilled runs
+        """
+
+        return self._runs_count
+
+    def set_column_names(self, column_names: Sequence[str]) -> None:
+        """
+        Sets column names used to find key columns (usually read from the last header line)
+        :param column_names: List of column names
+        """
+
+        self._column_names = list(column_names)
+        self._sort_key = None
+
+    def _get_sort_key(self) -> SortKey:
+        if self._sort_key is None:
+            positions = []
+
+            for key_column in self._options.key_columns:
+                if key_column in self._column_names:
+                    positions.append(self._column_names.index(key_column))
+                elif key_column.isdigit():
+                    positions.append(int(key_column))
+                else:
+                    raise ValueError(f'Key column {key_column} does not exist')
+
+            key_types = self._options.key_types or ('str',) * len(positions)
+            self._sort_key = SortKey(positions, key_types)
+
+        return self._sort_key
+
+    def _create_run_file_path(self) -> str:
+        if self._runs_directory is None:
+            self._runs_directory = tempfile.TemporaryDirectory(dir=self._temporary_directory)
+
+        self._runs_count += 1
+
+        return os.path.join(self._runs_directory.name, f'run{self._runs_count}')
+
+    def _spill(self) -> None:
+        if not self._lines:
+            return
+
+        run_file_path = self._create_run_file_path()
+        sort_key = self._get_sort_key()
+
+        if self._options.workers > 1:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self._options.workers)
+
+            # Waiting for the oldest run bounds the number of runs kept in memory
+            if len(self._pending_runs) >= self._options.workers:
+                self._runs.append(self._pending_runs.pop(0).result())
+
+            self._pending_runs.append(self._executor.submit(_write_run, run_file_path, self._lines, sort_key))
+        else:
+            self._runs.append(_write_run(run_file_path, self._lines, sort_key))
+
+        self._lines = []
+        self._lines_size = 0
+
+    def add(self, values: List[Any]) -> None:
+        """
+        Adds a line to be sorted
+        :param values: Processed values of the line
+        """
+
+        self._lines.append(values)
+        self._lines_size += LINE_OVERHEAD + sum(
+            VALUE_OVERHEAD + (len(value) if isinstance(value, str) else TYPED_VALUE_SIZE) for value in values)
+
+        if self._lines_size > self._options.memory_limit:
+            self._spill()
+
+    def _merge(self, runs: Sequence[str]) -> Iterable[List[str]]:
+        return heapq.merge(*[_read_run(run) for run in runs], key=self._get_sort_key())
+
+    def sorted_values(self) -> Iterator[List[str]]:
+        """
+        Returns sorted lines
+        :return: Iterator over values of sorted lines
+        """
+
+        if not self._runs and not self._pending_runs:
+            self._lines.sort(key=self._get_sort_key())
+
+            yield from self._lines
+
+            self._lines = []
+            self._lines_size = 0
+
+            return
+
+        self._spill()
+
+        for pending_run in self._pending_runs:
+            self._runs.append(pending_run.result())
+
+        self._pending_runs = []
+        runs = self._runs
+
+        while len(runs) > MAX_MERGED_RUNS:
+            run_file_path = self._create_run_file_path()
+
+            with open(run_file_path, 'w', encoding='utf-8', buffering=RUN_BUFFER_SIZE) as run_file:
+                for values in self._merge(runs[:MAX_MERGED_RUNS]):
+                    run_file.write(json.dumps(values, ensure_ascii=False, default=str) + '\n')
+
+            for run in runs[:MAX_MERGED_RUNS]:
+                os.remove(run)
+
+            # The merged run replaces the first runs which keeps the sort stable
+            runs = [run_file_path] + runs[MAX_MERGED_RUNS:]
+
+        self._logger.info(f'Merging {len(runs)} sorted runs ({self._runs_count} runs written)')
+
+        yield from self._merge(runs)
+
+    def close(self) -> None:
+        """
+        Stops worker processes and removes runs
+        """
+
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+        if self._runs_directory is not None:
+            self._runs_directory.cleanup()
+            self._runs_directory = None
@@ -0,0 +1,291 @@
+import math
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import IO, Any, Dict, List, Optional, Sequence, Tuple
+
+from csv_import.csv.parsers import LineParser, ParserOptions
+from csv_import.csv.processors import ProcessingError
+from csv_import.csv.sinks import OutputSink
+
+POSTGRESQL: str = 'postgresql'
+MYSQL: str = 'mysql'
+SQLITE: str = 'sqlite'
+
+# MySQL interprets backslashes in string literals, so special chars are escaped with them
+_MYSQL_ESCAPES: Dict[int, str] = {
+    ord('\\'): '\\\\',
+    ord("'"): "\\'",
+    ord('\0'): '\\0',
+    ord('\n'): '\\n',
+    ord('\r'): '\\r',
+    ord('\x1a'): '\\Z'
+}
+
+
+def quote_identifier(identifier: str, dialect: str = POSTGRESQL) -> str:
+    """
+    Quotes an identifier (e.g. a column name) for a SQL dialect
+    :param identifier: Identifier
+    :param dialect: SQL dialect
+    :return: Quoted identifier
+    """
+
+    if dialect == MYSQL:
+        return '`' + identifier.replace('`', '``') + '`'
+
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def quote_table(table: str, dialect: str = POSTGRESQL) -> str:
+    """
+    Quotes a table name optionally prefixed with a schema name (e.g. import.orders) for a SQL dialect
+    :param table: Table name
+    :param dialect: SQL dialect
+    :return: Quoted table name
+    """
+
+    return '.'.join(quote_identifier(part, dialect) for part in table.split('.'))
+
+
+@dataclass(frozen=True)
+class SqlOptions:
+    """
+    Class used for storing options of SQL script output
+    """
+
+    # Name of the table rows are inserted into (optionally prefixed with a schema name, e.g. import.orders)
+    table: str
+    # SQL dialect used to quote identifiers and escape values (postgresql, mysql or sqlite)
+    dialect: str = POSTGRESQL
+    # Names of columns (by default they are taken from the last header line, and if there is no header line
+    # rows are inserted into all columns of the table in their order)
+    columns: Optional[Tuple[str, ...]] = None
+    # Names (or 0-based positions) of key columns turning inserts into upserts updating the rest of columns
+    conflict_columns: Optional[Tuple[str, ...]] = None
+    rows_per_statement: int = 1000
+    # Number of statements executed in a single transaction (statements aren't wrapped into transactions if 0)
+    statements_per_transaction: int = 100
+    # Maximum size of a statement in bytes (it has to stay under max_allowed_packet of MySQL)
+    max_statement_size: int = 1024 * 1024
+    # Boolean value indicating whether empty strings are inserted as NULL values
+    empty_as_null: bool = False
+
+
+class SqlSink(OutputSink):
+    """
+    Output sink writing a SQL script inserting rows with multi-row INSERT statements
+    (or upserting them with INSERT ... ON CONFLICT / ON DUPLICATE KEY UPDATE statements when key columns are set).
+    Statements contain up to the configured number of rows and never exceed the maximum statement size,
+    and they are grouped into transactions
+    """
+
+    def __init__(
+            self,
+            output_file_path: str,
+            sql_options: SqlOptions,
+            options: ParserOptions = ParserOptions()) -> None:
+        """
+        :param output_file_path: Path to the output SQL script
+        :param sql_options: SQL options
+        :param options: Parser options used to split the header line
+        """
+
+        if sql_options.dialect not in (POSTGRESQL, MYSQL, SQLITE):
+            raise ValueError(f'Unsupported SQL dialect "{sql_options.dialect}"')
+
+        if sql_options.rows_per_statement < 1:
+            raise ValueError('Number of rows per statement has to be positive')
+
+        self._output_file_path: str = output_file_path
+        self._sql_options: SqlOptions = sql_options
+        self._options: ParserOptions = options
+        self._column_names: Optional[List[str]] = list(sql_options.columns) if sql_options.columns else None
+        self._prefix: Optional[bytes] = None
+        self._suffix: bytes = b''
+        self._rows: List[bytes] = []
+        self._statement_size: int = 0
+        self._statements: int = 0
+        self._file: Optional[IO[bytes]] = None
+
+    @property
+    def statements(self) -> int:
+        """
+        Returns the number of written statements
+        :return: Number of written statements
+        """
+
+        return self._statements
+
+    def open(self) -> None:
+        # The script is written in UTF-8 regardless of the input encoding
+        self._file = open(self._output_file_path, 'wb')
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+
+        self._flush_statement()
+
+        if self._statements and self._sql_options.statements_per_transaction:
+            if self._statements % self._sql_options.statements_per_transaction:
+                self._file.write(b'COMMIT;\n')
+
+        self._file.close()
+        self._file = None
+
+    def write_header(self, line: str) -> None:
+        if not self._sql_options.columns:
+            self._flush_statement()
+            self._column_names = LineParser.split(line, self._options)
+            self._prefix = None
+
+    def quote_identifier(self, identifier: str) -> str:
+        """
+        Quotes an identifier (e.g. a column name) for the dialect
+        :param identifier: Identifier
+        :return: Quoted identifier
+        """
+
+        return quote_identifier(identifier, self._sql_options.dialect)
+
+    def literal(self, value: Any) -> str:
+        """
+        Formats a value as a SQL literal of the dialect
+        :param value: Processed value (a string or a typed value)
+        :return: SQL literal
+        """
+
+        if value is None or (self._sql_options.empty_as_null and value == ''):
+            return 'NULL'
+
+        if isinstance(value, str):
+            return self._string_literal(value)
+
+        if isinstance(value, bool):
+            return 'TRUE' if value else 'FALSE'
+
+        if isinstance(value, (int, Decimal)):
+            if isinstance(value, Decimal) and not value.is_finite():
+                raise ProcessingError(f'Value {value} cannot be inserted as a number')
+
+            return str(value)
+
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                raise ProcessingError(f'Value {value} cannot be inserted as a number')
+
+            return repr(value)
+
+        if isinstance(value, datetime):
+            return self._string_literal(value.isoformat(sep=' '))
+
+        if isinstance(value, date):
+            return self._string_literal(value.isoformat())
+
+        return self._string_literal(str(value))
+
+    def _string_literal(self, value: str) -> str:
+        if self._sql_options.dialect == MYSQL:
+            return "'" + value.translate(_MYSQL_ESCAPES) + "'"
+
+        # PostgreSQL text can't contain NUL chars, and SQLite would truncate them
+        if '\0' in value:
+            raise ProcessingError(f'Value "{value}" contains a NUL char which cannot be inserted')
+
+        return "'" + value.replace("'", "''") + "'"
+
+    def _create_statement_parts(self, values_count: int) -> None:
+        table = quote_table(self._sql_options.table, self._sql_options.dialect)
+
+        if self._column_names is None:
+            if self._sql_options.conflict_columns:
+                raise ProcessingError('Upserts require column names (a header line or columns set in SQL options)')
+
+            self._prefix = f'INSERT INTO {table} VALUES\n'.encode('utf-8')
+
+            return
+
+        if len(self._column_names) != values_count:
+            raise ProcessingError(f'Expected {len(self._column_names)} number of values (got {values_count})')
+
+        columns = ', '.join(self.quote_identifier(column_name) for column_name in self._column_names)
+        self._prefix = f'INSERT INTO {table} ({columns}) VALUES\n'.encode('utf-8')
+        self._suffix = self._upsert_clause().encode('utf-8')
+
+    def _upsert_clause(self) -> str:
+        if not self._sql_options.conflict_columns or self._column_names is None:
+            return ''
+
+        column_names = self._column_names
+        key_columns: List[str] = []
+
+        for key_column in self._sql_options.conflict_columns:
+            if key_column in column_names:
+                key_columns.append(key_column)
+            elif key_column.isdigit() and int(key_column) < len(column_names):
+                key_columns.append(column_names[int(key_column)])
+            else:
+                raise ValueError(f'Column {key_column} does not exist')
+
+        updated_columns = [
+            self.quote_identifier(column_name) for column_name in column_names if column_name not in key_columns]
+
+        if self._sql_options.dialect == MYSQL:
+            # Updating a key column with its own value turns a duplicate into a no-op
+            assignments = [f'{column} = VALUES({column})' for column in updated_columns] or \
+                [f'{self.quote_identifier(key_columns[0])} = {self.quote_identifier(key_columns[0])}']
+
+            return '\nON DUPLICATE KEY UPDATE ' + ', '.join(assignments)
+
+        conflict_target = ', '.join(self.quote_identifier(key_column) for key_column in key_columns)
+
+        if not updated_columns:
+            return f'\nON CONFLICT ({conflict_target}) DO NOTHING'
+
+        assignments = [f'{column} = excluded.{column}' for column in updated_columns]
+
+        return f'\nON CONFLICT ({conflict_target}) DO UPDATE SET ' + ', '.join(assignments)
+
+    def write_values(self, values: Sequence[Any]) -> None:
+        if self._prefix is None:
+            self._create_statement_parts(len(values))
+        elif self._column_names is not None and len(values) != len(self._column_names):
+            raise ProcessingError(f'Expected {len(self._column_names)} number of values (got {len(values)})')
+
+        row = ('(' + ', '.join([self.literal(value) for value in values]) + ')').encode('utf-8')
+        # Rows are separated by a comma and a new line, and the statement is terminated by a semicolon and a new line
+        row_size = len(row) + 2
+
+        if self._rows and (
+                len(self._rows) >= self._sql_options.rows_per_statement or
+                self._statement_size + row_size > self._sql_options.max_statement_size):
+            self._flush_statement()
+
+        if not self._rows:
+            self._statement_size = len(self._prefix or b'') + len(self._suffix)
+
+            if self._statement_size + row_size > self._sql_options.max_statement_size:
+                raise ProcessingError(
+                    f'Row of {len(row)} bytes exceeds the maximum statement size '
+                    f'of {self._sql_options.max_statement_size} bytes')
+
+        self._rows.append(row)
+        self._statement_size += row_size
+
+    def _flush_statement(self) -> None:
+        if not self._rows or self._file is None:
+            return
+
+        statements_per_transaction = self._sql_options.statements_per_transaction
+
+        if statements_per_transaction and self._statements % statements_per_transaction == 0:
+            self._file.write(b'START TRANSACTION;\n' if self._sql_options.dialect == MYSQL else b'BEGIN;\n')
+
+        self._file.write((self._prefix or b'') + b',\n'.join(self._rows) + self._suffix + b';\n')
+        self._statements += 1
+        self._rows = []
+        self._statement_size = 0
+
+        if statements_per_transaction and self._statements % statements_per_transaction == 0:
+            self._file.write(b'COMMIT;\n')
@@ -1,21 +1,36 @@
+import codecs
+import locale
 from abc import ABC
 from types import TracebackType
-from typing import IO, Optional, Type, TypeVar
+from typing import IO, Any, Iterator, Optional, Type, TypeVar
 
 TextIOType = TypeVar('TextIOType', bound='TextIO')
 
+# Size of chunks in which remainders of oversized lines are read
+LINE_CHUNK_SIZE: int = 1024 * 1024
+
 
 class TextIO(ABC):
     """
     Base class for all text file related operations
     """
-    def __init__(self, file_path: str, file_mode: str) -> None:
+    def __init__(self, file_path: str, file_mode: str, encoding: Optional[str] = None) -> None:
         self._file_path: str = file_path
         self._file_mode: str = file_mode
-        self._file: Optional[IO[str]] = None
+        self._encoding: str = encoding or locale.getpreferredencoding(False)
+        self._file: Optional[IO[Any]] = None
         self._current_line_index: int = -1
         self._current_line: Optional[str] = None
 
+    @property
+    def file_path(self) -> str:
+        """
+        Returns path to the file
+
+        :return: Path to the file
+        """
+        return self._file_path
+
     @property
     def current_line(self) -> Optional[str]:
         """
@@ -35,7 +50,10 @@ class TextIO(ABC):
         return self._current_line_index
 
     def __enter__(self) -> TextIOType:
-        self._file = open(self._file_path, self._file_mode)
+        if 'b' in self._file_mode:
+            self._file = open(self._file_path, self._file_mode)
+        else:
+            self._file = open(self._file_path, self._file_mode, encoding=self._encoding)
 
         return self
 
@@ -53,10 +71,52 @@ class TextIO(ABC):
 
 class TextReader(TextIO):
     """
-    Class for reading text files
+    Class for reading text files.
+    The file is read in binary mode, so offsets are counted in bytes without encoding lines back,
+    and every line is decoded once with the explicit encoding (the platform one by default).
+    A UTF-8 byte order mark is skipped (and switches the default encoding to UTF-8),
+    UTF-16 and UTF-32 files are not supported as their lines cannot be found in bytes.
+    When the maximum line size is set, only the beginning of a longer line is read (see truncated),
+    and the rest of it is either read in chunks by read_remainder or skipped by the next read
     """
-    def __init__(self, file_path: str) -> None:
-        super().__init__(file_path, 'r')
+    def __init__(self, file_path: str, encoding: Optional[str] = None, max_line_size: Optional[int] = None) -> None:
+        super().__init__(file_path, 'rb', encoding)
+        self._explicit_encoding: bool = encoding is not None
+        self._max_line_size: Optional[int] = max_line_size
+        self._current_line_offset: int = 0
+        self._position: int = 0
+        self._line_index_known: bool = True
+        self._truncated: bool = False
+        self._decoder: Optional[codecs.IncrementalDecoder] = None
+        self._pending_remainder: str = ''
+
+    @property
+    def current_line_offset(self) -> int:
+        """
+        Returns byte offset of the current line from the beginning of the file
+
+        :return: Byte offset of the current line
+        """
+        return self._current_line_offset
+
+    @property
+    def position(self) -> int:
+        """
+        Returns byte offset of the next line from the beginning of the file
+
+        :return: Byte offset of the next line
+        """
+        return self._position
+
+    @property
+    def truncated(self) -> bool:
+        """
+        Returns a boolean value indicating whether the current line exceeds the maximum line size
+        (only its beginning is read by read_line, the rest of it is read by read_remainder)
+
+        :return: Boolean value indicating whether the current line has been truncated
+        """
+        return self._truncated
 
     def read_line(self) -> str:
         """
@@ -67,22 +127,140 @@ class TextReader(TextIO):
         if self._file is None:
             raise IOError(f'Cannot read from file {self._file_path}')
 
-        self._current_line = self._file.readline()
-        self._current_line_index += 1
+        # The reader resynchronizes on the terminator of a truncated line whose remainder hasn't been read
+        if self._truncated:
+            for _ in self.read_remainder():
+                pass
+
+        truncated = False
+
+        if self._max_line_size is None:
+            binary_line = self._file.readline()
+        else:
+            # Line terminators (including Windows ones) don't count towards the maximum line size
+            binary_line = self._file.readline(self._max_line_size + 2)
+            content_size = len(binary_line) - (
+                2 if binary_line.endswith(b'\r\n') else 1 if binary_line.endswith(b'\n') else 0)
+
+            truncated = content_size > self._max_line_size
+
+        self._current_line_offset = self._position
+        self._position += len(binary_line)
+
+        if self._current_line_offset == 0:
+            binary_line = self._skip_byte_order_mark(binary_line)
+
+        self._truncated = truncated
+
+        # An oversized line may end right after its beginning, otherwise the beginning may end in the middle
+        # of a multi-byte char which is completed by the remainder
+        if truncated and not binary_line.endswith(b'\n'):
+            self._decoder = codecs.getincrementaldecoder(self._encoding)(errors='replace')
+            line = self._decoder.decode(binary_line)
+
+            # Windows line terminators may be split between the beginning and the remainder
+            if line.endswith('\r'):
+                line = line[:-1]
+                self._pending_remainder = '\r'
+        else:
+            line = binary_line.decode(self._encoding)
+
+        # Line terminators are translated in the same way as by files opened in text mode
+        if line.endswith('\r\n'):
+            line = line[:-2] + '\n'
+
+        self._current_line = line
+
+        # Line indexes are unknown after seeking to an arbitrary offset
+        if self._line_index_known:
+            self._current_line_index += 1
 
         return self._current_line
 
+    def read_remainder(self, chunk_size: int = LINE_CHUNK_SIZE) -> Iterator[str]:
+        """
+        Reads the rest of a truncated line in chunks, so the line is never held in memory as a whole.
+        Invalid bytes are replaced, as the line is read for diagnostic purposes only
+
+        :param chunk_size: Maximum size of a chunk in bytes
+        :return: Iterator of chunks (the last one ends with the line terminator unless the file ends)
+        """
+        if self._file is None:
+            raise IOError(f'Cannot read from file {self._file_path}')
+
+        decoder = self._decoder
+        pending = self._pending_remainder
+        self._truncated = False
+        self._decoder = None
+        self._pending_remainder = ''
+
+        # The line has already been read completely
+        if decoder is None:
+            return
+
+        while True:
+            binary_chunk = self._file.readline(chunk_size)
+            self._position += len(binary_chunk)
+            last_chunk = not binary_chunk or binary_chunk.endswith(b'\n')
+            chunk = pending + decoder.decode(binary_chunk, final=last_chunk)
+            pending = ''
+
+            if last_chunk and chunk.endswith('\r\n'):
+                chunk = chunk[:-2] + '\n'
+            elif not last_chunk and chunk.endswith('\r'):
+                # Windows line terminators may be split between chunks
+                pending = '\r'
+                chunk = chunk[:-1]
+
+            if chunk:
+                yield chunk
+
+            if last_chunk:
+                return
+
+    def _skip_byte_order_mark(self, binary_line: bytes) -> bytes:
+        if binary_line.startswith((codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE, codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            raise ValueError(f'File {self._file_path} is encoded in UTF-16 or UTF-32 which is not supported')
+
+        if not binary_line.startswith(codecs.BOM_UTF8):
+            return binary_line
+
+        if not self._explicit_encoding:
+            self._encoding = 'utf-8'
+
+        return binary_line[len(codecs.BOM_UTF8):]
+
+    def seek(self, offset: int, line_index: Optional[int] = None) -> None:
+        """
+        Moves to a line starting at the byte offset
+
+        :param offset: Byte offset of a line start
+        :param line_index: Optional index of the line starting at the offset
+                           (when it's missing indexes of the following lines are reported as -1)
+        """
+        if self._file is None:
+            raise IOError(f'Cannot seek in file {self._file_path}')
+
+        self._file.seek(offset)
+        self._position = offset
+        self._current_line = None
+        self._truncated = False
+        self._decoder = None
+        self._pending_remainder = ''
+        self._line_index_known = line_index is not None
+        self._current_line_index = line_index - 1 if line_index is not None else -1
+
     @staticmethod
-    def create(file_path: str) -> 'TextReader':
-        return TextReader(file_path)
+    def create(file_path: str, encoding: Optional[str] = None, max_line_size: Optional[int] = None) -> 'TextReader':
+        return TextReader(file_path, encoding, max_line_size)
 
 
 class TextWriter(TextIO):
     """
     Class for write textual information to files
     """
-    def __init__(self, file_path: str) -> None:
-        super().__init__(file_path, 'w')
+    def __init__(self, file_path: str, append: bool = False, encoding: Optional[str] = None) -> None:
+        super().__init__(file_path, 'a' if append else 'w', encoding)
 
     def write_line(self, line: str) -> None:
         """
@@ -102,5 +280,5 @@ class TextWriter(TextIO):
         self._current_line_index += 1
 
     @staticmethod
-    def create(file_path: str) -> 'TextWriter':
-        return TextWriter(file_path)
+    def create(file_path: str, append: bool = False, encoding: Optional[str] = None) -> 'TextWriter':
+        return TextWriter(file_path, append, encoding)
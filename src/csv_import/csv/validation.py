@@ -0,0 +1,269 @@
+import logging
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from logging import Logger
+from typing import Any, Dict, List, Optional, Tuple
+
+from csv_import.csv.index import find_line_start
+from csv_import.csv.parsers import FileParser, LineParser, ParsedLine
+from csv_import.csv.text import TextReader
+
+# Files smaller than this are validated in the current process
+MIN_PARALLEL_FILE_SIZE: int = 4 * 1024 * 1024
+
+
+@dataclass
+class ValidationReport:
+    """
+    Class used for storing results of a file validation
+    """
+
+    good: int = 0
+    skipped: int = 0
+    recovered: int = 0
+    field_count_errors: int = 0
+    errors_by_column: Counter = field(default_factory=Counter)
+    errors_by_value_parser: Counter = field(default_factory=Counter)
+    offending_offsets: List[int] = field(default_factory=list)
+
+    def merge(self, report: 'ValidationReport', max_offending_offsets: int) -> None:
+        """
+        Adds results of another validation (e.g. validation of another part of the same file)
+        :param report: Validation report
+        :param max_offending_offsets: Maximum number of offsets of offending lines kept in the report
+        """
+
+        self.good += report.good
+        self.skipped += report.skipped
+        self.recovered += report.recovered
+        self.field_count_errors += report.field_count_errors
+        self.errors_by_column.update(report.errors_by_column)
+        self.errors_by_value_parser.update(report.errors_by_value_parser)
+        self.offending_offsets = sorted(self.offending_offsets + report.offending_offsets)[:max_offending_offsets]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converts the report into a dictionary which can be serialized into JSON
+        :return: Dictionary containing the report
+        """
+
+        return {
+            'good': self.good,
+            'skipped': self.skipped,
+            'recovered': self.recovered,
+            'field_count_errors': self.field_count_errors,
+            'errors_by_column': dict(self.errors_by_column.most_common()),
+            'errors_by_value_parser': dict(self.errors_by_value_parser.most_common()),
+            'offending_offsets': self.offending_offsets
+        }
+
+
+class _RangeValidator:
+    """
+    Class validating parsed lines and collecting statistics into a report
+    """
+
+    def __init__(
+            self,
+            file_parser: FileParser,
+            column_names: List[str],
+            max_offending_offsets: int,
+            projection: Optional[List[int]] = None) -> None:
+        self._file_parser: FileParser = file_parser
+        self._line_parser: LineParser = file_parser.line_parser
+        self._projection: Optional[List[int]] = projection
+        # Value parsers and errors correspond to projected columns
+        self._column_names: List[str] = column_names if projection is None else [
+            column_names[position] if position < len(column_names) else str(position) for position in projection
+        ]
+        self._max_offending_offsets: int = max_offending_offsets
+        self._report: ValidationReport = ValidationReport()
+
+    @property
+    def report(self) -> ValidationReport:
+        return self._report
+
+    def _column_name(self, position: int) -> str:
+        return self._column_names[position] if position < len(self._column_names) else str(position)
+
+    def _diagnose(self, parsed_line: ParsedLine) -> None:
+        """
+        Finds out which values of a skipped line could not be parsed by the primary line parser
+        """
+
+        value_parsers = self._line_parser.value_parsers
+        values = LineParser.split(parsed_line.line, self._file_parser.options)
+
+        if self._projection is not None:
+            if len(values) <= max(self._projection):
+                self._report.field_count_errors += 1
+                return
+
+            values = [values[position] for position in self._projection]
+
+        if len(values) != len(value_parsers):
+            self._report.field_count_errors += 1
+            return
+
+        for position, (value_parser, value) in enumerate(zip(value_parsers, values)):
+            if value_parser.try_parse(value) is None:
+                self._report.errors_by_column[self._column_name(position)] += 1
+                self._report.errors_by_value_parser[type(value_parser).__name__] += 1
+
+    def add(self, parsed_line: ParsedLine) -> None:
+        if parsed_line.header:
+            return
+
+        if not parsed_line.skipped():
+            self._report.good += 1
+
+            if parsed_line.recovered:
+                self._report.recovered += 1
+
+            return
+
+        self._report.skipped += 1
+        self._diagnose(parsed_line)
+
+        if len(self._report.offending_offsets) < self._max_offending_offsets:
+            self._report.offending_offsets.append(parsed_line.offset)
+
+
+_worker_file_parser: Optional[FileParser] = None
+
+
+def _initialize_worker(file_parser: FileParser) -> None:
+    global _worker_file_parser
+
+    _worker_file_parser = file_parser
+
+
+def _validate_range(
+        input_file_path: str,
+        start_offset: int,
+        end_offset: int,
+        column_names: List[str],
+        max_offending_offsets: int,
+        projection: Optional[List[int]]) -> ValidationReport:
+    if _worker_file_parser is None:
+        raise RuntimeError('Worker has not been initialized')
+
+    validator = _RangeValidator(_worker_file_parser, column_names, max_offending_offsets, projection)
+
+    for parsed_line in _worker_file_parser.parse_range(input_file_path, start_offset, end_offset):
+        validator.add(parsed_line)
+
+    return validator.report
+
+
+class FileValidator:
+    """
+    Class used for validating files without formatting and writing output.
+    Large files are split into byte ranges aligned on line starts which are validated by worker processes.
+    Please note that records spanning several lines (handled by recovery parsers reading next lines) can be
+    counted twice when they cross a range boundary, so a single worker gives exact results for such files
+    """
+
+    DEFAULT_MAX_OFFENDING_OFFSETS: int = 10
+
+    def __init__(
+            self,
+            file_parser: FileParser,
+            workers: int = 1,
+            max_offending_offsets: int = DEFAULT_MAX_OFFENDING_OFFSETS,
+            min_parallel_file_size: int = MIN_PARALLEL_FILE_SIZE) -> None:
+        """
+        :param file_parser: File parser used to parse the file
+        :param workers: Number of worker processes
+        :param max_offending_offsets: Maximum number of offsets of offending lines kept in the report
+        :param min_parallel_file_size: Files smaller than this size are validated in the current process
+        """
+
+        self._logger: Logger = logging.getLogger(__name__)
+        self._file_parser: FileParser = file_parser
+        self._workers: int = workers
+        self._max_offending_offsets: int = max_offending_offsets
+        self._min_parallel_file_size: int = min_parallel_file_size
+
+    def _read_header(self, input_file_path: str) -> Tuple[List[str], int]:
+        """
+        Reads header lines
+        :return: 2-tuple containing column names and the byte offset of the first data line
+        """
+
+        column_names: List[str] = []
+
+        with TextReader.create(input_file_path, self._file_parser.options.encoding) as input_file:
+            for _ in range(self._file_parser.options.header_lines):
+                header_line = input_file.read_line()
+
+                if header_line:
+                    column_names = LineParser.split(header_line, self._file_parser.options)
+
+            return column_names, input_file.position
+
+    def _split(self, input_file_path: str, start_offset: int) -> List[Tuple[int, int]]:
+        file_size = os.path.getsize(input_file_path)
+        range_size = max((file_size - start_offset) // self._workers, 1)
+        offsets = [start_offset]
+
+        with open(input_file_path, 'rb') as binary_file:
+            for worker in range(1, self._workers):
+                offset = find_line_start(binary_file, start_offset + worker * range_size)
+
+                if offsets[-1] < offset < file_size:
+                    offsets.append(offset)
+
+        offsets.append(file_size)
+
+        return list(zip(offsets[:-1], offsets[1:]))
+
+    def validate(self, input_file_path: str) -> ValidationReport:
+        """
+        Validates an input file
+        :param input_file_path: Input file path
+        :return: Validation report
+        """
+
+        self._logger.info(f'Started validating file "{input_file_path}"')
+
+        column_names, data_offset = self._read_header(input_file_path)
+        # Value parsers correspond to projected columns only if the line parser supports projection
+        projection = self._file_parser.projection(input_file_path) \
+            if self._file_parser.line_parser.supports_projection else None
+        report = ValidationReport()
+
+        if self._workers <= 1 or os.path.getsize(input_file_path) < self._min_parallel_file_size:
+            validator = _RangeValidator(self._file_parser, column_names, self._max_offending_offsets, projection)
+
+            for parsed_line in self._file_parser.parse(input_file_path):
+                validator.add(parsed_line)
+
+            report = validator.report
+        else:
+            ranges = self._split(input_file_path, data_offset)
+
+            with ProcessPoolExecutor(
+                    max_workers=self._workers,
+                    initializer=_initialize_worker,
+                    initargs=(self._file_parser,)) as executor:
+                futures = [
+                    executor.submit(
+                        _validate_range,
+                        input_file_path,
+                        start_offset,
+                        end_offset,
+                        column_names,
+                        self._max_offending_offsets,
+                        projection)
+                    for start_offset, end_offset in ranges
+                ]
+
+                for future in futures:
+                    report.merge(future.result(), self._max_offending_offsets)
+
+        self._logger.info(f'Finished validating file "{input_file_path}"')
+
+        return report
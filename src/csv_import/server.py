@@ -0,0 +1,255 @@
+import io
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import socket
+import socketserver
+import threading
+import traceback
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
+from logging import Logger
+from multiprocessing.managers import SyncManager
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple
+
+import click
+
+STDOUT: str = 'stdout'
+STDERR: str = 'stderr'
+EXIT: str = 'exit'
+
+# Number of seconds a connection handler waits for output of a job before checking whether it has finished
+POLL_INTERVAL: float = 0.1
+
+JobFunction = Callable[[List[str]], None]
+
+
+class _QueueStream(io.TextIOBase):
+    """
+    Text stream forwarding everything written to it into a queue (used to redirect standard streams of jobs)
+    """
+
+    def __init__(self, messages: 'queue.Queue[Tuple[str, str]]', name: str) -> None:
+        """
+        :param messages: Queue receiving 2-tuples containing the stream name and written data
+        :param name: Stream name
+        """
+
+        super().__init__()
+        self._messages: 'queue.Queue[Tuple[str, str]]' = messages
+        self._name: str = name
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: str) -> int:
+        # Like other text streams it rejects bytes (click detects binary streams by writing empty bytes to them)
+        if not isinstance(data, str):
+            raise TypeError(f'write() argument must be str, not {type(data).__name__}')
+
+        if data:
+            self._messages.put((self._name, data))
+
+        return len(data)
+
+
+def _run_job(job_function: JobFunction, args: List[str], cwd: str, messages: 'queue.Queue[Tuple[str, str]]') -> int:
+    """
+    Runs a job in a worker process redirecting its standard streams into a queue
+    :param job_function: Function running the job
+    :param args: Command line arguments of the job
+    :param cwd: Working directory of the client (relative paths are resolved against it)
+    :param messages: Queue receiving output of the job
+    :return: Exit code of the job
+    """
+
+    stdout = _QueueStream(messages, STDOUT)
+    stderr = _QueueStream(messages, STDERR)
+    os.chdir(cwd)
+
+    with redirect_stdout(stdout), redirect_stderr(stderr):  # type: ignore
+        try:
+            job_function(args)
+        except click.ClickException as exception:
+            exception.show(stderr)
+
+            return exception.exit_code
+        except click.exceptions.Exit as exception:
+            return exception.exit_code
+        except Exception:
+            stderr.write(traceback.format_exc())
+
+            return 1
+
+    return 0
+
+
+class _JobHandler(socketserver.StreamRequestHandler):
+    """
+    Handler of a single client connection: reads a job request, runs the job in the worker pool
+    and streams its output back as JSON messages (one per line)
+    """
+
+    server: '_UnixJobServer'
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        self.wfile.write(json.dumps(message).encode('utf-8') + b'\n')
+        self.wfile.flush()
+
+    def handle(self) -> None:
+        request = json.loads(self.rfile.readline())
+        job_server = self.server.job_server
+        messages = job_server.manager.Queue()
+        future: Future = job_server.executor.submit(
+            _run_job, job_server.job_function, request['args'], request['cwd'], messages)
+
+        while True:
+            try:
+                stream, data = messages.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                # Output is put into the queue before the job finishes, so nothing is lost after it's done
+                if future.done():
+                    break
+
+                continue
+
+            self._send({'type': stream, 'data': data})
+
+        try:
+            exit_code = future.result()
+        except Exception as exception:
+            # The worker process has crashed
+            self._send({'type': STDERR, 'data': f'Job failed: {exception}\n'})
+            exit_code = 1
+
+        self._send({'type': EXIT, 'code': exit_code})
+
+
+class _UnixJobServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, job_server: 'JobServer') -> None:
+        self.job_server: JobServer = job_server
+        super().__init__(socket_path, _JobHandler)
+
+
+class JobServer:
+    """
+    Class used for running jobs submitted through a local Unix socket on a pool of warm worker processes.
+    Worker processes are reused between jobs, so modules imported by a job (e.g. parser factory plugins)
+    stay loaded for the next ones
+    """
+
+    def __init__(self, socket_path: str, job_function: JobFunction, workers: int = 1) -> None:
+        """
+        :param socket_path: Path to the Unix socket
+        :param job_function: Module-level function running a job with command line arguments (it has to be picklable)
+        :param workers: Number of worker processes
+        """
+
+        self._logger: Logger = logging.getLogger(__name__)
+        self._socket_path: str = socket_path
+        self.job_function: JobFunction = job_function
+        self._workers: int = workers
+        self.manager: SyncManager = multiprocessing.Manager()
+        self.executor: ProcessPoolExecutor = ProcessPoolExecutor(max_workers=workers)
+        self._server: Optional[_UnixJobServer] = None
+        # Set once the server has been created (or failed to start), so shutdown can't miss it
+        self._started: threading.Event = threading.Event()
+
+    def _remove_stale_socket(self) -> None:
+        if not os.path.exists(self._socket_path):
+            return
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client_socket:
+            try:
+                client_socket.connect(self._socket_path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                os.remove(self._socket_path)
+
+                return
+
+        raise ValueError(f'Server is already listening on {self._socket_path}')
+
+    def serve_forever(self) -> None:
+        """
+        Accepts jobs until the server is shut down
+        """
+
+        try:
+            self._remove_stale_socket()
+            self._server = _UnixJobServer(self._socket_path, self)
+        finally:
+            self._started.set()
+
+        self._logger.info(f'Listening on {self._socket_path} with {self._workers} worker processes')
+
+        try:
+            self._server.serve_forever()
+        finally:
+            self.close()
+
+    def wait_until_started(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until the server is listening (called from another thread)
+        :param timeout: Optional number of seconds to wait
+        :return: Boolean value indicating whether the server is listening
+        """
+
+        return self._started.wait(timeout) and self._server is not None
+
+    def shutdown(self) -> None:
+        """
+        Stops accepting jobs (called from another thread after serve_forever has been called)
+        """
+
+        self._started.wait()
+
+        if self._server is not None:
+            self._server.shutdown()
+
+    def close(self) -> None:
+        """
+        Stops worker processes and removes the socket
+        """
+
+        if self._server is not None:
+            self._server.server_close()
+            self._server = None
+
+            if os.path.exists(self._socket_path):
+                os.remove(self._socket_path)
+
+        self.executor.shutdown()
+        self.manager.shutdown()
+
+
+def submit_job(socket_path: str, args: List[str], stdout: IO[str], stderr: IO[str]) -> int:
+    """
+    Submits a job to a running server and streams its output
+    :param socket_path: Path to the Unix socket of the server
+    :param args: Command line arguments of the job
+    :param stdout: Stream receiving standard output of the job
+    :param stderr: Stream receiving standard error of the job
+    :return: Exit code of the job
+    """
+
+    streams = {STDOUT: stdout, STDERR: stderr}
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client_socket:
+        client_socket.connect(socket_path)
+        client_socket.sendall(json.dumps({'args': args, 'cwd': os.getcwd()}).encode('utf-8') + b'\n')
+
+        with client_socket.makefile('rb') as server_file:
+            for message_line in server_file:
+                message = json.loads(message_line)
+
+                if message['type'] == EXIT:
+                    return message['code']
+
+                streams[message['type']].write(message['data'])
+                streams[message['type']].flush()
+
+    raise ConnectionError(f'Server on {socket_path} has closed the connection before the job finished')
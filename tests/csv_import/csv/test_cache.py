@@ -0,0 +1,153 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from parameterized import parameterized
+
+from csv_import.csv.cache import SAMPLE_BLOCK_SIZE, CacheOptions, ResultCache
+
+DATA: bytes = b'ID,Name\n1,a\n2,b\n'
+
+
+class ResultCacheTest(TestCase):
+    def setUp(self) -> None:
+        self._temporary_directory = tempfile.TemporaryDirectory()
+        self._cache_directory = os.path.join(self._temporary_directory.name, 'cache')
+        self._input_file_path = os.path.join(self._temporary_directory.name, 'input.csv')
+        self._output_file_path = os.path.join(self._temporary_directory.name, 'output.csv')
+        self._reject_file_path = os.path.join(self._temporary_directory.name, 'rejects.csv')
+        os.makedirs(self._cache_directory)
+        self._write(self._input_file_path, DATA)
+        self._write(self._output_file_path, b'"ID","Name"\n"1","a"\n')
+
+    def tearDown(self) -> None:
+        self._temporary_directory.cleanup()
+
+    @staticmethod
+    def _write(file_path: str, data: bytes) -> None:
+        with open(file_path, 'wb') as file:
+            file.write(data)
+
+    @staticmethod
+    def _read(file_path: str) -> bytes:
+        with open(file_path, 'rb') as file:
+            return file.read()
+
+    def test_fingerprint_is_stable(self) -> None:
+        # Arrange
+        cache = ResultCache(CacheOptions(self._cache_directory), {'header_lines': 1})
+
+        # Act
+        result = cache.fingerprint(self._input_file_path)
+
+        # Assert
+        self.assertEqual(result, ResultCache(CacheOptions(self._cache_directory), {'header_lines': 1}).fingerprint(
+            self._input_file_path))
+
+    @parameterized.expand([
+        ['changed settings', DATA, {'header_lines': 2}],
+        ['changed file', b'ID,Name\n1,a\n2,c\n', {'header_lines': 1}]
+    ])
+    def test_fingerprint_changes(self, name: str, new_data: bytes, new_settings: dict) -> None:
+        # Arrange
+        cache_options = CacheOptions(self._cache_directory, full_hash=True)
+        fingerprint = ResultCache(cache_options, {'header_lines': 1}).fingerprint(self._input_file_path)
+        self._write(self._input_file_path, new_data)
+        os.utime(self._input_file_path, ns=(0, 0))
+
+        # Act
+        result = ResultCache(cache_options, new_settings).fingerprint(self._input_file_path)
+
+        # Assert
+        self.assertNotEqual(fingerprint, result)
+
+    def test_fingerprint_samples_large_file(self) -> None:
+        # Arrange
+        cache = ResultCache(CacheOptions(self._cache_directory), {})
+        self._write(self._input_file_path, b'1' * 4 * SAMPLE_BLOCK_SIZE)
+        os.utime(self._input_file_path, ns=(0, 0))
+        fingerprint = cache.fingerprint(self._input_file_path)
+        # Changed byte is between the sampled blocks
+        self._write(self._input_file_path, b'1' * SAMPLE_BLOCK_SIZE + b'2' + b'1' * (3 * SAMPLE_BLOCK_SIZE - 1))
+        os.utime(self._input_file_path, ns=(0, 0))
+
+        # Act
+        result = cache.fingerprint(self._input_file_path)
+
+        # Assert
+        self.assertEqual(fingerprint, result)
+
+    def test_store_and_restore(self) -> None:
+        # Arrange
+        cache = ResultCache(CacheOptions(self._cache_directory), {})
+        fingerprint = cache.fingerprint(self._input_file_path)
+        self._write(self._reject_file_path, b'x\n')
+        cache.store(fingerprint, self._output_file_path, self._reject_file_path)
+        os.remove(self._output_file_path)
+        os.remove(self._reject_file_path)
+
+        # Act
+        result = cache.restore(fingerprint, self._output_file_path, self._reject_file_path)
+
+        # Assert
+        self.assertTrue(result)
+        self.assertEqual(b'"ID","Name"\n"1","a"\n', self._read(self._output_file_path))
+        self.assertEqual(b'x\n', self._read(self._reject_file_path))
+
+    def test_restore_misses_unknown_fingerprint(self) -> None:
+        # Act
+        result = ResultCache(CacheOptions(self._cache_directory), {}).restore('0' * 64, self._output_file_path)
+
+        # Assert
+        self.assertFalse(result)
+
+    def test_restore_misses_entry_without_rejects(self) -> None:
+        # Arrange
+        cache = ResultCache(CacheOptions(self._cache_directory), {})
+        fingerprint = cache.fingerprint(self._input_file_path)
+        cache.store(fingerprint, self._output_file_path)
+
+        # Act
+        result = cache.restore(fingerprint, self._output_file_path, self._reject_file_path)
+
+        # Assert
+        self.assertFalse(result)
+
+    def test_store_keeps_entry_when_output_is_overwritten(self) -> None:
+        # Arrange
+        cache = ResultCache(CacheOptions(self._cache_directory), {})
+        fingerprint = cache.fingerprint(self._input_file_path)
+        cache.store(fingerprint, self._output_file_path)
+        self._write(self._output_file_path, b'changed\n')
+
+        # Act
+        cache.restore(fingerprint, self._output_file_path)
+
+        # Assert
+        self.assertEqual(b'"ID","Name"\n"1","a"\n', self._read(self._output_file_path))
+
+    def test_store_evicts_least_recently_used_entries(self) -> None:
+        # Arrange
+        output_size = os.path.getsize(self._output_file_path)
+        cache = ResultCache(CacheOptions(self._cache_directory, max_size=2 * output_size), {})
+        cache.store('a', self._output_file_path)
+        cache.store('b', self._output_file_path)
+        os.utime(os.path.join(self._cache_directory, 'a', ResultCache.ENTRY_FILE_NAME), (0, 0))
+        os.utime(os.path.join(self._cache_directory, 'b', ResultCache.ENTRY_FILE_NAME), (0, 1))
+        cache.restore('a', self._output_file_path)
+
+        # Act
+        cache.store('c', self._output_file_path)
+
+        # Assert
+        self.assertEqual(['a', 'c'], sorted(os.listdir(self._cache_directory)))
+
+    def test_store_skips_output_larger_than_cache(self) -> None:
+        # Arrange
+        cache = ResultCache(CacheOptions(self._cache_directory, max_size=1), {})
+
+        # Act
+        cache.store('a', self._output_file_path)
+
+        # Assert
+        self.assertEqual([], os.listdir(self._cache_directory))
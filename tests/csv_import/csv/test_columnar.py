@@ -0,0 +1,143 @@
+import os
+import tempfile
+from decimal import Decimal
+from typing import Any, List, Sequence
+from unittest import TestCase
+
+from parameterized import parameterized
+
+from csv_import.csv.columnar import (FLOAT64, INT64, STRING, Column,
+                                     ColumnarReader, ColumnarSink)
+from csv_import.csv.parsers import ParserOptions
+from csv_import.csv.processors import ProcessingError
+
+
+class ColumnarSinkTest(TestCase):
+    def setUp(self) -> None:
+        self._temporary_directory = tempfile.TemporaryDirectory()
+        self._directory = os.path.join(self._temporary_directory.name, 'output')
+
+    def tearDown(self) -> None:
+        self._temporary_directory.cleanup()
+
+    @parameterized.expand([
+        ['batch larger than data', 100],
+        ['batch smaller than data', 2]
+    ])
+    def test_write_and_read(self, name: str, batch_size: int) -> None:
+        # Arrange
+        rows = [
+            ['John Doe', '23', '10.5'],
+            ['Bob Doe', '30', '15'],
+            ['Jane Doe', '25', '0.25'],
+            ['Юрий', '40', '1']
+        ]
+        sink = ColumnarSink(
+            self._directory,
+            column_types=[STRING, INT64, FLOAT64],
+            options=ParserOptions(field_terminator=','),
+            batch_size=batch_size)
+
+        # Act
+        with sink:
+            sink.write_header('Name,Age,Salary\n')
+
+            for row in rows:
+                sink.write_values(row)
+
+        # Assert
+        with ColumnarReader(self._directory) as reader:
+            self.assertEqual(
+                [Column('Name', STRING), Column('Age', INT64), Column('Salary', FLOAT64)],
+                reader.columns)
+            self.assertEqual(len(rows), len(reader))
+            self.assertEqual([row[0] for row in rows], list(reader.read_column('Name')))
+            self.assertEqual([int(row[1]) for row in rows], list(reader.read_column('Age')))
+            self.assertEqual([float(row[2]) for row in rows], list(reader.read_column('Salary')))
+            self.assertEqual('Bob Doe', reader.read_column('Name')[1])
+
+    def test_write_infers_column_types_from_typed_values(self) -> None:
+        # Arrange
+        sink = ColumnarSink(self._directory, options=ParserOptions(field_terminator=','))
+
+        # Act
+        with sink:
+            sink.write_header('Name,Age,Salary\n')
+            sink.write_values(['John Doe', 23, 10.5])
+            sink.write_values(['Bob Doe', 30, 15.0])
+
+        # Assert
+        with ColumnarReader(self._directory) as reader:
+            self.assertEqual(
+                [Column('Name', STRING), Column('Age', INT64), Column('Salary', FLOAT64)],
+                reader.columns)
+            self.assertEqual([23, 30], list(reader.read_column('Age')))
+
+    def test_write_accepts_integral_real_values_in_integer_column(self) -> None:
+        # Arrange
+        sink = ColumnarSink(self._directory, column_types=[INT64])
+
+        # Act
+        with sink:
+            sink.write_values([Decimal('2')])
+            sink.write_values([3.0])
+
+        # Assert
+        with ColumnarReader(self._directory) as reader:
+            self.assertEqual([2, 3], list(reader.read_column('column0')))
+
+    def test_write_writes_missing_values_as_empty_strings(self) -> None:
+        # Arrange
+        sink = ColumnarSink(self._directory, column_types=[STRING, STRING])
+
+        # Act
+        with sink:
+            sink.write_values(['a', None])
+            sink.write_values([None, 'None'])
+
+        # Assert
+        with ColumnarReader(self._directory) as reader:
+            self.assertEqual(['a', ''], list(reader.read_column('column0')))
+            self.assertEqual(['', 'None'], list(reader.read_column('column1')))
+
+    def test_write_without_header_uses_generated_names(self) -> None:
+        # Arrange
+        sink = ColumnarSink(self._directory)
+
+        # Act
+        with sink:
+            sink.write_values(['a', 'b'])
+
+        # Assert
+        with ColumnarReader(self._directory) as reader:
+            self.assertEqual([Column('column0'), Column('column1')], reader.columns)
+
+    def test_write_header_without_data_creates_empty_columns(self) -> None:
+        # Arrange
+        sink = ColumnarSink(self._directory, column_types=[INT64], options=ParserOptions())
+
+        # Act
+        with sink:
+            sink.write_header('Age\n')
+
+        # Assert
+        with ColumnarReader(self._directory) as reader:
+            self.assertEqual(0, len(reader))
+            self.assertEqual([], list(reader.read_column('Age')))
+
+    @parameterized.expand([
+        ['non-numeric value', [INT64], ['abc']],
+        ['real value of integer column', [INT64], [1.5]],
+        ['real string of integer column', [INT64], ['1.5']],
+        ['integer out of range', [INT64], [2 ** 63]],
+        ['wrong number of values', [INT64], ['1', '2']]
+    ])
+    def test_write_values_raises_error(self, name: str, column_types: List[str], values: Sequence[Any]) -> None:
+        # Arrange
+        sink = ColumnarSink(self._directory, column_types=column_types)
+
+        # Act, Assert
+        with self.assertRaises(ProcessingError):
+            with sink:
+                sink.write_values(['1'])
+                sink.write_values(values)
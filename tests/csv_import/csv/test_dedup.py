@@ -0,0 +1,111 @@
+from typing import Any, List, Optional, Tuple
+from unittest import TestCase
+from unittest.mock import patch
+
+from parameterized import parameterized
+
+from csv_import.csv.dedup import (HASH_SET_ENTRY_SIZE, BloomFilter,
+                                  DeduplicationOptions, DuplicateFilter)
+
+LINES: List[List[str]] = [[str(index % 7), f'Name {index % 5}'] for index in range(70)]
+
+
+class BloomFilterTest(TestCase):
+    def test_contains(self) -> None:
+        # Arrange
+        bloom_filter = BloomFilter(1024)
+
+        # Act
+        for key in range(0, 2 ** 64, 2 ** 58):
+            bloom_filter.add(key)
+
+        # Assert
+        self.assertTrue(all(key in bloom_filter for key in range(0, 2 ** 64, 2 ** 58)))
+        self.assertFalse(12345 in bloom_filter)
+
+
+class DuplicateFilterTest(TestCase):
+    def _filter(self, options: DeduplicationOptions, lines: List[List[Any]]) -> Tuple[List[List[Any]], DuplicateFilter]:
+        with DuplicateFilter(options) as duplicate_filter:
+            duplicate_filter.set_column_names(['ID', 'Name'])
+            result = [values for values in lines if duplicate_filter.add(values)]
+            result.extend(duplicate_filter.verify())
+
+        return result, duplicate_filter
+
+    @parameterized.expand([
+        ['all columns', None, 35],
+        ['key column name', ('ID',), 7],
+        ['key column position', ('1',), 5]
+    ])
+    def test_add(self, name: str, key_columns: Optional[Tuple[str, ...]], expected_count: int) -> None:
+        # Act
+        result, duplicate_filter = self._filter(DeduplicationOptions(key_columns=key_columns), LINES)
+
+        # Assert
+        self.assertEqual(expected_count, len(result))
+        self.assertEqual(LINES[:expected_count], result)
+        self.assertEqual(70 - expected_count, duplicate_filter.statistics.duplicates)
+        self.assertEqual(0, duplicate_filter.statistics.spilled_runs)
+
+    @parameterized.expand([
+        ['memory limit exceeded', 10 * HASH_SET_ENTRY_SIZE],
+        # Bloom filter of a single byte reports almost every line as a possible duplicate
+        ['bloom filter full of false positives', 1]
+    ])
+    def test_add_exceeding_memory_limit(self, name: str, memory_limit: int) -> None:
+        # Arrange
+        lines = [[str(index)] for index in range(1000)] + [[str(index)] for index in range(0, 1000, 3)]
+
+        # Act
+        result, duplicate_filter = self._filter(DeduplicationOptions(memory_limit=memory_limit), lines)
+
+        # Assert
+        self.assertEqual(sorted(lines[:1000]), sorted(result))
+        self.assertEqual(334, duplicate_filter.statistics.duplicates)
+        self.assertGreater(duplicate_filter.statistics.spilled_runs, 0)
+        self.assertEqual(
+            duplicate_filter.statistics.deferred,
+            duplicate_filter.statistics.false_positives + 334)
+
+    def test_add_exceeding_memory_limit_with_typed_values(self) -> None:
+        # Arrange
+        lines = [[index % 10, index % 3] for index in range(100)]
+
+        # Act
+        result, duplicate_filter = self._filter(DeduplicationOptions(memory_limit=1), lines)
+
+        # Assert
+        self.assertEqual(sorted(lines[:30]), sorted(result))
+        self.assertEqual(70, duplicate_filter.statistics.duplicates)
+
+    def test_add_keeps_distinct_typed_values_with_equal_builtin_hashes(self) -> None:
+        # Arrange
+        lines = [[-1, 'x'], [-2, 'x'], [1, 'x'], [1.0, 'x'], [-1, 'x']]
+
+        # Act
+        result, duplicate_filter = self._filter(DeduplicationOptions(), lines)
+
+        # Assert
+        self.assertEqual(lines[:4], result)
+        self.assertEqual(1, duplicate_filter.statistics.duplicates)
+
+    def test_verify_compares_values_of_lines_with_equal_hashes(self) -> None:
+        # Arrange
+        lines = [['a'], ['b'], ['c'], ['b']]
+
+        # Act
+        # Every line but the first one collides, and the Bloom filter is created after the first line
+        with patch.object(DuplicateFilter, '_hash', side_effect=lambda encoding: 1 if 'a' in encoding else 2):
+            result, duplicate_filter = self._filter(DeduplicationOptions(memory_limit=HASH_SET_ENTRY_SIZE - 1), lines)
+
+        # Assert
+        self.assertEqual([['a'], ['b'], ['c']], result)
+        self.assertEqual(2, duplicate_filter.statistics.deferred)
+        self.assertEqual(1, duplicate_filter.statistics.false_positives)
+        self.assertEqual(1, duplicate_filter.statistics.duplicates)
+
+    def test_add_raises_error_for_unknown_key_column(self) -> None:
+        # Act, Assert
+        with self.assertRaises(ValueError):
+            self._filter(DeduplicationOptions(key_columns=('Age',)), LINES)
@@ -0,0 +1,105 @@
+import os
+import tempfile
+from typing import List
+from unittest import TestCase
+
+from parameterized import parameterized
+
+from csv_import.csv.diff import DiffOptions, FileDiffer
+from csv_import.csv.parsers import (FileParser, IntegerParser, LineParser,
+                                    NumberParser, ParserOptions, StringParser)
+
+OLD_DATA: str = 'ID,Name\n1,John\n2,Bob\n3,Ann\n5,Kate\n'
+NEW_DATA: str = 'ID,Name\n2,Bobby\n1,John\n4,Eve\nx,Tom\n5,Kate\n'
+
+
+class FileDifferTest(TestCase):
+    def setUp(self) -> None:
+        self._temporary_directory = tempfile.TemporaryDirectory()
+
+        for file_name, data in (('old.csv', OLD_DATA), ('new.csv', NEW_DATA)):
+            with open(self._path(file_name), 'w') as file:
+                file.write(data)
+
+    def tearDown(self) -> None:
+        self._temporary_directory.cleanup()
+
+    def _path(self, file_name: str) -> str:
+        return os.path.join(self._temporary_directory.name, file_name)
+
+    def _read_lines(self, file_name: str) -> List[str]:
+        with open(self._path(file_name)) as file:
+            return file.read().splitlines()
+
+    def _create_differ(self, options: DiffOptions) -> FileDiffer:
+        parser_options = ParserOptions(field_terminator=',', error_sample_size=0)
+        file_parser = FileParser(LineParser([NumberParser(), StringParser()], parser_options), parser_options)
+
+        return FileDiffer(file_parser, options)
+
+    @parameterized.expand([
+        ['old version fits into memory', DiffOptions(('ID',)), False],
+        ['partitioned old version', DiffOptions(('ID',), memory_limit=0), True]
+    ])
+    def test_diff(self, name: str, options: DiffOptions, partitioned: bool) -> None:
+        # Arrange
+        differ = self._create_differ(options)
+
+        # Act
+        statistics = differ.diff(
+            self._path('old.csv'),
+            self._path('new.csv'),
+            self._path('inserts.csv'),
+            self._path('updates.csv'),
+            self._path('deletes.csv'))
+
+        # Assert
+        self.assertEqual(['ID,Name', '4,Eve'], self._read_lines('inserts.csv'))
+        self.assertEqual(['ID,Name', '2,Bobby'], self._read_lines('updates.csv'))
+        self.assertEqual(['ID,Name', '3,Ann'], self._read_lines('deletes.csv'))
+        self.assertEqual(
+            (1, 1, 1, 2), (statistics.inserts, statistics.updates, statistics.deletes, statistics.unchanged))
+        self.assertEqual(partitioned, statistics.partitions > 0)
+
+    @parameterized.expand([
+        ['old version fits into memory', DiffOptions(('ID',))],
+        ['partitioned old version', DiffOptions(('ID',), memory_limit=0)]
+    ])
+    def test_diff_detects_changes_of_typed_values_with_equal_builtin_hashes(
+            self,
+            name: str,
+            options: DiffOptions) -> None:
+        # Arrange
+        for file_name, data in (('old.csv', 'ID,Value\n1,-1\n2,5\n'), ('new.csv', 'ID,Value\n1,-2\n2,5\n')):
+            with open(self._path(file_name), 'w') as file:
+                file.write(data)
+
+        parser_options = ParserOptions(field_terminator=',', error_sample_size=0)
+        file_parser = FileParser(LineParser([IntegerParser(), IntegerParser()], parser_options), parser_options)
+
+        # Act
+        statistics = FileDiffer(file_parser, options).diff(
+            self._path('old.csv'),
+            self._path('new.csv'),
+            self._path('inserts.csv'),
+            self._path('updates.csv'),
+            self._path('deletes.csv'))
+
+        # Assert
+        self.assertEqual(['ID,Value', '1,-2'], self._read_lines('updates.csv'))
+        self.assertEqual(
+            (0, 1, 0, 1),
+            (statistics.inserts, statistics.updates, statistics.deletes, statistics.unchanged))
+
+    def test_diff_raises_error_for_unknown_key_column(self) -> None:
+        # Arrange
+        differ = self._create_differ(DiffOptions(('Age',)))
+
+        # Act, Assert
+        with self.assertRaises(ValueError):
+            differ.diff(
+                self._path('old.csv'),
+                self._path('new.csv'),
+                self._path('inserts.csv'),
+                self._path('updates.csv'),
+                self._path('deletes.csv'))
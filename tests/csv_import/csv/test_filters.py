@@ -0,0 +1,70 @@
+from typing import List
+from unittest import TestCase
+
+from parameterized import parameterized
+
+from csv_import.csv.filters import RowFilter
+
+COLUMN_NAMES: List[str] = ['id', 'status', 'amount', 'created at']
+
+
+class RowFilterTest(TestCase):
+    @parameterized.expand([
+        ['string equality', "status == 'ACTIVE'", ['1', 'ACTIVE', '10', '2024-01-01'], True],
+        ['string inequality', "status != 'ACTIVE'", ['1', 'ACTIVE', '10', '2024-01-01'], False],
+        ['numeric comparison', 'amount >= 100', ['1', 'ACTIVE', '99.5', '2024-01-01'], False],
+        ['numeric comparison is not lexicographic', 'amount > 9', ['1', 'ACTIVE', '10', '2024-01-01'], True],
+        ['non-numeric value', 'amount > 9', ['1', 'ACTIVE', 'n/a', '2024-01-01'], False],
+        ['reversed comparison', '100 < amount', ['1', 'ACTIVE', '150', '2024-01-01'], True],
+        ['chained comparison', '10 <= amount < 20', ['1', 'ACTIVE', '20', '2024-01-01'], False],
+        ['column function', "column('created at') >= '2024-01-01'", ['1', 'ACTIVE', '10', '2024-02-01'], True],
+        ['column position', "column(1) == 'ACTIVE'", ['1', 'ACTIVE', '10', '2024-01-01'], True],
+        ['membership', "status in ('ACTIVE', 'NEW')", ['1', 'NEW', '10', '2024-01-01'], True],
+        ['numeric membership', 'id not in [1, 2]', ['1.0', 'NEW', '10', '2024-01-01'], False],
+        ['boolean operators', "not (status == 'CLOSED' or amount < 5)", ['1', 'NEW', '10', '2024-01-01'], True],
+        ['comparison of columns', 'id < amount', ['1', 'NEW', '2', '2024-01-01'], True],
+        ['non-empty column', "column('created at') or amount", ['1', 'NEW', '', ''], False]
+    ])
+    def test_bind(self, name: str, expression: str, fields: List[str], expected_result: bool) -> None:
+        # Arrange
+        row_filter = RowFilter(expression)
+
+        # Act
+        predicate, _ = row_filter.bind(COLUMN_NAMES)
+
+        # Assert
+        self.assertEqual(expected_result, predicate(fields))
+
+    def test_bind_returns_number_of_needed_fields(self) -> None:
+        # Act
+        _, values_count = RowFilter("status == 'ACTIVE' or column(0) == '1'").bind(COLUMN_NAMES)
+
+        # Assert
+        self.assertEqual(2, values_count)
+
+    @parameterized.expand([
+        ['syntax error', 'status =='],
+        ['function call', "open('file')"],
+        ['arithmetic', 'amount * 2 > 10'],
+        ['comparison of constants', '1 < 2'],
+        ['membership in a column', "'A' in status"],
+        ['mixed membership list', "status in ('A', 1)"]
+    ])
+    def test_init_raises_error_for_unsupported_expression(self, name: str, expression: str) -> None:
+        # Act, Assert
+        with self.assertRaises(ValueError):
+            RowFilter(expression)
+
+    @parameterized.expand([
+        ['unknown column name', 'region == 1', COLUMN_NAMES, None],
+        ['position out of range', 'column(7) == 1', [], 3]
+    ])
+    def test_bind_raises_error_for_unknown_column(
+            self,
+            name: str,
+            expression: str,
+            column_names: List[str],
+            columns_count: int) -> None:
+        # Act, Assert
+        with self.assertRaises(ValueError):
+            RowFilter(expression).bind(column_names, columns_count)
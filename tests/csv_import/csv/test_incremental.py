@@ -0,0 +1,71 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from parameterized import parameterized
+
+from csv_import.csv.incremental import TAIL_CHECKSUM_SIZE, IncrementalState
+
+DATA: bytes = b'ID,Name\n1,a\n2,b\n'
+
+
+class IncrementalStateTest(TestCase):
+    def setUp(self) -> None:
+        self._temporary_directory = tempfile.TemporaryDirectory()
+        self._file_path = os.path.join(self._temporary_directory.name, 'input.csv')
+
+        with open(self._file_path, 'wb') as file:
+            file.write(DATA)
+
+    def tearDown(self) -> None:
+        self._temporary_directory.cleanup()
+
+    @parameterized.expand([
+        ['appended file', DATA + b'3,c\n', True],
+        ['unchanged file', DATA, True],
+        ['truncated file', DATA[:10], False],
+        ['rewritten file', b'ID,Name\n1,x\n2,b\n3,c\n', False]
+    ])
+    def test_matches(self, name: str, new_data: bytes, expected_result: bool) -> None:
+        # Arrange
+        state = IncrementalState.create(self._file_path, len(DATA), 3)
+
+        with open(self._file_path, 'wb') as file:
+            file.write(new_data)
+
+        # Act
+        result = state.matches(self._file_path)
+
+        # Assert
+        self.assertEqual(expected_result, result)
+
+    def test_create_limits_checksum_size(self) -> None:
+        # Arrange
+        with open(self._file_path, 'wb') as file:
+            file.write(b'1\n' * TAIL_CHECKSUM_SIZE)
+
+        # Act
+        result = IncrementalState.create(self._file_path, 2 * TAIL_CHECKSUM_SIZE, TAIL_CHECKSUM_SIZE)
+
+        # Assert
+        self.assertEqual(TAIL_CHECKSUM_SIZE, result.tail_size)
+        self.assertTrue(result.matches(self._file_path))
+
+    def test_save_and_load(self) -> None:
+        # Arrange
+        state = IncrementalState.create(self._file_path, 12, 2)
+        state_file_path = IncrementalState.state_file_path(self._file_path)
+
+        # Act
+        state.save(state_file_path)
+        result = IncrementalState.load(state_file_path)
+
+        # Assert
+        self.assertEqual(state, result)
+
+    def test_load_returns_none_for_missing_state(self) -> None:
+        # Act
+        result = IncrementalState.load(IncrementalState.state_file_path(self._file_path))
+
+        # Assert
+        self.assertIsNone(result)
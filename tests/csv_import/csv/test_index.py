@@ -0,0 +1,152 @@
+import io
+import os
+import tempfile
+from unittest import TestCase
+
+from parameterized import parameterized
+
+from csv_import.csv.index import (LineIndex, estimate_lines_count,
+                                  find_last_line_end, find_line_start,
+                                  find_tail_offset)
+
+DATA: bytes = b'abc\nde\n\nfghi\nj'
+
+
+class LineIndexTest(TestCase):
+    def setUp(self) -> None:
+        self._temporary_directory = tempfile.TemporaryDirectory()
+        self._file_path = os.path.join(self._temporary_directory.name, 'input.csv')
+
+        with open(self._file_path, 'wb') as file:
+            file.write(DATA)
+
+    def tearDown(self) -> None:
+        self._temporary_directory.cleanup()
+
+    @parameterized.expand([
+        ['first line', 0, (0, 0)],
+        ['line before the second checkpoint', 1, (0, 0)],
+        ['second checkpoint', 2, (7, 2)],
+        ['last line', 4, (13, 4)]
+    ])
+    def test_locate(self, name: str, line_index: int, expected_result: tuple) -> None:
+        # Arrange
+        index = LineIndex.build(self._file_path, step=2)
+
+        # Act
+        result = index.locate(line_index)
+
+        # Assert
+        self.assertEqual(5, index.lines_count)
+        self.assertEqual(expected_result, result)
+
+    def test_locate_raises_error_for_lines_out_of_range(self) -> None:
+        # Arrange
+        index = LineIndex.build(self._file_path)
+
+        # Act, Assert
+        with self.assertRaises(IndexError):
+            index.locate(5)
+
+    def test_save_and_load(self) -> None:
+        # Arrange
+        index = LineIndex.build(self._file_path, step=2)
+
+        # Act
+        index.save(LineIndex.index_file_path(self._file_path))
+        loaded_index = LineIndex.load(self._file_path)
+
+        # Assert
+        self.assertIsNotNone(loaded_index)
+        self.assertEqual(index.lines_count, loaded_index.lines_count)
+        self.assertEqual(index.locate(3), loaded_index.locate(3))
+
+    def test_load_ignores_stale_index(self) -> None:
+        # Arrange
+        LineIndex.build(self._file_path).save(LineIndex.index_file_path(self._file_path))
+
+        with open(self._file_path, 'ab') as file:
+            file.write(b'\nklm')
+
+        # Act
+        with self.assertLogs('csv_import.csv.index', 'WARNING'):
+            result = LineIndex.load(self._file_path)
+
+        # Assert
+        self.assertIsNone(result)
+
+    def test_load_returns_none_for_missing_index(self) -> None:
+        # Act
+        result = LineIndex.load(self._file_path)
+
+        # Assert
+        self.assertIsNone(result)
+
+
+class SeekFunctionsTest(TestCase):
+    @parameterized.expand([
+        ['beginning of the file', 0, 0],
+        ['line start', 4, 4],
+        ['middle of a line', 5, 7],
+        ['empty line', 7, 7],
+        ['middle of the last line', 14, 14]
+    ])
+    def test_find_line_start(self, name: str, offset: int, expected_result: int) -> None:
+        # Act
+        result = find_line_start(io.BytesIO(DATA), offset)
+
+        # Assert
+        self.assertEqual(expected_result, result)
+
+    @parameterized.expand([
+        ['no lines', DATA, 0, 0, len(DATA)],
+        ['one line', DATA, 1, 0, 13],
+        ['several lines', DATA, 3, 0, 7],
+        ['more lines than the file has', DATA, 10, 0, 0],
+        ['lower bound', DATA, 10, 4, 4],
+        ['terminated last line', b'abc\nde\n', 1, 0, 4]
+    ])
+    def test_find_tail_offset(
+            self,
+            name: str,
+            data: bytes,
+            lines_count: int,
+            lower_bound: int,
+            expected_result: int) -> None:
+        # Act
+        result = find_tail_offset(io.BytesIO(data), lines_count, lower_bound)
+
+        # Assert
+        self.assertEqual(expected_result, result)
+
+    @parameterized.expand([
+        ['whole file', b'ab\ncd\nef\n', 0, 100, 3],
+        ['unterminated last line', b'ab\ncd\nef', 0, 100, 3],
+        ['estimated from the beginning', b'ab\n' * 100, 0, 30, 100],
+        ['offset at the end', b'ab\n', 3, 100, 0]
+    ])
+    def test_estimate_lines_count(
+            self,
+            name: str,
+            data: bytes,
+            offset: int,
+            sample_size: int,
+            expected_result: int) -> None:
+        # Act
+        result = estimate_lines_count(io.BytesIO(data), offset, len(data), sample_size)
+
+        # Assert
+        self.assertEqual(expected_result, result)
+
+    @parameterized.expand([
+        ['incomplete last line', DATA, 13],
+        ['terminated last line', b'abc\nde\n', 7],
+        ['no terminated lines', b'abc', 0],
+        ['empty file', b'', 0]
+    ])
+    def test_find_last_line_end(self, name: str, data: bytes, expected_result: int) -> None:
+        # Act
+        result = find_last_line_end(io.BytesIO(data))
+
+        # Assert
+        self.assertEqual(expected_result, result)
@@ -0,0 +1,107 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from parameterized import parameterized
+
+from csv_import.csv.lookup import (HashLookupIndex, LookupIndex, LookupOptions,
+                                   SortedLookupIndex)
+from csv_import.csv.parsers import ParserOptions
+
+REFERENCE_OPTIONS: ParserOptions = ParserOptions(field_terminator=',')
+
+
+class LookupIndexTest(TestCase):
+    def setUp(self) -> None:
+        self._temporary_directory = tempfile.TemporaryDirectory()
+        self._reference_file_path = os.path.join(self._temporary_directory.name, 'customers.csv')
+
+        with open(self._reference_file_path, 'w') as reference_file:
+            reference_file.write('name,customer_id,region\nAnn,1,EU\nBob,2,US\nAnn,1,ASIA\nbroken\nŁucja,ą,EU\n')
+
+    def tearDown(self) -> None:
+        self._temporary_directory.cleanup()
+
+    def _options(self, **kwargs: object) -> LookupOptions:
+        return LookupOptions(self._reference_file_path, 'customer_id', **kwargs)  # type: ignore
+
+    @parameterized.expand([
+        ['hash index', 1024 * 1024, HashLookupIndex],
+        ['sorted index', 1, SortedLookupIndex]
+    ])
+    def test_lookup(self, name: str, memory_limit: int, expected_type: type) -> None:
+        # Arrange
+        with LookupIndex.create(self._options(memory_limit=memory_limit), REFERENCE_OPTIONS) as index:
+            # Act
+            results = [index.lookup(key) for key in ['1', '2', '3', 'ą']]
+
+            # Assert
+            self.assertIsInstance(index, expected_type)
+            self.assertEqual(['name', 'region'], index.value_names)
+            self.assertEqual([('Ann', 'EU'), ('Bob', 'US'), None, ('Łucja', 'EU')], results)
+            self.assertEqual({'lookups': 4, 'hits': 3, 'misses': 1, 'hit_rate': 0.75}, index.statistics.to_dict())
+
+    @parameterized.expand([
+        ['hash index', 1024 * 1024],
+        ['sorted index', 1]
+    ])
+    def test_lookup_many(self, name: str, memory_limit: int) -> None:
+        # Arrange
+        options = self._options(memory_limit=memory_limit, value_columns=('region',))
+
+        with LookupIndex.create(options, REFERENCE_OPTIONS) as index:
+            # Act
+            result = index.lookup_many(['ą', '3', '1', 'ą'])
+
+            # Assert
+            self.assertEqual([('EU',), None, ('EU',), ('EU',)], result)
+            self.assertEqual(3, index.statistics.hits)
+
+    @parameterized.expand([
+        ['hash index', 1024 * 1024, HashLookupIndex],
+        ['sorted index', 1, SortedLookupIndex]
+    ])
+    def test_create_reuses_cached_index(self, name: str, memory_limit: int, expected_type: type) -> None:
+        # Arrange
+        options = self._options(memory_limit=memory_limit)
+        LookupIndex.create(options, REFERENCE_OPTIONS).close()
+
+        # Act
+        with self.assertLogs('csv_import.csv.lookup', 'INFO') as logs:
+            with LookupIndex.create(options, REFERENCE_OPTIONS) as result:
+                result.lookup('1')
+
+        # Assert
+        self.assertIsInstance(result, expected_type)
+        self.assertTrue(os.path.exists(self._reference_file_path + LookupIndex.FILE_EXTENSION))
+        self.assertIn('Loaded lookup index', logs.output[0])
+        self.assertIn('Looked up 1 keys', logs.output[-1])
+
+    def test_create_rebuilds_stale_index(self) -> None:
+        # Arrange
+        LookupIndex.create(self._options(), REFERENCE_OPTIONS).close()
+
+        with open(self._reference_file_path, 'a') as reference_file:
+            reference_file.write('Cecil,3,EU\n')
+
+        # Act
+        with self.assertLogs('csv_import.csv.lookup', 'WARNING'):
+            with LookupIndex.create(self._options(), REFERENCE_OPTIONS) as result:
+                # Assert
+                self.assertEqual(('Cecil', 'EU'), result.lookup('3'))
+
+    def test_create_removes_temporary_index(self) -> None:
+        # Arrange
+        options = self._options(memory_limit=1, cache_index=False)
+
+        # Act
+        with LookupIndex.create(options, REFERENCE_OPTIONS) as index:
+            index.lookup('1')
+
+        # Assert
+        self.assertEqual(['customers.csv'], os.listdir(self._temporary_directory.name))
+
+    def test_create_raises_error_for_unknown_column(self) -> None:
+        # Act, Assert
+        with self.assertRaises(ValueError):
+            LookupIndex.create(self._options(value_columns=('country',)), REFERENCE_OPTIONS)
@@ -1,13 +1,24 @@
-from typing import List, Optional, Type
+import os
+import re
+import tempfile
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, FrozenSet, List, Optional, Type
 from unittest import TestCase, mock
-from unittest.mock import MagicMock, create_autospec
+from unittest.mock import MagicMock, create_autospec, patch
 
 from parameterized import parameterized
 
-from csv_import.csv.parsers import (EchoValueParser, FileParser,
-                                    FileParserFactory, Line, LineParser,
+from csv_import.csv.index import LineIndex
+from csv_import.csv.parsers import (AdaptiveLineParserDispatcher, DateParser,
+                                    DateTimeParser, DecimalParser,
+                                    EchoValueParser, FieldTooLargeError,
+                                    FileParser, FileParserFactory, FloatParser,
+                                    IntegerParser, LazyParsedLine, Line,
+                                    LineParser, LineParserDispatcher,
                                     NumberParser, ParsedLine, ParserOptions,
-                                    ParsingError, StringParser, ValueParser)
+                                    ParsingError, SplitFields, StringParser,
+                                    ValueParser, resolve_projection)
 from csv_import.csv.text import TextReader
 from tests.csv_import.csv.test_text import mock_builtin_open
 
@@ -30,6 +41,97 @@ class NumberParserTest(TestCase):
             else:
                 raise
 
+    @parameterized.expand([
+        ('0', '0'),
+        ('123', '123'),
+        ('s', None)
+    ])
+    def test_try_parse(self, number_string: str, expected_result: Optional[str]) -> None:
+        # Arrange
+        parser = NumberParser()
+
+        # Act
+        result = parser.try_parse(number_string)
+
+        # Assert
+        self.assertEqual(expected_result, result)
+
+
+class IntegerParserTest(TestCase):
+    @parameterized.expand([
+        ['integer', None, '123', 123],
+        ['negative integer', None, '-5', -5],
+        ['thousands separator', ',', '10,000', 10000],
+        ['misplaced thousands separator', ',', '10,00', None],
+        ['thousands separator is not set', None, '10,000', None],
+        ['real number', ',', '1.5', None],
+        ['string', None, 's', None]
+    ])
+    def test_try_parse(
+            self,
+            name: str,
+            thousands_separator: Optional[str],
+            string: str,
+            expected_result: Optional[int]) -> None:
+        # Arrange
+        parser = IntegerParser(thousands_separator)
+
+        # Act
+        result = parser.try_parse(string)
+
+        # Assert
+        self.assertEqual(expected_result, result)
+
+    def test_parse_raises_error(self) -> None:
+        # Act, Assert
+        with self.assertRaises(ParsingError):
+            IntegerParser().parse('s')
+
+
+class FloatParserTest(TestCase):
+    @parameterized.expand([
+        ['float', FloatParser(), '10.5', 10.5],
+        ['exponent', FloatParser(), '1e3', 1000.0],
+        ['decimal comma', FloatParser(decimal_separator=',', thousands_separator=' '), '10 000,5', 10000.5],
+        ['decimal', DecimalParser(), '0.10', Decimal('0.10')],
+        ['decimal with thousands separator', DecimalParser(thousands_separator=','), '1,000.25', Decimal('1000.25')],
+        ['string', DecimalParser(), 'abc', None]
+    ])
+    def test_try_parse(self, name: str, parser: FloatParser, string: str, expected_result: Any) -> None:
+        # Act
+        result = parser.try_parse(string)
+
+        # Assert
+        self.assertEqual(expected_result, result)
+        self.assertEqual(type(expected_result), type(result))
+
+
+class DateTimeParserTest(TestCase):
+    @parameterized.expand([
+        ['iso timestamp', DateTimeParser(), '2020-01-31T10:20:30', datetime(2020, 1, 31, 10, 20, 30)],
+        ['iso date', DateParser(), '2020-01-31', date(2020, 1, 31)],
+        ['second format', DateParser(['%Y-%m-%d', '%d.%m.%Y']), '31.01.2020', date(2020, 1, 31)],
+        ['incorrect timestamp', DateTimeParser(['%Y-%m-%d %H:%M']), '2020-01-31', None]
+    ])
+    def test_try_parse(self, name: str, parser: DateTimeParser, string: str, expected_result: Any) -> None:
+        # Act
+        result = parser.try_parse(string)
+
+        # Assert
+        self.assertEqual(expected_result, result)
+
+    def test_try_parse_memoizes_results(self) -> None:
+        # Arrange
+        parser = DateParser(['%d.%m.%Y'])
+
+        # Act
+        with patch.object(parser, '_parse_formats', wraps=parser._parse_formats) as parse_formats_mock:
+            results = [parser.try_parse('31.01.2020') for _ in range(3)]
+
+        # Assert
+        self.assertEqual([date(2020, 1, 31)] * 3, results)
+        parse_formats_mock.assert_called_once()
+
 
 class StringValueParser(TestCase):
     @parameterized.expand([
@@ -111,6 +213,70 @@ class LineParserTest(TestCase):
         # Assert
         self.assertEqual(expected_result, result)
 
+    @parameterized.expand([
+        ['limit lower than the number of values', 'a\tb\tc\td', 2, ['a', 'b']],
+        ['limit equal to the number of values', 'a\tb\tc', 3, ['a', 'b', 'c']],
+        ['limit greater than the number of values', 'a\tb', 3, ['a', 'b']],
+        ['empty first value', '\tb\tc', 1, ['']],
+        ['enclosed terminator', '"a\tb"\tc\td', 1, ['a\tb']]
+    ])
+    def test_split_with_max_values(self, name: str, string: str, max_values: int, expected_result: List[str]) -> None:
+        # Act
+        result = LineParser.split(string, ParserOptions(field_enclosing_value='"'), max_values)
+
+        # Assert
+        self.assertEqual(expected_result, result)
+
+    @parameterized.expand([
+        ['empty string', '', None, []],
+        ['trailing line terminator', 'a\tb\n', None, [0, 1, 2, 3]],
+        ['trimmed whitespaces', ' a \t b', None, [1, 2, 5, 6]],
+        ['enclosed values', '"a\tb"\t"c"', None, [1, 4, 7, 8]],
+        ['empty last value', 'a\t\n', None, [0, 1]],
+        ['empty first value', '\t', None, []],
+        ['limit', 'a\tb\tc', 2, [0, 1, 2, 3]]
+    ])
+    def test_split_offsets(self, name: str, string: str, max_values: Optional[int], expected_result: List[int]) -> None:
+        # Act
+        result = LineParser.split_offsets(string, ParserOptions(field_enclosing_value='"'), max_values)
+
+        # Assert
+        self.assertEqual(expected_result, list(result or []))
+
+    @parameterized.expand([
+        ['string', ' a \t"b\tc"\t\td\n'],
+        ['enclosing chars in the middle of a value', 'a"b"c\td'],
+        ['unclosed enclosing char', 'a\t"b\tc'],
+        ['whitespaces only', '  \n']
+    ])
+    def test_split_fields_returns_same_values_as_split(self, name: str, string: str) -> None:
+        # Arrange
+        options = ParserOptions(field_enclosing_value='"')
+
+        # Act
+        result = LineParser.split_fields(string, options)
+
+        # Assert
+        self.assertEqual(LineParser.split(string, options), list(result))
+        self.assertEqual(LineParser.split(string, options, 1), list(LineParser.split_fields(string, options, 1)))
+
+    def test_split_offsets_returns_none_for_values_which_are_not_slices(self) -> None:
+        # Act
+        result = LineParser.split_offsets('a"b"c\td', ParserOptions(field_enclosing_value='"'))
+
+        # Assert
+        self.assertIsNone(result)
+
+    def test_split_fields_creates_strings_of_accessed_values(self) -> None:
+        # Act
+        result = LineParser.split_fields('a\tb\tc', ParserOptions())
+
+        # Assert
+        self.assertIsInstance(result, SplitFields)
+        self.assertEqual(3, len(result))
+        self.assertEqual(['c', 'b'], [result[-1], result[1]])
+        self.assertEqual(['a', 'b'], result[:2])
+
     @parameterized.expand([
         [
             'empty string and empty value parsers list (skip errors = True)',
@@ -219,6 +385,252 @@ class LineParserTest(TestCase):
         self.assertEqual(line, parsed_line.parsed_values[0])
         next_line_parser_mock.parse.assert_called_once()
 
+    @parameterized.expand([
+        ['matching number of fields', '1\t2', True],
+        ['wrong number of fields', '1\t2\t3', False],
+        ['empty string', '', False]
+    ])
+    def test_can_parse(self, name: str, line: str, expected_result: bool) -> None:
+        # Arrange
+        line_parser = LineParser([NumberParser(), NumberParser()], ParserOptions())
+        input_line = Line(file=create_autospec(TextReader), index=0, header=False, line=line)
+
+        # Act
+        result = line_parser.can_parse(input_line, LineParser.split(line, ParserOptions()))
+
+        # Assert
+        self.assertEqual(expected_result, result)
+
+    @parameterized.expand([
+        ['short line', '1\t22', False],
+        ['long line with short fields', '111\t22', False],
+        ['long field', '1\t2222', True]
+    ])
+    def test_parse_rejects_lines_with_oversized_fields(self, name: str, line: str, expected_error: bool) -> None:
+        # Arrange
+        options = ParserOptions(max_field_size=3)
+        line_parser = LineParser([StringParser(), StringParser()], options)
+        input_line = Line(file=create_autospec(TextReader), index=0, header=False, line=line)
+
+        # Act
+        parsed_line = line_parser.parse(input_line)
+
+        # Assert
+        self.assertEqual(expected_error, isinstance(parsed_line.error, FieldTooLargeError))
+
+    @parameterized.expand([
+        ['without next line parser', None, 0],
+        ['with next line parser', LineParser([StringParser()], ParserOptions()), 1]
+    ])
+    def test_parse_checks_lines_in_advance_only_in_chains(
+            self,
+            name: str,
+            next_line_parser: Optional[LineParser],
+            expected_calls_count: int) -> None:
+        # Arrange
+        line_parser = LineParser([NumberParser()], ParserOptions(), next_line_parser is None, next_line_parser)
+        input_line = Line(file=create_autospec(TextReader), index=0, header=False, line='1')
+
+        # Act
+        with patch.object(LineParser, 'can_parse', autospec=True, return_value=True) as can_parse_mock:
+            parsed_line = line_parser.parse(input_line)
+
+        # Assert
+        self.assertEqual(['1'], parsed_line.parsed_values)
+        self.assertEqual(expected_calls_count, can_parse_mock.call_count)
+        self.assertEqual(frozenset([1]), line_parser.field_counts)
+
+    def test_parse_does_not_call_raising_parse_of_value_parsers(self) -> None:
+        # Arrange
+        value_parser = NumberParser()
+        value_parser.parse = MagicMock(side_effect=ParsingError)  # type: ignore
+        line_parser = LineParser([value_parser], ParserOptions(), False, LineParser([StringParser()], ParserOptions()))
+        input_line = Line(file=create_autospec(TextReader), index=0, header=False, line='abc')
+
+        # Act
+        parsed_line = line_parser.parse(input_line)
+
+        # Assert
+        self.assertEqual(['abc'], parsed_line.parsed_values)
+        value_parser.parse.assert_not_called()
+
+
+class LazyParsedLineTest(TestCase):
+    def test_value_parses_only_accessed_values_once(self) -> None:
+        # Arrange
+        value_parser = create_autospec(ValueParser)
+        value_parser.try_parse.side_effect = lambda value: int(value)
+        line_parser = LineParser([value_parser] * 3, ParserOptions(lazy_parsing=True))
+        input_line = Line(file=create_autospec(TextReader), index=1, header=False, line='1\t2\t3')
+
+        # Act
+        parsed_line = line_parser.parse(input_line)
+        result = [parsed_line.value(1), parsed_line.value(1)]
+
+        # Assert
+        self.assertIsInstance(parsed_line, LazyParsedLine)
+        self.assertEqual([2, 2], result)
+        value_parser.try_parse.assert_called_once_with('2')
+        self.assertEqual([1, 2, 3], parsed_line.parsed_values)
+        self.assertEqual(3, value_parser.try_parse.call_count)
+
+    def test_value_raises_error_of_incorrect_value(self) -> None:
+        # Arrange
+        line_parser = LineParser([NumberParser(), NumberParser()], ParserOptions(lazy_parsing=True))
+        input_line = Line(file=create_autospec(TextReader), index=1, header=False, line='1\ta')
+        parsed_line = line_parser.parse(input_line)
+
+        # Act
+        result = parsed_line.value(0)
+
+        # Assert
+        self.assertEqual('1', result)
+        self.assertFalse(parsed_line.validate())
+        self.assertTrue(parsed_line.skipped())
+        self.assertIsInstance(parsed_line.error, ParsingError)
+
+        with self.assertRaises(ParsingError):
+            parsed_line.value(0)
+
+    def test_parse_checks_number_of_values_eagerly(self) -> None:
+        # Arrange
+        line_parser = LineParser([NumberParser(), NumberParser()], ParserOptions(lazy_parsing=True))
+        input_line = Line(file=create_autospec(TextReader), index=1, header=False, line='1')
+
+        # Act
+        parsed_line = line_parser.parse(input_line)
+
+        # Assert
+        self.assertNotIsInstance(parsed_line, LazyParsedLine)
+        self.assertIsInstance(parsed_line.error, ParsingError)
+
+    def test_dispatcher_parses_values_eagerly(self) -> None:
+        # Arrange
+        options = ParserOptions(lazy_parsing=True)
+        line_parser = LineParserDispatcher(
+            [LineParser([NumberParser()], options), LineParser([StringParser()], options)], options)
+        input_line = Line(file=create_autospec(TextReader), index=1, header=False, line='a')
+
+        # Act
+        parsed_line = line_parser.parse(input_line)
+
+        # Assert
+        self.assertNotIsInstance(parsed_line, LazyParsedLine)
+        self.assertEqual(['a'], parsed_line.parsed_values)
+        self.assertTrue(parsed_line.recovered)
+
+
+class _TwoFieldsLineParser(LineParser):
+    @property
+    def field_counts(self) -> Optional[FrozenSet[int]]:
+        return frozenset([2])
+
+    def _parse(self, line: Line, values: List[str]) -> List[str]:
+        if values[0] == 'error':
+            raise ValueError('Unexpected value')
+
+        return values + ['default']
+
+
+class LineParserDispatcherTest(TestCase):
+    def _create_dispatcher(self, skip_incorrect_lines: bool = True) -> LineParserDispatcher:
+        value_parsers = [NumberParser(), StringParser(), StringParser()]
+        options = ParserOptions()
+
+        return LineParserDispatcher(
+            [
+                LineParser(value_parsers, options),
+                _TwoFieldsLineParser(value_parsers, options)
+            ],
+            options,
+            skip_incorrect_lines
+        )
+
+    @parameterized.expand([
+        ['line handled by the first parser', '1\tabc\tdef', ['1', 'abc', 'def']],
+        ['line handled by the second parser', '1\tabc', ['1', 'abc', 'default']],
+        ['line not handled by any parser', '1', None],
+        ['empty line', '   ', None]
+    ])
+    def test_parse(self, name: str, line: str, expected_result: Optional[List[str]]) -> None:
+        # Arrange
+        dispatcher = self._create_dispatcher()
+        input_line = Line(file=create_autospec(TextReader), index=0, header=False, line=line)
+
+        # Act
+        parsed_line = dispatcher.parse(input_line)
+
+        # Assert
+        self.assertEqual(expected_result, parsed_line.parsed_values)
+
+    def test_route(self) -> None:
+        # Arrange
+        dispatcher = self._create_dispatcher()
+        input_line = Line(file=create_autospec(TextReader), index=0, header=False, line='1\tabc')
+
+        # Act
+        candidates = dispatcher.route(input_line, ['1', 'abc'])
+
+        # Assert
+        self.assertEqual([dispatcher.line_parsers[1]], candidates)
+        self.assertEqual(frozenset([2, 3]), dispatcher.field_counts)
+
+    def test_parse_keeps_error_raised_by_custom_parser(self) -> None:
+        # Arrange
+        dispatcher = self._create_dispatcher(skip_incorrect_lines=False)
+        input_line = Line(file=create_autospec(TextReader), index=0, header=False, line='error\tabc')
+
+        # Act, Assert
+        with self.assertRaises(ValueError):
+            dispatcher.parse(input_line)
+
+
+class AdaptiveLineParserDispatcherTest(TestCase):
+    def test_parse_moves_successful_parsers_to_the_front(self) -> None:
+        # Arrange
+        options = ParserOptions()
+        first_parser = LineParser([NumberParser(), NumberParser()], options)
+        second_parser = LineParser([NumberParser(re.compile('[a-z]+$')), NumberParser(re.compile('[a-z]+$'))], options)
+        dispatcher = AdaptiveLineParserDispatcher([first_parser, second_parser], options, window_size=4)
+        lines = ['abc\tdef', 'ghi\tjkl', '1\t2', 'mno\tpqr']
+
+        # Act
+        results = [
+            dispatcher.parse(Line(file=create_autospec(TextReader), index=index, header=False, line=line))
+            for index, line in enumerate(lines)
+        ]
+
+        # Assert
+        self.assertEqual(
+            [['abc', 'def'], ['ghi', 'jkl'], ['1', '2'], ['mno', 'pqr']],
+            [result.parsed_values for result in results])
+        self.assertEqual(4, dispatcher.lines)
+        self.assertEqual(0, dispatcher.misses)
+        self.assertEqual(7, dispatcher.attempts)
+        self.assertEqual(
+            [(second_parser, 1, 3), (first_parser, 0, 1)],
+            [(statistics.line_parser, statistics.position, statistics.hits) for statistics in dispatcher.statistics])
+        self.assertEqual(
+            [second_parser, first_parser],
+            dispatcher.route(results[0], ['abc', 'def']))
+
+    def test_parse_forgets_hits_outside_of_window(self) -> None:
+        # Arrange
+        options = ParserOptions()
+        first_parser = LineParser([NumberParser()], options)
+        second_parser = LineParser([NumberParser(re.compile('[a-z]+$'))], options)
+        dispatcher = AdaptiveLineParserDispatcher([first_parser, second_parser], options, window_size=2)
+
+        # Act
+        for index, line in enumerate(['abc', 'def', '1', '2']):
+            dispatcher.parse(Line(file=create_autospec(TextReader), index=index, header=False, line=line))
+
+        # Assert
+        statistics = dispatcher.statistics
+        self.assertEqual([first_parser, second_parser], [item.line_parser for item in statistics])
+        self.assertEqual([2, 0], [item.window_hits for item in statistics])
+        self.assertEqual([2, 2], [item.hits for item in statistics])
+
 
 class FileParserTest(TestCase):
     @parameterized.expand([
@@ -297,6 +709,276 @@ class FileParserTest(TestCase):
                 else:
                     raise
 
+    def test_parse_reports_skipped_lines(self) -> None:
+        # Arrange
+        options = ParserOptions(field_terminator=',', error_summary_interval=3600)
+        file_parser = FileParser(LineParser([NumberParser(), NumberParser()], options), options)
+
+        # Act
+        with mock_builtin_open(data='a,b\n1,2\n3\n4,5\n'):
+            with self.assertLogs('csv_import.csv.rejects', 'WARNING') as logs:
+                result = list(file_parser.parse(''))
+
+        # Assert
+        self.assertEqual(4, len(result))
+        self.assertTrue(result[2].skipped())
+        self.assertIsInstance(result[2].error, ParsingError)
+        self.assertEqual(8, result[2].offset)
+        self.assertTrue(any('Skipped line # 2 (byte 8, ParsingError): 3' in output for output in logs.output))
+
+    @parameterized.expand([
+        ['head', ParserOptions(head=2), False, ['0', '1']],
+        ['tail without line index', ParserOptions(tail=2), False, ['8', '9']],
+        ['tail with line index', ParserOptions(tail=2), True, ['8', '9']],
+        ['tail longer than file', ParserOptions(tail=20), True, [str(i) for i in range(10)]],
+        ['head and tail', ParserOptions(head=1, tail=3), False, ['7']],
+        ['sample size without line index', ParserOptions(sample=10, sample_seed=1), False, None],
+        ['sample size with line index', ParserOptions(sample=3, sample_seed=1), True, None],
+        ['sample rate with line index', ParserOptions(sample=0.5, sample_seed=1), True, None]
+    ])
+    def test_parse_selected_lines(
+            self,
+            name: str,
+            options: ParserOptions,
+            use_line_index: bool,
+            expected_values: Optional[List[str]]) -> None:
+        # Arrange
+        with tempfile.TemporaryDirectory() as directory:
+            input_file_path = os.path.join(directory, 'input.csv')
+
+            with open(input_file_path, 'w') as input_file:
+                input_file.write('ID\n' + ''.join(f'{index}\n' for index in range(10)))
+
+            if use_line_index:
+                LineIndex.build(input_file_path, step=3).save(LineIndex.index_file_path(input_file_path))
+
+            file_parser = FileParser(LineParser([NumberParser()], options), options)
+
+            # Act
+            result = list(file_parser.parse(input_file_path))
+
+        # Assert
+        self.assertTrue(result[0].header)
+        values = [parsed_line.parsed_values[0] for parsed_line in result[1:]]
+
+        if expected_values is not None:
+            self.assertEqual(expected_values, values)
+        else:
+            sample_size = options.sample if options.sample >= 1 else options.sample * 10
+            self.assertLessEqual(len(values), sample_size)
+            self.assertEqual(sorted(set(values), key=int), values)
+
+            if use_line_index:
+                self.assertEqual(sample_size, len(values))
+
+        if use_line_index:
+            for parsed_line in result:
+                self.assertEqual(parsed_line.index, int(parsed_line.line) + 1 if not parsed_line.header else 0)
+
+    def test_parse_skips_lines_not_matching_row_filter(self) -> None:
+        # Arrange
+        options = ParserOptions(field_terminator=',', row_filter="status == 'ACTIVE'")
+        value_parser = create_autospec(ValueParser)
+        value_parser.try_parse.side_effect = lambda value: value
+        file_parser = FileParser(LineParser([value_parser, value_parser], options), options)
+
+        # Act
+        with mock_builtin_open(data='id,status\n1,ACTIVE\n2,CLOSED\n3\n'):
+            result = list(file_parser.parse(''))
+
+        # Assert
+        self.assertEqual([None, ['1', 'ACTIVE'], None], [parsed_line.parsed_values for parsed_line in result])
+        # Values of the filtered line are never parsed, the short line is rejected by the line parser
+        self.assertEqual(2, value_parser.try_parse.call_count)
+        self.assertIsInstance(result[2].error, ParsingError)
+
+    @parameterized.expand([
+        ['lazy', False, 0],
+        ['strict', True, 1]
+    ])
+    def test_parse_rejects_lazily_parsed_lines(self, name: str, strict: bool, expected_rejects_count: int) -> None:
+        # Arrange
+        options = ParserOptions(field_terminator=',', lazy_parsing=True, strict_lazy_parsing=strict)
+        file_parser = FileParser(LineParser([NumberParser(), NumberParser()], options), options)
+
+        # Act
+        with mock_builtin_open(data='a,b\n1,x\n'), patch('csv_import.csv.parsers.RejectSink.reject') as reject:
+            result = [parsed_line.value(0) for parsed_line in file_parser.parse('') if not parsed_line.header]
+
+        # Assert
+        self.assertEqual(['1'], result)
+        self.assertEqual(expected_rejects_count, reject.call_count)
+
+    def test_parse_sample_without_line_index_returns_requested_number_of_lines(self) -> None:
+        # Arrange
+        options = ParserOptions(sample=20, sample_seed=3)
+        file_parser = FileParser(LineParser([NumberParser()], options), options)
+
+        with tempfile.TemporaryDirectory() as directory:
+            input_file_path = os.path.join(directory, 'input.csv')
+
+            with open(input_file_path, 'w') as input_file:
+                input_file.write('ID\n' + ''.join(f'{index}\n' for index in range(100)))
+
+            # Act
+            result = list(file_parser.parse(input_file_path))
+
+        # Assert
+        values = [parsed_line.parsed_values[0] for parsed_line in result[1:]]
+        self.assertEqual(20, len(set(values)))
+
+    @parameterized.expand([
+        ['whole data', 3, 100, ['0', '1', '2', '3', '4']],
+        ['range starting in the middle of a line', 4, 10, ['1', '2', '3']],
+        ['range ending at a line start', 5, 9, ['1', '2']],
+        ['range after the last line', 13, 100, []]
+    ])
+    def test_parse_range(self, name: str, start_offset: int, end_offset: int, expected_values: List[str]) -> None:
+        # Arrange
+        options = ParserOptions()
+        file_parser = FileParser(LineParser([NumberParser()], options), options)
+
+        with tempfile.TemporaryDirectory() as directory:
+            input_file_path = os.path.join(directory, 'input.csv')
+
+            with open(input_file_path, 'w') as input_file:
+                input_file.write('ID\n0\n1\n2\n3\n4\n')
+
+            # Act
+            result = list(file_parser.parse_range(input_file_path, start_offset, end_offset))
+
+        # Assert
+        self.assertEqual(expected_values, [parsed_line.parsed_values[0] for parsed_line in result])
+
+    def test_parse_streams_oversized_lines_to_reject_file(self) -> None:
+        # Arrange
+        with tempfile.TemporaryDirectory() as directory:
+            input_file_path = os.path.join(directory, 'input.csv')
+            reject_file_path = os.path.join(directory, 'rejects.tsv')
+            options = ParserOptions(max_record_size=8, reject_file_path=reject_file_path, error_summary_interval=3600)
+            file_parser = FileParser(LineParser([NumberParser()], options), options)
+
+            with open(input_file_path, 'w') as input_file:
+                input_file.write('ID\n1\n' + '2' * 20 + '\n3\n')
+
+            # Act
+            with self.assertLogs('csv_import.csv.parsers', 'WARNING') as logs, \
+                    patch('csv_import.csv.text.LINE_CHUNK_SIZE', 4):
+                result = list(file_parser.parse(input_file_path))
+
+            with open(reject_file_path) as reject_file:
+                rejects = reject_file.read()
+
+        # Assert
+        self.assertEqual([['1'], ['3']], [parsed_line.parsed_values for parsed_line in result[1:]])
+        self.assertEqual([0, 1, 3], [parsed_line.index for parsed_line in result])
+        self.assertEqual(
+            f'2\t5\tRecordTooLargeError: Line # 2 exceeds the maximum record size of 8 bytes\t{"2" * 20}\n', rejects)
+        self.assertIn('Rejected 1 lines', logs.output[0])
+
+
+class ProjectionTest(TestCase):
+    @parameterized.expand([
+        ['all columns', ParserOptions(), None],
+        ['names', ParserOptions(columns=('salary', 'name')), [2, 0]],
+        ['positions', ParserOptions(columns=('1',)), [1]],
+        ['excluded columns', ParserOptions(exclude_columns=('age',)), [0, 2]],
+        ['selected and excluded columns', ParserOptions(columns=('name', 'age'), exclude_columns=('1',)), [0]],
+        ['all columns reordered', ParserOptions(columns=('salary', 'name', 'age')), [2, 0, 1]]
+    ])
+    def test_resolve_projection(self, name: str, options: ParserOptions, expected_result: Optional[List[int]]) -> None:
+        # Act
+        result = resolve_projection(['name', 'age', 'salary'], options)
+
+        # Assert
+        self.assertEqual(expected_result, result)
+
+    @parameterized.expand([
+        ['unknown column', ['name'], ParserOptions(columns=('age',))],
+        ['position out of range', ['name'], ParserOptions(columns=('5',))],
+        ['excluded columns without header', [], ParserOptions(exclude_columns=('0',))],
+        ['no columns left', ['name'], ParserOptions(exclude_columns=('name',))]
+    ])
+    def test_resolve_projection_raises_error(self, name: str, column_names: List[str], options: ParserOptions) -> None:
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            resolve_projection(column_names, options)
+
+    @parameterized.expand([
+        [
+            'value parsers of all columns',
+            lambda options: LineParser([StringParser(), NumberParser(), NumberParser()], options),
+            ParserOptions(field_terminator=',', columns=('salary', 'name'))
+        ],
+        [
+            'parser without projection support',
+            lambda options: LineParserDispatcher([
+                LineParser([StringParser(), StringParser(), NumberParser()], options),
+                LineParser([StringParser(), NumberParser()], options)
+            ], options),
+            ParserOptions(field_terminator=',', columns=('2', '0'))
+        ]
+    ])
+    def test_parse_projected_columns(self, name: str, create_line_parser: Any, options: ParserOptions) -> None:
+        # Arrange
+        file_parser = FileParser(create_line_parser(options), options)
+
+        # Act
+        with mock_builtin_open(data='name,age,salary\nJohn,x,100\nBob,30\n'):
+            result = list(file_parser.parse(''))
+
+        # Assert
+        self.assertEqual('salary,name\n', result[0].line)
+        self.assertEqual(['100', 'John'], result[1].parsed_values)
+        self.assertTrue(result[2].skipped())
+        self.assertIsInstance(result[2].error, ParsingError)
+
+    @parameterized.expand([
+        ['enclosed name with a field terminator', '"id","name, full","x"\n', '"name, full","x"\n'],
+        ['doubled enclosing chars', '"id","a "" b","x"\n', '"a "" b","x"\n'],
+        ['windows line terminator', 'id,name,x\r\n', 'name,x\n']
+    ])
+    def test_parse_projects_raw_header_fields(self, name: str, header_line: str, expected_line: str) -> None:
+        # Arrange
+        options = ParserOptions(field_terminator=',', field_enclosing_value='"', columns=('1', '2'))
+        file_parser = FileParser(LineParser([StringParser(), StringParser(), StringParser()], options), options)
+
+        # Act
+        with mock_builtin_open(data=header_line + '1,John,a\n'):
+            result = list(file_parser.parse(''))
+
+        # Assert
+        self.assertEqual(expected_line, result[0].line)
+        self.assertEqual(['John', 'a'], result[1].parsed_values)
+
+    def test_parse_does_not_parse_skipped_columns(self) -> None:
+        # Arrange
+        options = ParserOptions(field_terminator=',', columns=('id',))
+        skipped_value_parser = create_autospec(ValueParser)
+        line_parser = LineParser([NumberParser(), skipped_value_parser], options)
+        file_parser = FileParser(line_parser, options)
+
+        # Act
+        with mock_builtin_open(data='id,comment\n1,a\n'):
+            result = list(file_parser.parse(''))
+
+        # Assert
+        self.assertEqual(['1'], result[1].parsed_values)
+        skipped_value_parser.try_parse.assert_not_called()
+
+    def test_parse_all_columns_in_new_order(self) -> None:
+        # Arrange
+        options = ParserOptions(field_terminator=',', columns=('salary', 'name', 'age'))
+        line_parser = LineParser([StringParser(), NumberParser(), NumberParser()], options)
+        file_parser = FileParser(line_parser, options)
+
+        # Act
+        with mock_builtin_open(data='name,age,salary\nJohn,23,100\n'):
+            result = list(file_parser.parse(''))
+
+        # Assert
+        self.assertEqual(['100', 'John', '23'], result[1].parsed_values)
+
 
 class FileParserFactoryTest(TestCase):
     @parameterized.expand([
@@ -324,6 +1006,19 @@ class FileParserFactoryTest(TestCase):
             ParserOptions(header_lines=0),
             'abc\tdef\tghi\t123\n',
             [StringParser, StringParser, StringParser, NumberParser]
+        ],
+        [
+            'projected columns',
+            ParserOptions(columns=('id', 'name')),
+            'name\tcomment\tid\nabc\tdef\t123\n',
+            [StringParser, EchoValueParser, NumberParser]
+        ],
+        [
+            'projected position out of range',
+            ParserOptions(header_lines=0, columns=('5',)),
+            'abc\t123\n',
+            [],
+            ValueError
         ]
 
     ])
@@ -0,0 +1,117 @@
+import json
+import os
+import tempfile
+from typing import List
+from unittest import TestCase
+
+from parameterized import parameterized
+
+from csv_import.csv.parsers import ParserOptions
+from csv_import.csv.partitions import (BYTES, HASH, ROWS, PartitionedSink,
+                                       PartitionOptions)
+from csv_import.csv.processors import NDJSON, OutputFormatter, OutputOptions
+
+OPTIONS: ParserOptions = ParserOptions(field_terminator=',')
+LINES: List[List[str]] = [[str(index), f'Name {index}'] for index in range(10)]
+
+
+class PartitionedSinkTest(TestCase):
+    def setUp(self) -> None:
+        self._temporary_directory = tempfile.TemporaryDirectory()
+        self._output_file_path = os.path.join(self._temporary_directory.name, 'output.csv')
+
+    def tearDown(self) -> None:
+        self._temporary_directory.cleanup()
+
+    def _write(self, partition_options: PartitionOptions, lines: List[List[str]]) -> PartitionedSink:
+        with PartitionedSink(self._output_file_path, partition_options, OPTIONS) as sink:
+            sink.write_header('ID,Name\n')
+
+            for values in lines:
+                sink.write_values(values)
+
+        return sink
+
+    def _read_partitions(self, sink: PartitionedSink) -> List[List[str]]:
+        with open(sink.manifest_file_path) as manifest_file:
+            manifest = json.load(manifest_file)
+
+        partitions = []
+
+        for partition in manifest['partitions']:
+            with open(os.path.join(self._temporary_directory.name, partition['file']), 'rb') as partition_file:
+                data = partition_file.read()
+
+            self.assertEqual(partition['size'], len(data))
+            self.assertEqual(partition['rows'], data[partition['data_offset']:].count(b'\n'))
+            partitions.append(data.decode().splitlines())
+
+        return partitions
+
+    @parameterized.expand([
+        ['rows', PartitionOptions(mode=ROWS, partition_size=4), [5, 5, 3]],
+        ['bytes', PartitionOptions(mode=BYTES, partition_size=40), [4, 4, 4, 2]],
+        ['rows without repeated header', PartitionOptions(mode=ROWS, partition_size=4, repeat_header=False), [5, 4, 2]]
+    ])
+    def test_write_values(self, name: str, partition_options: PartitionOptions, expected_lengths: List[int]) -> None:
+        # Act
+        sink = self._write(partition_options, LINES)
+
+        # Assert
+        partitions = self._read_partitions(sink)
+
+        self.assertEqual(expected_lengths, [len(partition) for partition in partitions])
+        self.assertEqual('ID,Name', partitions[0][0])
+        self.assertEqual(
+            [f'{index},Name {index}' for index in range(10)],
+            [line for partition in partitions for line in partition if line != 'ID,Name'])
+
+    def test_write_values_by_hash_with_limited_number_of_open_files(self) -> None:
+        # Arrange
+        partition_options = PartitionOptions(
+            mode=HASH, partitions_count=3, key_columns=('ID',), max_open_files=1, buffer_size=1)
+
+        # Act
+        sink = self._write(partition_options, LINES + LINES)
+
+        # Assert
+        partitions = self._read_partitions(sink)
+
+        self.assertEqual(3, len(partitions))
+        self.assertEqual(20 + 3, sum(len(partition) for partition in partitions))
+
+        for partition in partitions:
+            self.assertEqual('ID,Name', partition[0])
+
+            # Lines with the same key are written into the same partition
+            for line in partition[1:]:
+                self.assertEqual(2, partition.count(line))
+
+    def test_close_creates_partitions_for_file_without_data_lines(self) -> None:
+        # Act
+        sink = self._write(PartitionOptions(mode=HASH, partitions_count=2), [])
+
+        # Assert
+        self.assertEqual([['ID,Name'], ['ID,Name']], self._read_partitions(sink))
+
+    def test_write_header_uses_output_dialect(self) -> None:
+        # Arrange
+        formatter = OutputFormatter.create(OutputOptions(dialect=NDJSON), OPTIONS)
+
+        # Act
+        with PartitionedSink(
+                self._output_file_path,
+                PartitionOptions(mode=ROWS, partition_size=2),
+                OPTIONS,
+                formatter.format_values,
+                formatter.format_header) as sink:
+            sink.write_header('ID,Name\n')
+            sink.write_values(['1', 'a'])
+
+        # Assert
+        self.assertEqual([['{"ID":"1","Name":"a"}']], self._read_partitions(sink))
+
+    def test_init_raises_error_for_unknown_mode(self) -> None:
+        # Act, Assert
+        with self.assertRaises(ValueError):
+            PartitionedSink(self._output_file_path, PartitionOptions(mode='columns'))
@@ -1,16 +1,27 @@
 import os
-from typing import List, Sequence
+import tempfile
+from datetime import date
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence
 from unittest import TestCase
 from unittest.mock import MagicMock, call, create_autospec, patch
 
 from parameterized import parameterized
 
+from csv_import.csv.cache import CacheOptions, ResultCache
+from csv_import.csv.dedup import DeduplicationOptions
+from csv_import.csv.lookup import HashLookupIndex, LookupOptions
 from csv_import.csv.parsers import (FileParser, FileParserFactory, Line,
                                     LineParser, NumberParser, ParsedLine,
                                     ParserOptions, StringParser)
-from csv_import.csv.processors import (EchoValueProcessor, FileProcessor,
+from csv_import.csv.processors import (ENCLOSED, MINIMAL, NDJSON, TSV,
+                                       EchoValueProcessor, FileProcessor,
                                        FileProcessorFactory, LineProcessor,
+                                       LookupLineProcessor, OutputFormatter,
+                                       OutputOptions, ProcessingError,
                                        ValueProcessor)
+from csv_import.csv.sinks import OutputSink
+from csv_import.csv.sort import SortOptions
 from csv_import.csv.text import TextReader, TextWriter
 from tests.csv_import.csv.test_text import mock_builtin_open
 
@@ -50,6 +61,16 @@ class LineProcessorTest(TestCase):
                 parsed_values=['John Doe', '23', '10,000']
             ),
             'John Doe\t23\t10,000'
+        ],
+        [
+            'typed values',
+            [EchoValueProcessor(), EchoValueProcessor(), EchoValueProcessor(), EchoValueProcessor()],
+            ParserOptions(field_terminator=',', field_enclosing_value='"'),
+            ParsedLine(
+                Line(file=create_autospec(TextReader), index=1, header=False, line='John Doe,23,"10,000",2020-01-31'),
+                parsed_values=['John Doe', 23, Decimal('10000.50'), date(2020, 1, 31)]
+            ),
+            '"John Doe","23","10000.50","2020-01-31"'
         ]
     ])
     def test_process(
@@ -69,6 +90,112 @@ class LineProcessorTest(TestCase):
         self.assertEqual(expected_result, result)
 
 
+class OutputFormatterTest(TestCase):
+    @parameterized.expand([
+        ['enclosed', OutputOptions(dialect=ENCLOSED), ['a', 1, None], '"a","1",""'],
+        ['enclosed with output terminator', OutputOptions(field_terminator=';'), ['a', 'b'], '"a";"b"'],
+        ['minimal without special chars', OutputOptions(dialect=MINIMAL), ['a b', 1, None], 'a b,1,'],
+        ['minimal with terminator', OutputOptions(dialect=MINIMAL), ['a,b', 'c'], '"a,b",c'],
+        ['minimal with enclosing value', OutputOptions(dialect=MINIMAL), ['say "hi"', 'c'], '"say ""hi""",c'],
+        ['minimal with new line', OutputOptions(dialect=MINIMAL), ['a\nb'], '"a\nb"'],
+        [
+            'minimal with escape char',
+            OutputOptions(dialect=MINIMAL, escape_char='\\'),
+            ['"hi"', 'a\\b'],
+            '"\\"hi\\"","a\\\\b"'
+        ],
+        ['minimal with output terminator', OutputOptions(dialect=MINIMAL, field_terminator='|'), ['a,b', 'c'], 'a,b|c'],
+        ['tsv without special chars', OutputOptions(dialect=TSV), ['a', 'b c', 2], 'a\tb c\t2'],
+        ['tsv with special chars', OutputOptions(dialect=TSV), ['a\tb', 'c\\d\n', None], 'a\\tb\tc\\\\d\\n\t\\N'],
+        ['ndjson without header', OutputOptions(dialect=NDJSON), ['a', 1, Decimal('1.5')], '["a",1,"1.5"]']
+    ])
+    def test_format_values(
+            self,
+            name: str,
+            output_options: OutputOptions,
+            values: List[Any],
+            expected_result: str) -> None:
+        # Arrange
+        options = ParserOptions(field_terminator=',', field_enclosing_value='"')
+        formatter = OutputFormatter.create(output_options, options)
+
+        # Act
+        result = formatter.format_values(values)
+
+        # Assert
+        self.assertEqual(expected_result, result)
+
+    @parameterized.expand([
+        ['enclosed', OutputOptions(dialect=ENCLOSED), 'id,first name\n'],
+        ['enclosed with output terminator', OutputOptions(field_terminator=';'), '"id";"first name"'],
+        ['minimal', OutputOptions(dialect=MINIMAL), 'id,first name'],
+        ['tsv', OutputOptions(dialect=TSV), 'id\tfirst name'],
+        ['ndjson', OutputOptions(dialect=NDJSON), None]
+    ])
+    def test_format_header(self, name: str, output_options: OutputOptions, expected_result: Optional[str]) -> None:
+        # Arrange
+        options = ParserOptions(field_terminator=',', field_enclosing_value='"')
+        formatter = OutputFormatter.create(output_options, options)
+
+        # Act
+        result = formatter.format_header('id,first name\n')
+
+        # Assert
+        self.assertEqual(expected_result, result)
+
+    def test_ndjson_format_values_uses_column_names(self) -> None:
+        # Arrange
+        formatter = OutputFormatter.create(OutputOptions(dialect=NDJSON), ParserOptions(field_terminator=','))
+        formatter.format_header('id,born\n')
+
+        # Act
+        result = formatter.format_values([1, date(2020, 1, 31)])
+
+        # Assert
+        self.assertEqual('{"id":1,"born":"2020-01-31"}', result)
+
+        with self.assertRaises(ProcessingError):
+            formatter.format_values([float('nan'), None])
+
+
+class LookupLineProcessorTest(TestCase):
+    @parameterized.expand([
+        ['left join', False, ['ID,Customer,Region\n', '"1","A","EU"', '"2","B",""', '"3","A","EU"']],
+        ['inner join', True, ['ID,Customer,Region\n', '"1","A","EU"', '"3","A","EU"']]
+    ])
+    def test_process(self, name: str, inner_join: bool, expected_lines: List[str]) -> None:
+        # Arrange
+        options = ParserOptions(field_terminator=',', field_enclosing_value='"')
+        lookup_options = LookupOptions('customers.csv', 'Customer', inner_join=inner_join)
+        lookup_index = HashLookupIndex({'A': ('EU',)}, ['Region'], lookup_options)
+        formatter = OutputFormatter.create(OutputOptions(dialect=ENCLOSED), options)
+        lines = [
+            ParsedLine(Line(TextReader(''), 0, True, 'ID,Customer\n')),
+            ParsedLine(Line(TextReader(''), 1, False, ''), ['1', 'A']),
+            ParsedLine(Line(TextReader(''), 2, False, ''), ['2', 'B']),
+            ParsedLine(Line(TextReader(''), 3, False, ''), ['3', 'A'])
+        ]
+        line_processor = LookupLineProcessor(
+            [EchoValueProcessor(), EchoValueProcessor()], options, lookup_index, formatter=formatter)
+
+        # Act
+        result = [line_processor.process(line) for line in lines]
+
+        # Assert
+        self.assertEqual(expected_lines, [line for line in result if line is not None])
+        self.assertEqual(2 / 3, lookup_index.statistics.hit_rate)
+
+    def test_process_header_raises_error_for_unknown_key_column(self) -> None:
+        # Arrange
+        options = ParserOptions(field_terminator=',')
+        lookup_index = HashLookupIndex({}, ['Region'], LookupOptions('customers.csv', 'Customer'))
+        line_processor = LookupLineProcessor([EchoValueProcessor()], options, lookup_index)
+
+        # Act, Assert
+        with self.assertRaises(ValueError):
+            line_processor.process_header('ID\n')
+
+
 class FileProcessorTest(TestCase):
     @parameterized.expand([
         [
@@ -143,6 +270,135 @@ class FileProcessorTest(TestCase):
             [call(line.line) for line in lines]
         )
 
+    def test_process_into(self) -> None:
+        # Arrange
+        lines = [
+            ParsedLine(Line(file=create_autospec(TextReader), index=0, header=True, line='Name\tAge\n')),
+            ParsedLine(
+                Line(file=create_autospec(TextReader), index=1, header=False, line='John\t23\n'), ['John', '23']),
+            ParsedLine(Line(file=create_autospec(TextReader), index=2, header=False, line='Bob\n'))
+        ]
+        file_parser = create_autospec(FileParser)
+        file_parser.parse = MagicMock(side_effect=lambda _: lines)
+        line_processor = LineProcessor([EchoValueProcessor(), EchoValueProcessor()], ParserOptions())
+        file_processor = FileProcessor(file_parser, line_processor)
+        output_sink = MagicMock(spec=OutputSink)
+        output_sink.__enter__ = MagicMock(return_value=output_sink)
+
+        # Act
+        file_processor.process_into('', output_sink)
+
+        # Assert
+        output_sink.write_header.assert_called_once_with('Name\tAge\n')
+        output_sink.write_values.assert_called_once_with(['John', '23'])
+        output_sink.__exit__.assert_called_once()
+
+    def test_process_into_drops_duplicate_lines(self) -> None:
+        # Arrange
+        options = ParserOptions(field_terminator=',')
+        file_parser = FileParser(LineParser([NumberParser(), StringParser()], options), options)
+        line_processor = LineProcessor([EchoValueProcessor(), EchoValueProcessor()], options)
+        file_processor = FileProcessor(file_parser, line_processor, DeduplicationOptions(key_columns=('ID',)))
+        output_sink = MagicMock(spec=OutputSink)
+        output_sink.__enter__ = MagicMock(return_value=output_sink)
+
+        # Act
+        with mock_builtin_open(data='ID,Name\n1,John\n2,Bob\n1,Johnny\n'):
+            file_processor.process_into('', output_sink)
+
+        # Assert
+        output_sink.write_values.assert_has_calls([call(['1', 'John']), call(['2', 'Bob'])])
+        self.assertEqual(2, output_sink.write_values.call_count)
+        self.assertEqual(1, file_processor.deduplication_statistics.duplicates)
+
+    def test_process_sorts_lines(self) -> None:
+        # Arrange
+        options = ParserOptions(field_terminator=',')
+        file_parser = FileParser(LineParser([NumberParser(), StringParser()], options), options)
+        line_processor = LineProcessor([EchoValueProcessor(), EchoValueProcessor()], options)
+        file_processor = FileProcessor(file_parser, line_processor, sort_options=SortOptions(('ID',), ('int64',)))
+        text_writer_mock = create_autospec(TextWriter)
+        text_writer_mock.__enter__ = MagicMock(return_value=text_writer_mock)
+
+        # Act
+        with patch('csv_import.csv.text.TextWriter.create', MagicMock(return_value=text_writer_mock)):
+            with mock_builtin_open(data='ID,Name\n10,John\n2,Bob\n1,Ann\n'):
+                file_processor.process('', '')
+
+        # Assert
+        text_writer_mock.write_line.assert_has_calls(
+            [call('ID,Name\n'), call('1,Ann'), call('2,Bob'), call('10,John')])
+
+    def test_process_appends_new_lines_incrementally(self) -> None:
+        # Arrange
+        options = ParserOptions(field_terminator=',')
+        file_parser = FileParser(LineParser([NumberParser(), StringParser()], options), options)
+        line_processor = LineProcessor([EchoValueProcessor(), EchoValueProcessor()], options)
+        file_processor = FileProcessor(file_parser, line_processor)
+
+        with tempfile.TemporaryDirectory() as directory:
+            input_file_path = os.path.join(directory, 'input.csv')
+            output_file_path = os.path.join(directory, 'output.csv')
+            state_file_path = os.path.join(directory, 'input.state')
+
+            with open(input_file_path, 'w') as input_file:
+                input_file.write('ID,Name\n1,John\n2,B')
+
+            # Act
+            file_processor.process(input_file_path, output_file_path, state_file_path)
+
+            with open(input_file_path, 'a') as input_file:
+                input_file.write('ob\n3,Ann\n')
+
+            file_processor.process(input_file_path, output_file_path, state_file_path)
+
+            with open(output_file_path) as output_file:
+                result = output_file.read()
+
+        # Assert
+        self.assertEqual('ID,Name\n1,John\n2,Bob\n3,Ann\n', result)
+        self.assertEqual(4, file_processor.incremental_state.line_index)
+
+    def test_process_restores_cached_output(self) -> None:
+        # Arrange
+        options = ParserOptions(field_terminator=',')
+        file_parser = FileParser(LineParser([NumberParser(), StringParser()], options), options)
+        line_processor = LineProcessor([EchoValueProcessor(), EchoValueProcessor()], options)
+
+        with tempfile.TemporaryDirectory() as directory:
+            input_file_path = os.path.join(directory, 'input.csv')
+            output_file_path = os.path.join(directory, 'output.csv')
+            result_cache = ResultCache(CacheOptions(directory), {})
+            file_processor = FileProcessor(file_parser, line_processor, result_cache=result_cache)
+
+            with open(input_file_path, 'w') as input_file:
+                input_file.write('ID,Name\n1,John\n')
+
+            file_processor.process(input_file_path, output_file_path)
+            os.remove(output_file_path)
+
+            # Act
+            with patch.object(FileParser, 'parse') as parse_mock:
+                file_processor.process(input_file_path, output_file_path)
+
+            with open(output_file_path) as output_file:
+                result = output_file.read()
+
+            # Restored outputs don't share their data with cache entries
+            with open(output_file_path, 'w') as output_file:
+                output_file.write('changed\n')
+
+            with patch.object(FileParser, 'parse'):
+                file_processor.process(input_file_path, output_file_path)
+
+            with open(output_file_path) as output_file:
+                restored_again_result = output_file.read()
+
+        # Assert
+        parse_mock.assert_not_called()
+        self.assertEqual('ID,Name\n1,John\n', result)
+        self.assertEqual('ID,Name\n1,John\n', restored_again_result)
+
 
 class FileProcessorFactoryTest(TestCase):
     @parameterized.expand([
@@ -170,6 +426,27 @@ class FileProcessorFactoryTest(TestCase):
         self.assertIsNotNone(result.line_processor.value_processors)
         self.assertEqual(len(file_parser.line_parser.value_parsers), len(result.line_processor.value_processors))
 
+    @parameterized.expand([
+        ['all lines', ParserOptions(), True],
+        ['seeded sample', ParserOptions(sample=10, sample_seed=1), True],
+        ['unseeded sample', ParserOptions(sample=10), False]
+    ])
+    def test_create_caches_only_deterministic_outputs(
+            self,
+            name: str,
+            options: ParserOptions,
+            expected_cached: bool) -> None:
+        # Arrange
+        file_parser_factory_mock = create_autospec(FileParserFactory)
+        file_parser_factory_mock.create = MagicMock(return_value=FileParser(LineParser([], options), options))
+        factory = FileProcessorFactory(file_parser_factory_mock)
+
+        # Act
+        result = factory.create('', options, cache_options=CacheOptions('cache'))
+
+        # Assert
+        self.assertEqual(expected_cached, result._result_cache is not None)
+
 
 class FileProcessorIntegrationTest(TestCase):
     @parameterized.expand([
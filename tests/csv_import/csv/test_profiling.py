@@ -0,0 +1,218 @@
+from typing import Any, List, Optional
+from unittest import TestCase
+
+from parameterized import parameterized
+
+from csv_import.csv.parsers import (FileParser, LineParser, ParserOptions,
+                                    StringParser)
+from csv_import.csv.profiling import (BOOLEAN, DATE, DECIMAL, DOUBLE, INTEGER,
+                                      TEXT, TIMESTAMP, ColumnProfile,
+                                      FileProfiler, HyperLogLog, TopValues)
+from csv_import.csv.sql import MYSQL, POSTGRESQL, SQLITE
+from tests.csv_import.csv.test_text import mock_builtin_open
+
+
+class HyperLogLogTest(TestCase):
+    @parameterized.expand([
+        ['no values', 0],
+        ['small cardinality', 100],
+        ['large cardinality', 100000]
+    ])
+    def test_count(self, name: str, distinct_values: int) -> None:
+        # Arrange
+        sketch = HyperLogLog()
+
+        for value in range(distinct_values):
+            sketch.add(str(value))
+            sketch.add(str(value))
+
+        # Act
+        result = sketch.count()
+
+        # Assert
+        self.assertAlmostEqual(distinct_values, result, delta=distinct_values * 0.03)
+
+    def test_merge(self) -> None:
+        # Arrange
+        sketch = HyperLogLog()
+        other_sketch = HyperLogLog()
+
+        for value in range(1000):
+            sketch.add(str(value))
+            other_sketch.add(str(value + 500))
+
+        # Act
+        sketch.merge(other_sketch)
+
+        # Assert
+        self.assertAlmostEqual(1500, sketch.count(), delta=1500 * 0.03)
+
+    def test_init_raises_error_for_incorrect_precision(self) -> None:
+        # Act, Assert
+        with self.assertRaises(ValueError):
+            HyperLogLog(20)
+
+
+class TopValuesTest(TestCase):
+    def test_most_common_finds_frequent_values(self) -> None:
+        # Arrange
+        top_values = TopValues(10)
+
+        for value in range(1000):
+            top_values.add(str(value))
+            top_values.add('frequent')
+
+        # Act
+        result = top_values.most_common(1)
+
+        # Assert
+        self.assertEqual('frequent', result[0][0])
+        self.assertLessEqual(result[0][1], 1000)
+        self.assertGreaterEqual(result[0][1], 1000 - top_values.max_error)
+
+
+class ColumnProfileTest(TestCase):
+    @parameterized.expand([
+        ['booleans', ['true', 'F', 'yes'], BOOLEAN],
+        ['integers', ['1', '-20', '+3'], INTEGER],
+        ['decimals', ['1', '2.50', '.5'], DECIMAL],
+        ['doubles', ['1.5', '2e10'], DOUBLE],
+        ['dates', ['2024-01-01', '2024-02-29'], DATE],
+        ['timestamps', ['2024-01-01', '2024-01-01 10:00:00', '2024-01-01T10:00:00.123'], TIMESTAMP],
+        ['incorrect dates', ['2023-02-29'], TEXT],
+        ['leading zeros', ['007', '123'], TEXT],
+        ['mixed values', ['1', 'abc'], TEXT],
+        ['only empty values', ['', None], TEXT],
+        ['empty values are ignored', ['1', '', None], INTEGER],
+        ['typed values', [1, 20], INTEGER]
+    ])
+    def test_type(self, name: str, values: List[Any], expected_type: str) -> None:
+        # Arrange
+        profile = ColumnProfile('column')
+
+        for value in values:
+            profile.add(value)
+
+        # Act
+        result = profile.type
+
+        # Assert
+        self.assertEqual(expected_type, result)
+
+    def test_to_dict(self) -> None:
+        # Arrange
+        profile = ColumnProfile('amount')
+
+        for value in ['10', '9', '', None, '10', 'zażółć']:
+            profile.add(value)
+
+        # Act
+        result = profile.to_dict()
+
+        # Assert
+        self.assertEqual(
+            {
+                'name': 'amount',
+                'type': TEXT,
+                'count': 6,
+                'nulls': 1,
+                'empty': 1,
+                'min': '10',
+                'max': 'zażółć',
+                'max_byte_length': 10,
+                'distinct': 3,
+                'top_values': [('10', 2), ('9', 1), ('zażółć', 1)],
+                'top_values_max_error': 0
+            },
+            result)
+
+    def test_min_and_max_of_numbers(self) -> None:
+        # Arrange
+        profile = ColumnProfile('amount')
+
+        for value in ['10', '9', '-1.5']:
+            profile.add(value)
+
+        # Act, Assert
+        self.assertEqual(('-1.5', '10'), (profile.min, profile.max))
+
+    @parameterized.expand([
+        ['small integers', ['1', '-32768'], POSTGRESQL, 'SMALLINT'],
+        ['integers', ['1', '32768'], POSTGRESQL, 'INTEGER'],
+        ['big integers', ['1', '2147483648'], MYSQL, 'BIGINT'],
+        ['huge integers', ['99999999999999999999'], POSTGRESQL, 'DECIMAL(20, 0)'],
+        ['integers in SQLite', ['2147483648'], SQLITE, 'INTEGER'],
+        ['decimals', ['123.4', '1.25'], POSTGRESQL, 'DECIMAL(5, 2)'],
+        ['doubles', ['1e5'], POSTGRESQL, 'DOUBLE PRECISION'],
+        ['timestamps in MySQL', ['2024-01-01 10:00:00'], MYSQL, 'DATETIME(6)'],
+        ['text', ['abc', 'zażółć'], POSTGRESQL, 'VARCHAR(10)'],
+        ['text in SQLite', ['abc'], SQLITE, 'TEXT']
+    ])
+    def test_sql_type(self, name: str, values: List[str], dialect: str, expected_type: str) -> None:
+        # Arrange
+        profile = ColumnProfile('column')
+
+        for value in values:
+            profile.add(value)
+
+        # Act
+        result = profile.sql_type(dialect)
+
+        # Assert
+        self.assertEqual(expected_type, result)
+
+
+class FileProfilerTest(TestCase):
+    @parameterized.expand([
+        ['all columns', None, ['ID', 'Name', 'Amount']],
+        ['projected columns', ('Amount', 'ID'), ['Amount', 'ID']]
+    ])
+    def test_profile(self, name: str, columns: Optional[tuple], expected_names: List[str]) -> None:
+        # Arrange
+        options = ParserOptions(field_terminator=',', columns=columns)
+        file_parser = FileParser(LineParser([StringParser(), StringParser(), StringParser()], options), options)
+        file_profiler = FileProfiler(file_parser)
+
+        # Act
+        with mock_builtin_open(data='ID,Name,Amount\n1,Ann,10.5\n2,,7\n3,Bob\n'):
+            result = file_profiler.profile('input.csv')
+
+        # Assert
+        self.assertEqual(3, result.lines)
+        self.assertEqual(1, result.skipped)
+        self.assertEqual(expected_names, [column.name for column in result.columns])
+
+    def test_create_table(self) -> None:
+        # Arrange
+        options = ParserOptions(field_terminator=',')
+        file_parser = FileParser(LineParser([StringParser(), StringParser(), StringParser()], options), options)
+        file_profiler = FileProfiler(file_parser)
+
+        with mock_builtin_open(data='ID,Name,Amount\n1,Ann,10.5\n2,,7\n'):
+            file_profile = file_profiler.profile('input.csv')
+
+        # Act
+        result = file_profile.create_table('import.orders', MYSQL)
+
+        # Assert
+        self.assertEqual(
+            'CREATE TABLE `import`.`orders` (\n'
+            '    `ID` SMALLINT NOT NULL,\n'
+            '    `Name` VARCHAR(3),\n'
+            '    `Amount` DECIMAL(3, 1) NOT NULL\n'
+            ');\n',
+            result)
+
+    def test_observe_passes_lines_through(self) -> None:
+        # Arrange
+        options = ParserOptions(field_terminator=',')
+        file_parser = FileParser(LineParser([StringParser(), StringParser()], options), options)
+        file_profiler = FileProfiler(file_parser)
+
+        # Act
+        with mock_builtin_open(data='ID,Name\n1,Ann\n'):
+            result = list(file_profiler.observe(file_parser.parse('input.csv')))
+
+        # Assert
+        self.assertEqual(2, len(result))
+        self.assertEqual(['ID', 'Name'], [column.name for column in file_profiler.result.columns])
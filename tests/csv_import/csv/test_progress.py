@@ -0,0 +1,77 @@
+import io
+import json
+from typing import List
+from unittest import TestCase
+from unittest.mock import patch
+
+from parameterized import parameterized
+
+from csv_import.csv.progress import JSON, NONE, TTY, ProgressReporter
+
+
+class ProgressReporterTest(TestCase):
+    @patch('csv_import.csv.progress.time.monotonic')
+    def test_json_events_contain_throughput_and_eta(self, monotonic_mock) -> None:
+        # Arrange
+        monotonic_mock.side_effect = [0.0, 0.0, 2.0, 4.0]
+        stream = io.StringIO()
+        progress_reporter = ProgressReporter(4 * 1024 * 1024, JSON, 1.0, stream)
+
+        # Act
+        progress_reporter.update(1, 0)
+        progress_reporter.update(1000, 2 * 1024 * 1024)
+        progress_reporter.finish(2000, 4 * 1024 * 1024)
+
+        # Assert
+        events = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(['progress', 'finished'], [event['event'] for event in events])
+        self.assertEqual(50.0, events[0]['percent'])
+        self.assertEqual(500.0, events[0]['rows_per_second'])
+        self.assertEqual(1.0, events[0]['megabytes_per_second'])
+        self.assertEqual(2.0, events[0]['eta_seconds'])
+        self.assertEqual(100.0, events[1]['percent'])
+        self.assertEqual(0.0, events[1]['eta_seconds'])
+
+    @parameterized.expand([
+        ['reports are throttled', JSON, 10.0, 1],
+        ['no reports', NONE, None, 0]
+    ])
+    def test_reports_are_throttled_by_wall_time(
+            self,
+            name: str,
+            mode: str,
+            interval: float,
+            expected_reports: int) -> None:
+        # Arrange
+        stream = io.StringIO()
+        progress_reporter = ProgressReporter(100, mode, interval, stream)
+
+        # Act
+        for position in range(100):
+            progress_reporter.update(position + 1, position + 1)
+
+        progress_reporter.finish(100, 100)
+
+        # Assert
+        self.assertEqual(expected_reports, len(stream.getvalue().splitlines()))
+
+    def test_tty_line_is_refreshed_in_place(self) -> None:
+        # Arrange
+        stream = io.StringIO()
+        progress_reporter = ProgressReporter(100, TTY, 0.0, stream)
+
+        # Act
+        progress_reporter.update(1, 50)
+        progress_reporter.finish(2, 100)
+
+        # Assert
+        reports: List[str] = stream.getvalue().split('\r')[1:]
+        self.assertEqual(2, len(reports))
+        self.assertIn('50.0%', reports[0])
+        self.assertFalse(reports[0].endswith('\n'))
+        self.assertTrue(reports[1].endswith('\n'))
+
+    def test_unsupported_mode_raises_error(self) -> None:
+        # Act, Assert
+        with self.assertRaises(ValueError):
+            ProgressReporter(100, 'bar')
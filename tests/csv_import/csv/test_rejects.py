@@ -0,0 +1,156 @@
+import logging
+from unittest import TestCase
+from unittest.mock import mock_open, patch
+
+from parameterized import parameterized
+
+from csv_import.csv.parsers import ParsingError
+from csv_import.csv.rejects import (ErrorAggregator, RejectedLine, RejectSink,
+                                    RejectWriter)
+from tests.csv_import.csv.test_text import mock_builtin_open
+
+
+def create_rejected_line(index: int, reason: str = 'ParsingError') -> RejectedLine:
+    return RejectedLine(index=index, offset=index * 10, reason=reason, message='', line=f'line {index}\n')
+
+
+class ErrorAggregatorTest(TestCase):
+    def test_add_counts_errors_per_reason(self) -> None:
+        # Arrange
+        aggregator = ErrorAggregator(summary_interval=3600)
+
+        # Act
+        aggregator.add(create_rejected_line(0, 'ParsingError'))
+        aggregator.add(create_rejected_line(1, 'ValueError'))
+        aggregator.add(create_rejected_line(2, 'ParsingError'))
+
+        # Assert
+        self.assertEqual(3, aggregator.total)
+        self.assertEqual({'ParsingError': 2, 'ValueError': 1}, aggregator.counts)
+
+    @parameterized.expand([
+        ['fewer lines than sample size', 3, 5, 3],
+        ['more lines than sample size', 100, 5, 5]
+    ])
+    def test_add_keeps_bounded_sample(self, name: str, lines_count: int, sample_size: int, expected_size: int) -> None:
+        # Arrange
+        aggregator = ErrorAggregator(summary_interval=3600, sample_size=sample_size, seed=0)
+
+        # Act
+        for index in range(lines_count):
+            aggregator.add(create_rejected_line(index))
+
+        # Assert
+        samples = aggregator.samples
+        self.assertEqual(expected_size, len(samples))
+        self.assertEqual(expected_size, len({sample.index for sample in samples}))
+
+    def test_add_rate_limits_summaries(self) -> None:
+        # Arrange
+        aggregator = ErrorAggregator(summary_interval=3600)
+
+        # Act
+        with self.assertLogs('csv_import.csv.rejects', 'WARNING') as logs:
+            for index in range(100):
+                aggregator.add(create_rejected_line(index))
+
+        # Assert
+        self.assertEqual(1, len(logs.output))
+
+    def test_add_does_not_log_summaries_with_infinite_interval(self) -> None:
+        # Arrange
+        aggregator = ErrorAggregator(summary_interval=float('inf'))
+
+        # Act
+        with patch.object(logging.getLogger('csv_import.csv.rejects'), 'warning') as warning_mock:
+            for index in range(10):
+                aggregator.add(create_rejected_line(index))
+
+        # Assert
+        self.assertEqual(10, aggregator.total)
+        warning_mock.assert_not_called()
+
+    def test_close_logs_summary_and_samples(self) -> None:
+        # Arrange
+        aggregator = ErrorAggregator(summary_interval=3600, sample_size=2)
+        aggregator.add(create_rejected_line(0))
+        aggregator.add(create_rejected_line(1))
+
+        # Act
+        with self.assertLogs('csv_import.csv.rejects', 'WARNING') as logs:
+            aggregator.close()
+
+        # Assert
+        self.assertEqual(3, len(logs.output))
+        self.assertIn('Skipped 2 lines in total', logs.output[0])
+
+
+class RejectWriterTest(TestCase):
+    def test_write(self) -> None:
+        # Arrange
+        open_mock = mock_open()
+        rejected_line = RejectedLine(index=2, offset=49, reason='ParsingError', message='Bad\tline\n', line='2,B\n')
+
+        # Act
+        with mock_builtin_open(open_mock):
+            with RejectWriter('rejects.tsv') as writer:
+                writer.write(rejected_line)
+
+        # Assert
+        open_mock().write.assert_called_once_with('2\t49\tParsingError: Bad line \t2,B\n')
+        open_mock().close.assert_called_once()
+
+    def test_write_chunks(self) -> None:
+        # Arrange
+        open_mock = mock_open()
+        rejected_line = RejectedLine(index=2, offset=49, reason='RecordTooLargeError', message='', line='2,B')
+
+        # Act
+        with mock_builtin_open(open_mock):
+            with RejectWriter('rejects.tsv') as writer:
+                writer.write_chunks(rejected_line, iter(['BB', 'B']))
+
+        # Assert
+        self.assertEqual(
+            ['2\t49\tRecordTooLargeError\t2,B', 'BB', 'B', '\n'],
+            [call.args[0] for call in open_mock().write.call_args_list])
+
+
+class RejectSinkTest(TestCase):
+    def test_reject_without_reject_file(self) -> None:
+        # Arrange
+        open_mock = mock_open()
+
+        # Act
+        with mock_builtin_open(open_mock):
+            with RejectSink.create(summary_interval=3600) as sink:
+                sink.reject(1, 10, 'abc\n', ParsingError('abc is not a number'))
+
+        # Assert
+        open_mock.assert_not_called()
+        self.assertEqual({'ParsingError': 1}, sink.aggregator.counts)
+
+    def test_reject_with_reject_file(self) -> None:
+        # Arrange
+        open_mock = mock_open()
+
+        # Act
+        with mock_builtin_open(open_mock):
+            with RejectSink.create('rejects.tsv', summary_interval=3600) as sink:
+                sink.reject(1, 10, 'abc\n', ParsingError('abc is not a number'))
+
+        # Assert
+        open_mock().write.assert_called_once_with('1\t10\tParsingError: abc is not a number\tabc\n')
+
+    def test_reject_oversized_consumes_chunks_without_reject_file(self) -> None:
+        # Arrange
+        chunks = iter(['BB', 'B\n'])
+
+        # Act
+        with patch('csv_import.csv.rejects.OVERSIZED_LINE_PREVIEW_SIZE', 2):
+            with RejectSink.create(summary_interval=3600) as sink:
+                sink.reject_oversized(1, 10, '2,B', chunks, ParsingError('Line is too long'))
+
+        # Assert
+        self.assertEqual([], list(chunks))
+        self.assertEqual('2,', sink.aggregator.samples[0].line)
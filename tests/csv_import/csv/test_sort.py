@@ -0,0 +1,91 @@
+import random
+from typing import Any, List, Optional, Tuple
+from unittest import TestCase
+
+from parameterized import parameterized
+
+from csv_import.csv.sort import (LINE_OVERHEAD, VALUE_OVERHEAD,
+                                 ExternalSorter, SortOptions)
+
+LINES: List[List[str]] = [['10', 'b', '1.5'], ['9', 'a', ''], ['10', 'a', '-2'], ['', 'c', '3']]
+
+
+class ExternalSorterTest(TestCase):
+    def _sort(self, options: SortOptions, lines: List[List[Any]]) -> Tuple[List[List[Any]], int]:
+        with ExternalSorter(options) as sorter:
+            sorter.set_column_names(['ID', 'Name', 'Score'])
+
+            for values in lines:
+                sorter.add(values)
+
+            return list(sorter.sorted_values()), sorter.runs_count
+
+    @parameterized.expand([
+        ['string key', ('ID',), None, [['', 'c', '3'], ['10', 'b', '1.5'], ['10', 'a', '-2'], ['9', 'a', '']]],
+        ['integer key', ('ID',), ('int64',), [['', 'c', '3'], ['9', 'a', ''], ['10', 'b', '1.5'], ['10', 'a', '-2']]],
+        [
+            'several keys',
+            ('ID', 'Name'),
+            ('int64', 'str'),
+            [['', 'c', '3'], ['9', 'a', ''], ['10', 'a', '-2'], ['10', 'b', '1.5']]
+        ],
+        ['float key', ('2',), ('float64',), [['9', 'a', ''], ['10', 'a', '-2'], ['10', 'b', '1.5'], ['', 'c', '3']]]
+    ])
+    def test_sorted_values(
+            self,
+            name: str,
+            key_columns: Tuple[str, ...],
+            key_types: Optional[Tuple[str, ...]],
+            expected_result: List[List[str]]) -> None:
+        # Act
+        result, runs_count = self._sort(SortOptions(key_columns, key_types), LINES)
+
+        # Assert
+        self.assertEqual(expected_result, result)
+        self.assertEqual(0, runs_count)
+
+    @parameterized.expand([
+        ['sequential', 1],
+        ['parallel', 2]
+    ])
+    def test_sorted_values_spills_runs(self, name: str, workers: int) -> None:
+        # Arrange
+        generator = random.Random(1)
+        lines = [[str(generator.randrange(100)), str(index)] for index in range(1000)]
+        # Every run contains about 10 lines
+        line_size = LINE_OVERHEAD + 2 * VALUE_OVERHEAD + 6
+        options = SortOptions(('ID',), ('int64',), memory_limit=10 * line_size, workers=workers)
+
+        # Act
+        result, runs_count = self._sort(options, lines)
+
+        # Assert
+        self.assertEqual(sorted(lines, key=lambda values: int(values[0])), result)
+        self.assertGreater(runs_count, 50)
+
+    def test_sorted_values_spills_runs_of_typed_values(self) -> None:
+        # Arrange
+        generator = random.Random(1)
+        lines = [[generator.randrange(100), index] for index in range(100)]
+        options = SortOptions(('ID',), ('int64',), memory_limit=1)
+
+        # Act
+        result, runs_count = self._sort(options, lines)
+
+        # Assert
+        self.assertEqual(sorted(lines, key=lambda values: values[0]), result)
+        self.assertGreater(runs_count, 0)
+
+    @parameterized.expand([
+        ['unknown key type', SortOptions(('ID',), ('date',))],
+        ['wrong number of key types', SortOptions(('ID',), ('str', 'str'))]
+    ])
+    def test_init_raises_error_for_incorrect_options(self, name: str, options: SortOptions) -> None:
+        # Act, Assert
+        with self.assertRaises(ValueError):
+            ExternalSorter(options)
+
+    def test_sorted_values_raises_error_for_incorrect_key_value(self) -> None:
+        # Act, Assert
+        with self.assertRaises(ValueError):
+            self._sort(SortOptions(('Name',), ('int64',)), LINES)
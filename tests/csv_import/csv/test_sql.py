@@ -0,0 +1,151 @@
+import os
+import tempfile
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Sequence
+from unittest import TestCase
+
+from parameterized import parameterized
+
+from csv_import.csv.parsers import ParserOptions
+from csv_import.csv.processors import ProcessingError
+from csv_import.csv.sql import MYSQL, POSTGRESQL, SQLITE, SqlOptions, SqlSink
+
+OPTIONS: ParserOptions = ParserOptions(field_terminator=',')
+
+
+class SqlSinkTest(TestCase):
+    def setUp(self) -> None:
+        self._temporary_directory = tempfile.TemporaryDirectory()
+        self._output_file_path = os.path.join(self._temporary_directory.name, 'output.sql')
+
+    def tearDown(self) -> None:
+        self._temporary_directory.cleanup()
+
+    def _write(self, sql_options: SqlOptions, lines: Sequence[Sequence[Any]], header: str = 'id,name\n') -> str:
+        with SqlSink(self._output_file_path, sql_options, OPTIONS) as sink:
+            if header:
+                sink.write_header(header)
+
+            for values in lines:
+                sink.write_values(values)
+
+        with open(self._output_file_path, encoding='utf-8') as output_file:
+            return output_file.read()
+
+    def test_write_values(self) -> None:
+        # Act
+        result = self._write(SqlOptions(table='orders', rows_per_statement=2), [['1', 'a'], ['2', 'b'], ['3', 'c']])
+
+        # Assert
+        self.assertEqual(
+            'BEGIN;\n'
+            'INSERT INTO "orders" ("id", "name") VALUES\n(\'1\', \'a\'),\n(\'2\', \'b\');\n'
+            'INSERT INTO "orders" ("id", "name") VALUES\n(\'3\', \'c\');\n'
+            'COMMIT;\n',
+            result)
+
+    def test_write_values_groups_statements_into_transactions(self) -> None:
+        # Act
+        result = self._write(
+            SqlOptions(table='orders', rows_per_statement=1, statements_per_transaction=2),
+            [[index, 'a'] for index in range(3)])
+
+        # Assert
+        self.assertEqual(['BEGIN;', 'COMMIT;', 'BEGIN;', 'COMMIT;'], [
+            line for line in result.splitlines() if line in ('BEGIN;', 'COMMIT;')])
+        self.assertEqual(3, result.count('INSERT INTO'))
+
+    def test_write_values_keeps_statements_under_maximum_size(self) -> None:
+        # Arrange
+        sql_options = SqlOptions(table='orders', statements_per_transaction=0, max_statement_size=120)
+
+        # Act
+        result = self._write(sql_options, [[index, 'x' * 20] for index in range(10)])
+
+        # Assert
+        statements = [statement + ';\n' for statement in result.split(';\n') if statement]
+
+        self.assertGreater(len(statements), 1)
+        self.assertTrue(all(len(statement.encode('utf-8')) <= 120 for statement in statements))
+        self.assertEqual(10, result.count("'xxxxxxxxxxxxxxxxxxxx'"))
+
+    def test_write_values_raises_error_for_row_exceeding_maximum_size(self) -> None:
+        # Act, Assert
+        with self.assertRaises(ProcessingError):
+            self._write(SqlOptions(table='orders', max_statement_size=50), [['1', 'x' * 50]])
+
+    @parameterized.expand([
+        [
+            'postgresql',
+            POSTGRESQL,
+            'INSERT INTO "orders" ("id", "name") VALUES\n(1, \'a\')\n'
+            'ON CONFLICT ("id") DO UPDATE SET "name" = excluded."name";\n'
+        ],
+        [
+            'mysql',
+            MYSQL,
+            'INSERT INTO `orders` (`id`, `name`) VALUES\n(1, \'a\')\nON DUPLICATE KEY UPDATE `name` = VALUES(`name`);\n'
+        ]
+    ])
+    def test_write_values_writes_upserts(self, name: str, dialect: str, expected_result: str) -> None:
+        # Arrange
+        sql_options = SqlOptions(table='orders', dialect=dialect, conflict_columns=('0',), statements_per_transaction=0)
+
+        # Act
+        result = self._write(sql_options, [[1, 'a']])
+
+        # Assert
+        self.assertEqual(expected_result, result)
+
+    def test_write_values_without_header(self) -> None:
+        # Act
+        result = self._write(SqlOptions(table='import.orders', statements_per_transaction=0), [[1, 'a']], header='')
+
+        # Assert
+        self.assertEqual('INSERT INTO "import"."orders" VALUES\n(1, \'a\');\n', result)
+
+    @parameterized.expand([
+        ['postgresql string', POSTGRESQL, "O'Brien \\ 1", "'O''Brien \\ 1'"],
+        ['mysql string', MYSQL, "O'Brien \\ 1\n", "'O\\'Brien \\\\ 1\\n'"],
+        ['sqlite string', SQLITE, "it's", "'it''s'"],
+        ['none', POSTGRESQL, None, 'NULL'],
+        ['integer', POSTGRESQL, 10, '10'],
+        ['float', POSTGRESQL, 0.5, '0.5'],
+        ['decimal', MYSQL, Decimal('10.25'), '10.25'],
+        ['boolean', POSTGRESQL, True, 'TRUE'],
+        ['datetime', POSTGRESQL, datetime(2024, 1, 2, 3, 4, 5), "'2024-01-02 03:04:05'"],
+        ['date', MYSQL, date(2024, 1, 2), "'2024-01-02'"]
+    ])
+    def test_literal(self, name: str, dialect: str, value: Any, expected_result: str) -> None:
+        # Arrange
+        sink = SqlSink(self._output_file_path, SqlOptions(table='orders', dialect=dialect))
+
+        # Act
+        result = sink.literal(value)
+
+        # Assert
+        self.assertEqual(expected_result, result)
+
+    @parameterized.expand([
+        ['infinite float', POSTGRESQL, float('inf')],
+        ['nan decimal', MYSQL, Decimal('NaN')],
+        ['nul char', POSTGRESQL, 'a\0b']
+    ])
+    def test_literal_raises_error(self, name: str, dialect: str, value: Any) -> None:
+        # Arrange
+        sink = SqlSink(self._output_file_path, SqlOptions(table='orders', dialect=dialect))
+
+        # Act, Assert
+        with self.assertRaises(ProcessingError):
+            sink.literal(value)
+
+    def test_literal_writes_empty_strings_as_null(self) -> None:
+        # Arrange
+        sink = SqlSink(self._output_file_path, SqlOptions(table='orders', empty_as_null=True))
+
+        # Act
+        result: List[str] = [sink.literal(''), sink.literal(' ')]
+
+        # Assert
+        self.assertEqual(['NULL', "' '"], result)
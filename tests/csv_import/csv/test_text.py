@@ -1,28 +1,36 @@
+import os
+import tempfile
 from abc import ABC, abstractmethod
 from contextlib import contextmanager
-from typing import Optional, Type, cast
+from typing import List, Optional, Type, cast
 from unittest import TestCase
 from unittest.mock import Mock, mock_open, patch
 
+from parameterized import parameterized
+
 from csv_import.csv.text import TextIO, TextReader, TextWriter
 
 
 @contextmanager
 def mock_builtin_open(open_mock: Optional[Mock] = None, data: Optional[str] = None) -> Mock:
     """
-    Patches buit-in open function to avoid the need to work with real files
+    Patches buit-in open function (and os.path.getsize used by progress reporting) to avoid the need to work
+    with real files
     :param open_mock: Optional Mock object used as a return value of open function
                       (can be used to get access to internal Handle object)
-    :param data: Optional string parameter used as file content
+    :param data: Optional string parameter used as file content (encoded in UTF-8 as files are read in binary mode)
     :return: Mock object
     """
     if data and open_mock:
         raise ValueError('open_mock and data parameters are mutually exclusive')
 
+    binary_data = data.encode('utf-8') if data is not None else b''
+
     if not open_mock:
-        open_mock = mock_open(read_data=data)
+        open_mock = mock_open(read_data=binary_data)
 
-    with patch('builtins.open', open_mock, create=True) as open_patch:
+    with patch('builtins.open', open_mock, create=True) as open_patch, \
+            patch('os.path.getsize', return_value=len(binary_data)):
         yield open_patch
 
 
@@ -79,7 +87,7 @@ class TextReaderTest(_AbstractTextIOTest):
         first_line = 'abc\n'
         second_line = 'cde'
         data_mock = f'{first_line}{second_line}'
-        open_mock = mock_open(read_data=data_mock)
+        open_mock = mock_open(read_data=data_mock.encode())
 
         # Act
         with cast(TextReader, self._create_text_instance(open_mock)) as text_reader:
@@ -93,6 +101,106 @@ class TextReaderTest(_AbstractTextIOTest):
             self.assertEqual(1, text_reader.current_line_index)
             self.assertEqual(second_line, text_reader.current_line)
 
+    @parameterized.expand([
+        ['utf-8 with byte order mark', b'\xef\xbb\xbfN\xc3\xa4me\n1\n', None, ['Näme\n', '1\n'], [0, 9]],
+        ['latin-1', b'N\xe4me\n1\n', 'latin-1', ['Näme\n', '1\n'], [0, 5]],
+        ['windows line terminators', b'a,b\r\n1,2\r\n', 'utf-8', ['a,b\n', '1,2\n'], [0, 5]]
+    ])
+    def test_read_line_decodes_lines(
+            self,
+            name: str,
+            data: bytes,
+            encoding: Optional[str],
+            expected_lines: List[str],
+            expected_offsets: List[int]) -> None:
+        # Arrange
+        open_mock = mock_open(read_data=data)
+
+        # Act
+        with mock_builtin_open(open_mock):
+            with TextReader.create('dummy', encoding) as text_reader:
+                lines = []
+                offsets = []
+
+                for _ in expected_lines:
+                    lines.append(text_reader.read_line())
+                    offsets.append(text_reader.current_line_offset)
+
+        # Assert
+        self.assertEqual(expected_lines, lines)
+        self.assertEqual(expected_offsets, offsets)
+        self.assertEqual(len(data), text_reader.position)
+
+    @parameterized.expand([
+        ['remainder read in chunks', True],
+        ['remainder skipped by the next read', False]
+    ])
+    def test_read_line_truncates_oversized_lines(self, name: str, read_remainder: bool) -> None:
+        # Arrange
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'input.csv')
+
+            with open(file_path, 'wb') as file:
+                file.write(b'ab\n' + 'xä'.encode('utf-8') * 4 + b'\r\ncd\n')
+
+            # Act
+            with TextReader.create(file_path, 'utf-8', max_line_size=4) as text_reader:
+                lines = [text_reader.read_line(), text_reader.read_line()]
+                truncated = text_reader.truncated
+                remainder = list(text_reader.read_remainder(3)) if read_remainder else []
+                lines.append(text_reader.read_line())
+
+        # Assert
+        self.assertEqual(['ab\n', 'xäxä', 'cd\n'], lines)
+        self.assertTrue(truncated)
+        self.assertFalse(text_reader.truncated)
+        self.assertEqual(['xä', 'xä', '\n'] if read_remainder else [], remainder)
+        self.assertEqual(2, text_reader.current_line_index)
+        self.assertEqual(17, text_reader.current_line_offset)
+
+    @parameterized.expand([
+        ['line of the maximum size', b'abcde\r\n', 'abcde\n', False, []],
+        ['terminator split from the beginning', b'abcdef\r\n', 'abcdef', True, ['\n']],
+        ['terminator split between chunks', b'abcdefgh\r\n', 'abcdefg', True, ['h', '\n']],
+        ['line ending after the beginning', b'abcdef\n', 'abcdef\n', True, []]
+    ])
+    def test_read_line_does_not_count_windows_line_terminators(
+            self,
+            name: str,
+            data: bytes,
+            expected_line: str,
+            expected_truncated: bool,
+            expected_remainder: List[str]) -> None:
+        # Arrange
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'input.csv')
+
+            with open(file_path, 'wb') as file:
+                file.write(data + b'x\n')
+
+            # Act
+            with TextReader.create(file_path, 'utf-8', max_line_size=5) as text_reader:
+                line = text_reader.read_line()
+                truncated = text_reader.truncated
+                remainder = list(text_reader.read_remainder(1))
+                next_line = text_reader.read_line()
+
+        # Assert
+        self.assertEqual(expected_line, line)
+        self.assertEqual(expected_truncated, truncated)
+        self.assertEqual(expected_remainder, remainder)
+        self.assertEqual('x\n', next_line)
+
+    def test_read_line_raises_error_for_utf16_file(self) -> None:
+        # Arrange
+        open_mock = mock_open(read_data='a,b\n'.encode('utf-16'))
+
+        # Act, Assert
+        with mock_builtin_open(open_mock):
+            with TextReader.create('dummy') as text_reader:
+                with self.assertRaises(ValueError):
+                    text_reader.read_line()
+
 
 class TextWriterTest(_AbstractTextIOTest):
     @property
@@ -0,0 +1,89 @@
+import os
+import tempfile
+from collections import Counter
+from unittest import TestCase
+
+from parameterized import parameterized
+
+from csv_import.csv.parsers import (FileParser, LineParser,
+                                    LineParserDispatcher, NumberParser,
+                                    ParserOptions, StringParser)
+from csv_import.csv.validation import FileValidator, ValidationReport
+
+DATA: str = 'ID,Name,Age\n1,John,23\n2,Bob,x\n3,Ann\nx,Tom,40\n4,Eve,y,z\n5,Kate,30\n'
+
+
+class FileValidatorTest(TestCase):
+    def setUp(self) -> None:
+        self._temporary_directory = tempfile.TemporaryDirectory()
+        self._file_path = os.path.join(self._temporary_directory.name, 'input.csv')
+
+        with open(self._file_path, 'w') as file:
+            file.write(DATA * 50)
+
+    def tearDown(self) -> None:
+        self._temporary_directory.cleanup()
+
+    def _create_file_parser(self) -> FileParser:
+        options = ParserOptions(field_terminator=',', header_lines=0)
+        line_parser = LineParserDispatcher(
+            [
+                LineParser([NumberParser(), StringParser(), NumberParser()], options),
+                LineParser([StringParser(), StringParser(), StringParser(), StringParser()], options)
+            ],
+            options)
+
+        return FileParser(line_parser, options)
+
+    @parameterized.expand([
+        ['sequential', 1],
+        ['parallel', 3]
+    ])
+    def test_validate(self, name: str, workers: int) -> None:
+        # Arrange
+        validator = FileValidator(
+            self._create_file_parser(), workers, max_offending_offsets=3, min_parallel_file_size=0)
+
+        # Act
+        report = validator.validate(self._file_path)
+
+        # Assert
+        self.assertEqual(3 * 50, report.good)
+        # Repeated header lines are validated as data lines
+        self.assertEqual(4 * 50, report.skipped)
+        self.assertEqual(50, report.recovered)
+        self.assertEqual(50, report.field_count_errors)
+        # Without header lines columns are named after their positions
+        self.assertEqual(Counter({'0': 100, '2': 100}), report.errors_by_column)
+        self.assertEqual(Counter({'NumberParser': 200}), report.errors_by_value_parser)
+        self.assertEqual([0, 22, 30], report.offending_offsets)
+
+    def test_validate_reads_column_names_from_header(self) -> None:
+        # Arrange
+        options = ParserOptions(field_terminator=',')
+        file_parser = FileParser(LineParser([NumberParser(), StringParser(), NumberParser()], options), options)
+        validator = FileValidator(file_parser)
+
+        # Act
+        report = validator.validate(self._file_path)
+
+        # Assert
+        self.assertEqual(Counter({'Age': 99, 'ID': 99}), report.errors_by_column)
+
+
+class ValidationReportTest(TestCase):
+    def test_merge(self) -> None:
+        # Arrange
+        report = ValidationReport(good=1, skipped=2, errors_by_column=Counter({'ID': 2}), offending_offsets=[10, 30])
+        other_report = ValidationReport(
+            good=3, recovered=1, errors_by_column=Counter({'ID': 1, 'Age': 1}), offending_offsets=[20])
+
+        # Act
+        report.merge(other_report, max_offending_offsets=2)
+
+        # Assert
+        self.assertEqual(4, report.good)
+        self.assertEqual(2, report.skipped)
+        self.assertEqual(1, report.recovered)
+        self.assertEqual(Counter({'ID': 3, 'Age': 1}), report.errors_by_column)
+        self.assertEqual([10, 20], report.offending_offsets)
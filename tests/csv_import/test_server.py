@@ -0,0 +1,77 @@
+import io
+import os
+import sys
+import tempfile
+import threading
+from typing import List
+from unittest import TestCase
+
+import click
+from parameterized import parameterized
+
+from csv_import.server import JobServer, submit_job
+
+
+def _job(args: List[str]) -> None:
+    if args[0] == 'echo':
+        print(' '.join(args[1:]))
+        sys.stderr.write(os.getcwd() + '\n')
+    elif args[0] == 'usage':
+        raise click.UsageError('Wrong usage')
+    else:
+        raise ValueError('Job failed')
+
+
+class JobServerTest(TestCase):
+    def setUp(self) -> None:
+        self._temporary_directory = tempfile.TemporaryDirectory()
+        self._socket_path = os.path.join(self._temporary_directory.name, 'server.sock')
+        self._job_server = JobServer(self._socket_path, _job, workers=1)
+        self._server_thread = threading.Thread(target=self._job_server.serve_forever)
+        self._server_thread.start()
+        self._job_server.wait_until_started()
+
+    def tearDown(self) -> None:
+        self._job_server.shutdown()
+        self._server_thread.join()
+        self._temporary_directory.cleanup()
+
+    @parameterized.expand([
+        ['successful job', ['echo', 'a', 'b'], 0, 'a b\n', os.getcwd()],
+        ['usage error', ['usage'], 2, '', 'Wrong usage'],
+        ['failed job', ['fail'], 1, '', 'ValueError: Job failed']
+    ])
+    def test_submit_job_streams_output_and_returns_exit_code(
+            self,
+            name: str,
+            args: List[str],
+            expected_exit_code: int,
+            expected_stdout: str,
+            expected_stderr: str) -> None:
+        # Arrange
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+
+        # Act
+        exit_code = submit_job(self._socket_path, args, stdout, stderr)
+
+        # Assert
+        self.assertEqual(expected_exit_code, exit_code)
+        self.assertEqual(expected_stdout, stdout.getvalue())
+        self.assertIn(expected_stderr, stderr.getvalue())
+
+    def test_jobs_reuse_worker_processes(self) -> None:
+        # Act
+        for _ in range(3):
+            submit_job(self._socket_path, ['echo'], io.StringIO(), io.StringIO())
+
+        # Assert
+        self.assertEqual(1, len(self._job_server.executor._processes))  # type: ignore
+
+    def test_socket_is_removed_after_shutdown(self) -> None:
+        # Act
+        self._job_server.shutdown()
+        self._server_thread.join()
+
+        # Assert
+        self.assertFalse(os.path.exists(self._socket_path))